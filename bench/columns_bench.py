@@ -0,0 +1,89 @@
+"""
+Cost of a Get's response as GetPairs (rows) and as GetColumns, per key.
+
+    python -m bench.columns_bench [--sizes 100,1000,10000,100000]
+        [--repeats 5] [--out results.json]
+
+For each size, the same read values (the building mix of bench.hotpath_bench,
+read a few milliseconds apart device by device) are timed through
+
+    encode      the server copying them into a response and serializing it
+    decode      the client parsing the response into {key: value}
+
+and the serialized response measured. Rows are what Get and GetKeySet send,
+columns what GetKeySetColumns sends.
+"""
+import argparse
+import json
+import sys
+import time
+import timeit
+
+import src.client as client
+import src.common_pb2 as common_pb2
+import src.parse as parse
+import src.server as server
+from bench.hotpath_bench import keys, values
+
+SIZES = (100, 1000, 10000, 100000)
+
+def _formats(key_set:list[str]) -> dict:
+    """Return (encode, decode, response bytes) for each format."""
+    points = [parse.ParseKey(k) for k in key_set]
+    read = values(len(key_set))
+    now = time.time()
+    times = [now + (i // 50) * 0.003 for i in range(len(key_set))]
+
+    def encode_rows() -> bytes:
+        pairs = [server._get_pair(k, v, t) for k, v, t in zip(key_set, read, times)]
+        return common_pb2.GetResponse(Pairs=pairs).SerializeToString()
+
+    def encode_columns() -> bytes:
+        return server._get_columns(points, read, times).SerializeToString()
+
+    rows = encode_rows()
+    columns = encode_columns()
+    return {
+        "rows": (encode_rows, lambda: client._get_values(key_set, common_pb2.GetResponse.FromString(rows).Pairs), rows),
+        "columns": (encode_columns, lambda: client.decode_columns(key_set, common_pb2.GetColumns.FromString(columns)), columns),
+    }
+
+def run(sizes:list[int], repeats:int) -> dict:
+    """Return {format: {size: {"encode": us/key, "decode": us/key, "bytes": per key}}}."""
+    results:dict[str, dict[int, dict]] = {"rows": {}, "columns": {}}
+    for size in sizes:
+        for name, (encode, decode, response) in _formats(keys(size)).items():
+            results[name][size] = {
+                "encode": min(timeit.repeat(encode, number=1, repeat=repeats)) / size * 1e6,
+                "decode": min(timeit.repeat(decode, number=1, repeat=repeats)) / size * 1e6,
+                "bytes": len(response) / size,
+            }
+    return results
+
+def main(argv:list[str]=None) -> int:
+    parser = argparse.ArgumentParser(description="Compare row and column Get responses.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in SIZES))
+    parser.add_argument("--repeats", type=int, default=5)
+    parser.add_argument("--out", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    results = run(sizes, args.repeats)
+
+    print(f"per key, best of {args.repeats}")
+    print(f"  {'keys':>8}  {'format':>8}  {'encode us':>10}  {'decode us':>10}  {'bytes':>7}")
+    for size in sizes:
+        for name in results:
+            r = results[name][size]
+            print(f"  {size:>8}  {name:>8}  {r['encode']:10.3f}  {r['decode']:10.3f}  {r['bytes']:7.1f}")
+        rows, columns = results["rows"][size], results["columns"][size]
+        print(f"  {'':>8}  {'ratio':>8}  {rows['encode'] / columns['encode']:9.1f}x  {rows['decode'] / columns['decode']:9.1f}x"
+              f"  {rows['bytes'] / columns['bytes']:6.1f}x")
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
@@ -0,0 +1,244 @@
+"""
+End-to-end throughput and latency of the driver's Get and Set against a
+simulated device fleet.
+
+    python -m bench.e2e_bench [--devices 20] [--objects 100] [--keys 50]
+        [--concurrency 8] [--duration 10] [--latency 0.005]
+        [--scenarios get-sequential,...] [--out results.json]
+
+Each scenario starts a fleet (see bench.simulator) in this process and the
+driver, `src.server.main`, in a child process configured by a generated
+ini, then runs Get (or Set) requests of `keys` random keys from
+`concurrency` callers for `duration` seconds after one warm-up pass over
+every key. In get-keyset each caller registers one sample of keys and
+gets it by handle. Reported per scenario:
+
+    p50/p95/p99     request latency in milliseconds
+    keys_per_s      keys read (or written) per second
+    packets_per_key BACnet requests and responses the fleet saw per key
+    cpu_per_key     driver CPU microseconds per key (Linux only)
+
+Results are printed and, with --out, written as JSON along with the commit
+and settings so runs can be compared.
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+import grpc
+
+import src.common_pb2 as common_pb2
+import src.common_pb2_grpc as common_pb2_grpc
+from bench.simulator import SimulatorFleet, SIM_LATENCY
+
+# where everything listens, clear of a driver running on the defaults
+DRIVER_ADDRESS = "127.0.0.1/8:47800"
+DRIVER_PORT = "50162"
+FLEET_PORT = 47900
+
+DRIVER_START_TIMEOUT = 30.0     # seconds for the driver to come up
+REQUEST_TIMEOUT = 10.0          # seconds a Get or Set may take
+
+# name -> (rpc, concurrent, cache, rpm); the concurrent ones use --concurrency
+SCENARIOS = {
+    "get-sequential": ("Get", False, True, True),
+    "get-concurrent": ("Get", True, True, True),
+    "get-no-cache": ("Get", True, False, True),
+    "get-no-rpm": ("Get", True, False, False),
+    "get-keyset": ("GetKeySet", True, False, True),
+    "set-concurrent": ("Set", True, True, True),
+}
+
+_INI = """[BACpypes]
+objectname: e2e-bench
+objectidentifier: 599
+address: {address}
+vendoridentifier: 999
+cachettl: {cache_ttl}
+catalogresync: 0
+"""
+
+def _percentile(samples:list[float], p:float) -> float:
+    if not samples:
+        return 0.0
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p / 100))]
+
+def _cpu_seconds(pid:int) -> float:
+    """Return the user and system CPU time of a process, None off Linux."""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            fields = f.read().rsplit(")", 1)[1].split()
+    except OSError:
+        return None
+    return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+
+def _commit() -> str:
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True).stdout.strip()
+    except OSError:
+        return ""
+
+class _Driver:
+    """The driver in a child process, on its own ini file."""
+    def __init__(self, cache:bool):
+        self._dir = tempfile.TemporaryDirectory()
+        self.ini = os.path.join(self._dir.name, "bench.ini")
+        with open(self.ini, "w") as f:
+            f.write(_INI.format(address=DRIVER_ADDRESS, cache_ttl=5.0 if cache else 0))
+        self.process = subprocess.Popen(
+            [sys.executable, "-m", "bench.e2e_bench", "serve", self.ini, DRIVER_PORT],
+            stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+        )
+
+    async def ready(self, channel:grpc.aio.Channel):
+        try:
+            await asyncio.wait_for(channel.channel_ready(), DRIVER_START_TIMEOUT)
+        except asyncio.TimeoutError:
+            raise RuntimeError(f"driver did not start, exit code {self.process.poll()}") from None
+
+    def close(self):
+        self.process.terminate()
+        try:
+            self.process.wait(5)
+        except subprocess.TimeoutExpired:
+            self.process.kill()
+        self._dir.cleanup()
+
+async def _call(stub, rpc:str, keys:list[str], handle:str=None) -> tuple[int, int]:
+    """Make one Get or Set of `keys` (GetKeySet of their `handle`), returning
+    the keys done and failed.
+    """
+    if rpc == "GetKeySet":
+        response = await stub.GetKeySet(common_pb2.KeySetRequest(Handle=handle), timeout=REQUEST_TIMEOUT)
+        errors = sum(1 for pair in response.Pairs if pair.HasField("Error")) + len(keys) - len(response.Pairs)
+    elif rpc == "Get":
+        response = await stub.Get(common_pb2.GetRequest(Keys=keys), timeout=REQUEST_TIMEOUT)
+        errors = sum(1 for pair in response.Pairs if pair.HasField("Error"))
+    else:
+        pairs = [common_pb2.SetPair(Key=key, Value="active" if "binary" in key else str(random.uniform(60, 80)))
+                 for key in keys]
+        response = await stub.Set(common_pb2.SetRequest(Pairs=pairs), timeout=REQUEST_TIMEOUT)
+        errors = sum(1 for pair in response.Pairs if not pair.Ok)
+    return len(keys), errors
+
+async def run_scenario(name:str, args:argparse.Namespace) -> dict:
+    rpc, concurrent, cache, rpm = SCENARIOS[name]
+    concurrency = args.concurrency if concurrent else 1
+    fleet = await SimulatorFleet.create(args.devices, port=FLEET_PORT, objects=args.objects,
+                                        latency=args.latency, rpm=rpm, change=0)
+    driver = _Driver(cache)
+    try:
+        async with grpc.aio.insecure_channel(f"127.0.0.1:{DRIVER_PORT}") as channel:
+            await driver.ready(channel)
+            stub = common_pb2_grpc.DeviceControlStub(channel)
+            keys = fleet.keys()
+            rng = random.Random(name)
+
+            # warm up: every key once, so the cache and device state are settled
+            for i in range(0, len(keys), args.keys):
+                await _call(stub, "Set" if rpc == "Set" else "Get", keys[i:i + args.keys])
+
+            latencies:list[float] = []
+            done = 0
+            errors = 0
+            packets = fleet.packets()
+            cpu = _cpu_seconds(driver.process.pid)
+            start = time.perf_counter()
+            stop = start + args.duration
+
+            async def caller():
+                nonlocal done, errors
+                sample = handle = None
+                if rpc == "GetKeySet":
+                    sample = rng.sample(keys, min(args.keys, len(keys)))
+                    handle = (await stub.RegisterKeys(common_pb2.RegisterKeysRequest(Keys=sample))).Handle
+                while time.perf_counter() < stop:
+                    if handle is None:
+                        sample = rng.sample(keys, min(args.keys, len(keys)))
+                    sent = time.perf_counter()
+                    try:
+                        count, failed = await _call(stub, rpc, sample, handle)
+                    except grpc.aio.AioRpcError:
+                        count, failed = len(sample), len(sample)
+                    latencies.append(time.perf_counter() - sent)
+                    done += count
+                    errors += failed
+
+            await asyncio.gather(*(caller() for _ in range(concurrency)))
+            elapsed = time.perf_counter() - start
+            packets = fleet.packets() - packets
+            if cpu is not None:
+                cpu = _cpu_seconds(driver.process.pid) - cpu
+    finally:
+        driver.close()
+        fleet.close()
+
+    return {
+        "scenario": name,
+        "rpc": rpc,
+        "concurrency": concurrency,
+        "cache": cache,
+        "rpm": rpm,
+        "requests": len(latencies),
+        "keys": done,
+        "errors": errors,
+        "p50": _percentile(latencies, 50) * 1000,
+        "p95": _percentile(latencies, 95) * 1000,
+        "p99": _percentile(latencies, 99) * 1000,
+        "keys_per_s": done / elapsed,
+        "packets_per_key": packets / done if done else 0.0,
+        "cpu_per_key": cpu / done * 1e6 if (cpu is not None) and done else None,
+    }
+
+def _print(result:dict):
+    cpu = "-" if result["cpu_per_key"] is None else f"{result['cpu_per_key']:.0f}"
+    print(f"  {result['scenario']:>15}: {result['keys_per_s']:9.0f} keys/s"
+          f"  p50 {result['p50']:7.1f}  p95 {result['p95']:7.1f}  p99 {result['p99']:7.1f} ms"
+          f"  {result['packets_per_key']:5.2f} pkt/key  {cpu:>6} us cpu/key"
+          f"  {result['errors']} errors")
+
+async def main(argv:list[str]=None):
+    parser = argparse.ArgumentParser(description="Benchmark the driver against a simulated fleet.")
+    parser.add_argument("--devices", type=int, default=20)
+    parser.add_argument("--objects", type=int, default=100)
+    parser.add_argument("--keys", type=int, default=50, help="keys per request")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds per scenario")
+    parser.add_argument("--latency", type=float, default=SIM_LATENCY, help="device response latency")
+    parser.add_argument("--scenarios", default=",".join(SCENARIOS))
+    parser.add_argument("--out", help="write the results to this JSON file")
+    args = parser.parse_args(argv)
+
+    print(f"{args.devices} devices x {args.objects} objects, {args.keys} keys per request, {args.duration}s per scenario")
+    results = []
+    for name in args.scenarios.split(","):
+        result = await run_scenario(name, args)
+        _print(result)
+        results.append(result)
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump({
+                "commit": _commit(),
+                "time": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "settings": vars(args),
+                "results": results,
+            }, f, indent=2)
+
+def serve(config:str, port:str):
+    """Run the driver, the child process of a scenario."""
+    import src.server
+    asyncio.run(src.server.main(config=config, port=port))
+
+if __name__ == "__main__":
+    if sys.argv[1:2] == ["serve"]:
+        serve(*sys.argv[2:4])
+    else:
+        asyncio.run(main(sys.argv[1:]))
@@ -0,0 +1,174 @@
+"""
+Per-key CPU of the driver's hot paths, stage by stage, with regression
+thresholds.
+
+    python -m bench.hotpath_bench [--sizes 10,100,1000,10000,100000]
+        [--repeats 3] [--stages parse_warm,...] [--out results.json]
+        [--baseline results.json] [--tolerance 1.25]
+
+Stages, each timed alone over a realistic key set (several devices and
+ports, object types, properties and array indexes):
+
+    parse_legacy    ParseBacnetPtKey, what every key used to cost
+    parse_cold      ParseKey of a key never seen
+    parse_warm      ParseKey of a key seen before (every poll after the first),
+                    as slow as parse_cold past PARSE_CACHE_SIZE keys
+    split_property  the property[index] regex
+    plan            PlanReads over the parsed keys
+    str_value       str() of read values (Real, Enumerated, CharacterString)
+    encode_value    _encode_value, the Value text and Dtype of read values
+    timestamp       the local-time read timestamp of a GetPair
+    get_pair        _get_pair, the above plus GetPair construction
+    response        a GetResponse of the pairs, serialized
+
+A stage fails if its cost per key (best of --repeats, at key sets of at
+least CHECK_MIN_KEYS, and for parse_warm at most PARSE_CACHE_SIZE) is
+above THRESHOLDS, or above --tolerance times its cost in a --baseline
+run. Any failure exits with status 1.
+"""
+import argparse
+import datetime as dt
+import json
+import sys
+import timeit
+
+from bacpypes3.basetypes import BinaryPV, EngineeringUnits
+from bacpypes3.primitivedata import CharacterString, Real, Unsigned
+
+import src.common_pb2 as common_pb2
+import src.parse as parse
+import src.planner as planner
+import src.server as server
+from src.app import split_property
+
+SIZES = (10, 100, 1000, 10000, 100000)
+CHECK_MIN_KEYS = 100        # smaller key sets are dominated by fixed costs
+
+# microseconds per key a stage may cost, a few times what it costs on a
+# developer laptop so only real regressions trip them
+THRESHOLDS = {
+    "parse_legacy": 60.0,
+    "parse_cold": 200.0,
+    "parse_warm": 1.0,
+    "split_property": 3.0,
+    "plan": 15.0,
+    "str_value": 10.0,
+    "encode_value": 10.0,
+    "timestamp": 10.0,
+    "get_pair": 30.0,
+    "response": 10.0,
+}
+
+_OBJECTS = ("analog-input", "analog-value", "binary-value", "multi-state-value", "analog-output")
+_PROPERTIES = ("present-value", "present-value", "present-value", "status-flags", "priority-array[16]", "object-name")
+
+def keys(count:int) -> list[str]:
+    """Return `count` distinct keys spread over devices of 50 points each."""
+    result = []
+    for i in range(count):
+        device = i // 50
+        port = "" if device % 3 else ":47809"
+        obj = _OBJECTS[i % len(_OBJECTS)]
+        prop = _PROPERTIES[(i // len(_OBJECTS)) % len(_PROPERTIES)]
+        result.append(f"bacnet://10.{device // 62500 % 250}.{device // 250 % 250}.{device % 250 + 1}{port}/{device}/{obj},{i}/{prop}")
+    return result
+
+def values(count:int) -> list:
+    """Return read values in the mix a building returns them."""
+    samples = (Real(72.5), BinaryPV("active"), Unsigned(3), Real(-1.25), CharacterString("AHU-1 SAT"),
+               EngineeringUnits("degreesFahrenheit"))
+    return [samples[i % len(samples)] for i in range(count)]
+
+def _stages(key_set:list[str]) -> dict:
+    """Return each stage as a function running it over the key set once."""
+    points = [parse.ParseKey(k) for k in key_set]
+    properties = [k.rsplit("/", 1)[1] for k in key_set]
+    read = values(len(key_set))
+    now = dt.datetime.now().timestamp()
+    pairs = [server._get_pair(k, v, now) for k, v in zip(key_set, read)]
+    caps = lambda address: planner.DeviceCaps(planner.MAX_APDU)
+
+    def parse_cold():
+        parse.ParseKey.cache_clear()
+        for k in key_set:
+            parse.ParseKey(k)
+
+    return {
+        "parse_legacy": lambda: [parse.ParseBacnetPtKey(k) for k in key_set],
+        "parse_cold": parse_cold,
+        "parse_warm": lambda: [parse.ParseKey(k) for k in key_set],
+        "split_property": lambda: [split_property(p) for p in properties],
+        "plan": lambda: planner.PlanReads(points, caps),
+        "str_value": lambda: [str(v) for v in read],
+        "encode_value": lambda: [server._encode_value(v) for v in read],
+        "timestamp": lambda: [dt.datetime.fromtimestamp(now, server._local_tz) for _ in read],
+        "get_pair": lambda: [server._get_pair(k, v, now) for k, v in zip(key_set, read)],
+        "response": lambda: common_pb2.GetResponse(Pairs=pairs).SerializeToString(),
+    }
+
+def run(sizes:list[int], repeats:int, stages:list[str]) -> dict:
+    """Return {stage: {size: microseconds per key}}."""
+    results:dict[str, dict[int, float]] = {stage: {} for stage in stages}
+    for size in sizes:
+        key_set = keys(size)
+        parse.ParseKey.cache_clear()
+        bench = _stages(key_set)
+        for stage in stages:
+            fn = bench[stage]
+            fn()    # warm
+            best = min(timeit.repeat(fn, number=1, repeat=repeats))
+            results[stage][size] = best / size * 1e6
+        parse.ParseKey.cache_clear()
+    return results
+
+def check(results:dict, baseline:dict=None, tolerance:float=1.25) -> list[str]:
+    """Return a message for every stage and size over its threshold."""
+    failures = []
+    for stage, costs in results.items():
+        for size, cost in costs.items():
+            if size < CHECK_MIN_KEYS:
+                continue
+            if (stage == "parse_warm") and (size > parse.PARSE_CACHE_SIZE):
+                continue    # every key is evicted before it's seen again
+            limit = THRESHOLDS.get(stage)
+            if (limit is not None) and (cost > limit):
+                failures.append(f"{stage} at {size} keys: {cost:.2f} us/key over the {limit:.2f} threshold")
+            before = (baseline or {}).get(stage, {}).get(str(size))
+            if (before is not None) and (cost > before * tolerance):
+                failures.append(f"{stage} at {size} keys: {cost:.2f} us/key, {cost / before:.2f}x the baseline {before:.2f}")
+    return failures
+
+def main(argv:list[str]=None) -> int:
+    parser = argparse.ArgumentParser(description="Time the driver's per-key hot paths.")
+    parser.add_argument("--sizes", default=",".join(str(s) for s in SIZES))
+    parser.add_argument("--repeats", type=int, default=3)
+    parser.add_argument("--stages", default=",".join(THRESHOLDS))
+    parser.add_argument("--out", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="a previous --out to compare against")
+    parser.add_argument("--tolerance", type=float, default=1.25, help="slowdown over the baseline allowed")
+    args = parser.parse_args(argv)
+
+    sizes = [int(s) for s in args.sizes.split(",")]
+    stages = args.stages.split(",")
+    results = run(sizes, args.repeats, stages)
+
+    print(f"us/key, best of {args.repeats}")
+    print(f"  {'':>14}" + "".join(f"{s:>10}" for s in sizes))
+    for stage, costs in results.items():
+        print(f"  {stage:>14}" + "".join(f"{costs[s]:10.3f}" for s in sizes))
+
+    if args.out:
+        with open(args.out, "w") as f:
+            json.dump(results, f, indent=2)
+
+    baseline = None
+    if args.baseline:
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+    failures = check(results, baseline, args.tolerance)
+    for failure in failures:
+        print(f"FAIL {failure}")
+    return 1 if failures else 0
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
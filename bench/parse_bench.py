@@ -0,0 +1,48 @@
+"""
+Per-key parsing overhead of a Get, before and after memoized keys.
+
+    python -m bench.parse_bench [keys] [repeats]
+
+"before" is what every poll used to do for each key: ParseBacnetPtKey, then
+split the property and build the bacpypes3 Address and ObjectIdentifier
+for the request. "cold" is ParseKey's first sight of a key, "warm" a
+repeated poll.
+"""
+import sys
+import timeit
+
+from bacpypes3.pdu import Address
+from bacpypes3.primitivedata import ObjectIdentifier
+
+import src.parse as parse
+from src.app import split_property
+
+def _keys(count:int) -> list[str]:
+    return [f"bacnet://192.168.{i // 250 % 250}.{i % 250 + 1}/{i}/analog-input,{i}/present-value" for i in range(count)]
+
+def before(keys:list[str]):
+    for k in keys:
+        params = parse.ParseBacnetPtKey(k)
+        Address(params.address)
+        ObjectIdentifier(params.object_identifier)
+        split_property(params.property)
+
+def cold(keys:list[str]):
+    parse.ParseKey.cache_clear()
+    for k in keys:
+        parse.ParseKey(k)
+
+def warm(keys:list[str]):
+    for k in keys:
+        parse.ParseKey(k)
+
+def main(count:int=1000, repeats:int=20):
+    keys = _keys(count)
+    warm(keys)
+    print(f"{count} keys, best of {repeats}")
+    for fn in (before, cold, warm):
+        best = min(timeit.repeat(lambda: fn(keys), number=1, repeat=repeats))
+        print(f"  {fn.__name__:>6}: {best / count * 1e6:8.2f} us/key")
+
+if __name__ == "__main__":
+    main(*(int(a) for a in sys.argv[1:3]))
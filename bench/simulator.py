@@ -0,0 +1,263 @@
+"""
+A fleet of simulated BACnet devices on one host, the stand-in for a building
+when measuring the driver.
+
+    python -m bench.simulator [devices] [objects] [--host 127.0.0.1]
+        [--port 47900] [--instance 1000] [--latency 0.005] [--max-apdu 1476]
+        [--segmented] [--no-rpm] [--no-cov] [--change 1.0] [--keys keys.txt]
+
+Device i has instance `instance + i` and listens on `host:port + i`, so
+keys for it are `bacnet://host:port+i/instance+i/...` and it answers
+targeted Who-Is (broadcasts don't reach devices on other ports, seed the
+driver's device table with `SimulatorFleet.devices` or address keys
+directly). Each device has `objects` analog-values and binary-values, odd
+instances analog, and answers every request `latency` seconds late.
+
+A device without `rpm` rejects ReadPropertyMultiple as an unrecognized
+service and one without `cov` refuses SubscribeCOV. Responses longer than
+`max_apdu` are aborted unless the device is `segmented`, as a real device
+of that size would. Every `change` seconds a tenth of the analog values
+drift, so scans and COV subscriptions see traffic.
+"""
+import argparse
+import asyncio
+import random
+import sys
+
+from bacpypes3.apdu import AbortPDU, AbortReason, ComplexAckPDU
+from bacpypes3.app import Application
+from bacpypes3.basetypes import Segmentation
+from bacpypes3.debugging import ModuleLogger
+from bacpypes3.errors import ExecutionError, UnrecognizedService
+from bacpypes3.local.analog import AnalogValueObject
+from bacpypes3.local.binary import BinaryValueObject
+from bacpypes3.local.device import DeviceObject
+from bacpypes3.local.networkport import NetworkPortObject
+from bacpypes3.vendor import VendorInfo, get_vendor_info
+
+# Register vendor 15 (used by BACpypes for testing), unless the driver has
+if get_vendor_info(15).vendor_identifier != 15:
+    VendorInfo(vendor_identifier=15)
+
+# some debugging
+_debug = 0
+_log = ModuleLogger(globals())
+
+# default fleet settings
+SIM_HOST = "127.0.0.1"
+SIM_PORT = 47900            # device i listens on port + i
+SIM_INSTANCE = 1000         # device i is instance + i
+SIM_OBJECTS = 100           # objects per device
+SIM_LATENCY = 0.005         # seconds each request is held before it's answered
+SIM_MAX_APDU = 1476
+SIM_CHANGE = 1.0            # seconds between value changes, 0 turns them off
+SIM_COV_INCREMENT = 0.5     # analog change that triggers a COV notification
+
+class SimulatedApplication(Application):
+    """An Application serving a simulated device's objects, counting the
+    requests it gets and the responses it sends.
+    """
+    latency = SIM_LATENCY
+    rpm = True
+    cov = True
+    max_apdu = SIM_MAX_APDU
+    segmented = False
+    requests = 0
+    responses = 0
+
+    async def indication(self, apdu):
+        self.requests += 1
+        await super().indication(apdu)
+
+    async def do_ReadPropertyRequest(self, apdu):
+        await asyncio.sleep(self.latency)
+        await super().do_ReadPropertyRequest(apdu)
+
+    async def do_ReadPropertyMultipleRequest(self, apdu):
+        if not self.rpm:
+            raise UnrecognizedService()
+        await asyncio.sleep(self.latency)
+        await super().do_ReadPropertyMultipleRequest(apdu)
+
+    async def do_WritePropertyRequest(self, apdu):
+        await asyncio.sleep(self.latency)
+        await super().do_WritePropertyRequest(apdu)
+
+    async def do_SubscribeCOVRequest(self, apdu):
+        if not self.cov:
+            raise ExecutionError("services", "optionalFunctionalityNotSupported")
+        await asyncio.sleep(self.latency)
+        await super().do_SubscribeCOVRequest(apdu)
+
+    async def response(self, apdu):
+        # the stack segments to fit the client, a device can't send more
+        # than its own buffers hold
+        if isinstance(apdu, ComplexAckPDU) and not self.segmented:
+            if len(apdu.encode().pduData) > self.max_apdu:
+                abort = AbortPDU(reason=AbortReason.segmentationNotSupported)
+                abort.apduSrv = True
+                abort.apduInvokeID = apdu.apduInvokeID
+                abort.pduDestination = apdu.pduDestination
+                apdu = abort
+        self.responses += 1
+        await super().response(apdu)
+
+class SimulatedDevice:
+    """One simulated device and its objects."""
+    __slots__ = ("instance", "address", "app", "analogs", "binaries")
+
+    def __init__(self, instance:int, address:str, objects:int=SIM_OBJECTS, latency:float=SIM_LATENCY,
+                 rpm:bool=True, cov:bool=True, max_apdu:int=SIM_MAX_APDU, segmented:bool=False):
+        self.instance = instance
+        self.address = address          # "{host}:{port}", as in keys
+        self.analogs:list[AnalogValueObject] = []
+        self.binaries:list[BinaryValueObject] = []
+
+        host, port = address.split(":")
+        segmentation = Segmentation.segmentedBoth if segmented else Segmentation.noSegmentation
+        object_list = [
+            DeviceObject(
+                objectIdentifier=("device", instance),
+                objectName=f"sim-{instance}",
+                vendorIdentifier=15,
+                maxApduLengthAccepted=max_apdu,
+                segmentationSupported=segmentation,
+            ),
+            NetworkPortObject(f"{host}/8:{port}", objectIdentifier=("network-port", 1), objectName="NetworkPort-1"),
+        ]
+        for i in range(1, objects + 1):
+            if i % 2:
+                obj = AnalogValueObject(
+                    objectIdentifier=("analog-value", i),
+                    objectName=f"AV-{i}",
+                    description=f"simulated analog {i}",
+                    presentValue=float(i % 100),
+                    units="degrees-fahrenheit",
+                    statusFlags=[0, 0, 0, 0],
+                    covIncrement=SIM_COV_INCREMENT,
+                )
+                self.analogs.append(obj)
+            else:
+                obj = BinaryValueObject(
+                    objectIdentifier=("binary-value", i),
+                    objectName=f"BV-{i}",
+                    description=f"simulated binary {i}",
+                    presentValue="inactive",
+                    statusFlags=[0, 0, 0, 0],
+                )
+                self.binaries.append(obj)
+            object_list.append(obj)
+
+        self.app = SimulatedApplication.from_object_list(object_list)
+        self.app.latency = latency
+        self.app.rpm = rpm
+        self.app.cov = cov
+        self.app.max_apdu = max_apdu
+        self.app.segmented = segmented
+
+    def __repr__(self):
+        return f"SimulatedDevice(instance={self.instance}, address='{self.address}', objects={len(self.analogs) + len(self.binaries)})"
+
+    def keys(self, property:str="present-value") -> list[str]:
+        """Return the keys of the device's objects."""
+        return [f"bacnet://{self.address}/{self.instance}/{obj.objectIdentifier[0]},{obj.objectIdentifier[1]}/{property}"
+                for obj in self.analogs + self.binaries]
+
+    def _endpoints(self) -> list[asyncio.Task]:
+        # the tasks opening the device's sockets, closing the application
+        # before they finish leaves the sockets open
+        return [task for link in self.app.link_layers.values() for task in link.server._transport_tasks]
+
+    async def bound(self):
+        """Wait until the device's sockets are open."""
+        await asyncio.gather(*self._endpoints())
+
+    def change(self, fraction:float=0.1):
+        """Drift a random `fraction` of the analog values."""
+        for obj in random.sample(self.analogs, int(len(self.analogs) * fraction)):
+            obj.presentValue = obj.presentValue + random.uniform(-1.0, 1.0)
+
+    def close(self):
+        for task in self._endpoints():
+            task.cancel()
+        self.app.close()
+
+class SimulatorFleet:
+    """`count` simulated devices on consecutive ports of one host. Extra
+    keyword arguments configure every device, see SimulatedDevice. Use
+    `create`, the devices are up when it returns.
+    """
+    def __init__(self, count:int, host:str=SIM_HOST, port:int=SIM_PORT, instance:int=SIM_INSTANCE,
+                 change:float=SIM_CHANGE, **kwargs):
+        self.change = change
+        self.devices = [SimulatedDevice(instance + i, f"{host}:{port + i}", **kwargs) for i in range(count)]
+        self._task:asyncio.Task = None
+
+    @classmethod
+    async def create(cls, *args, **kwargs) -> 'SimulatorFleet':
+        fleet = cls(*args, **kwargs)
+        await asyncio.gather(*(device.bound() for device in fleet.devices))
+        if fleet.change:
+            fleet._task = asyncio.create_task(fleet._run())
+        return fleet
+
+    def __repr__(self):
+        return f"SimulatorFleet(devices={len(self.devices)}, change={self.change})"
+
+    def __len__(self):
+        return len(self.devices)
+
+    def keys(self, property:str="present-value") -> list[str]:
+        """Return the keys of every object in the fleet."""
+        return [key for device in self.devices for key in device.keys(property)]
+
+    def packets(self) -> int:
+        """Return the requests and responses the fleet has seen so far."""
+        return sum(device.app.requests + device.app.responses for device in self.devices)
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(self.change)
+            for device in self.devices:
+                device.change()
+
+    def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            self._task = None
+        for device in self.devices:
+            device.close()
+
+async def main(argv:list[str]=None):
+    parser = argparse.ArgumentParser(description="Run a fleet of simulated BACnet devices.")
+    parser.add_argument("devices", type=int, nargs="?", default=10)
+    parser.add_argument("objects", type=int, nargs="?", default=SIM_OBJECTS)
+    parser.add_argument("--host", default=SIM_HOST)
+    parser.add_argument("--port", type=int, default=SIM_PORT)
+    parser.add_argument("--instance", type=int, default=SIM_INSTANCE)
+    parser.add_argument("--latency", type=float, default=SIM_LATENCY)
+    parser.add_argument("--max-apdu", type=int, default=SIM_MAX_APDU)
+    parser.add_argument("--segmented", action="store_true")
+    parser.add_argument("--no-rpm", dest="rpm", action="store_false")
+    parser.add_argument("--no-cov", dest="cov", action="store_false")
+    parser.add_argument("--change", type=float, default=SIM_CHANGE)
+    parser.add_argument("--keys", help="write the fleet's present-value keys to this file")
+    args = parser.parse_args(argv)
+
+    fleet = await SimulatorFleet.create(args.devices, args.host, args.port, args.instance, args.change,
+                           objects=args.objects, latency=args.latency, rpm=args.rpm, cov=args.cov,
+                           max_apdu=args.max_apdu, segmented=args.segmented)
+    if args.keys:
+        with open(args.keys, "w") as f:
+            f.write("\n".join(fleet.keys()) + "\n")
+    print(f"{len(fleet)} devices with {args.objects} objects on {args.host}:{args.port}-{args.port + len(fleet) - 1}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        fleet.close()
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main(sys.argv[1:]))
+    except KeyboardInterrupt:
+        pass
@@ -1,11 +1,24 @@
 import asyncio
+import collections
 import logging
 import sys
 import re
+import statistics
+import time
+from typing import Callable
 
-from bacpypes3.primitivedata import ObjectIdentifier
-from bacpypes3.constructeddata import AnyAtomic
-from bacpypes3.apdu import ErrorRejectAbortNack
+from bacpypes3.primitivedata import ObjectIdentifier, PropertyIdentifier, Unsigned
+from bacpypes3.constructeddata import AnyAtomic, Any, Array
+from bacpypes3.apdu import (
+    ErrorRejectAbortNack,
+    RejectPDU,
+    AbortPDU,
+    RejectReason,
+    AbortReason,
+    WritePropertyMultipleRequest,
+    WritePropertyMultipleError,
+)
+from bacpypes3.basetypes import ErrorType, ErrorCode, Segmentation, PropertyValue, WriteAccessSpecification
 from bacpypes3.debugging import bacpypes_debugging, ModuleLogger, LoggingFormatter
 from bacpypes3.settings import settings
 from bacpypes3.app import Application
@@ -15,19 +28,96 @@ from bacpypes3.vendor import VendorInfo, get_vendor_info
 from bacpypes3.argparse import INIArgumentParser, create_log_handlers
 import argparse
 
-# Register vendor 15 (used by BACpypes for testing)
-VendorInfo(vendor_identifier=15)
+# Register vendor 15 (used by BACpypes for testing), unless the simulator has
+if get_vendor_info(15).vendor_identifier != 15:
+    VendorInfo(vendor_identifier=15)
 
 import src.parse
+import src.planner as planner
+from src.limiter import ConcurrencyLimiter
+from src.cache import ValueCache, CacheKey
+from src.scheduler import ScanScheduler
+from src.devices import DeviceTable, DeviceNotFound, DEVICE_TTL
+from src.discovery import DiscoverySweep, SWEEP_LATENCY_BOUND
+from src.catalog import CatalogBuilder, CATALOG_RESYNC_INTERVAL
+from src.keysets import KeySetRegistry, KEYSET_TTL, KEYSET_MAX_SETS, KEYSET_MAX_KEYS
 
 # some debugging
 _debug = 1
 _log = ModuleLogger(globals())
 _log.setLevel(logging.DEBUG)
 
+# default request concurrency, overridden by maxconcurrent, maxpernetwork
+# and maxperdevice in the [BACpypes] section of the ini file. maxpernetwork
+# bounds each remote network, the local one only has the global bound
+MAX_CONCURRENT = 16
+MAX_PER_NETWORK = 8
+MAX_PER_DEVICE = 4
+
+# default value cache settings, overridden by cachesize, cachettl (0 turns the
+# cache off) and cachemaxstale in the [BACpypes] section of the ini file
+CACHE_SIZE = 10000
+CACHE_TTL = 5.0
+CACHE_MAX_STALE = 30.0
+
+# default COV settings, overridden by covlifetime and covconfirmed in the
+# [BACpypes] section of the ini file
+COV_LIFETIME = 300          # seconds a subscription lasts unless renewed
+COV_CONFIRMED = False       # ask for confirmed notifications
+COV_RENEW_AT = 0.75         # renew after this fraction of the lifetime
+COV_RETRY = 60.0            # seconds to poll before trying a failed subscription again
+COV_HOLDOFF = 10.0          # ignore I-Ams this soon after (re)subscribing
+
+# seconds of batch reads read_latency() looks back over, it paces discovery
+READ_LATENCY_WINDOW = 10.0
+
+# the device table's entry ttl is overridden by devicettl in the [BACpypes]
+# section of the ini file, see src.devices for its other settings; kept
+# catalogs are resynced every catalogresync seconds, see src.catalog; key
+# sets registered for Get by handle are bounded by keysetttl, keysetmaxsets
+# and keysetmaxkeys, see src.keysets; discovery sweeps wait while reads take
+# longer than sweeplatencybound seconds, see src.discovery
+
+# properties a standard object reports in its COV notifications
+COV_PROPERTIES = ("present-value", "status-flags")
+
+# SubscribeCOV errors meaning the object will never take a subscription
+_cov_unsupported = (
+    ErrorCode.optionalFunctionalityNotSupported,
+    ErrorCode.serviceRequestDenied,
+    ErrorCode.notCovProperty,
+)
+
 # 'property[index]' matching
 property_index_re = re.compile(r"^([0-9A-Za-z-]+)(?:\[([0-9]+)\])?$")
 
+# aborts that mean an RPM/WPM was too large for the device, not that it failed
+_size_aborts = (
+    AbortReason.bufferOverflow,
+    AbortReason.segmentationNotSupported,
+    AbortReason.apduTooLong,
+)
+
+class PropertyAccessError(Exception):
+    """A ReadPropertyMultiple result that came back as an error."""
+    def __init__(self, error:ErrorType):
+        self.errorClass = error.errorClass
+        self.errorCode = error.errorCode
+        super().__init__(f"{error.errorClass}: {error.errorCode}")
+
+def split_property(property_id:str) -> tuple:
+    """Split 'property[index]' into its identifier and optional array index."""
+    property_index_match = property_index_re.match(property_id)
+    if not property_index_match:
+        raise ValueError("property specification incorrect")
+
+    property_identifier, property_array_index = property_index_match.groups()
+    if property_identifier.isdigit():
+        property_identifier = int(property_identifier)
+    if property_array_index is not None:
+        property_array_index = int(property_array_index)
+    return property_identifier, property_array_index
+
 def load_ini_args(path:str, debug_modules:list[str]=None, color:bool=False) -> argparse.Namespace:
     # turn on logging and colors
     create_log_handlers(debug_modules, use_color=True)
@@ -49,27 +139,424 @@ def load_ini_args(path:str, debug_modules:list[str]=None, color:bool=False) -> a
         debug=debug_modules,
         color=color,
         route_aware=None,
+        max_concurrent=int(ini.get('maxconcurrent', MAX_CONCURRENT)),
+        max_per_network=int(ini.get('maxpernetwork', MAX_PER_NETWORK)),
+        max_per_device=int(ini.get('maxperdevice', MAX_PER_DEVICE)),
+        cache_size=int(ini.get('cachesize', CACHE_SIZE)),
+        cache_ttl=float(ini.get('cachettl', CACHE_TTL)),
+        cache_max_stale=float(ini.get('cachemaxstale', CACHE_MAX_STALE)),
+        cov_lifetime=int(ini.get('covlifetime', COV_LIFETIME)),
+        cov_confirmed=ini.get('covconfirmed', str(COV_CONFIRMED)).lower() in ('1', 'true', 'yes'),
+        scan_rates=ini.get('scanrates'),
+        device_ttl=float(ini.get('devicettl', DEVICE_TTL)),
+        catalog_resync=float(ini.get('catalogresync', CATALOG_RESYNC_INTERVAL)),
+        keyset_ttl=float(ini.get('keysetttl', KEYSET_TTL)),
+        keyset_max_sets=int(ini.get('keysetmaxsets', KEYSET_MAX_SETS)),
+        keyset_max_keys=int(ini.get('keysetmaxkeys', KEYSET_MAX_KEYS)),
+        sweep_latency_bound=float(ini.get('sweeplatencybound', SWEEP_LATENCY_BOUND)),
     )
     return args
 
+class DeadlineExceeded(TimeoutError):
+    """A read abandoned because the caller's deadline passed."""
+    def __init__(self, msg:str="deadline exceeded"):
+        super().__init__(msg)
+
+class _Flight:
+    """A read of one point in flight, shared by everyone waiting for it."""
+    __slots__ = ("key", "future", "waiters", "task", "peers")
+
+    def __init__(self, key:tuple, future:asyncio.Future):
+        self.key = key
+        self.future = future
+        self.waiters = 0
+        self.task:asyncio.Task = None       # reads this point's batch
+        self.peers:list['_Flight'] = []     # every flight the task resolves
+
+class COVSubscription:
+    """The points on one object that a COVManager keeps warm."""
+    __slots__ = ("address", "device_address", "object_identifier", "cov", "points", "users",
+                 "task", "polling", "subscribed", "renew")
+
+    def __init__(self, address:str, object_identifier:str, cov:bool):
+        self.address = address
+        self.device_address = Address(address)
+        self.object_identifier = object_identifier
+        self.cov = cov              # the points are reported by COV notifications
+        self.points:dict[tuple, src.parse.BACnetKey] = {}  # cache key -> point
+        self.users:dict[tuple, int] = {}                        # cache key -> subscribe count
+        self.task:asyncio.Task = None
+        self.polling = False        # no COV, the points are being polled
+        self.subscribed = 0.0       # loop time of the last (re)subscribe
+        self.renew = asyncio.Event()    # set to resubscribe now
+
+    def __repr__(self):
+        return f"COVSubscription(address='{self.address}', object_identifier='{self.object_identifier}', points={len(self.points)}, polling={self.polling})"
+
+    @staticmethod
+    def Ident(params:src.parse.BACnetKey) -> tuple:
+        """Points on one object share a subscription, apart from properties
+        that COV doesn't report, which share a poller.
+        """
+        cov = (params.property in COV_PROPERTIES) and (params.index is None)
+        return (params.address, params.object_identifier, cov)
+
+class COVManager:
+    """Keeps points warm in a BACnetClient's value cache with SubscribeCOV.
+
+    There is one subscription per object, renewed before its lifetime runs
+    out and renewed early when the device announces itself with an I-Am
+    (it may have restarted and lost its subscriptions). Notifications are
+    put straight into the cache, and the points' cache TTL is stretched to
+    the subscription lifetime so Get serves them without a read.
+
+    Objects that can't be subscribed are polled instead: forever if the
+    device has no COV support, otherwise until the next attempt to
+    subscribe.
+    """
+    def __init__(self, client:'BACnetClient', lifetime:int=COV_LIFETIME, confirmed:bool=COV_CONFIRMED,
+                 retry:float=COV_RETRY, poll_interval:float=None):
+        self._client = client
+        self.lifetime = lifetime
+        self.confirmed = confirmed
+        self.retry = retry
+        self.poll_interval = poll_interval  # None polls at the cache ttl
+
+        self._subscriptions:dict[tuple[str, str], COVSubscription] = {}
+        self._unsupported:set[str] = set()  # addresses that rejected SubscribeCOV
+
+        self.subscribes = 0
+        self.failures = 0
+        self.notifications = 0
+        self.polls = 0
+
+    def __repr__(self):
+        return f"COVManager(subscriptions={len(self._subscriptions)}, lifetime={self.lifetime}, confirmed={self.confirmed})"
+
+    def subscribe(self, points:list[src.parse.BACnetKey]):
+        """Start keeping points warm. Each call must be matched by an
+        `unsubscribe` of the same points.
+        """
+        added = set()
+        for params in points:
+            if not params.is_valid:
+                continue
+            ident = COVSubscription.Ident(params)
+            sub = self._subscriptions.get(ident)
+            if sub is None:
+                sub = self._subscriptions[ident] = COVSubscription(*ident)
+            key = CacheKey(params)
+            if key not in sub.points:
+                sub.points[key] = params
+                added.add(ident)
+            sub.users[key] = sub.users.get(key, 0) + 1
+
+        for ident in added:
+            sub = self._subscriptions[ident]
+            if sub.task is None:
+                sub.task = asyncio.create_task(self._run(sub))
+            elif not sub.polling:
+                sub.renew.set()     # a new point needs its initial value
+
+    async def unsubscribe(self, points:list[src.parse.BACnetKey]):
+        """Stop keeping points warm, cancelling subscriptions nobody uses."""
+        stopped = []
+        for params in points:
+            ident = COVSubscription.Ident(params)
+            sub = self._subscriptions.get(ident)
+            key = CacheKey(params)
+            if (sub is None) or (key not in sub.users):
+                continue
+            sub.users[key] -= 1
+            if sub.users[key] == 0:
+                del sub.users[key]
+                del sub.points[key]
+                self._client.cache.SetTTL(key, owner=self)
+            if not sub.points:
+                del self._subscriptions[ident]
+                sub.task.cancel()
+                stopped.append(sub.task)
+        await asyncio.gather(*stopped, return_exceptions=True)
+
+    def is_subscribed(self, params:src.parse.BACnetKey) -> bool:
+        """True if a point is currently kept warm by COV notifications."""
+        sub = self._subscriptions.get(COVSubscription.Ident(params))
+        return (sub is not None) and (CacheKey(params) in sub.points) and (not sub.polling) and (sub.subscribed > 0)
+
+    def device_announced(self, device_address:Address):
+        """Resubscribe a device's objects, it may have restarted."""
+        now = asyncio.get_running_loop().time()
+        for sub in self._subscriptions.values():
+            if (sub.device_address == device_address) and (now - sub.subscribed > COV_HOLDOFF):
+                sub.renew.set()
+
+    async def close(self):
+        """Cancel every subscription."""
+        tasks = [sub.task for sub in self._subscriptions.values()]
+        self._subscriptions.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        subs = list(self._subscriptions.values())
+        return {
+            "objects": len(subs),
+            "subscribed": sum(1 for s in subs if s.subscribed and not s.polling),
+            "polled": sum(1 for s in subs if s.polling),
+            "subscribes": self.subscribes,
+            "failures": self.failures,
+            "notifications": self.notifications,
+            "polls": self.polls,
+        }
+
+    async def _run(self, sub:COVSubscription):
+        while sub.points:
+            if sub.cov and (sub.address not in self._unsupported):
+                try:
+                    await self._follow(sub)
+                    continue
+                except (ErrorRejectAbortNack, Exception) as err:
+                    self.failures += 1
+                    retry = self._subscribe_failed(sub, err)
+            else:
+                retry = None
+            await self._poll(sub, retry)
+
+    def _subscribe_failed(self, sub:COVSubscription, err:BaseException) -> float:
+        """Work out how long to poll after a failed subscribe, None for ever."""
+        sub.subscribed = 0.0
+        for key in sub.points:
+            self._client.cache.SetTTL(key, owner=self)
+
+        if isinstance(err, RejectPDU) and (err.apduAbortRejectReason == RejectReason.unrecognizedService):
+            _log.info("%s does not support COV, polling", sub.address)
+            self._unsupported.add(sub.address)
+            return None
+        if getattr(err, "errorCode", None) in _cov_unsupported:
+            _log.info("%s %s does not support COV, polling", sub.address, sub.object_identifier)
+            return None
+        if _debug:
+            _log.debug("    - subscribe %s %s failed: %r", sub.address, sub.object_identifier, err)
+        return self.retry
+
+    async def _follow(self, sub:COVSubscription):
+        """Subscribe, then put notifications in the cache and renew the
+        subscription in place until cancelled. Raises if the subscription
+        can't be made or renewed.
+        """
+        loop = asyncio.get_running_loop()
+        context = self._client._app.change_of_value(
+            sub.device_address,
+            ObjectIdentifier(sub.object_identifier),
+            issue_confirmed_notifications=self.confirmed,
+            lifetime=self.lifetime,
+        )
+
+        sub.renew.clear()
+        async with self._client._limiter.slot(sub.address):
+            await context.__aenter__()
+        self._subscribed(sub, context)
+
+        getter = None
+        try:
+            while True:
+                renew_at = sub.subscribed + self.lifetime * COV_RENEW_AT
+                if getter is None:
+                    getter = asyncio.ensure_future(context.get_value())
+                renew = asyncio.ensure_future(sub.renew.wait())
+                done, _ = await asyncio.wait(
+                    (getter, renew),
+                    timeout=max(0.0, renew_at - loop.time()),
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                renew.cancel()
+                if getter in done:
+                    self._notified(sub, *getter.result())
+                    getter = None
+                    continue
+
+                sub.renew.clear()
+                async with self._client._limiter.slot(sub.address):
+                    await context.refresh_subscription()
+                self._subscribed(sub, context)
+        except asyncio.CancelledError:
+            # unsubscribed, let the device drop it too
+            try:
+                await context.__aexit__(None, None, None)
+            except ErrorRejectAbortNack:
+                pass
+            raise
+        except BaseException as err:
+            await context.__aexit__(type(err), err, err.__traceback__)
+            raise
+        finally:
+            if getter is not None:
+                getter.cancel()
+
+    def _subscribed(self, sub:COVSubscription, context):
+        # renewals are scheduled here, not by bacpypes3
+        if context.refresh_subscription_handle:
+            context.refresh_subscription_handle.cancel()
+        self.subscribes += 1
+        sub.polling = False
+        sub.subscribed = asyncio.get_running_loop().time()
+        for key in sub.points:
+            self._client.cache.SetTTL(key, self.lifetime, owner=self)
+
+    def _notified(self, sub:COVSubscription, property_identifier, value):
+        self.notifications += 1
+        if isinstance(value, AnyAtomic):
+            value = value.get_value()
+        if isinstance(value, BaseException):
+            if _debug:
+                _log.debug("    - bad notification from %s: %r", sub.address, value)
+            return
+        property_id = str(property_identifier)
+        for key, params in sub.points.items():
+            if params.property == property_id:
+                self._client.cache.Put(key, value)
+
+    async def _poll(self, sub:COVSubscription, duration:float=None):
+        """Poll until `duration` runs out (never if None) or a resubscribe is
+        asked for.
+        """
+        loop = asyncio.get_running_loop()
+        sub.polling = True
+        sub.renew.clear()
+        stop_at = None if duration is None else loop.time() + duration
+        while sub.points:
+            interval = self.poll_interval or self._client.cache.ttl
+            if interval > 0:
+                self.polls += 1
+                await self._client._read_and_cache(list(sub.points.values()))
+            else:
+                interval = self.retry   # nothing to keep warm with the cache off
+
+            if stop_at is not None:
+                interval = min(interval, stop_at - loop.time())
+                if interval <= 0:
+                    return
+            try:
+                await asyncio.wait_for(sub.renew.wait(), interval)
+                if duration is not None:
+                    return
+                sub.renew.clear()
+            except asyncio.TimeoutError:
+                pass
+
 class BACnetClient:
     _instance: 'BACnetClient' = None
     
-    def __init__(self, app: Application):
+    def __init__(self, app: Application, limiter: ConcurrencyLimiter = None, cache: ValueCache = None):
         self._app = app
-        self._semaphore = asyncio.Semaphore(8)  # tune based on your network
+        self._limiter = limiter or ConcurrencyLimiter(MAX_CONCURRENT, MAX_PER_NETWORK, MAX_PER_DEVICE)
+        self.cache = cache if cache is not None else ValueCache(CACHE_SIZE, CACHE_TTL, CACHE_MAX_STALE)
+        self._background:set[asyncio.Task] = set()  # cache refreshes and shared reads
+        self._in_flight:dict[tuple, _Flight] = {}   # cache key -> shared read
+        self.coalesced = 0  # reads that joined one already in flight
+        self.abandoned = 0  # batches cancelled because nobody waited for them
+        self.cancelled_rpcs = 0 # calls whose caller went away before they finished
+        self._rpm_unsupported:set[str] = set()  # addresses that rejected RPM
+        self._wpm_unsupported:set[str] = set()  # addresses that rejected WPM
+        self.devices = DeviceTable(app)
+        self.devices.on_moved(self._device_moved)
+        self._routes:dict[tuple, src.parse.BACnetKey] = {}  # keys rerouted to their device's address
+        self._latencies:collections.deque = collections.deque(maxlen=256)  # (finished, seconds) of batch reads
+        self.discovery = DiscoverySweep(self)
+        self.catalog = CatalogBuilder(self)
+        self.keysets = KeySetRegistry()
+        self.cov = COVManager(self)
+        self.scheduler = ScanScheduler(self)
+        self._hook_i_am()
     
     @classmethod
     async def create(cls, args) -> 'BACnetClient':
         """Factory method - call once at startup."""
         print()
         app = Application.from_args(args)
+        limiter = ConcurrencyLimiter(
+            getattr(args, 'max_concurrent', MAX_CONCURRENT),
+            getattr(args, 'max_per_network', MAX_PER_NETWORK),
+            getattr(args, 'max_per_device', MAX_PER_DEVICE),
+        )
+        cache = ValueCache(
+            getattr(args, 'cache_size', CACHE_SIZE),
+            getattr(args, 'cache_ttl', CACHE_TTL),
+            getattr(args, 'cache_max_stale', CACHE_MAX_STALE),
+        )
         if _debug:
             _log.debug("app: %r", app)
-        cls._instance = cls(app)
+            _log.debug("limiter: %r", limiter)
+            _log.debug("cache: %r", cache)
+        cls._instance = cls(app, limiter, cache)
+        cls._instance.cov.lifetime = getattr(args, 'cov_lifetime', COV_LIFETIME)
+        cls._instance.cov.confirmed = getattr(args, 'cov_confirmed', COV_CONFIRMED)
+        cls._instance.scheduler.rates_file = getattr(args, 'scan_rates', None)
+        cls._instance.devices.ttl = getattr(args, 'device_ttl', DEVICE_TTL)
+        cls._instance.keysets.ttl = getattr(args, 'keyset_ttl', KEYSET_TTL)
+        cls._instance.keysets.max_sets = getattr(args, 'keyset_max_sets', KEYSET_MAX_SETS)
+        cls._instance.keysets.max_keys = getattr(args, 'keyset_max_keys', KEYSET_MAX_KEYS)
+        cls._instance.discovery.latency_bound = getattr(args, 'sweep_latency_bound', SWEEP_LATENCY_BOUND)
+        cls._instance.catalog.start(getattr(args, 'catalog_resync', CATALOG_RESYNC_INTERVAL))
+        await cls._instance.scheduler.refresh()
         await asyncio.sleep(0.5)  # Let the network stack settle
         return cls._instance
     
+    def _hook_i_am(self):
+        """Have I-Ams update the device table and tell the COV manager a
+        device is (back) online.
+        """
+        do_i_am = getattr(self._app, "do_IAmRequest", None)
+        if do_i_am is None:
+            return
+
+        async def do_IAmRequest(apdu):
+            await do_i_am(apdu)
+            self.devices.i_am(apdu)
+            self.cov.device_announced(apdu.pduSource)
+        self._app.do_IAmRequest = do_IAmRequest
+
+    def _device_moved(self, instance:int, old_address:str, new_address:str):
+        self._routes.clear()
+
+    def _route(self, params:src.parse.BACnetKey) -> src.parse.BACnetKey:
+        """Return the key for the address its device was last heard from.
+        Keys of unknown devices are returned as they are, a by-instance key
+        stays invalid and its device is looked for in the background.
+        """
+        if (params.device_instance is None) or not (params.is_valid or params.by_instance):
+            return params
+        entry = self.devices.get(params.device_instance)
+        if entry is None:
+            if params.by_instance:
+                self.devices.resolving(params.device_instance)
+            return params
+        if entry.address == params.address:
+            return params
+        if params.value is not None:
+            return params.WithAddress(entry.address)
+
+        route = (params.device_instance, params.cache_key, entry.address)
+        routed = self._routes.get(route)
+        if routed is None:
+            routed = self._routes[route] = params.WithAddress(entry.address)
+        return routed
+
+    async def route(self, points:list[src.parse.BACnetKey], timeout:float=None) -> list[src.parse.BACnetKey]:
+        """Route points to the addresses their devices were last heard from,
+        waiting up to `timeout` seconds for a Who-Is to find the devices of
+        by-instance keys. Keys of devices that were not found stay invalid.
+        """
+        waits = set()
+        for params in points:
+            if params.by_instance and (self.devices.get(params.device_instance) is None):
+                waits.add(self.devices.resolving(params.device_instance))
+        waits.discard(None)
+        if waits:
+            await asyncio.wait(waits, timeout=timeout)
+        return [self._route(params) for params in points]
+
     @classmethod
     def get(cls) -> 'BACnetClient':
         """Get the singleton instance."""
@@ -78,37 +565,257 @@ class BACnetClient:
         return cls._instance
     
     async def read_property(self, device_addr: str, object_id: str, property_id: str) -> str:
-        async with self._semaphore:
-            device_address = Address(device_addr)
-            object_identifier = ObjectIdentifier(object_id)
-            
-            property_index_match = property_index_re.match(property_id)
-            if not property_index_match:
-                raise ValueError("property specification incorrect")
-            
-            property_identifier, property_array_index = property_index_match.groups()
-            if property_identifier.isdigit():
-                property_identifier = int(property_identifier)
-            if property_array_index is not None:
-                property_array_index = int(property_array_index)
+        property_id, array_index = split_property(property_id)
+        params = src.parse.BACnetKey(device_addr, object_id, str(property_id), array_index)   # no device instance, not routed
+        if not params.is_valid:
+            raise ValueError(f"invalid point {device_addr} {object_id} {property_id}")
 
-            try:
-                response = await self._app.read_property(
-                    device_address,
-                    object_identifier,
-                    property_identifier,
-                    property_array_index,
-                )
-            except ErrorRejectAbortNack as err:
-                if _debug:
-                    _log.debug("    - exception: %r", err)
-                return str(err)
+        # shares a read of the same point already in flight
+        (value, _), = await self._read_and_cache([params])
+        if isinstance(value, ErrorRejectAbortNack):
+            if _debug:
+                _log.debug("    - exception: %r", value)
+            return str(value)
+        if isinstance(value, BaseException):
+            raise value
+        return value
+
+    async def _read_property(self, params:src.parse.BACnetKey):
+        """Read a single property, raising the error, reject or abort."""
+        async with self._limiter.slot(params.address):
+            response = await self._app.read_property(
+                params.device_address,
+                params.object_id,
+                params.property_id,
+                params.index,
+            )
 
             if isinstance(response, AnyAtomic):
                 response = response.get_value()
             
             return response
-    
+
+    def device_caps(self, device_addr:str) -> planner.DeviceCaps:
+        """Return what is known about a device's APDU size and RPM/WPM support."""
+        caps = planner.DeviceCaps(
+            rpm=device_addr not in self._rpm_unsupported,
+            wpm=device_addr not in self._wpm_unsupported,
+        )
+        entry = self.devices.by_address(device_addr)
+        if entry is not None:
+            caps.max_apdu = entry.max_apdu
+            caps.segmented = entry.segmented()
+            return caps
+
+        info = self._app.device_info_cache.address_cache.get(Address(device_addr))
+        if info is not None:
+            caps.max_apdu = info.max_apdu_length_accepted
+            caps.segmented = info.segmentation_supported in (
+                Segmentation.segmentedBoth,
+                Segmentation.segmentedTransmit,
+            )
+        return caps
+
+    async def read_batch(self, batch:planner.ReadBatch) -> list:
+        """Read every point in a batch with one ReadPropertyMultiple, falling
+        back to single reads if the device rejects it. Values are returned in
+        `batch.Items()` order, failed reads as their error, reject or abort.
+        """
+        items = batch.Items()
+        if (len(items) > 1) and (batch.address not in self._rpm_unsupported):
+            async with self._limiter.slot(batch.address):
+                try:
+                    response = await self._app.read_property_multiple(
+                        Address(batch.address),
+                        batch.ParameterList(),
+                    )
+                except (ErrorRejectAbortNack, Exception) as err:
+                    # errors, rejects and aborts from the device, and the
+                    # ValueError or TypeError of a request bacpypes3 can't
+                    # encode, are every point's result
+                    response = err
+
+            if isinstance(response, RejectPDU) and (response.apduAbortRejectReason == RejectReason.unrecognizedService):
+                _log.info("%s does not support RPM, using single reads", batch.address)
+                self._rpm_unsupported.add(batch.address)
+            elif isinstance(response, AbortPDU) and (response.apduAbortRejectReason in _size_aborts):
+                if _debug:
+                    _log.debug("    - rpm too large for %s: %r", batch.address, response)
+            elif isinstance(response, (ErrorRejectAbortNack, Exception)):
+                if _debug:
+                    _log.debug("    - exception: %r", response)
+                return [response] * len(items)
+            elif (response is None) or (len(response) != len(items)):
+                return [ValueError("invalid RPM response")] * len(items)
+            else:
+                results = []
+                for _, _, _, value in response:
+                    if isinstance(value, AnyAtomic):
+                        value = value.get_value()
+                    elif isinstance(value, ErrorType):
+                        value = PropertyAccessError(value)
+                    results.append(value)
+                return results
+
+        return await asyncio.gather(
+            *(self._read_property(p) for p in items),
+            return_exceptions=True,
+        )
+
+    async def read_points(self, points:list[src.parse.BACnetKey], timeout:float=None,
+                          plan:Callable=planner.PlanReads) -> tuple[list, list]:
+        """Read points through the value cache. Misses are planned into
+        batches by `plan` and read now, stale hits are served and refreshed
+        in the background. Returns the values (or errors) and the times they
+        were read, None for invalid points. Reads still running after
+        `timeout` seconds are abandoned and returned as DeadlineExceeded.
+        """
+        values:list = [None] * len(points)
+        times:list = [None] * len(points)
+        missed:list[int] = []
+        stale:list[src.parse.BACnetKey] = []
+
+        start = time.monotonic()
+        points = await self.route(points, timeout)
+        if timeout is not None:
+            timeout = max(0.0, timeout - (time.monotonic() - start))
+
+        for i, params in enumerate(points):
+            if not params.is_valid:
+                if params.by_instance:
+                    values[i] = DeviceNotFound(params.device_instance)
+                continue
+            entry, is_stale = self.cache.Lookup(CacheKey(params))
+            if entry is None:
+                missed.append(i)
+                continue
+            values[i], times[i] = entry.value, entry.time
+            if is_stale and not entry.refreshing:
+                entry.refreshing = True
+                stale.append(params)
+
+        if stale:
+            task = asyncio.create_task(self._read_and_cache(stale))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+
+        if missed:
+            read = await self._read_and_cache([points[i] for i in missed], timeout, plan)
+            for i, (value, read_time) in zip(missed, read):
+                values[i], times[i] = value, read_time
+        return values, times
+
+    def sequences(self, points:list[src.parse.BACnetKey], values:list) -> list[int]:
+        """Return the cache's seq of the last change of each point's value,
+        for values read by `read_points`. None for a value the cache no
+        longer holds, it may have changed since.
+        """
+        return [self.cache.Sequence(CacheKey(self._route(params)), value) if params.is_valid else None
+                for params, value in zip(points, values)]
+
+    async def _read_and_cache(self, points:list[src.parse.BACnetKey], timeout:float=None,
+                              plan:Callable=planner.PlanReads) -> list[tuple]:
+        """Read points and put them in the cache, returning a (value or
+        error, read time) per point. A point already being read, by any
+        caller, joins that read instead of sending its own. A read is
+        cancelled once nobody is waiting for any point in its batch.
+        """
+        loop = asyncio.get_running_loop()
+        flights:list[_Flight] = []
+        new:list[src.parse.BACnetKey] = []
+        for params in points:
+            params = self._route(params)
+            key = CacheKey(params)
+            if not params.is_valid:
+                flight = _Flight(key, loop.create_future())
+                flight.future.set_result((DeviceNotFound(params.device_instance) if params.by_instance else None, None))
+                flights.append(flight)
+                continue
+            flight = self._in_flight.get(key)
+            if flight is None:
+                flight = self._in_flight[key] = _Flight(key, loop.create_future())
+                new.append(params)
+            else:
+                self.coalesced += 1
+            flights.append(flight)
+
+        # one task per batch, so a batch nobody waits for can be cancelled
+        # without touching the others
+        for batch in plan(new, self.device_caps):
+            batch_flights = [self._in_flight[CacheKey(p)] for p in batch.Items()]
+            task = asyncio.create_task(self._read_flight(batch, batch_flights))
+            self._background.add(task)
+            task.add_done_callback(self._background.discard)
+            for flight in batch_flights:
+                flight.task = task
+                flight.peers = batch_flights
+
+        waiting = set(flights)
+        for flight in waiting:
+            flight.waiters += 1
+        try:
+            if waiting:
+                await asyncio.wait([f.future for f in waiting], timeout=timeout)
+        finally:
+            for flight in waiting:
+                self._leave_flight(flight)
+
+        results = []
+        for flight in flights:
+            if flight.future.done():
+                results.append(flight.future.result())
+            else:
+                self.cache.Failed(flight.key)
+                results.append((DeadlineExceeded(), None))
+        return results
+
+    def _leave_flight(self, flight:'_Flight'):
+        flight.waiters -= 1
+        if flight.future.done() or (flight.task is None) or flight.task.done():
+            return
+        if all(peer.waiters == 0 for peer in flight.peers):
+            # nobody wants the batch any more, free its request slot. later
+            # reads of these points start over instead of joining it
+            for peer in flight.peers:
+                if self._in_flight.get(peer.key) is peer:
+                    del self._in_flight[peer.key]
+            flight.task.cancel()
+            self.abandoned += 1
+
+    async def _read_flight(self, batch:planner.ReadBatch, flights:list['_Flight']):
+        epoch = self.cache.epoch
+        items = batch.Items()
+        error = None
+        try:
+            start = time.monotonic()
+            values = await self.read_batch(batch)
+            read_time = time.time()
+            if not all((v is None) or isinstance(v, BaseException) for v in values):
+                # a read that timed out says how dead a device is, not how busy
+                self._latencies.append((time.monotonic(), time.monotonic() - start))
+            for params, value, flight in zip(items, values, flights):
+                if (value is None) or isinstance(value, BaseException):
+                    self.cache.RefreshFailed(flight.key)
+                    if isinstance(value, AbortPDU) and (value.apduAbortRejectReason == AbortReason.noResponse):
+                        # it may have moved, see where it answers from now
+                        self.devices.confirm(params.device_instance)
+                else:
+                    self.cache.Put(flight.key, value, epoch)
+                flight.future.set_result((value, read_time))
+        except Exception as err:
+            _log.error("read of %d points failed: %r", len(items), err)
+            error = err
+        except asyncio.CancelledError as err:
+            error = err
+            raise
+        finally:
+            for flight in flights:
+                if self._in_flight.get(flight.key) is flight:
+                    del self._in_flight[flight.key]
+                if not flight.future.done():
+                    self.cache.RefreshFailed(flight.key)
+                    flight.future.set_result((error, None))
+
     async def write_property(
             self, device_addr:str,
             object_id:str, 
@@ -116,42 +823,242 @@ class BACnetClient:
             value,
             priority=None,
             array_index=None):
-        async with self._semaphore:
+        try:
+            await self._write_property(device_addr, object_id, property_id, value, priority, array_index)
+        except ErrorRejectAbortNack as err:
+            if _debug:
+                _log.debug("    - exception: %r", err)
+            return str(err)
+
+    async def _write_property(
+            self, device_addr:str,
+            object_id:str,
+            property_id:str,
+            value,
+            priority=None,
+            array_index=None):
+        """Write a single property, raising the error, reject or abort."""
+        async with self._limiter.slot(device_addr):
             device_addr = Address(device_addr)
             object_id = ObjectIdentifier(object_id)
 
             # split the property identifier and its index
-            property_index_match = property_index_re.match(property_id)
-            if not property_index_match:
-                raise ValueError("property specification incorrect")
-            property_id, property_array_index = property_index_match.groups()
-            if property_id.isdigit():
-                property_id = int(property_id)
-            if property_array_index is not None:
-                property_array_index = int(property_array_index)
+            property_id, property_array_index = split_property(property_id)
+            if array_index is None:
+                array_index = property_array_index
 
             # check if caller wants a specific priority
             if priority:
                 if (priority < 1) or (priority > 16):
                     raise ValueError(f"set error: priority {priority}")
-        if _debug:
-            _log.debug("priority: %r", priority)
+            if _debug:
+                _log.debug("priority: %r", priority)
+
+            resp = await self._app.write_property(
+                device_addr,
+                object_id,
+                property_id,
+                value,
+                array_index,
+                priority,
+            )
+            if _debug:
+                _log.debug("write_resp: %r", resp)
+
+    async def _write_access_specs(self, items:list[src.parse.BACnetKey]) -> tuple[list, list]:
+        """Build the WritePropertyMultiple specs for a device's points, casting
+        each value to its property type the way `Application.write_property`
+        does. Returns the specs and, per item, the error that kept it out.
+        """
+        vendor_info = await self._app.get_vendor_info(device_address=Address(items[0].address))
+
+        specs:dict[str, WriteAccessSpecification] = {}
+        errors:list = [None] * len(items)
+        for i, params in enumerate(items):
             try:
-                resp = await self._app.write_property(
-                    device_addr,
-                    object_id,
-                    property_id,
-                    value,
-                    array_index,
-                    priority,
+                object_identifier = params.object_id
+                property_identifier = params.property_id
+                array_index = params.index
+
+                object_class = vendor_info.get_object_class(object_identifier[0])
+                if not object_class:
+                    raise ValueError("no object class")
+                property_type = object_class.get_property_type(property_identifier)
+                if not property_type:
+                    raise ValueError("no property type")
+                if issubclass(property_type, Array):
+                    if array_index == 0:
+                        property_type = Unsigned
+                    elif array_index is not None:
+                        property_type = property_type._subtype
+
+                value = params.value
+                if not isinstance(value, property_type):
+                    value = property_type(value)
+            except Exception as err:
+                errors[i] = err
+                continue
+
+            property_value = PropertyValue(propertyIdentifier=property_identifier, value=Any(value))
+            if array_index is not None:
+                property_value.propertyArrayIndex = array_index
+            spec = specs.get(params.object_identifier)
+            if spec is None:
+                spec = specs[params.object_identifier] = WriteAccessSpecification(
+                    objectIdentifier=object_identifier,
+                    listOfProperties=[],
                 )
-                if _debug:
-                    _log.debug("write_resp: %r", resp)
-            except ErrorRejectAbortNack as err:
-                if _debug:
-                    _log.debug("    - exception: %r", err)
-                return str(err)
+            spec.listOfProperties.append(property_value)
+
+        return list(specs.values()), errors
+
+    async def _write_multiple(self, address:str, items:list[src.parse.BACnetKey], indexes:list[int], results:list) -> list[int]:
+        """Write the indexed items with one WritePropertyMultiple, putting the
+        error of each that failed in `results`. A request the device aborts
+        as too large is split in half and each half written the same way.
+        Any other failure is the error of every item it was sending, it
+        doesn't take the other devices' writes with it. Returns the indexes
+        left to be written singly.
+        """
+        try:
+            specs, errors = await self._write_access_specs([items[i] for i in indexes])
+        except Exception as err:
+            _log.warning("wpm to %s failed: %r", address, err)
+            for i in indexes:
+                results[i] = err
+            return []
+        sent = []
+        for i, err in zip(indexes, errors):
+            if err is None:
+                sent.append(i)
+            else:
+                results[i] = err
+        if not specs:
+            return []
+
+        async with self._limiter.slot(address):
+            try:
+                response = await self._app.request(WritePropertyMultipleRequest(
+                    listOfWriteAccessSpecs=specs,
+                    destination=Address(address),
+                ))
+            except (ErrorRejectAbortNack, Exception) as err:
+                # errors, rejects and aborts from the device, and whatever
+                # else the stack raises, are every sent item's result
+                response = err
+
+        if isinstance(response, WritePropertyMultipleError):
+            # writes before the failed one were applied, the rest were
+            # never attempted and get written singly
+            failed = response.firstFailedWriteAttempt
+            for n, i in enumerate(sent):
+                params = items[i]
+                if (params.object_id == failed.objectIdentifier) and (params.property_id == failed.propertyIdentifier):
+                    results[i] = response.errorType
+                    return sent[n+1:]
+            return sent
+        if isinstance(response, RejectPDU) and (response.apduAbortRejectReason == RejectReason.unrecognizedService):
+            _log.info("%s does not support WPM, using single writes", address)
+            self._wpm_unsupported.add(address)
+            return sent
+        if isinstance(response, AbortPDU) and (response.apduAbortRejectReason in _size_aborts):
+            if _debug:
+                _log.debug("    - wpm of %d too large for %s: %r", len(sent), address, response)
+            retry = []
+            half = len(sent) // 2
+            for part in (sent[:half], sent[half:]):
+                if len(part) > 1:
+                    retry.extend(await self._write_multiple(address, items, part, results))
+                else:
+                    retry.extend(part)
+            return retry
+        if isinstance(response, (ErrorRejectAbortNack, Exception)):
+            if _debug:
+                _log.debug("    - exception: %r", response)
+            for i in sent:
+                results[i] = response
+        return []
+
+    async def write_batch(self, batch:planner.WriteBatch) -> list:
+        """Write every point in a batch with one WritePropertyMultiple, split
+        in halves if the device aborts it as too large, falling back to
+        single writes if the device rejects it. Returns, in
+        `batch.Items()` order, None for each write that succeeded and the
+        error for each that did not.
+        """
+        items = batch.Items()
+        results:list = [None] * len(items)
+        retry = list(range(len(items)))  # indexes still to be written singly
+
+        try:
+            if (len(items) > 1) and (batch.address not in self._wpm_unsupported):
+                retry = await self._write_multiple(batch.address, items, retry, results)
+
+            errors = await asyncio.gather(
+                *(self._write_property(items[i].address, items[i].object_identifier, items[i].property, items[i].value, items[i].priority, items[i].index) for i in retry),
+                return_exceptions=True,
+            )
+            for i, err in zip(retry, errors):
+                results[i] = err
+        finally:
+            # whatever was written, even by a cancelled call, the next read
+            # has to go to the device. reads still in flight may have the old
+            # value, later ones don't join them
+            for params in items:
+                key = CacheKey(params)
+                self.cache.Invalidate(key)
+                self._in_flight.pop(key, None)
+        return results
     
+    def cache_stats(self) -> dict:
+        """Return value cache hit/miss counters and shared reads."""
+        stats = self.cache.Stats()
+        stats["coalesced"] = self.coalesced
+        stats["abandoned"] = self.abandoned
+        stats["in_flight"] = len(self._in_flight)
+        return stats
+
+    def limiter_stats(self) -> dict:
+        """Return request queue-wait statistics and abandoned calls."""
+        stats = self._limiter.stats()
+        stats["cancelled_rpcs"] = self.cancelled_rpcs
+        return stats
+
+    def cov_stats(self) -> dict:
+        """Return COV subscription counters."""
+        return self.cov.stats()
+
+    def scan_stats(self) -> dict:
+        """Return scan counts and overruns."""
+        return self.scheduler.stats()
+
+    def device_stats(self) -> dict:
+        """Return the device table's size, discovery and catalog counters."""
+        stats = self.devices.stats()
+        stats["discovery"] = self.discovery.stats()
+        stats["catalog"] = self.catalog.stats()
+        return stats
+
+    def keyset_stats(self) -> dict:
+        """Return the registered key sets and their counters."""
+        return self.keysets.stats()
+
+    def read_latency(self, window:float=READ_LATENCY_WINDOW) -> float:
+        """Return the median seconds batch reads finished in the last
+        `window` seconds took, queueing included, or 0 if there were none.
+        Reads that got nothing back are left out, so an offline device
+        doesn't make every read look slow.
+        """
+        since = time.monotonic() - window
+        recent = [seconds for finished, seconds in self._latencies if finished >= since]
+        return statistics.median(recent) if recent else 0.0
+
     async def close(self):
         """Call only at shutdown."""
+        for task in list(self._background):
+            task.cancel()
+        await self.scheduler.close()
+        await self.cov.close()
+        await self.catalog.close()
+        await self.devices.close()
         self._app.close()
\ No newline at end of file
@@ -0,0 +1,231 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable
+
+from src.parse import BACnetKey
+
+def CacheKey(params:BACnetKey) -> tuple:
+    """CacheKey returns the (address, object id, property, index) of a point."""
+    return params.cache_key
+
+
+def _Same(a, b) -> bool:
+    try:
+        return bool(a == b) and (type(a) is type(b))
+    except Exception:
+        return False
+
+
+class CacheEntry(object):
+    __slots__ = ("value", "time", "fetched", "ttl", "refreshing", "seq", "failed")
+
+    def __init__(self, value, ttl:float, fetched:float=None) -> None:
+        self.value = value
+        self.time = time.time()                         # wall clock, for GetPair.time
+        self.fetched = fetched or time.monotonic()      # for ttl checks
+        self.ttl = ttl
+        self.refreshing = False     # a background refresh is running
+        self.seq = 0                # the cache's seq when the value last changed
+        self.failed = False         # a read failed since the value was put
+
+    def __repr__(self):
+        return f"CacheEntry(value={self.value!r}, age={self.Age():.3f}, ttl={self.ttl}, refreshing={self.refreshing})"
+
+    def Age(self, now:float=None) -> float:
+        return (now or time.monotonic()) - self.fetched
+
+
+class ValueCache(object):
+    """A read-through cache of point values with per-point TTLs and LRU
+    eviction. Values older than their TTL but younger than TTL + max_stale are
+    served as stale so the caller can refresh them in the background.
+
+    Invalidations drop the value and leave a tombstone stamped with the
+    cache's epoch; a read that started before the invalidation (see
+    `epoch`) cannot put an older value back. Tombstones are kept apart,
+    at most `max_entries` of them, so a burst of invalidations never
+    evicts live values.
+
+    Watchers of a key are called with every value put for it, even when
+    caching is off for the key.
+
+    Every change of a point's value is numbered from one sequence, `seq`,
+    and the entry keeps the number of its last change, so a caller holding
+    a Version of the cache can tell which values changed since. A value put
+    after a failed read counts as a change even if it is the same, the
+    caller was given the error. Values whose entries are gone (or were
+    never kept, with caching off) have to be taken as changed.
+    """
+    def __init__(self, max_entries:int=10000, ttl:float=5.0, max_stale:float=30.0) -> None:
+        self.max_entries = max_entries
+        self.ttl = ttl                  # default ttl, 0 disables the cache
+        self.max_stale = max_stale      # how long past its ttl a value is served
+        self.epoch = 0                  # bumped on every invalidation
+        self.seq = 0                    # bumped on every value change
+        self.generation = uuid.uuid4().hex[:8]  # tells this cache's versions from another's
+
+        self._entries:OrderedDict[tuple, CacheEntry] = OrderedDict()
+        self._tombstones:OrderedDict[tuple, int] = OrderedDict()   # key -> epoch of its invalidation
+        self._ttls:dict[tuple, float] = {}
+        self._owners:dict[tuple, dict] = {}     # key -> owner -> ttl
+        self._watchers:dict[tuple, list[Callable[[tuple, CacheEntry], None]]] = {}
+
+        self.hits = 0
+        self.stale_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    def __repr__(self):
+        return f"ValueCache(entries={len(self._entries)}/{self.max_entries}, ttl={self.ttl}, max_stale={self.max_stale})"
+
+    def __len__(self):
+        return len(self._entries)
+
+    def TTL(self, key:tuple) -> float:
+        return self._ttls.get(key, self.ttl)
+
+    def SetTTL(self, key:tuple, ttl:float=None, owner=None):
+        """SetTTL sets a point's ttl on behalf of `owner`, or drops the
+        owner's ttl if ttl is None. A point given ttls by several owners has
+        the longest of them, one given none the default.
+        """
+        owners = self._owners.setdefault(key, {})
+        if ttl is None:
+            owners.pop(owner, None)
+        else:
+            owners[owner] = ttl
+        if owners:
+            self._ttls[key] = max(owners.values())
+        else:
+            del self._owners[key]
+            self._ttls.pop(key, None)
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.ttl = self.TTL(key)
+
+    def Lookup(self, key:tuple) -> tuple[CacheEntry, bool]:
+        """Lookup returns the entry for a key and whether it is stale, or
+        (None, False) on a miss.
+        """
+        entry = self._entries.get(key)
+        if (entry is None) or (entry.ttl <= 0):
+            self.misses += 1
+            return None, False
+
+        age = entry.Age()
+        if age > entry.ttl + self.max_stale:
+            self.misses += 1
+            return None, False
+
+        self._entries.move_to_end(key)
+        if age > entry.ttl:
+            self.stale_hits += 1
+            return entry, True
+        self.hits += 1
+        return entry, False
+
+    def Put(self, key:tuple, value, epoch:int=None) -> CacheEntry:
+        """Put stores a value read at `epoch`, unless the key has been
+        invalidated since then, and passes it to the key's watchers.
+        """
+        if (epoch is not None) and (self._tombstones.get(key, 0) > epoch):
+            return None
+        self._tombstones.pop(key, None)
+
+        ttl = self.TTL(key)
+        old = self._entries.get(key)
+        entry = CacheEntry(value, ttl)
+        if (old is not None) and old.seq and not old.failed and _Same(old.value, value):
+            entry.seq = old.seq
+        else:
+            self.seq += 1
+            entry.seq = self.seq
+        for watcher in self._watchers.get(key, ()):
+            watcher(key, entry)
+        if ttl <= 0:
+            return None
+
+        self._entries[key] = entry
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+        return entry
+
+    def Watch(self, key:tuple, watcher:Callable[[tuple, CacheEntry], None]):
+        """Watch calls `watcher(key, entry)` whenever a value is put for key."""
+        self._watchers.setdefault(key, []).append(watcher)
+
+    def Unwatch(self, key:tuple, watcher:Callable[[tuple, CacheEntry], None]):
+        watchers = self._watchers.get(key)
+        if watchers and (watcher in watchers):
+            watchers.remove(watcher)
+            if not watchers:
+                del self._watchers[key]
+
+    def RefreshFailed(self, key:tuple):
+        """RefreshFailed lets a later lookup try refreshing the key again."""
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.refreshing = False
+        self.Failed(key)
+
+    def Failed(self, key:tuple):
+        """Failed notes that a read of the key failed (or was given up on),
+        so the next value put for it counts as a change.
+        """
+        entry = self._entries.get(key)
+        if entry is not None:
+            entry.failed = True
+
+    def Sequence(self, key:tuple, value) -> int:
+        """Sequence returns the seq of the last change of a key's value if
+        `value` is the value the cache holds for it, otherwise None.
+        """
+        entry = self._entries.get(key)
+        if (entry is None) or (entry.value is not value) or entry.failed:
+            return None
+        return entry.seq
+
+    def Version(self) -> str:
+        """Version returns a token for the values in the cache now."""
+        return f"{self.generation}.{self.seq}"
+
+    def Since(self, version:str) -> int:
+        """Since returns the seq a Version token stands for, or None if it
+        is not a version of this cache (say from before a restart).
+        """
+        generation, _, seq = version.partition(".")
+        if (generation != self.generation) or not seq.isdigit():
+            return None
+        seq = int(seq)
+        return seq if seq <= self.seq else None
+
+    def Invalidate(self, key:tuple):
+        self.epoch += 1
+        self.invalidations += 1
+        self._entries.pop(key, None)
+        self._tombstones[key] = self.epoch
+        self._tombstones.move_to_end(key)
+        while len(self._tombstones) > self.max_entries:
+            self._tombstones.popitem(last=False)
+
+    def Clear(self):
+        self._entries.clear()
+        self._tombstones.clear()
+
+    def Stats(self) -> dict:
+        lookups = self.hits + self.stale_hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "stale_hits": self.stale_hits,
+            "misses": self.misses,
+            "hit_rate": (self.hits + self.stale_hits) / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "invalidations": self.invalidations,
+            "tombstones": len(self._tombstones),
+            "watched": len(self._watchers),
+        }
@@ -0,0 +1,321 @@
+import asyncio
+import functools
+from typing import AsyncIterator
+
+from bacpypes3.debugging import ModuleLogger
+from bacpypes3.basetypes import ObjectType
+from bacpypes3.vendor import get_vendor_info
+
+import src.parse
+import src.planner as planner
+from src.devices import DeviceNotFound
+
+# some debugging
+_debug = 0
+_log = ModuleLogger(globals())
+
+# what is read for every object, units only for the object types that have them
+CATALOG_PROPERTIES = ("object-name", "description", "units")
+UNITS_TYPES = {
+    "analog-input", "analog-output", "analog-value", "large-analog-value",
+    "integer-value", "positive-integer-value", "accumulator", "pulse-converter",
+}
+
+# seconds between resyncs of every kept catalog, 0 turns them off
+CATALOG_RESYNC_INTERVAL = 86400.0
+
+@functools.cache
+def HasPresentValue(object_type:str) -> bool:
+    """Whether a standard object type has a present-value, by bacpypes3's
+    object definitions. Proprietary types are taken not to.
+    """
+    try:
+        object_class = get_vendor_info(0).get_object_class(ObjectType(object_type))
+    except (TypeError, ValueError):
+        return False
+    return (object_class is not None) and (object_class.get_property_type("present-value") is not None)
+
+class IncompleteCatalog(Exception):
+    """Elements of a device's object-list that could not be read, so which
+    objects the device has isn't known.
+    """
+    def __init__(self, device:str, indexes:list[int]):
+        super().__init__(f"{device} object-list elements {indexes} could not be read")
+        self.device = device
+        self.indexes = indexes
+
+class CatalogEntry:
+    """An object of a device and the properties read for it, by name. A
+    property the object doesn't have (or that failed) is missing.
+    """
+    __slots__ = ("key", "object_identifier", "properties")
+
+    def __init__(self, key:str, object_identifier:str):
+        self.key = key                              # the object's present-value key, or the object's
+        self.object_identifier = object_identifier  # e.g, "analog-value,3"
+        self.properties:dict[str, str] = {}
+
+    def __repr__(self):
+        return f"CatalogEntry(key='{self.key}', properties={self.properties!r})"
+
+class DeviceCatalog:
+    """The catalogued objects of a device and what the device said about
+    its database when they were read. A device bumps its database-revision
+    whenever objects are added, removed or renamed, and its
+    last-restore-time when a backup is restored.
+    """
+    __slots__ = ("device", "entries", "revision", "restore_time", "length")
+
+    def __init__(self, device:str):
+        self.device = device            # bacnet://<host>[:port]/<dev>
+        self.entries:dict[str, CatalogEntry] = {}   # object identifier -> entry
+        self.revision = None            # database-revision, None if not supported
+        self.restore_time = None        # last-restore-time, as a string
+        self.length = 0                 # object-list length
+
+    def __repr__(self):
+        return f"DeviceCatalog(device='{self.device}', objects={len(self.entries)}, revision={self.revision})"
+
+    def signature(self) -> tuple:
+        """What changes when the device's objects may have."""
+        return (self.revision, self.restore_time, self.length)
+
+class CatalogBuilder:
+    """Lists the objects of a device and reads the properties needed to
+    name them, with as few requests as the device allows.
+
+    The object-list is read element by element (index 0 is its length) so
+    that a long list never needs a segmented response; the planner packs
+    the elements, then every object's properties, into RPMs. Objects are
+    looked up as soon as the part of the object-list naming them arrives
+    and each entry is yielded once all its properties are in.
+
+    Finished catalogs are kept so `resync` can bring them up to date
+    cheaply: a device whose database-revision, last-restore-time and
+    object count are unchanged costs one RPM, a changed one has its
+    object-list read again but only the objects added to it looked up.
+
+    Reads bypass the value cache, a catalog would only evict live points.
+    """
+    def __init__(self, client:'BACnetClient', properties:tuple[str, ...]=CATALOG_PROPERTIES):
+        self._client = client
+        self.properties = properties
+        self._catalogs:dict[str, DeviceCatalog] = {}    # device key -> catalog
+        self._task:asyncio.Task = None
+
+        self.catalogs = 0
+        self.objects = 0
+        self.batches = 0
+        self.resyncs = 0
+        self.unchanged = 0
+        self.added = 0
+        self.removed = 0
+
+    def __repr__(self):
+        return f"CatalogBuilder(properties={self.properties!r}, kept={len(self._catalogs)})"
+
+    def catalog(self, device:src.parse.BACnetKey) -> DeviceCatalog:
+        """Return the kept catalog of a device, or None."""
+        return self._catalogs.get(self._device_key(device))
+
+    def _device_key(self, device:src.parse.BACnetKey) -> str:
+        # entries are keyed like the device key, by instance if it was
+        return f"bacnet://{device.address}/{device.device_instance}"
+
+    def _object_key(self, catalog:DeviceCatalog, object_identifier:str) -> str:
+        # objects without a present-value (device, network-port,
+        # notification-class...) are keyed by the object alone
+        key = f"{catalog.device}/{object_identifier}"
+        if HasPresentValue(object_identifier.split(",")[0]):
+            key += "/present-value"
+        return key
+
+    def _object_properties(self, object_identifier:str) -> list[str]:
+        object_type = object_identifier.split(",")[0]
+        return [p for p in self.properties if (p != "units") or (object_type in UNITS_TYPES)]
+
+    async def build(self, device:src.parse.BACnetKey) -> AsyncIterator[CatalogEntry]:
+        """Catalog a device given the key of its object-list (see
+        ParseDeviceKey). Raises DeviceNotFound, or the error that stopped
+        the object-list being read, or IncompleteCatalog after the objects
+        that were listed if elements of it could not be read. The catalog
+        is kept once complete.
+        """
+        routed = await self._route(device)
+        self.catalogs += 1
+        catalog = DeviceCatalog(self._device_key(device))
+        await self._read_header(routed, catalog)
+        failed:list[int] = []
+        async for entry in self._crawl(routed, catalog, set(), failed):
+            yield entry
+        if failed:
+            raise IncompleteCatalog(catalog.device, failed)
+        self._catalogs[catalog.device] = catalog
+
+    async def resync(self, device:src.parse.BACnetKey) -> tuple[list[CatalogEntry], list[CatalogEntry]]:
+        """Bring a device's catalog up to date, building it if there is
+        none. Returns the entries added and removed. Objects are only found
+        removed from a complete object-list; if elements of it can't be
+        read the objects added are kept but the catalog keeps its old
+        signature, so the next resync lists the device again.
+        """
+        catalog = self.catalog(device)
+        if catalog is None:
+            return [entry async for entry in self.build(device)], []
+
+        routed = await self._route(device)
+        self.resyncs += 1
+        latest = DeviceCatalog(catalog.device)
+        await self._read_header(routed, latest)
+        if latest.signature() == catalog.signature():
+            self.unchanged += 1
+            return [], []
+
+        _log.info("%s changed (revision %s -> %s), resyncing", catalog.device, catalog.revision, latest.revision)
+        listed:set[str] = set()
+        failed:list[int] = []
+        latest.entries = dict(catalog.entries)
+        added = [entry async for entry in self._crawl(routed, latest, listed, failed)]
+        self.added += len(added)
+        if failed:
+            _log.warning("%s object-list incomplete, resyncing it again next time", catalog.device)
+            catalog.entries = latest.entries
+            return added, []
+
+        removed = [latest.entries.pop(o) for o in list(latest.entries) if o not in listed]
+        self._catalogs[catalog.device] = latest
+        self.removed += len(removed)
+        return added, removed
+
+    async def resync_all(self):
+        """Resync every kept catalog, logging the ones that fail."""
+        devices = list(self._catalogs)
+        results = await asyncio.gather(*(self.resync(src.parse.ParseDeviceKey(d)) for d in devices),
+                                       return_exceptions=True)
+        for device, result in zip(devices, results):
+            if isinstance(result, BaseException):
+                _log.warning("resync of %s failed: %r", device, result)
+
+    def start(self, interval:float=CATALOG_RESYNC_INTERVAL):
+        """Resync the kept catalogs every `interval` seconds, unless it is 0."""
+        if interval and (self._task is None):
+            self._task = asyncio.create_task(self._run(interval))
+
+    async def _run(self, interval:float):
+        while True:
+            await asyncio.sleep(interval)
+            await self.resync_all()
+
+    async def close(self):
+        if self._task is not None:
+            self._task.cancel()
+            await asyncio.gather(self._task, return_exceptions=True)
+            self._task = None
+
+    async def _route(self, device:src.parse.BACnetKey) -> src.parse.BACnetKey:
+        routed, = await self._client.route([device])
+        if not routed.is_valid:
+            if routed.by_instance:
+                raise DeviceNotFound(routed.device_instance)
+            raise ValueError("invalid device key")
+        return routed
+
+    async def _read_header(self, routed:src.parse.BACnetKey, catalog:DeviceCatalog):
+        """Read the object-list length, database-revision and
+        last-restore-time, one RPM on any device. Only the length is
+        required.
+        """
+        device = routed.object_identifier
+        length, revision, restore_time = await self._read([
+            routed.WithPoint(device, "object-list", 0),
+            routed.WithPoint(device, "database-revision"),
+            routed.WithPoint(device, "last-restore-time"),
+        ])
+        if isinstance(length, BaseException):
+            raise length
+        catalog.length = int(length)
+        if (revision is not None) and not isinstance(revision, BaseException):
+            catalog.revision = int(revision)
+        if (restore_time is not None) and not isinstance(restore_time, BaseException):
+            catalog.restore_time = str(restore_time)
+        if _debug:
+            _log.debug("    - %s has %s objects, revision %s", routed.address, length, catalog.revision)
+
+    async def _crawl(self, routed:src.parse.BACnetKey, catalog:DeviceCatalog,
+                     listed:set[str], failed:list[int]) -> AsyncIterator[CatalogEntry]:
+        """Read the object-list, adding every object in it to `listed` and
+        the index of every element that couldn't be read to `failed`, and
+        look up (and yield) the objects not in the catalog yet.
+        """
+        point = routed.WithPoint
+        entries = catalog.entries
+        outstanding:dict[str, int] = {}     # object -> properties still to read
+        tasks:dict[asyncio.Task, tuple[bool, planner.ReadBatch]] = {}
+
+        def start(points:list[src.parse.BACnetKey], is_list:bool):
+            for batch in planner.PlanReads(points, self._client.device_caps):
+                self.batches += 1
+                tasks[asyncio.create_task(self._client.read_batch(batch))] = (is_list, batch)
+
+        start([point(routed.object_identifier, "object-list", i) for i in range(1, catalog.length + 1)], True)
+        try:
+            while tasks:
+                done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    is_list, batch = tasks.pop(task)
+                    values = task.result()
+                    if is_list:
+                        points = []
+                        ready = []
+                        for params, value in zip(batch.Items(), values):
+                            if (value is None) or isinstance(value, BaseException):
+                                _log.warning("%s object-list[%d] failed: %r", routed.address, params.index, value)
+                                failed.append(params.index)
+                                continue
+                            object_identifier = str(value)
+                            listed.add(object_identifier)
+                            if object_identifier in entries:
+                                continue
+                            entry = entries[object_identifier] = CatalogEntry(self._object_key(catalog, object_identifier), object_identifier)
+                            properties = self._object_properties(object_identifier)
+                            if not properties:
+                                ready.append(entry)
+                            outstanding[object_identifier] = len(properties)
+                            points.extend(point(object_identifier, p) for p in properties)
+                        start(points, False)
+                        for entry in ready:
+                            self.objects += 1
+                            yield entry
+                        continue
+
+                    for params, value in zip(batch.Items(), values):
+                        entry = entries[params.object_identifier]
+                        if (value is not None) and not isinstance(value, BaseException):
+                            entry.properties[params.property] = str(value)
+                        outstanding[params.object_identifier] -= 1
+                        if outstanding[params.object_identifier] == 0:
+                            self.objects += 1
+                            yield entry
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def _read(self, points:list[src.parse.BACnetKey]) -> list:
+        values = []
+        for batch in planner.PlanReads(points, self._client.device_caps):
+            self.batches += 1
+            values.extend(await self._client.read_batch(batch))
+        return values
+
+    def stats(self) -> dict:
+        """Return the catalog, object and read batch counts and how resyncs went."""
+        return {
+            "kept": len(self._catalogs),
+            "catalogs": self.catalogs,
+            "objects": self.objects,
+            "batches": self.batches,
+            "resyncs": self.resyncs,
+            "unchanged": self.unchanged,
+            "added": self.added,
+            "removed": self.removed,
+        }
@@ -1,77 +1,449 @@
-import sys
+"""Usage:
+    a client for a driver's DeviceControl service. Calls share a pool of
+    long-lived channels per address, so only the first call pays for the
+    TCP and HTTP/2 handshakes.
 
-import grpc
-import comms_pb2
-import comms_pb2_grpc
+        with Client("localhost:50062") as c:
+            values = c.get(["bacnet://192.168.13.133/100/analog-input,6/present-value"])
+            errors = c.set({"bacnet://192.168.13.133/100/analog-value,1/present-value": 72.5})
 
-# device_address = "192.168.1.174"
-# description = "Smart Air Quality Monitor"
+        async with AsyncClient("localhost:50062") as c:
+            values = await c.get(keys)
 
-"""Usage:
-    client sends a bos point uri that identifies the point to access.
+    get returns {key: value}, values decoded by their Dtype and failed keys
+    as PointErrors. Structured values (status flags, priority arrays, date
+    times) come back parsed from JSON, as lists and dicts. Key lists longer
+    than chunk_size are split into requests sent in parallel, at most
+    max_parallel at a time. Get and Set at module level use a shared Client
+    per address.
+
+    get_changes(keys, since) is a get of the values that changed since the
+    version an earlier get_changes returned, for polling many keys that
+    mostly hold still:
+
+        values, version = c.get_changes(keys)           # everything
+        values, version = c.get_changes(keys, version)  # what changed
 
-        e.g., <bos://localhost/dev/3/pts/6>
+    Keys polled over and over can be registered once and read by handle as
+    columns, which for thousands of keys costs a fraction of a get to
+    encode, send and decode. Numbers come back as floats, enumerations and
+    booleans as their numbers:
 
-    devCtrl will query the sysmod and replace it with a uri that looks like:
+        handle = c.register(keys)
+        values, version = c.get_columns(handle, keys)
 
-        <bacnet://192.168.13.133:47808/analog-input/6/present-value>
+    AsyncClient gathers the small gets of concurrent coroutines for up to
+    batch_window seconds (or batch_keys keys) into one GetRequest and hands
+    each caller its own pairs, so many one-key reads cost one RPC and reach
+    the driver together, where they share ReadPropertyMultiple requests.
 """
+import asyncio
+import itertools
+import json
+import threading
+from typing import Any
+
+import grpc
+
+import src.common_pb2 as common_pb2
+import src.common_pb2_grpc as common_pb2_grpc
 
 serverAddr = "localhost:50062"
-devCtrlAddr = "localhost:2822"
-
-# def Get(keys:str, addr=devCtrlAddr) -> str:
-#     header = comms_pb2.Header(Src=devCtrlAddr, Dst=addr)
-
-
-#     with grpc.insecure_channel(addr) as channel:
-#         stub = comms_pb2_grpc.GetSetRunStub(channel)
-#         result:comms_pb2.GetResponse
-#         result = stub.Get(comms_pb2.GetRequest(
-#             Header=header,
-#             Keys=key,
-#         ))
-#         return result.Value
-def Get(keys:list[str], addr=devCtrlAddr) -> list[comms_pb2.GetResponse]:
-    header = comms_pb2.Header(Src=devCtrlAddr, Dst=addr)
-    if isinstance(keys, str):
-        keys = [keys]
 
-    result:comms_pb2.GetResponse
-    with grpc.insecure_channel(addr) as channel:
-        print("opened channel with addr:", addr)
-        stub = comms_pb2_grpc.GetSetRunStub(channel)
-        result = stub.Get(comms_pb2.GetRequest(
-            Header=header,
-            Keys=keys
-        ))
-    
-    return result.Pairs
+POOL_SIZE = 2               # channels per client, calls are spread across them
+CHUNK_SIZE = 1000           # keys per Get or Set request
+MAX_PARALLEL = 8            # requests of one call in flight at once
+KEEPALIVE_TIME = 30000      # ms between keepalive pings on an idle channel
+KEEPALIVE_TIMEOUT = 10000   # ms to wait for a ping's ack before reconnecting
+BATCH_WINDOW = 0.002        # seconds an AsyncClient holds gets to send them together, 0 turns it off
+BATCH_KEYS = 256            # keys that send a batch at once, larger gets aren't batched
+
+CHANNEL_OPTIONS = (
+    ("grpc.keepalive_time_ms", KEEPALIVE_TIME),
+    ("grpc.keepalive_timeout_ms", KEEPALIVE_TIMEOUT),
+    ("grpc.keepalive_permit_without_calls", 1),
+    ("grpc.http2.max_pings_without_data", 0),
+    ("grpc.max_receive_message_length", 64 * 1024 * 1024),
+)
+
+_INTEGER_DTYPES = {
+    common_pb2.INT32, common_pb2.INT64, common_pb2.UINT32, common_pb2.UINT64,
+    common_pb2.SINT32, common_pb2.SINT64, common_pb2.FIXED32, common_pb2.FIXED64,
+    common_pb2.SFIXED32, common_pb2.SFIXED64,
+}
+
+class PointError(Exception):
+    """A key the driver could not get or set."""
+    def __init__(self, key:str, error:int, msg:str):
+        super().__init__(f"{key}: {msg}")
+        self.key = key
+        self.error = error      # the GetError or SetError
+        self.msg = msg
+
+class HandleError(LookupError):
+    """A key set handle the driver no longer has, register the keys again."""
+
+def decode_value(value:str, dtype:int) -> Any:
+    """Return a pair's Value as the Python type its Dtype names. Values
+    that don't parse are returned as they are.
+    """
+    try:
+        if dtype == common_pb2.NULL:
+            return None
+        if dtype in (common_pb2.DOUBLE, common_pb2.FLOAT):
+            return float(value)
+        if dtype in _INTEGER_DTYPES:
+            return int(value)
+        if dtype == common_pb2.BOOL:
+            return value.lower() in ("true", "1", "active")
+        if dtype == common_pb2.BYTES:
+            return bytes.fromhex(value)
+        if dtype == common_pb2.JSON:
+            return json.loads(value)
+    except ValueError:
+        pass
+    return value
+
+def _get_values(keys:list[str], pairs) -> dict[str, Any]:
+    # the driver leaves out keys it can't parse
+    values = {k: PointError(k, common_pb2.GET_ERROR_COULD_NOT_RESOLVE_XREF, "invalid key") for k in keys}
+    for pair in pairs:
+        if pair.HasField("Error"):
+            values[pair.Key] = PointError(pair.Key, pair.Error, pair.ErrorMsg)
+        else:
+            values[pair.Key] = decode_value(pair.Value, pair.Dtype)
+    return values
+
+def _changed_values(responses:list[common_pb2.GetResponse]) -> tuple[dict[str, Any], str]:
+    values = {}
+    for response in responses:
+        for pair in response.Pairs:
+            if pair.HasField("Error"):
+                values[pair.Key] = PointError(pair.Key, pair.Error, pair.ErrorMsg)
+            else:
+                values[pair.Key] = decode_value(pair.Value, pair.Dtype)
+    return values, _oldest_version([r.Version for r in responses])
+
+def _oldest_version(versions:list[str]) -> str:
+    # the chunks of one get_changes are read at slightly different times,
+    # the next delta has to start from the oldest. versions are
+    # <generation>.<seq>; of different generations (the driver restarted
+    # between chunks) none is safe and "" gets every value next time
+    try:
+        parsed = [(g, int(seq)) for g, _, seq in (v.partition(".") for v in versions)]
+    except ValueError:
+        return ""
+    if len({g for g, _ in parsed}) != 1:
+        return ""
+    return min(zip(parsed, versions))[1]
+
+def _changes_requests(header:common_pb2.Header, keys:list[str], since:str, size:int) -> list[common_pb2.GetRequest]:
+    return [common_pb2.GetRequest(Header=header, Keys=chunk, Since=since) for chunk in (_chunks(keys, size) or [[]])]
+
+def decode_handle(response:common_pb2.RegisterKeysResponse) -> str:
+    """Return the handle of a RegisterKeysResponse. Raises ValueError if the
+    driver refused the keys, there were too many to keep.
+    """
+    if response.Error != common_pb2.SERVICE_ERROR_NONE:
+        raise ValueError(response.ErrorMsg)
+    return response.Handle
+
+def decode_columns(keys:list[str], columns:common_pb2.GetColumns) -> dict[str, Any]:
+    """Return {key: value} of the GetColumns of a key set registered with
+    `keys`, failed keys as PointErrors.
+    """
+    if columns.Error == common_pb2.SERVICE_ERROR_UNKNOWN_HANDLE:
+        raise HandleError(columns.ErrorMsg)
+    keys = list(dict.fromkeys(keys))
+    if columns.Indexes:
+        keys = [keys[i] for i in columns.Indexes]
+    values:dict[str, Any] = dict(zip(keys, columns.Values))
+    for n, text in columns.Text.items():
+        values[keys[n]] = text
+    for n, msg in columns.ErrorMsgs.items():
+        values[keys[n]] = PointError(keys[n], columns.Errors[n], msg)
+    return values
+
+def _set_errors(pairs) -> dict[str, PointError]:
+    return {p.Key: PointError(p.Key, p.Error, p.ErrorMsg) for p in pairs if not p.Ok}
+
+def _set_pairs(values:dict[str, Any]) -> list[common_pb2.SetPair]:
+    return [common_pb2.SetPair(Key=k, Value=v if isinstance(v, str) else str(v)) for k, v in values.items()]
+
+def _chunks(items:list, size:int) -> list[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
+
+class Client:
+    """A blocking client, safe to share between threads."""
+    def __init__(self, addr:str=serverAddr, pool_size:int=POOL_SIZE, chunk_size:int=CHUNK_SIZE,
+                 max_parallel:int=MAX_PARALLEL, src:str=""):
+        self.addr = addr
+        self.chunk_size = chunk_size
+        self.max_parallel = max_parallel
+        self._header = common_pb2.Header(Src=src, Dst=addr)
+        self._channels = [grpc.insecure_channel(addr, options=CHANNEL_OPTIONS) for _ in range(pool_size)]
+        self._stubs = itertools.cycle([common_pb2_grpc.DeviceControlStub(c) for c in self._channels])
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"Client(addr='{self.addr}', channels={len(self._channels)}, chunk_size={self.chunk_size})"
+
+    def __enter__(self) -> 'Client':
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _stub(self) -> common_pb2_grpc.DeviceControlStub:
+        with self._lock:
+            return next(self._stubs)
+
+    def _call(self, rpc:str, requests:list, timeout:float) -> list:
+        # every request is started on the next channel as soon as one of the
+        # max_parallel in flight finishes; the responses come back in request
+        # order. the first failure stops the rest and is raised
+        slots = threading.Semaphore(self.max_parallel)
+        failed = threading.Event()
+
+        def done(call):
+            if (not call.cancelled()) and (call.exception() is not None):
+                failed.set()
+            slots.release()
+
+        calls = []
+        try:
+            for request in requests:
+                slots.acquire()
+                if failed.is_set():
+                    break
+                call = getattr(self._stub(), rpc).future(request, timeout=timeout)
+                call.add_done_callback(done)
+                calls.append(call)
+            return [call.result() for call in calls]
+        finally:
+            for call in calls:
+                call.cancel()
+
+    def get_pairs(self, keys:list[str], timeout:float=None) -> list[common_pb2.GetPair]:
+        """Return the driver's GetPairs for the keys, in key order."""
+        requests = [common_pb2.GetRequest(Header=self._header, Keys=chunk) for chunk in _chunks(list(keys), self.chunk_size)]
+        return [pair for response in self._call("Get", requests, timeout) for pair in response.Pairs]
+
+    def get(self, keys:list[str], timeout:float=None) -> dict[str, Any]:
+        """Return {key: value} for the keys, failed keys as PointErrors."""
+        keys = list(keys)
+        return _get_values(keys, self.get_pairs(keys, timeout))
+
+    def get_changes(self, keys:list[str], since:str=None, timeout:float=None) -> tuple[dict[str, Any], str]:
+        """Return {key: value} for the keys whose values changed (or failed)
+        since the version `since`, every key without it, and the version to
+        pass next time. Chunks of keys are sent like get's, all since the
+        same version.
+        """
+        requests = _changes_requests(self._header, list(keys), since, self.chunk_size)
+        return _changed_values(self._call("Get", requests, timeout))
+
+    def register(self, keys:list[str], ttl:float=None, timeout:float=None) -> str:
+        """Register keys to get by handle, returning the handle. Raises
+        ValueError if the driver refuses that many keys.
+        """
+        request = common_pb2.RegisterKeysRequest(Header=self._header, Keys=list(keys), Ttl=ttl)
+        return decode_handle(self._stub().RegisterKeys(request, timeout=timeout))
 
+    def get_columns(self, handle:str, keys:list[str], since:str=None, timeout:float=None) -> tuple[dict[str, Any], str]:
+        """Return {key: value} for the keys registered as `handle`, as
+        get_changes does, and the version. Raises HandleError if the driver
+        no longer has the handle.
+        """
+        request = common_pb2.KeySetRequest(Header=self._header, Handle=handle, Since=since)
+        columns = self._stub().GetKeySetColumns(request, timeout=timeout)
+        return decode_columns(keys, columns), columns.Version
 
-def Set(keys:str, values:str, addr=devCtrlAddr) -> bool:
-    header = comms_pb2.Header(Src=devCtrlAddr)
+    def set(self, values:dict[str, Any], timeout:float=None) -> dict[str, PointError]:
+        """Write {key: value}, returning the errors of the keys that failed."""
+        requests = [common_pb2.SetRequest(Header=self._header, Pairs=chunk)
+                    for chunk in _chunks(_set_pairs(values), self.chunk_size)]
+        return _set_errors(pair for response in self._call("Set", requests, timeout) for pair in response.Pairs)
+
+    def close(self):
+        for channel in self._channels:
+            channel.close()
+
+class _GetBatch:
+    """Gets waiting to go out in one GetRequest."""
+    __slots__ = ("keys", "waiters", "timeouts", "handle")
+
+    def __init__(self):
+        self.keys:dict[str, None] = {}      # every caller's keys, in order
+        self.waiters:list[tuple[list[str], asyncio.Future]] = []
+        self.timeouts:list[float] = []
+        self.handle:asyncio.TimerHandle = None
+
+    def __repr__(self):
+        return f"_GetBatch(keys={len(self.keys)}, waiters={len(self.waiters)})"
+
+    def timeout(self) -> float:
+        # long enough for the most patient caller, the others stop waiting
+        return None if None in self.timeouts else max(self.timeouts)
+
+class AsyncClient:
+    """An asyncio client. Its channels belong to the loop that made it."""
+    def __init__(self, addr:str=serverAddr, pool_size:int=POOL_SIZE, chunk_size:int=CHUNK_SIZE,
+                 max_parallel:int=MAX_PARALLEL, src:str="", batch_window:float=BATCH_WINDOW,
+                 batch_keys:int=BATCH_KEYS):
+        self.addr = addr
+        self.chunk_size = chunk_size
+        self.max_parallel = max_parallel
+        self.batch_window = batch_window
+        self.batch_keys = batch_keys
+        self._header = common_pb2.Header(Src=src, Dst=addr)
+        self._channels = [grpc.aio.insecure_channel(addr, options=CHANNEL_OPTIONS) for _ in range(pool_size)]
+        self._stubs = itertools.cycle([common_pb2_grpc.DeviceControlStub(c) for c in self._channels])
+        self._batch:_GetBatch = None
+        self._sending:set[asyncio.Task] = set()
+
+        self.gets = 0           # get_pairs calls
+        self.batched = 0        # of those, sent in a batch
+        self.batches = 0        # batches sent
+
+    def __repr__(self):
+        return f"AsyncClient(addr='{self.addr}', channels={len(self._channels)}, chunk_size={self.chunk_size}, batch_window={self.batch_window})"
+
+    async def __aenter__(self) -> 'AsyncClient':
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    async def _call(self, rpc:str, requests:list, timeout:float) -> list:
+        slots = asyncio.Semaphore(self.max_parallel)
+
+        async def call(request):
+            async with slots:
+                return await getattr(next(self._stubs), rpc)(request, timeout=timeout)
+
+        # the first failure cancels the calls still running or waiting
+        calls = [asyncio.ensure_future(call(r)) for r in requests]
+        try:
+            return await asyncio.gather(*calls)
+        finally:
+            for c in calls:
+                c.cancel()
+
+    async def _get(self, keys:list[str], timeout:float) -> list[common_pb2.GetPair]:
+        requests = [common_pb2.GetRequest(Header=self._header, Keys=chunk) for chunk in _chunks(keys, self.chunk_size)]
+        return [pair for response in await self._call("Get", requests, timeout) for pair in response.Pairs]
+
+    async def get_pairs(self, keys:list[str], timeout:float=None) -> list[common_pb2.GetPair]:
+        """Return the driver's GetPairs for the keys, in key order. Small
+        gets wait up to batch_window to share a request with others.
+        """
+        keys = list(keys)
+        self.gets += 1
+        if (not self.batch_window) or (len(keys) >= self.batch_keys):
+            return await self._get(keys, timeout)
+
+        self.batched += 1
+        batch = self._batch
+        if batch is None:
+            batch = self._batch = _GetBatch()
+            batch.handle = asyncio.get_running_loop().call_later(self.batch_window, self._flush)
+        future = asyncio.get_running_loop().create_future()
+        batch.waiters.append((keys, future))
+        batch.timeouts.append(timeout)
+        batch.keys.update(dict.fromkeys(keys))
+        if len(batch.keys) >= self.batch_keys:
+            self._flush()
+        return await asyncio.wait_for(future, timeout)
+
+    def _flush(self):
+        batch, self._batch = self._batch, None
+        if batch is None:
+            return
+        batch.handle.cancel()
+        self.batches += 1
+        task = asyncio.create_task(self._send(batch))
+        self._sending.add(task)
+        task.add_done_callback(self._sending.discard)
+
+    async def _send(self, batch:_GetBatch):
+        try:
+            pairs = {p.Key: p for p in await self._get(list(batch.keys), batch.timeout())}
+        except Exception as err:
+            for _, future in batch.waiters:
+                if not future.done():
+                    future.set_exception(err)
+            return
+        # each caller gets its keys' pairs, as the driver would have sent them
+        for keys, future in batch.waiters:
+            if not future.done():
+                future.set_result([pairs[k] for k in dict.fromkeys(keys) if k in pairs])
+
+    async def get(self, keys:list[str], timeout:float=None) -> dict[str, Any]:
+        """Return {key: value} for the keys, failed keys as PointErrors."""
+        keys = list(keys)
+        return _get_values(keys, await self.get_pairs(keys, timeout))
+
+    async def get_changes(self, keys:list[str], since:str=None, timeout:float=None) -> tuple[dict[str, Any], str]:
+        """Return {key: value} for the keys whose values changed (or failed)
+        since the version `since`, every key without it, and the version to
+        pass next time. Chunks of keys are sent like get's, all since the
+        same version, never batched.
+        """
+        requests = _changes_requests(self._header, list(keys), since, self.chunk_size)
+        return _changed_values(await self._call("Get", requests, timeout))
+
+    async def register(self, keys:list[str], ttl:float=None, timeout:float=None) -> str:
+        """Register keys to get by handle, returning the handle. Raises
+        ValueError if the driver refuses that many keys.
+        """
+        request = common_pb2.RegisterKeysRequest(Header=self._header, Keys=list(keys), Ttl=ttl)
+        return decode_handle(await next(self._stubs).RegisterKeys(request, timeout=timeout))
+
+    async def get_columns(self, handle:str, keys:list[str], since:str=None, timeout:float=None) -> tuple[dict[str, Any], str]:
+        """Return {key: value} for the keys registered as `handle`, as
+        get_changes does, and the version. Raises HandleError if the driver
+        no longer has the handle.
+        """
+        request = common_pb2.KeySetRequest(Header=self._header, Handle=handle, Since=since)
+        columns = await next(self._stubs).GetKeySetColumns(request, timeout=timeout)
+        return decode_columns(keys, columns), columns.Version
+
+    async def set(self, values:dict[str, Any], timeout:float=None) -> dict[str, PointError]:
+        """Write {key: value}, returning the errors of the keys that failed."""
+        requests = [common_pb2.SetRequest(Header=self._header, Pairs=chunk)
+                    for chunk in _chunks(_set_pairs(values), self.chunk_size)]
+        return _set_errors(pair for response in await self._call("Set", requests, timeout) for pair in response.Pairs)
+
+    def stats(self) -> dict:
+        """Return how many gets were batched into how many requests."""
+        return {"gets": self.gets, "batched": self.batched, "batches": self.batches}
+
+    async def close(self):
+        self._flush()
+        await asyncio.gather(*self._sending, return_exceptions=True)
+        await asyncio.gather(*(channel.close() for channel in self._channels))
+
+_clients:dict[str, Client] = {}
+_clients_lock = threading.Lock()
+
+def _shared(addr:str) -> Client:
+    with _clients_lock:
+        client = _clients.get(addr)
+        if client is None:
+            client = _clients[addr] = Client(addr)
+        return client
+
+def Get(keys:list[str], addr:str=serverAddr) -> dict[str, Any]:
+    if isinstance(keys, str):
+        keys = [keys]
+    return _shared(addr).get(keys)
+
+def Set(keys:list[str], values:list[Any], addr:str=serverAddr) -> dict[str, PointError]:
     if isinstance(keys, str):
         keys = [keys]
     if isinstance(values, str):
         values = [values]
-    
     if len(keys) != len(values):
-        print("error: Set must receive equal numbers of keys and values ({} != {})".format(
-            len(keys), len(values)))
-        return False
-    pairs:list[comms_pb2.SetPair] = [comms_pb2.SetPair(k, values[i]) for i, k in enumerate(keys)]
-    
-    result:comms_pb2.SetResponse
-    with grpc.insecure_channel(addr) as channel:
-        stub = comms_pb2_grpc.GetSetRunStub(channel)
-
-        result = stub.Set(comms_pb2.SetRequest(
-            Header=header,
-            Key=keys,
-            Value=pairs, 
-        ))
-    return result.Ok
-
-
-
+        raise ValueError(f"Set must receive equal numbers of keys and values ({len(keys)} != {len(values)})")
+    return _shared(addr).set(dict(zip(keys, values)))
@@ -1,4 +1,4 @@
-import client as c
+import src.client as c
 
 def driver_get_test(key:str):
     values = c.Get(key, addr="localhost:50062")
@@ -6,16 +6,16 @@ def driver_get_test(key:str):
     # print("{} -> '{}'".format(key, values[key]))
 
 def set_test(key:str, value:str):
-    ok = c.Set(key, value)
-    print("{} <- '{}' ({})".format(key, value, ok))
+    errors = c.Set(key, value)
+    print("{} <- '{}' ({})".format(key, value, errors.get(key, "ok")))
 
 def get_multiple_test(keys:list[str]):
-    res = c.GetMultiple(keys)
-    for r in res:
-        print("{} -> '{}'".format(r.Key, r.Value))
+    res = c.Get(keys)
+    for k, v in res.items():
+        print("{} -> '{}'".format(k, v))
 
 if __name__=="__main__":
-    c.devCtrlAddr = "localhost:2822"
+    c.serverAddr = "localhost:50062"
 
     # key1 = "bos://localhost/dev/3/pts/4" # temp
     # key2 = "bos://localhost/dev/3/pts/5" # humid
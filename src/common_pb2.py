@@ -26,13 +26,17 @@ from google.protobuf import timestamp_pb2 as google_dot_protobuf_dot_timestamp__
 from google.protobuf import struct_pb2 as google_dot_protobuf_dot_struct__pb2
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0c\x63ommon.proto\x12\x03\x62os\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1cgoogle/protobuf/struct.proto\"\x07\n\x05\x45mpty\"\xa7\x01\n\x06Header\x12\x0b\n\x03Src\x18\x01 \x01(\t\x12\x0b\n\x03\x44st\x18\x02 \x01(\t\x12\r\n\x05TxnId\x18\x03 \x01(\x04\x12\x14\n\x0cSessionToken\x18\x04 \x01(\t\x12(\n\x04Time\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x03\x61pp\x18\x06 \x01(\tH\x00\x88\x01\x01\x12\x11\n\x04user\x18\x07 \x01(\tH\x01\x88\x01\x01\x42\x06\n\x04_appB\x07\n\x05_user\"\xd8\x01\n\x07GetPair\x12\x0b\n\x03Key\x18\x01 \x01(\t\x12\r\n\x05Value\x18\x02 \x01(\t\x12\x1e\n\x05\x44type\x18\x03 \x01(\x0e\x32\n.bos.DtypeH\x00\x88\x01\x01\x12-\n\x04time\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12!\n\x05\x45rror\x18\x05 \x01(\x0e\x32\r.bos.GetErrorH\x02\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x06 \x01(\tH\x03\x88\x01\x01\x42\x08\n\x06_DtypeB\x07\n\x05_timeB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"\xac\x01\n\x07SetPair\x12\x0b\n\x03Key\x18\x01 \x01(\t\x12\r\n\x05Value\x18\x02 \x01(\t\x12\x1e\n\x05\x44type\x18\x03 \x01(\x0e\x32\n.bos.DtypeH\x00\x88\x01\x01\x12\n\n\x02Ok\x18\x04 \x01(\x08\x12!\n\x05\x45rror\x18\x05 \x01(\x0e\x32\r.bos.SetErrorH\x01\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x06 \x01(\tH\x02\x88\x01\x01\x42\x08\n\x06_DtypeB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"7\n\nGetRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0c\n\x04Keys\x18\x02 \x03(\t\"\xac\x01\n\x0bGetResponse\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x1b\n\x05Pairs\x18\x02 \x03(\x0b\x32\x0c.bos.GetPair\x12%\n\x05\x45rror\x18\x03 \x01(\x0e\x32\x11.bos.ServiceErrorH\x01\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x04 \x01(\tH\x02\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"V\n\nSetRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x1b\n\x05Pairs\x18\x02 \x03(\x0b\x32\x0c.bos.SetPairB\t\n\x07_Header\"\xac\x01\n\x0bSetResponse\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x1b\n\x05Pairs\x18\x02 \x03(\x0b\x32\x0c.bos.SetPair\x12%\n\x05\x45rror\x18\x03 \x01(\x0e\x32\x11.bos.ServiceErrorH\x01\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x04 \x01(\tH\x02\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"O\n\x11\x42\x61sicQueryRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\r\n\x05Query\x18\x02 \x01(\tB\t\n\x07_Header\"\xd0\x01\n\x12\x42\x61sicQueryResponse\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x12\n\x05Query\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x1c\n\x07Results\x18\x03 \x03(\x0b\x32\x0b.bos.Triple\x12#\n\x05\x45rror\x18\x04 \x01(\x0e\x32\x0f.bos.QueryErrorH\x02\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x05 \x01(\tH\x03\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_QueryB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"\xa4\x01\n\x12\x44\x65viceQueryRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x12\n\x05Query\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\r\n\x05Names\x18\x03 \x03(\t\x12\r\n\x05Types\x18\x04 \x03(\t\x12\x11\n\tLocations\x18\x05 \x03(\t\x12\x12\n\nChildTypes\x18\x06 \x03(\tB\t\n\x07_HeaderB\x08\n\x06_Query\"\xfd\x02\n\x11PointQueryRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x12\n\x05Query\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x13\n\x06\x44\x65vice\x18\x03 \x01(\tH\x02\x88\x01\x01\x12\r\n\x05Names\x18\x04 \x03(\t\x12\r\n\x05Types\x18\x05 \x03(\t\x12\x11\n\tLocations\x18\x06 \x03(\t\x12\x1e\n\x11\x43onsiderDeviceLoc\x18\x07 \x01(\x08H\x03\x88\x01\x01\x12!\n\x08Resource\x18\x08 \x01(\x0e\x32\n.bos.DtypeH\x04\x88\x01\x01\x12\x13\n\x0bParentTypes\x18\t \x03(\t\x12#\n\x05\x45rror\x18\x0b \x01(\x0e\x32\x0f.bos.QueryErrorH\x05\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x0c \x01(\tH\x06\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_QueryB\t\n\x07_DeviceB\x14\n\x12_ConsiderDeviceLocB\x0b\n\t_ResourceB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"\xe7\x01\n\rQueryResponse\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x12\n\x05Query\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x0e\n\x06Values\x18\x03 \x03(\t\x12\x1e\n\x05\x44type\x18\x04 \x01(\x0e\x32\n.bos.DtypeH\x02\x88\x01\x01\x12#\n\x05\x45rror\x18\x05 \x01(\x0e\x32\x0f.bos.QueryErrorH\x03\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x06 \x01(\tH\x04\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_QueryB\x08\n\x06_DtypeB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"p\n\x06Triple\x12\x14\n\x07Subject\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x16\n\tPredicate\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x13\n\x06Object\x18\x03 \x01(\tH\x02\x88\x01\x01\x42\n\n\x08_SubjectB\x0c\n\n_PredicateB\t\n\x07_Object\"\x89\x01\n\x11MakeDeviceRequest\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\r\n\x05Types\x18\x02 \x03(\t\x12\x11\n\tLocations\x18\x03 \x03(\t\x12\x13\n\x06\x44river\x18\x04 \x01(\tH\x00\x88\x01\x01\x12$\n\x0fOtherProperties\x18\n \x03(\x0b\x32\x0b.bos.TripleB\t\n\x07_Driver\"\x94\x01\n\x10MakePointRequest\x12\x0e\n\x06\x44\x65vice\x18\x01 \x01(\t\x12\x0c\n\x04Name\x18\x02 \x01(\t\x12\r\n\x05Types\x18\x03 \x03(\t\x12\x11\n\tLocations\x18\x04 \x03(\t\x12\x11\n\x04Xref\x18\x05 \x01(\tH\x00\x88\x01\x01\x12$\n\x0fOtherProperties\x18\n \x03(\x0b\x32\x0b.bos.TripleB\x07\n\x05_Xref\"_\n\x11MakeDriverRequest\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0c\n\x04Host\x18\x02 \x01(\t\x12\x0c\n\x04Port\x18\x03 \x01(\t\x12\r\n\x05Image\x18\x04 \x01(\t\x12\x11\n\tContainer\x18\x05 \x01(\t\"?\n\x0cMakeResponse\x12\x0b\n\x03Url\x18\x01 \x01(\t\x12\x15\n\x08\x45rrorMsg\x18\x02 \x01(\tH\x00\x88\x01\x01\x42\x0b\n\t_ErrorMsg\"\x87\x01\n\rDeleteRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x12\n\x05Query\x18\x02 \x01(\tH\x01\x88\x01\x01\x12 \n\x06Triple\x18\x03 \x01(\x0b\x32\x0b.bos.TripleH\x02\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_QueryB\t\n\x07_Triple\"\x1e\n\x0e\x44\x65leteResponse\x12\x0c\n\x04Urls\x18\x01 \x03(\t\"X\n\x0eHistoryRequest\x12\r\n\x05Start\x18\x01 \x01(\t\x12\x0b\n\x03\x45nd\x18\x02 \x01(\t\x12\x0c\n\x04Keys\x18\x03 \x03(\t\x12\x12\n\x05Limit\x18\x04 \x01(\x05H\x00\x88\x01\x01\x42\x08\n\x06_Limit\"6\n\x06HisRow\x12\x11\n\tTimestamp\x18\x01 \x01(\t\x12\r\n\x05Value\x18\x02 \x01(\x02\x12\n\n\x02Id\x18\x03 \x01(\t\"k\n\x0fHistoryResponse\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x19\n\x04Rows\x18\x02 \x03(\x0b\x32\x0b.bos.HisRow\x12 \n\x05\x45rror\x18\x03 \x01(\x0e\x32\x11.bos.ServiceError\"\x15\n\x13RefreshRatesRequest\"J\n\x14RefreshRatesResponse\x12 \n\x05\x45rror\x18\x01 \x01(\x0e\x32\x11.bos.ServiceError\x12\x10\n\x08\x45rrorMsg\x18\x02 \x01(\t\"W\n\x12SetForecastRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12$\n\x08\x66orecast\x18\x02 \x01(\x0b\x32\x12.bos.ForecastEntry\">\n\x13SetForecastResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\n\n\x02id\x18\x02 \x01(\t\"\xad\x01\n\x12GetForecastRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x13\n\x0b\x66orecast_id\x18\x02 \x01(\t\x12\x11\n\tpoint_uri\x18\x03 \x01(\t\x12)\n\x05start\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\'\n\x03\x65nd\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"Y\n\x13GetForecastResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12%\n\tforecasts\x18\x02 \x03(\x0b\x32\x12.bos.ForecastEntry\"\xc5\x02\n\rForecastEntry\x12\x18\n\x0b\x66orecast_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x33\n\ncreated_at\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12\x11\n\tpoint_uri\x18\x03 \x01(\t\x12\x1a\n\rforecast_type\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\r\n\x05model\x18\x05 \x01(\t\x12\x15\n\rmodel_version\x18\x06 \x01(\t\x12.\n\x08metadata\x18\x07 \x01(\x0b\x32\x17.google.protobuf.StructH\x03\x88\x01\x01\x12\"\n\x06values\x18\x08 \x03(\x0b\x32\x12.bos.ForecastValueB\x0e\n\x0c_forecast_idB\r\n\x0b_created_atB\x10\n\x0e_forecast_typeB\x0b\n\t_metadata\"\xa6\x01\n\rForecastValue\x12\x13\n\x0b\x66orecast_id\x18\x01 \x01(\t\x12.\n\ncreated_at\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12/\n\x0btarget_time\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08scenario\x18\x04 \x01(\t\x12\r\n\x05value\x18\x05 \x01(\x01\"\xc8\x02\n\nRunRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\r\n\x05Image\x18\x03 \x01(\t\x12\x16\n\tContainer\x18\x04 \x01(\tH\x01\x88\x01\x01\x12\x0c\n\x04\x41rgs\x18\x05 \x03(\t\x12+\n\x06Kwargs\x18\x06 \x03(\x0b\x32\x1b.bos.RunRequest.KwargsEntry\x12-\n\x07\x45nvVars\x18\x07 \x03(\x0b\x32\x1c.bos.RunRequest.EnvVarsEntry\x12\x0f\n\x07Timeout\x18\x08 \x01(\x03\x1a-\n\x0bKwargsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a.\n\x0c\x45nvVarsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\t\n\x07_HeaderB\x0c\n\n_Container\"\xb9\x01\n\x0bRunResponse\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0b\n\x03txn\x18\x02 \x01(\x04\x12\x14\n\x0c\x63ontainer_id\x18\x03 \x01(\t\x12\x10\n\x08\x45xitCode\x18\x04 \x01(\x05\x12\x13\n\x06StdOut\x18\x05 \x01(\tH\x00\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x06 \x01(\tH\x01\x88\x01\x01\x12\x14\n\x0cReturnValues\x18\x07 \x03(\tB\t\n\x07_StdOutB\x0b\n\t_ErrorMsg\"o\n\x0b\x43ronRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0f\n\x07\x43ronStr\x18\x02 \x01(\t\x12!\n\x08Requests\x18\x03 \x03(\x0b\x32\x0f.bos.RunRequest\x12\x0f\n\x07OnStart\x18\x04 \x01(\x08\"E\n\x0c\x43ronResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\n\n\x02ok\x18\x02 \x01(\x08\x12\x0c\n\x04uuid\x18\x03 \x01(\t\"g\n\x16RegisterHandlerRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\r\n\x05\x45vent\x18\x02 \x01(\t\x12!\n\x08Requests\x18\x03 \x03(\x0b\x32\x0f.bos.RunRequest\"B\n\x17RegisterHandlerResponse\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\n\n\x02Ok\x18\x02 \x01(\x08\"3\n\x14\x45ventHandlersRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\"4\n\x15\x45ventHandlersResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\"i\n\x18UnregisterHandlerRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\r\n\x05\x45vent\x18\x02 \x01(\t\x12!\n\x08Requests\x18\x03 \x03(\x0b\x32\x0f.bos.RunRequest\"D\n\x19UnregisterHandlerResponse\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\n\n\x02Ok\x18\x02 \x01(\x08\"?\n\x12RunningJobsRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0c\n\x04Txns\x18\x02 \x03(\x04\"N\n\x13RunningJobsResponse\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x1a\n\x04jobs\x18\x02 \x03(\x0b\x32\x0c.bos.JobData\"\xf3\x01\n\x07JobData\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0b\n\x03txn\x18\x02 \x01(\x04\x12\n\n\x02id\x18\x03 \x01(\t\x12\x0c\n\x04user\x18\x04 \x01(\t\x12\x0e\n\x06run_on\x18\x05 \x01(\t\x12+\n\x07\x63reated\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12(\n\x04next\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12,\n\x08previous\x18\x08 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x1e\n\x06status\x18\t \x01(\x0e\x32\x0e.bos.AppStatus\"E\n\x0bStopRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0c\n\x04txns\x18\x02 \x03(\x04\x12\x0b\n\x03ids\x18\x03 \x03(\t\"+\n\x0cStopResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\"L\n\x11\x43ronTableResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x1a\n\x04jobs\x18\x02 \x03(\x0b\x32\x0c.bos.JobData\"B\n\x15UnregisterCronRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0c\n\x04uuid\x18\x02 \x01(\t\"A\n\x16UnregisterCronResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\n\n\x02ok\x18\x02 \x01(\x08\"-\n\x0eLibraryRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\"P\n\x0fLibraryResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12 \n\x04\x61pps\x18\x02 \x03(\x0b\x32\x12.bos.AppDesciption\"B\n\rAppDesciption\x12\r\n\x05image\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12\r\n\x05usage\x18\x03 \x01(\t\"\x8b\x02\n\x05\x45vent\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05topic\x18\x02 \x01(\t\x12\x0e\n\x06source\x18\x03 \x01(\t\x12\x0c\n\x04type\x18\x04 \x01(\t\x12-\n\ttimestamp\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0f\n\x07payload\x18\x06 \x01(\x0c\x12\x1c\n\x14payload_content_type\x18\x07 \x01(\t\x12*\n\x08metadata\x18\x08 \x03(\x0b\x32\x18.bos.Event.MetadataEntry\x12\x0e\n\x06offset\x18\t \x01(\x03\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd9\x01\n\x0ePublishRequest\x12\r\n\x05topic\x18\x01 \x01(\t\x12\x0c\n\x04type\x18\x02 \x01(\t\x12\x0f\n\x07payload\x18\x03 \x01(\x0c\x12\x1c\n\x14payload_content_type\x18\x04 \x01(\t\x12\x33\n\x08metadata\x18\x05 \x03(\x0b\x32!.bos.PublishRequest.MetadataEntry\x12\x15\n\rpartition_key\x18\x06 \x01(\t\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"d\n\x0fPublishResponse\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12/\n\x0b\x61\x63\x63\x65pted_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"x\n\x10SubscribeRequest\x12\x0e\n\x06topics\x18\x01 \x03(\t\x12\x13\n\x0b\x63onsumer_id\x18\x02 \x01(\t\x12\x1c\n\x07\x66ilters\x18\x03 \x03(\x0b\x32\x0b.bos.Filter\x12!\n\x05start\x18\x04 \x01(\x0e\x32\x12.bos.StartPosition\"(\n\x06\x46ilter\x12\r\n\x05\x66ield\x18\x01 \x01(\t\x12\x0f\n\x07pattern\x18\x02 \x01(\t\"\xdb\x01\n\rReplayRequest\x12\r\n\x05topic\x18\x01 \x01(\t\x12\x34\n\x0e\x66rom_timestamp\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x00\x12\x15\n\x0b\x66rom_offset\x18\x03 \x01(\x03H\x00\x12\x17\n\rfrom_event_id\x18\x04 \x01(\tH\x00\x12)\n\x05until\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x1c\n\x07\x66ilters\x18\x06 \x03(\x0b\x32\x0b.bos.FilterB\x0c\n\nstart_from*\xa0\x01\n\x0cServiceError\x12\x16\n\x12SERVICE_ERROR_NONE\x10\x00\x12\x1d\n\x19SERVICE_ERROR_UNSPECIFIED\x10\x01\x12\x1d\n\x19SERVICE_ERROR_NO_RESPONSE\x10\x02\x12\x19\n\x15SERVICE_ERROR_TIMEOUT\x10\x03\x12\x1f\n\x1bSERVICE_ERROR_ACCESS_DENIED\x10\x07*\x83\x02\n\x08GetError\x12\x12\n\x0eGET_ERROR_NONE\x10\x00\x12\x19\n\x15GET_ERROR_UNSPECIFIED\x10\x01\x12 \n\x1cGET_ERROR_KEY_DOES_NOT_EXIST\x10\x02\x12\x15\n\x11GET_ERROR_TIMEOUT\x10\x03\x12&\n\"GET_ERROR_COULD_NOT_RESOLVE_DRIVER\x10\x04\x12$\n GET_ERROR_COULD_NOT_RESOLVE_ADDR\x10\x05\x12$\n GET_ERROR_COULD_NOT_RESOLVE_XREF\x10\x06\x12\x1b\n\x17GET_ERROR_ACCESS_DENIED\x10\x07*\xbe\x02\n\x08SetError\x12\x12\n\x0eSET_ERROR_NONE\x10\x00\x12\x19\n\x15SET_ERROR_UNSPECIFIED\x10\x01\x12 \n\x1cSET_ERROR_KEY_DOES_NOT_EXIST\x10\x02\x12\x15\n\x11SET_ERROR_TIMEOUT\x10\x03\x12&\n\"SET_ERROR_COULD_NOT_RESOLVE_DRIVER\x10\x04\x12$\n SET_ERROR_COULD_NOT_RESOLVE_ADDR\x10\x05\x12$\n SET_ERROR_COULD_NOT_RESOLVE_XREF\x10\x06\x12\x1b\n\x17SET_ERROR_ACCESS_DENIED\x10\x07\x12\x17\n\x13SET_ERROR_READ_ONLY\x10\x08\x12 \n\x1cSET_ERROR_INVALID_VALUE_TYPE\x10\t*\x97\x01\n\nQueryError\x12\x14\n\x10QUERY_ERROR_NONE\x10\x00\x12\x1b\n\x17QUERY_ERROR_UNSPECIFIED\x10\x01\x12\x17\n\x13QUERY_ERROR_TIMEOUT\x10\x03\x12\x1e\n\x1aQUERY_ERROR_UNKNOWN_PREFIX\x10\x04\x12\x1d\n\x19QUERY_ERROR_ACCESS_DENIED\x10\x05*\xab\x02\n\x05\x44type\x12\x0f\n\x0bUNSPECIFIED\x10\x00\x12\x08\n\x04NULL\x10\x01\x12\n\n\x06\x44OUBLE\x10\n\x12\t\n\x05\x46LOAT\x10\x0b\x12\t\n\x05INT32\x10\x0c\x12\t\n\x05INT64\x10\r\x12\n\n\x06UINT32\x10\x0e\x12\n\n\x06UINT64\x10\x0f\x12\n\n\x06SINT32\x10\x10\x12\n\n\x06SINT64\x10\x11\x12\x0b\n\x07\x46IXED32\x10\x12\x12\x0b\n\x07\x46IXED64\x10\x13\x12\x0c\n\x08SFIXED32\x10\x14\x12\x0c\n\x08SFIXED64\x10\x15\x12\x08\n\x04\x42OOL\x10\x16\x12\n\n\x06STRING\x10\x17\x12\t\n\x05\x42YTES\x10\x18\x12\t\n\x05POINT\x10\x1e\x12\x0e\n\nPOINT_LIST\x10\x1f\x12\n\n\x06\x44\x45VICE\x10(\x12\x0f\n\x0b\x44\x45VICE_LIST\x10)\x12\n\n\x06\x44RIVER\x10\x30\x12\x0f\n\x0b\x44RIVER_XREF\x10\x31*r\n\tAppStatus\x12\x12\n\x0eSTATUS_UNKNOWN\x10\x00\x12\x12\n\x0eSTATUS_STOPPED\x10\x01\x12\x13\n\x0fSTATUS_STOPPING\x10\x02\x12\x14\n\x10STATUS_SCHEDULED\x10\x03\x12\x12\n\x0eSTATUS_RUNNING\x10\x04*J\n\rStartPosition\x12\n\n\x06LATEST\x10\x00\x12\x0c\n\x08\x45\x41RLIEST\x10\x01\x12\x10\n\x0c\x41T_TIMESTAMP\x10\x02\x12\r\n\tAT_OFFSET\x10\x03\x32\x63\n\rDeviceControl\x12(\n\x03Get\x12\x0f.bos.GetRequest\x1a\x10.bos.GetResponse\x12(\n\x03Set\x12\x0f.bos.SetRequest\x1a\x10.bos.SetResponse2\xb3\x04\n\x06Sysmod\x12;\n\x0cQueryDevices\x12\x17.bos.DeviceQueryRequest\x1a\x12.bos.QueryResponse\x12\x39\n\x0bQueryPoints\x12\x16.bos.PointQueryRequest\x1a\x12.bos.QueryResponse\x12=\n\nBasicQuery\x12\x16.bos.BasicQueryRequest\x1a\x17.bos.BasicQueryResponse\x12.\n\x07GetName\x12\x0f.bos.GetRequest\x1a\x12.bos.QueryResponse\x12\x30\n\tGetDriver\x12\x0f.bos.GetRequest\x1a\x12.bos.QueryResponse\x12\x34\n\rGetDriverXref\x12\x0f.bos.GetRequest\x1a\x12.bos.QueryResponse\x12\x37\n\nMakeDevice\x12\x16.bos.MakeDeviceRequest\x1a\x11.bos.MakeResponse\x12\x35\n\tMakePoint\x12\x15.bos.MakePointRequest\x1a\x11.bos.MakeResponse\x12\x37\n\nMakeDriver\x12\x16.bos.MakeDriverRequest\x1a\x11.bos.MakeResponse\x12\x31\n\x06\x44\x65lete\x12\x12.bos.DeleteRequest\x1a\x13.bos.DeleteResponse2-\n\x0bHealthCheck\x12\x1e\n\x04Ping\x12\n.bos.Empty\x1a\n.bos.Empty2\xef\x01\n\x07History\x12\x37\n\nGetHistory\x12\x13.bos.HistoryRequest\x1a\x14.bos.HistoryResponse\x12\x32\n\rGetSampleRate\x12\x0f.bos.SetRequest\x1a\x10.bos.SetResponse\x12\x32\n\rSetSampleRate\x12\x0f.bos.SetRequest\x1a\x10.bos.SetResponse\x12\x43\n\x0cRefreshRates\x12\x18.bos.RefreshRatesRequest\x1a\x19.bos.RefreshRatesResponse2~\n\x08\x46orecast\x12\x38\n\x03Get\x12\x17.bos.GetForecastRequest\x1a\x18.bos.GetForecastResponse\x12\x38\n\x03Set\x12\x17.bos.SetForecastRequest\x1a\x18.bos.SetForecastResponse2\xd8\x05\n\tScheduler\x12(\n\x03Get\x12\x0f.bos.GetRequest\x1a\x10.bos.GetResponse\x12(\n\x03Set\x12\x0f.bos.SetRequest\x1a\x10.bos.SetResponse\x12\x34\n\x07Library\x12\x13.bos.LibraryRequest\x1a\x14.bos.LibraryResponse\x12(\n\x03Run\x12\x0f.bos.RunRequest\x1a\x10.bos.RunResponse\x12@\n\x0bRunningJobs\x12\x17.bos.RunningJobsRequest\x1a\x18.bos.RunningJobsResponse\x12+\n\x04Stop\x12\x10.bos.StopRequest\x1a\x11.bos.StopResponse\x12\x33\n\x0cRegisterCron\x12\x10.bos.CronRequest\x1a\x11.bos.CronResponse\x12>\n\tCronTable\x12\x17.bos.RunningJobsRequest\x1a\x18.bos.RunningJobsResponse\x12I\n\x0eUnregisterCron\x12\x1a.bos.UnregisterCronRequest\x1a\x1b.bos.UnregisterCronResponse\x12L\n\x0fRegisterHandler\x12\x1b.bos.RegisterHandlerRequest\x1a\x1c.bos.RegisterHandlerResponse\x12\x46\n\rEventHandlers\x12\x19.bos.EventHandlersRequest\x1a\x1a.bos.EventHandlersResponse\x12R\n\x11UnregisterHandler\x12\x1d.bos.UnregisterHandlerRequest\x1a\x1e.bos.UnregisterHandlerResponse2\x9e\x01\n\x08\x45ventBus\x12\x34\n\x07Publish\x12\x13.bos.PublishRequest\x1a\x14.bos.PublishResponse\x12\x30\n\tSubscribe\x12\x15.bos.SubscribeRequest\x1a\n.bos.Event0\x01\x12*\n\x06Replay\x12\x12.bos.ReplayRequest\x1a\n.bos.Event0\x01\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\x0c\x63ommon.proto\x12\x03\x62os\x1a\x1fgoogle/protobuf/timestamp.proto\x1a\x1cgoogle/protobuf/struct.proto\"\x07\n\x05\x45mpty\"\xa7\x01\n\x06Header\x12\x0b\n\x03Src\x18\x01 \x01(\t\x12\x0b\n\x03\x44st\x18\x02 \x01(\t\x12\r\n\x05TxnId\x18\x03 \x01(\x04\x12\x14\n\x0cSessionToken\x18\x04 \x01(\t\x12(\n\x04Time\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x03\x61pp\x18\x06 \x01(\tH\x00\x88\x01\x01\x12\x11\n\x04user\x18\x07 \x01(\tH\x01\x88\x01\x01\x42\x06\n\x04_appB\x07\n\x05_user\"\xd8\x01\n\x07GetPair\x12\x0b\n\x03Key\x18\x01 \x01(\t\x12\r\n\x05Value\x18\x02 \x01(\t\x12\x1e\n\x05\x44type\x18\x03 \x01(\x0e\x32\n.bos.DtypeH\x00\x88\x01\x01\x12-\n\x04time\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12!\n\x05\x45rror\x18\x05 \x01(\x0e\x32\r.bos.GetErrorH\x02\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x06 \x01(\tH\x03\x88\x01\x01\x42\x08\n\x06_DtypeB\x07\n\x05_timeB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"\xac\x01\n\x07SetPair\x12\x0b\n\x03Key\x18\x01 \x01(\t\x12\r\n\x05Value\x18\x02 \x01(\t\x12\x1e\n\x05\x44type\x18\x03 \x01(\x0e\x32\n.bos.DtypeH\x00\x88\x01\x01\x12\n\n\x02Ok\x18\x04 \x01(\x08\x12!\n\x05\x45rror\x18\x05 \x01(\x0e\x32\r.bos.SetErrorH\x01\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x06 \x01(\tH\x02\x88\x01\x01\x42\x08\n\x06_DtypeB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"U\n\nGetRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0c\n\x04Keys\x18\x02 \x03(\t\x12\x12\n\x05Since\x18\x03 \x01(\tH\x00\x88\x01\x01\x42\x08\n\x06_Since\"\xd0\x01\n\x0bGetResponse\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x1b\n\x05Pairs\x18\x02 \x03(\x0b\x32\x0c.bos.GetPair\x12%\n\x05\x45rror\x18\x03 \x01(\x0e\x32\x11.bos.ServiceErrorH\x01\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\x0f\n\x07Version\x18\x05 \x01(\t\x12\x11\n\tUnchanged\x18\x06 \x01(\rB\t\n\x07_HeaderB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"\x8f\x01\n\x14SubscribeKeysRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0c\n\x04Keys\x18\x02 \x03(\t\x12\x15\n\x08\x44\x65\x61\x64\x62\x61nd\x18\x03 \x01(\x01H\x00\x88\x01\x01\x12\x18\n\x0bMinInterval\x18\x04 \x01(\x01H\x01\x88\x01\x01\x42\x0b\n\t_DeadbandB\x0e\n\x0c_MinInterval\"d\n\x0f\x44iscoverRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x10\n\x03Low\x18\x02 \x01(\rH\x00\x88\x01\x01\x12\x11\n\x04High\x18\x03 \x01(\rH\x01\x88\x01\x01\x42\x06\n\x04_LowB\x07\n\x05_High\"x\n\x10\x44iscoveredDevice\x12\x0b\n\x03Key\x18\x01 \x01(\t\x12\x10\n\x08Instance\x18\x02 \x01(\r\x12\x0f\n\x07\x41\x64\x64ress\x18\x03 \x01(\t\x12\x0f\n\x07MaxApdu\x18\x04 \x01(\r\x12\x11\n\tSegmented\x18\x05 \x01(\x08\x12\x10\n\x08VendorId\x18\x06 \x01(\r\"]\n\x0e\x43\x61talogRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0e\n\x06\x44\x65vice\x18\x02 \x01(\t\x12\x13\n\x06Resync\x18\x03 \x01(\x08H\x00\x88\x01\x01\x42\t\n\x07_Resync\"\xb5\x01\n\x0c\x43\x61talogEntry\x12\x0b\n\x03Key\x18\x01 \x01(\t\x12\x12\n\nObjectName\x18\x02 \x01(\t\x12\x13\n\x0b\x44\x65scription\x18\x03 \x01(\t\x12\r\n\x05Units\x18\x04 \x01(\t\x12!\n\x05\x45rror\x18\x05 \x01(\x0e\x32\r.bos.GetErrorH\x00\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x06 \x01(\tH\x01\x88\x01\x01\x12\x0f\n\x07Removed\x18\x07 \x01(\x08\x42\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"Z\n\x13RegisterKeysRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0c\n\x04Keys\x18\x02 \x03(\t\x12\x10\n\x03Ttl\x18\x03 \x01(\x01H\x00\x88\x01\x01\x42\x06\n\x04_Ttl\"\xc4\x01\n\x14RegisterKeysResponse\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x0e\n\x06Handle\x18\x02 \x01(\t\x12\x0b\n\x03Ttl\x18\x03 \x01(\x01\x12\r\n\x05\x43ount\x18\x04 \x01(\r\x12%\n\x05\x45rror\x18\x05 \x01(\x0e\x32\x11.bos.ServiceErrorH\x01\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x06 \x01(\tH\x02\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"Z\n\rKeySetRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0e\n\x06Handle\x18\x02 \x01(\t\x12\x12\n\x05Since\x18\x03 \x01(\tH\x00\x88\x01\x01\x42\x08\n\x06_Since\"\xe6\x03\n\nGetColumns\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x0f\n\x07Indexes\x18\x02 \x03(\r\x12\x0e\n\x06Values\x18\x03 \x03(\x01\x12\x1d\n\x06\x45rrors\x18\x04 \x03(\x0e\x32\r.bos.GetError\x12\'\n\x04Text\x18\x05 \x03(\x0b\x32\x19.bos.GetColumns.TextEntry\x12\x31\n\tErrorMsgs\x18\x06 \x03(\x0b\x32\x1e.bos.GetColumns.ErrorMsgsEntry\x12(\n\x04Time\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\r\n\x05Times\x18\x08 \x03(\r\x12%\n\x05\x45rror\x18\t \x01(\x0e\x32\x11.bos.ServiceErrorH\x01\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\n \x01(\tH\x02\x88\x01\x01\x12\x0f\n\x07Version\x18\x0b \x01(\t\x12\x11\n\tUnchanged\x18\x0c \x01(\r\x1a+\n\tTextEntry\x12\x0b\n\x03key\x18\x01 \x01(\r\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a\x30\n\x0e\x45rrorMsgsEntry\x12\x0b\n\x03key\x18\x01 \x01(\r\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\t\n\x07_HeaderB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"V\n\nSetRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x1b\n\x05Pairs\x18\x02 \x03(\x0b\x32\x0c.bos.SetPairB\t\n\x07_Header\"\xac\x01\n\x0bSetResponse\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x1b\n\x05Pairs\x18\x02 \x03(\x0b\x32\x0c.bos.SetPair\x12%\n\x05\x45rror\x18\x03 \x01(\x0e\x32\x11.bos.ServiceErrorH\x01\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x04 \x01(\tH\x02\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"O\n\x11\x42\x61sicQueryRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\r\n\x05Query\x18\x02 \x01(\tB\t\n\x07_Header\"\xd0\x01\n\x12\x42\x61sicQueryResponse\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x12\n\x05Query\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x1c\n\x07Results\x18\x03 \x03(\x0b\x32\x0b.bos.Triple\x12#\n\x05\x45rror\x18\x04 \x01(\x0e\x32\x0f.bos.QueryErrorH\x02\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x05 \x01(\tH\x03\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_QueryB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"\xa4\x01\n\x12\x44\x65viceQueryRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x12\n\x05Query\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\r\n\x05Names\x18\x03 \x03(\t\x12\r\n\x05Types\x18\x04 \x03(\t\x12\x11\n\tLocations\x18\x05 \x03(\t\x12\x12\n\nChildTypes\x18\x06 \x03(\tB\t\n\x07_HeaderB\x08\n\x06_Query\"\xfd\x02\n\x11PointQueryRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x12\n\x05Query\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x13\n\x06\x44\x65vice\x18\x03 \x01(\tH\x02\x88\x01\x01\x12\r\n\x05Names\x18\x04 \x03(\t\x12\r\n\x05Types\x18\x05 \x03(\t\x12\x11\n\tLocations\x18\x06 \x03(\t\x12\x1e\n\x11\x43onsiderDeviceLoc\x18\x07 \x01(\x08H\x03\x88\x01\x01\x12!\n\x08Resource\x18\x08 \x01(\x0e\x32\n.bos.DtypeH\x04\x88\x01\x01\x12\x13\n\x0bParentTypes\x18\t \x03(\t\x12#\n\x05\x45rror\x18\x0b \x01(\x0e\x32\x0f.bos.QueryErrorH\x05\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x0c \x01(\tH\x06\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_QueryB\t\n\x07_DeviceB\x14\n\x12_ConsiderDeviceLocB\x0b\n\t_ResourceB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"\xe7\x01\n\rQueryResponse\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x12\n\x05Query\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x0e\n\x06Values\x18\x03 \x03(\t\x12\x1e\n\x05\x44type\x18\x04 \x01(\x0e\x32\n.bos.DtypeH\x02\x88\x01\x01\x12#\n\x05\x45rror\x18\x05 \x01(\x0e\x32\x0f.bos.QueryErrorH\x03\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x06 \x01(\tH\x04\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_QueryB\x08\n\x06_DtypeB\x08\n\x06_ErrorB\x0b\n\t_ErrorMsg\"p\n\x06Triple\x12\x14\n\x07Subject\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x16\n\tPredicate\x18\x02 \x01(\tH\x01\x88\x01\x01\x12\x13\n\x06Object\x18\x03 \x01(\tH\x02\x88\x01\x01\x42\n\n\x08_SubjectB\x0c\n\n_PredicateB\t\n\x07_Object\"\x89\x01\n\x11MakeDeviceRequest\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\r\n\x05Types\x18\x02 \x03(\t\x12\x11\n\tLocations\x18\x03 \x03(\t\x12\x13\n\x06\x44river\x18\x04 \x01(\tH\x00\x88\x01\x01\x12$\n\x0fOtherProperties\x18\n \x03(\x0b\x32\x0b.bos.TripleB\t\n\x07_Driver\"\x94\x01\n\x10MakePointRequest\x12\x0e\n\x06\x44\x65vice\x18\x01 \x01(\t\x12\x0c\n\x04Name\x18\x02 \x01(\t\x12\r\n\x05Types\x18\x03 \x03(\t\x12\x11\n\tLocations\x18\x04 \x03(\t\x12\x11\n\x04Xref\x18\x05 \x01(\tH\x00\x88\x01\x01\x12$\n\x0fOtherProperties\x18\n \x03(\x0b\x32\x0b.bos.TripleB\x07\n\x05_Xref\"_\n\x11MakeDriverRequest\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0c\n\x04Host\x18\x02 \x01(\t\x12\x0c\n\x04Port\x18\x03 \x01(\t\x12\r\n\x05Image\x18\x04 \x01(\t\x12\x11\n\tContainer\x18\x05 \x01(\t\"?\n\x0cMakeResponse\x12\x0b\n\x03Url\x18\x01 \x01(\t\x12\x15\n\x08\x45rrorMsg\x18\x02 \x01(\tH\x00\x88\x01\x01\x42\x0b\n\t_ErrorMsg\"\x87\x01\n\rDeleteRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\x12\n\x05Query\x18\x02 \x01(\tH\x01\x88\x01\x01\x12 \n\x06Triple\x18\x03 \x01(\x0b\x32\x0b.bos.TripleH\x02\x88\x01\x01\x42\t\n\x07_HeaderB\x08\n\x06_QueryB\t\n\x07_Triple\"\x1e\n\x0e\x44\x65leteResponse\x12\x0c\n\x04Urls\x18\x01 \x03(\t\"X\n\x0eHistoryRequest\x12\r\n\x05Start\x18\x01 \x01(\t\x12\x0b\n\x03\x45nd\x18\x02 \x01(\t\x12\x0c\n\x04Keys\x18\x03 \x03(\t\x12\x12\n\x05Limit\x18\x04 \x01(\x05H\x00\x88\x01\x01\x42\x08\n\x06_Limit\"6\n\x06HisRow\x12\x11\n\tTimestamp\x18\x01 \x01(\t\x12\r\n\x05Value\x18\x02 \x01(\x02\x12\n\n\x02Id\x18\x03 \x01(\t\"k\n\x0fHistoryResponse\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x19\n\x04Rows\x18\x02 \x03(\x0b\x32\x0b.bos.HisRow\x12 \n\x05\x45rror\x18\x03 \x01(\x0e\x32\x11.bos.ServiceError\"\x15\n\x13RefreshRatesRequest\"J\n\x14RefreshRatesResponse\x12 \n\x05\x45rror\x18\x01 \x01(\x0e\x32\x11.bos.ServiceError\x12\x10\n\x08\x45rrorMsg\x18\x02 \x01(\t\"W\n\x12SetForecastRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12$\n\x08\x66orecast\x18\x02 \x01(\x0b\x32\x12.bos.ForecastEntry\">\n\x13SetForecastResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\n\n\x02id\x18\x02 \x01(\t\"\xad\x01\n\x12GetForecastRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x13\n\x0b\x66orecast_id\x18\x02 \x01(\t\x12\x11\n\tpoint_uri\x18\x03 \x01(\t\x12)\n\x05start\x18\x04 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\'\n\x03\x65nd\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"Y\n\x13GetForecastResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12%\n\tforecasts\x18\x02 \x03(\x0b\x32\x12.bos.ForecastEntry\"\xc5\x02\n\rForecastEntry\x12\x18\n\x0b\x66orecast_id\x18\x01 \x01(\tH\x00\x88\x01\x01\x12\x33\n\ncreated_at\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x01\x88\x01\x01\x12\x11\n\tpoint_uri\x18\x03 \x01(\t\x12\x1a\n\rforecast_type\x18\x04 \x01(\tH\x02\x88\x01\x01\x12\r\n\x05model\x18\x05 \x01(\t\x12\x15\n\rmodel_version\x18\x06 \x01(\t\x12.\n\x08metadata\x18\x07 \x01(\x0b\x32\x17.google.protobuf.StructH\x03\x88\x01\x01\x12\"\n\x06values\x18\x08 \x03(\x0b\x32\x12.bos.ForecastValueB\x0e\n\x0c_forecast_idB\r\n\x0b_created_atB\x10\n\x0e_forecast_typeB\x0b\n\t_metadata\"\xa6\x01\n\rForecastValue\x12\x13\n\x0b\x66orecast_id\x18\x01 \x01(\t\x12.\n\ncreated_at\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12/\n\x0btarget_time\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x10\n\x08scenario\x18\x04 \x01(\t\x12\r\n\x05value\x18\x05 \x01(\x01\"\xc8\x02\n\nRunRequest\x12 \n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.HeaderH\x00\x88\x01\x01\x12\r\n\x05Image\x18\x03 \x01(\t\x12\x16\n\tContainer\x18\x04 \x01(\tH\x01\x88\x01\x01\x12\x0c\n\x04\x41rgs\x18\x05 \x03(\t\x12+\n\x06Kwargs\x18\x06 \x03(\x0b\x32\x1b.bos.RunRequest.KwargsEntry\x12-\n\x07\x45nvVars\x18\x07 \x03(\x0b\x32\x1c.bos.RunRequest.EnvVarsEntry\x12\x0f\n\x07Timeout\x18\x08 \x01(\x03\x1a-\n\x0bKwargsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x1a.\n\x0c\x45nvVarsEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\x42\t\n\x07_HeaderB\x0c\n\n_Container\"\xb9\x01\n\x0bRunResponse\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0b\n\x03txn\x18\x02 \x01(\x04\x12\x14\n\x0c\x63ontainer_id\x18\x03 \x01(\t\x12\x10\n\x08\x45xitCode\x18\x04 \x01(\x05\x12\x13\n\x06StdOut\x18\x05 \x01(\tH\x00\x88\x01\x01\x12\x15\n\x08\x45rrorMsg\x18\x06 \x01(\tH\x01\x88\x01\x01\x12\x14\n\x0cReturnValues\x18\x07 \x03(\tB\t\n\x07_StdOutB\x0b\n\t_ErrorMsg\"o\n\x0b\x43ronRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0f\n\x07\x43ronStr\x18\x02 \x01(\t\x12!\n\x08Requests\x18\x03 \x03(\x0b\x32\x0f.bos.RunRequest\x12\x0f\n\x07OnStart\x18\x04 \x01(\x08\"E\n\x0c\x43ronResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\n\n\x02ok\x18\x02 \x01(\x08\x12\x0c\n\x04uuid\x18\x03 \x01(\t\"g\n\x16RegisterHandlerRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\r\n\x05\x45vent\x18\x02 \x01(\t\x12!\n\x08Requests\x18\x03 \x03(\x0b\x32\x0f.bos.RunRequest\"B\n\x17RegisterHandlerResponse\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\n\n\x02Ok\x18\x02 \x01(\x08\"3\n\x14\x45ventHandlersRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\"4\n\x15\x45ventHandlersResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\"i\n\x18UnregisterHandlerRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\r\n\x05\x45vent\x18\x02 \x01(\t\x12!\n\x08Requests\x18\x03 \x03(\x0b\x32\x0f.bos.RunRequest\"D\n\x19UnregisterHandlerResponse\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\n\n\x02Ok\x18\x02 \x01(\x08\"?\n\x12RunningJobsRequest\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0c\n\x04Txns\x18\x02 \x03(\x04\"N\n\x13RunningJobsResponse\x12\x1b\n\x06Header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x1a\n\x04jobs\x18\x02 \x03(\x0b\x32\x0c.bos.JobData\"\xf3\x01\n\x07JobData\x12\x0c\n\x04name\x18\x01 \x01(\t\x12\x0b\n\x03txn\x18\x02 \x01(\x04\x12\n\n\x02id\x18\x03 \x01(\t\x12\x0c\n\x04user\x18\x04 \x01(\t\x12\x0e\n\x06run_on\x18\x05 \x01(\t\x12+\n\x07\x63reated\x18\x06 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12(\n\x04next\x18\x07 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12,\n\x08previous\x18\x08 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x1e\n\x06status\x18\t \x01(\x0e\x32\x0e.bos.AppStatus\"E\n\x0bStopRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0c\n\x04txns\x18\x02 \x03(\x04\x12\x0b\n\x03ids\x18\x03 \x03(\t\"+\n\x0cStopResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\"L\n\x11\x43ronTableResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x1a\n\x04jobs\x18\x02 \x03(\x0b\x32\x0c.bos.JobData\"B\n\x15UnregisterCronRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\x0c\n\x04uuid\x18\x02 \x01(\t\"A\n\x16UnregisterCronResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12\n\n\x02ok\x18\x02 \x01(\x08\"-\n\x0eLibraryRequest\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\"P\n\x0fLibraryResponse\x12\x1b\n\x06header\x18\x01 \x01(\x0b\x32\x0b.bos.Header\x12 \n\x04\x61pps\x18\x02 \x03(\x0b\x32\x12.bos.AppDesciption\"B\n\rAppDesciption\x12\r\n\x05image\x18\x01 \x01(\t\x12\x13\n\x0b\x64\x65scription\x18\x02 \x01(\t\x12\r\n\x05usage\x18\x03 \x01(\t\"\x8b\x02\n\x05\x45vent\x12\n\n\x02id\x18\x01 \x01(\t\x12\r\n\x05topic\x18\x02 \x01(\t\x12\x0e\n\x06source\x18\x03 \x01(\t\x12\x0c\n\x04type\x18\x04 \x01(\t\x12-\n\ttimestamp\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x0f\n\x07payload\x18\x06 \x01(\x0c\x12\x1c\n\x14payload_content_type\x18\x07 \x01(\t\x12*\n\x08metadata\x18\x08 \x03(\x0b\x32\x18.bos.Event.MetadataEntry\x12\x0e\n\x06offset\x18\t \x01(\x03\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"\xd9\x01\n\x0ePublishRequest\x12\r\n\x05topic\x18\x01 \x01(\t\x12\x0c\n\x04type\x18\x02 \x01(\t\x12\x0f\n\x07payload\x18\x03 \x01(\x0c\x12\x1c\n\x14payload_content_type\x18\x04 \x01(\t\x12\x33\n\x08metadata\x18\x05 \x03(\x0b\x32!.bos.PublishRequest.MetadataEntry\x12\x15\n\rpartition_key\x18\x06 \x01(\t\x1a/\n\rMetadataEntry\x12\x0b\n\x03key\x18\x01 \x01(\t\x12\r\n\x05value\x18\x02 \x01(\t:\x02\x38\x01\"d\n\x0fPublishResponse\x12\x10\n\x08\x65vent_id\x18\x01 \x01(\t\x12\x0e\n\x06offset\x18\x02 \x01(\x03\x12/\n\x0b\x61\x63\x63\x65pted_at\x18\x03 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\"x\n\x10SubscribeRequest\x12\x0e\n\x06topics\x18\x01 \x03(\t\x12\x13\n\x0b\x63onsumer_id\x18\x02 \x01(\t\x12\x1c\n\x07\x66ilters\x18\x03 \x03(\x0b\x32\x0b.bos.Filter\x12!\n\x05start\x18\x04 \x01(\x0e\x32\x12.bos.StartPosition\"(\n\x06\x46ilter\x12\r\n\x05\x66ield\x18\x01 \x01(\t\x12\x0f\n\x07pattern\x18\x02 \x01(\t\"\xdb\x01\n\rReplayRequest\x12\r\n\x05topic\x18\x01 \x01(\t\x12\x34\n\x0e\x66rom_timestamp\x18\x02 \x01(\x0b\x32\x1a.google.protobuf.TimestampH\x00\x12\x15\n\x0b\x66rom_offset\x18\x03 \x01(\x03H\x00\x12\x17\n\rfrom_event_id\x18\x04 \x01(\tH\x00\x12)\n\x05until\x18\x05 \x01(\x0b\x32\x1a.google.protobuf.Timestamp\x12\x1c\n\x07\x66ilters\x18\x06 \x03(\x0b\x32\x0b.bos.FilterB\x0c\n\nstart_from*\xe3\x01\n\x0cServiceError\x12\x16\n\x12SERVICE_ERROR_NONE\x10\x00\x12\x1d\n\x19SERVICE_ERROR_UNSPECIFIED\x10\x01\x12\x1d\n\x19SERVICE_ERROR_NO_RESPONSE\x10\x02\x12\x19\n\x15SERVICE_ERROR_TIMEOUT\x10\x03\x12\x1f\n\x1bSERVICE_ERROR_ACCESS_DENIED\x10\x07\x12 \n\x1cSERVICE_ERROR_UNKNOWN_HANDLE\x10\x08\x12\x1f\n\x1bSERVICE_ERROR_TOO_MANY_KEYS\x10\t*\x83\x02\n\x08GetError\x12\x12\n\x0eGET_ERROR_NONE\x10\x00\x12\x19\n\x15GET_ERROR_UNSPECIFIED\x10\x01\x12 \n\x1cGET_ERROR_KEY_DOES_NOT_EXIST\x10\x02\x12\x15\n\x11GET_ERROR_TIMEOUT\x10\x03\x12&\n\"GET_ERROR_COULD_NOT_RESOLVE_DRIVER\x10\x04\x12$\n GET_ERROR_COULD_NOT_RESOLVE_ADDR\x10\x05\x12$\n GET_ERROR_COULD_NOT_RESOLVE_XREF\x10\x06\x12\x1b\n\x17GET_ERROR_ACCESS_DENIED\x10\x07*\xbe\x02\n\x08SetError\x12\x12\n\x0eSET_ERROR_NONE\x10\x00\x12\x19\n\x15SET_ERROR_UNSPECIFIED\x10\x01\x12 \n\x1cSET_ERROR_KEY_DOES_NOT_EXIST\x10\x02\x12\x15\n\x11SET_ERROR_TIMEOUT\x10\x03\x12&\n\"SET_ERROR_COULD_NOT_RESOLVE_DRIVER\x10\x04\x12$\n SET_ERROR_COULD_NOT_RESOLVE_ADDR\x10\x05\x12$\n SET_ERROR_COULD_NOT_RESOLVE_XREF\x10\x06\x12\x1b\n\x17SET_ERROR_ACCESS_DENIED\x10\x07\x12\x17\n\x13SET_ERROR_READ_ONLY\x10\x08\x12 \n\x1cSET_ERROR_INVALID_VALUE_TYPE\x10\t*\x97\x01\n\nQueryError\x12\x14\n\x10QUERY_ERROR_NONE\x10\x00\x12\x1b\n\x17QUERY_ERROR_UNSPECIFIED\x10\x01\x12\x17\n\x13QUERY_ERROR_TIMEOUT\x10\x03\x12\x1e\n\x1aQUERY_ERROR_UNKNOWN_PREFIX\x10\x04\x12\x1d\n\x19QUERY_ERROR_ACCESS_DENIED\x10\x05*\xb5\x02\n\x05\x44type\x12\x0f\n\x0bUNSPECIFIED\x10\x00\x12\x08\n\x04NULL\x10\x01\x12\n\n\x06\x44OUBLE\x10\n\x12\t\n\x05\x46LOAT\x10\x0b\x12\t\n\x05INT32\x10\x0c\x12\t\n\x05INT64\x10\r\x12\n\n\x06UINT32\x10\x0e\x12\n\n\x06UINT64\x10\x0f\x12\n\n\x06SINT32\x10\x10\x12\n\n\x06SINT64\x10\x11\x12\x0b\n\x07\x46IXED32\x10\x12\x12\x0b\n\x07\x46IXED64\x10\x13\x12\x0c\n\x08SFIXED32\x10\x14\x12\x0c\n\x08SFIXED64\x10\x15\x12\x08\n\x04\x42OOL\x10\x16\x12\n\n\x06STRING\x10\x17\x12\t\n\x05\x42YTES\x10\x18\x12\x08\n\x04JSON\x10\x19\x12\t\n\x05POINT\x10\x1e\x12\x0e\n\nPOINT_LIST\x10\x1f\x12\n\n\x06\x44\x45VICE\x10(\x12\x0f\n\x0b\x44\x45VICE_LIST\x10)\x12\n\n\x06\x44RIVER\x10\x30\x12\x0f\n\x0b\x44RIVER_XREF\x10\x31*r\n\tAppStatus\x12\x12\n\x0eSTATUS_UNKNOWN\x10\x00\x12\x12\n\x0eSTATUS_STOPPED\x10\x01\x12\x13\n\x0fSTATUS_STOPPING\x10\x02\x12\x14\n\x10STATUS_SCHEDULED\x10\x03\x12\x12\n\x0eSTATUS_RUNNING\x10\x04*J\n\rStartPosition\x12\n\n\x06LATEST\x10\x00\x12\x0c\n\x08\x45\x41RLIEST\x10\x01\x12\x10\n\x0c\x41T_TIMESTAMP\x10\x02\x12\r\n\tAT_OFFSET\x10\x03\x32\xed\x03\n\rDeviceControl\x12(\n\x03Get\x12\x0f.bos.GetRequest\x1a\x10.bos.GetResponse\x12(\n\x03Set\x12\x0f.bos.SetRequest\x1a\x10.bos.SetResponse\x12\x36\n\tSubscribe\x12\x19.bos.SubscribeKeysRequest\x1a\x0c.bos.GetPair0\x01\x12\x39\n\x08\x44iscover\x12\x14.bos.DiscoverRequest\x1a\x15.bos.DiscoveredDevice0\x01\x12\x33\n\x07\x43\x61talog\x12\x13.bos.CatalogRequest\x1a\x11.bos.CatalogEntry0\x01\x12\x43\n\x0cRegisterKeys\x12\x18.bos.RegisterKeysRequest\x1a\x19.bos.RegisterKeysResponse\x12\x31\n\tGetKeySet\x12\x12.bos.KeySetRequest\x1a\x10.bos.GetResponse\x12\x37\n\x10GetKeySetColumns\x12\x12.bos.KeySetRequest\x1a\x0f.bos.GetColumns\x12/\n\rReleaseKeySet\x12\x12.bos.KeySetRequest\x1a\n.bos.Empty2\xb3\x04\n\x06Sysmod\x12;\n\x0cQueryDevices\x12\x17.bos.DeviceQueryRequest\x1a\x12.bos.QueryResponse\x12\x39\n\x0bQueryPoints\x12\x16.bos.PointQueryRequest\x1a\x12.bos.QueryResponse\x12=\n\nBasicQuery\x12\x16.bos.BasicQueryRequest\x1a\x17.bos.BasicQueryResponse\x12.\n\x07GetName\x12\x0f.bos.GetRequest\x1a\x12.bos.QueryResponse\x12\x30\n\tGetDriver\x12\x0f.bos.GetRequest\x1a\x12.bos.QueryResponse\x12\x34\n\rGetDriverXref\x12\x0f.bos.GetRequest\x1a\x12.bos.QueryResponse\x12\x37\n\nMakeDevice\x12\x16.bos.MakeDeviceRequest\x1a\x11.bos.MakeResponse\x12\x35\n\tMakePoint\x12\x15.bos.MakePointRequest\x1a\x11.bos.MakeResponse\x12\x37\n\nMakeDriver\x12\x16.bos.MakeDriverRequest\x1a\x11.bos.MakeResponse\x12\x31\n\x06\x44\x65lete\x12\x12.bos.DeleteRequest\x1a\x13.bos.DeleteResponse2-\n\x0bHealthCheck\x12\x1e\n\x04Ping\x12\n.bos.Empty\x1a\n.bos.Empty2\xef\x01\n\x07History\x12\x37\n\nGetHistory\x12\x13.bos.HistoryRequest\x1a\x14.bos.HistoryResponse\x12\x32\n\rGetSampleRate\x12\x0f.bos.SetRequest\x1a\x10.bos.SetResponse\x12\x32\n\rSetSampleRate\x12\x0f.bos.SetRequest\x1a\x10.bos.SetResponse\x12\x43\n\x0cRefreshRates\x12\x18.bos.RefreshRatesRequest\x1a\x19.bos.RefreshRatesResponse2~\n\x08\x46orecast\x12\x38\n\x03Get\x12\x17.bos.GetForecastRequest\x1a\x18.bos.GetForecastResponse\x12\x38\n\x03Set\x12\x17.bos.SetForecastRequest\x1a\x18.bos.SetForecastResponse2\xd8\x05\n\tScheduler\x12(\n\x03Get\x12\x0f.bos.GetRequest\x1a\x10.bos.GetResponse\x12(\n\x03Set\x12\x0f.bos.SetRequest\x1a\x10.bos.SetResponse\x12\x34\n\x07Library\x12\x13.bos.LibraryRequest\x1a\x14.bos.LibraryResponse\x12(\n\x03Run\x12\x0f.bos.RunRequest\x1a\x10.bos.RunResponse\x12@\n\x0bRunningJobs\x12\x17.bos.RunningJobsRequest\x1a\x18.bos.RunningJobsResponse\x12+\n\x04Stop\x12\x10.bos.StopRequest\x1a\x11.bos.StopResponse\x12\x33\n\x0cRegisterCron\x12\x10.bos.CronRequest\x1a\x11.bos.CronResponse\x12>\n\tCronTable\x12\x17.bos.RunningJobsRequest\x1a\x18.bos.RunningJobsResponse\x12I\n\x0eUnregisterCron\x12\x1a.bos.UnregisterCronRequest\x1a\x1b.bos.UnregisterCronResponse\x12L\n\x0fRegisterHandler\x12\x1b.bos.RegisterHandlerRequest\x1a\x1c.bos.RegisterHandlerResponse\x12\x46\n\rEventHandlers\x12\x19.bos.EventHandlersRequest\x1a\x1a.bos.EventHandlersResponse\x12R\n\x11UnregisterHandler\x12\x1d.bos.UnregisterHandlerRequest\x1a\x1e.bos.UnregisterHandlerResponse2\x9e\x01\n\x08\x45ventBus\x12\x34\n\x07Publish\x12\x13.bos.PublishRequest\x1a\x14.bos.PublishResponse\x12\x30\n\tSubscribe\x12\x15.bos.SubscribeRequest\x1a\n.bos.Event0\x01\x12*\n\x06Replay\x12\x12.bos.ReplayRequest\x1a\n.bos.Event0\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'common_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
+  _globals['_GETCOLUMNS_TEXTENTRY']._loaded_options = None
+  _globals['_GETCOLUMNS_TEXTENTRY']._serialized_options = b'8\001'
+  _globals['_GETCOLUMNS_ERRORMSGSENTRY']._loaded_options = None
+  _globals['_GETCOLUMNS_ERRORMSGSENTRY']._serialized_options = b'8\001'
   _globals['_RUNREQUEST_KWARGSENTRY']._loaded_options = None
   _globals['_RUNREQUEST_KWARGSENTRY']._serialized_options = b'8\001'
   _globals['_RUNREQUEST_ENVVARSENTRY']._loaded_options = None
@@ -41,20 +45,20 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_EVENT_METADATAENTRY']._serialized_options = b'8\001'
   _globals['_PUBLISHREQUEST_METADATAENTRY']._loaded_options = None
   _globals['_PUBLISHREQUEST_METADATAENTRY']._serialized_options = b'8\001'
-  _globals['_SERVICEERROR']._serialized_start=7293
-  _globals['_SERVICEERROR']._serialized_end=7453
-  _globals['_GETERROR']._serialized_start=7456
-  _globals['_GETERROR']._serialized_end=7715
-  _globals['_SETERROR']._serialized_start=7718
-  _globals['_SETERROR']._serialized_end=8036
-  _globals['_QUERYERROR']._serialized_start=8039
-  _globals['_QUERYERROR']._serialized_end=8190
-  _globals['_DTYPE']._serialized_start=8193
-  _globals['_DTYPE']._serialized_end=8492
-  _globals['_APPSTATUS']._serialized_start=8494
-  _globals['_APPSTATUS']._serialized_end=8608
-  _globals['_STARTPOSITION']._serialized_start=8610
-  _globals['_STARTPOSITION']._serialized_end=8684
+  _globals['_SERVICEERROR']._serialized_start=8880
+  _globals['_SERVICEERROR']._serialized_end=9107
+  _globals['_GETERROR']._serialized_start=9110
+  _globals['_GETERROR']._serialized_end=9369
+  _globals['_SETERROR']._serialized_start=9372
+  _globals['_SETERROR']._serialized_end=9690
+  _globals['_QUERYERROR']._serialized_start=9693
+  _globals['_QUERYERROR']._serialized_end=9844
+  _globals['_DTYPE']._serialized_start=9847
+  _globals['_DTYPE']._serialized_end=10156
+  _globals['_APPSTATUS']._serialized_start=10158
+  _globals['_APPSTATUS']._serialized_end=10272
+  _globals['_STARTPOSITION']._serialized_start=10274
+  _globals['_STARTPOSITION']._serialized_end=10348
   _globals['_EMPTY']._serialized_start=84
   _globals['_EMPTY']._serialized_end=91
   _globals['_HEADER']._serialized_start=94
@@ -64,133 +68,155 @@ if not _descriptor._USE_C_DESCRIPTORS:
   _globals['_SETPAIR']._serialized_start=483
   _globals['_SETPAIR']._serialized_end=655
   _globals['_GETREQUEST']._serialized_start=657
-  _globals['_GETREQUEST']._serialized_end=712
-  _globals['_GETRESPONSE']._serialized_start=715
-  _globals['_GETRESPONSE']._serialized_end=887
-  _globals['_SETREQUEST']._serialized_start=889
-  _globals['_SETREQUEST']._serialized_end=975
-  _globals['_SETRESPONSE']._serialized_start=978
-  _globals['_SETRESPONSE']._serialized_end=1150
-  _globals['_BASICQUERYREQUEST']._serialized_start=1152
-  _globals['_BASICQUERYREQUEST']._serialized_end=1231
-  _globals['_BASICQUERYRESPONSE']._serialized_start=1234
-  _globals['_BASICQUERYRESPONSE']._serialized_end=1442
-  _globals['_DEVICEQUERYREQUEST']._serialized_start=1445
-  _globals['_DEVICEQUERYREQUEST']._serialized_end=1609
-  _globals['_POINTQUERYREQUEST']._serialized_start=1612
-  _globals['_POINTQUERYREQUEST']._serialized_end=1993
-  _globals['_QUERYRESPONSE']._serialized_start=1996
-  _globals['_QUERYRESPONSE']._serialized_end=2227
-  _globals['_TRIPLE']._serialized_start=2229
-  _globals['_TRIPLE']._serialized_end=2341
-  _globals['_MAKEDEVICEREQUEST']._serialized_start=2344
-  _globals['_MAKEDEVICEREQUEST']._serialized_end=2481
-  _globals['_MAKEPOINTREQUEST']._serialized_start=2484
-  _globals['_MAKEPOINTREQUEST']._serialized_end=2632
-  _globals['_MAKEDRIVERREQUEST']._serialized_start=2634
-  _globals['_MAKEDRIVERREQUEST']._serialized_end=2729
-  _globals['_MAKERESPONSE']._serialized_start=2731
-  _globals['_MAKERESPONSE']._serialized_end=2794
-  _globals['_DELETEREQUEST']._serialized_start=2797
-  _globals['_DELETEREQUEST']._serialized_end=2932
-  _globals['_DELETERESPONSE']._serialized_start=2934
-  _globals['_DELETERESPONSE']._serialized_end=2964
-  _globals['_HISTORYREQUEST']._serialized_start=2966
-  _globals['_HISTORYREQUEST']._serialized_end=3054
-  _globals['_HISROW']._serialized_start=3056
-  _globals['_HISROW']._serialized_end=3110
-  _globals['_HISTORYRESPONSE']._serialized_start=3112
-  _globals['_HISTORYRESPONSE']._serialized_end=3219
-  _globals['_REFRESHRATESREQUEST']._serialized_start=3221
-  _globals['_REFRESHRATESREQUEST']._serialized_end=3242
-  _globals['_REFRESHRATESRESPONSE']._serialized_start=3244
-  _globals['_REFRESHRATESRESPONSE']._serialized_end=3318
-  _globals['_SETFORECASTREQUEST']._serialized_start=3320
-  _globals['_SETFORECASTREQUEST']._serialized_end=3407
-  _globals['_SETFORECASTRESPONSE']._serialized_start=3409
-  _globals['_SETFORECASTRESPONSE']._serialized_end=3471
-  _globals['_GETFORECASTREQUEST']._serialized_start=3474
-  _globals['_GETFORECASTREQUEST']._serialized_end=3647
-  _globals['_GETFORECASTRESPONSE']._serialized_start=3649
-  _globals['_GETFORECASTRESPONSE']._serialized_end=3738
-  _globals['_FORECASTENTRY']._serialized_start=3741
-  _globals['_FORECASTENTRY']._serialized_end=4066
-  _globals['_FORECASTVALUE']._serialized_start=4069
-  _globals['_FORECASTVALUE']._serialized_end=4235
-  _globals['_RUNREQUEST']._serialized_start=4238
-  _globals['_RUNREQUEST']._serialized_end=4566
-  _globals['_RUNREQUEST_KWARGSENTRY']._serialized_start=4448
-  _globals['_RUNREQUEST_KWARGSENTRY']._serialized_end=4493
-  _globals['_RUNREQUEST_ENVVARSENTRY']._serialized_start=4495
-  _globals['_RUNREQUEST_ENVVARSENTRY']._serialized_end=4541
-  _globals['_RUNRESPONSE']._serialized_start=4569
-  _globals['_RUNRESPONSE']._serialized_end=4754
-  _globals['_CRONREQUEST']._serialized_start=4756
-  _globals['_CRONREQUEST']._serialized_end=4867
-  _globals['_CRONRESPONSE']._serialized_start=4869
-  _globals['_CRONRESPONSE']._serialized_end=4938
-  _globals['_REGISTERHANDLERREQUEST']._serialized_start=4940
-  _globals['_REGISTERHANDLERREQUEST']._serialized_end=5043
-  _globals['_REGISTERHANDLERRESPONSE']._serialized_start=5045
-  _globals['_REGISTERHANDLERRESPONSE']._serialized_end=5111
-  _globals['_EVENTHANDLERSREQUEST']._serialized_start=5113
-  _globals['_EVENTHANDLERSREQUEST']._serialized_end=5164
-  _globals['_EVENTHANDLERSRESPONSE']._serialized_start=5166
-  _globals['_EVENTHANDLERSRESPONSE']._serialized_end=5218
-  _globals['_UNREGISTERHANDLERREQUEST']._serialized_start=5220
-  _globals['_UNREGISTERHANDLERREQUEST']._serialized_end=5325
-  _globals['_UNREGISTERHANDLERRESPONSE']._serialized_start=5327
-  _globals['_UNREGISTERHANDLERRESPONSE']._serialized_end=5395
-  _globals['_RUNNINGJOBSREQUEST']._serialized_start=5397
-  _globals['_RUNNINGJOBSREQUEST']._serialized_end=5460
-  _globals['_RUNNINGJOBSRESPONSE']._serialized_start=5462
-  _globals['_RUNNINGJOBSRESPONSE']._serialized_end=5540
-  _globals['_JOBDATA']._serialized_start=5543
-  _globals['_JOBDATA']._serialized_end=5786
-  _globals['_STOPREQUEST']._serialized_start=5788
-  _globals['_STOPREQUEST']._serialized_end=5857
-  _globals['_STOPRESPONSE']._serialized_start=5859
-  _globals['_STOPRESPONSE']._serialized_end=5902
-  _globals['_CRONTABLERESPONSE']._serialized_start=5904
-  _globals['_CRONTABLERESPONSE']._serialized_end=5980
-  _globals['_UNREGISTERCRONREQUEST']._serialized_start=5982
-  _globals['_UNREGISTERCRONREQUEST']._serialized_end=6048
-  _globals['_UNREGISTERCRONRESPONSE']._serialized_start=6050
-  _globals['_UNREGISTERCRONRESPONSE']._serialized_end=6115
-  _globals['_LIBRARYREQUEST']._serialized_start=6117
-  _globals['_LIBRARYREQUEST']._serialized_end=6162
-  _globals['_LIBRARYRESPONSE']._serialized_start=6164
-  _globals['_LIBRARYRESPONSE']._serialized_end=6244
-  _globals['_APPDESCIPTION']._serialized_start=6246
-  _globals['_APPDESCIPTION']._serialized_end=6312
-  _globals['_EVENT']._serialized_start=6315
-  _globals['_EVENT']._serialized_end=6582
-  _globals['_EVENT_METADATAENTRY']._serialized_start=6535
-  _globals['_EVENT_METADATAENTRY']._serialized_end=6582
-  _globals['_PUBLISHREQUEST']._serialized_start=6585
-  _globals['_PUBLISHREQUEST']._serialized_end=6802
-  _globals['_PUBLISHREQUEST_METADATAENTRY']._serialized_start=6535
-  _globals['_PUBLISHREQUEST_METADATAENTRY']._serialized_end=6582
-  _globals['_PUBLISHRESPONSE']._serialized_start=6804
-  _globals['_PUBLISHRESPONSE']._serialized_end=6904
-  _globals['_SUBSCRIBEREQUEST']._serialized_start=6906
-  _globals['_SUBSCRIBEREQUEST']._serialized_end=7026
-  _globals['_FILTER']._serialized_start=7028
-  _globals['_FILTER']._serialized_end=7068
-  _globals['_REPLAYREQUEST']._serialized_start=7071
-  _globals['_REPLAYREQUEST']._serialized_end=7290
-  _globals['_DEVICECONTROL']._serialized_start=8686
-  _globals['_DEVICECONTROL']._serialized_end=8785
-  _globals['_SYSMOD']._serialized_start=8788
-  _globals['_SYSMOD']._serialized_end=9351
-  _globals['_HEALTHCHECK']._serialized_start=9353
-  _globals['_HEALTHCHECK']._serialized_end=9398
-  _globals['_HISTORY']._serialized_start=9401
-  _globals['_HISTORY']._serialized_end=9640
-  _globals['_FORECAST']._serialized_start=9642
-  _globals['_FORECAST']._serialized_end=9768
-  _globals['_SCHEDULER']._serialized_start=9771
-  _globals['_SCHEDULER']._serialized_end=10499
-  _globals['_EVENTBUS']._serialized_start=10502
-  _globals['_EVENTBUS']._serialized_end=10660
+  _globals['_GETREQUEST']._serialized_end=742
+  _globals['_GETRESPONSE']._serialized_start=745
+  _globals['_GETRESPONSE']._serialized_end=953
+  _globals['_SUBSCRIBEKEYSREQUEST']._serialized_start=956
+  _globals['_SUBSCRIBEKEYSREQUEST']._serialized_end=1099
+  _globals['_DISCOVERREQUEST']._serialized_start=1101
+  _globals['_DISCOVERREQUEST']._serialized_end=1201
+  _globals['_DISCOVEREDDEVICE']._serialized_start=1203
+  _globals['_DISCOVEREDDEVICE']._serialized_end=1323
+  _globals['_CATALOGREQUEST']._serialized_start=1325
+  _globals['_CATALOGREQUEST']._serialized_end=1418
+  _globals['_CATALOGENTRY']._serialized_start=1421
+  _globals['_CATALOGENTRY']._serialized_end=1602
+  _globals['_REGISTERKEYSREQUEST']._serialized_start=1604
+  _globals['_REGISTERKEYSREQUEST']._serialized_end=1694
+  _globals['_REGISTERKEYSRESPONSE']._serialized_start=1697
+  _globals['_REGISTERKEYSRESPONSE']._serialized_end=1893
+  _globals['_KEYSETREQUEST']._serialized_start=1895
+  _globals['_KEYSETREQUEST']._serialized_end=1985
+  _globals['_GETCOLUMNS']._serialized_start=1988
+  _globals['_GETCOLUMNS']._serialized_end=2474
+  _globals['_GETCOLUMNS_TEXTENTRY']._serialized_start=2347
+  _globals['_GETCOLUMNS_TEXTENTRY']._serialized_end=2390
+  _globals['_GETCOLUMNS_ERRORMSGSENTRY']._serialized_start=2392
+  _globals['_GETCOLUMNS_ERRORMSGSENTRY']._serialized_end=2440
+  _globals['_SETREQUEST']._serialized_start=2476
+  _globals['_SETREQUEST']._serialized_end=2562
+  _globals['_SETRESPONSE']._serialized_start=2565
+  _globals['_SETRESPONSE']._serialized_end=2737
+  _globals['_BASICQUERYREQUEST']._serialized_start=2739
+  _globals['_BASICQUERYREQUEST']._serialized_end=2818
+  _globals['_BASICQUERYRESPONSE']._serialized_start=2821
+  _globals['_BASICQUERYRESPONSE']._serialized_end=3029
+  _globals['_DEVICEQUERYREQUEST']._serialized_start=3032
+  _globals['_DEVICEQUERYREQUEST']._serialized_end=3196
+  _globals['_POINTQUERYREQUEST']._serialized_start=3199
+  _globals['_POINTQUERYREQUEST']._serialized_end=3580
+  _globals['_QUERYRESPONSE']._serialized_start=3583
+  _globals['_QUERYRESPONSE']._serialized_end=3814
+  _globals['_TRIPLE']._serialized_start=3816
+  _globals['_TRIPLE']._serialized_end=3928
+  _globals['_MAKEDEVICEREQUEST']._serialized_start=3931
+  _globals['_MAKEDEVICEREQUEST']._serialized_end=4068
+  _globals['_MAKEPOINTREQUEST']._serialized_start=4071
+  _globals['_MAKEPOINTREQUEST']._serialized_end=4219
+  _globals['_MAKEDRIVERREQUEST']._serialized_start=4221
+  _globals['_MAKEDRIVERREQUEST']._serialized_end=4316
+  _globals['_MAKERESPONSE']._serialized_start=4318
+  _globals['_MAKERESPONSE']._serialized_end=4381
+  _globals['_DELETEREQUEST']._serialized_start=4384
+  _globals['_DELETEREQUEST']._serialized_end=4519
+  _globals['_DELETERESPONSE']._serialized_start=4521
+  _globals['_DELETERESPONSE']._serialized_end=4551
+  _globals['_HISTORYREQUEST']._serialized_start=4553
+  _globals['_HISTORYREQUEST']._serialized_end=4641
+  _globals['_HISROW']._serialized_start=4643
+  _globals['_HISROW']._serialized_end=4697
+  _globals['_HISTORYRESPONSE']._serialized_start=4699
+  _globals['_HISTORYRESPONSE']._serialized_end=4806
+  _globals['_REFRESHRATESREQUEST']._serialized_start=4808
+  _globals['_REFRESHRATESREQUEST']._serialized_end=4829
+  _globals['_REFRESHRATESRESPONSE']._serialized_start=4831
+  _globals['_REFRESHRATESRESPONSE']._serialized_end=4905
+  _globals['_SETFORECASTREQUEST']._serialized_start=4907
+  _globals['_SETFORECASTREQUEST']._serialized_end=4994
+  _globals['_SETFORECASTRESPONSE']._serialized_start=4996
+  _globals['_SETFORECASTRESPONSE']._serialized_end=5058
+  _globals['_GETFORECASTREQUEST']._serialized_start=5061
+  _globals['_GETFORECASTREQUEST']._serialized_end=5234
+  _globals['_GETFORECASTRESPONSE']._serialized_start=5236
+  _globals['_GETFORECASTRESPONSE']._serialized_end=5325
+  _globals['_FORECASTENTRY']._serialized_start=5328
+  _globals['_FORECASTENTRY']._serialized_end=5653
+  _globals['_FORECASTVALUE']._serialized_start=5656
+  _globals['_FORECASTVALUE']._serialized_end=5822
+  _globals['_RUNREQUEST']._serialized_start=5825
+  _globals['_RUNREQUEST']._serialized_end=6153
+  _globals['_RUNREQUEST_KWARGSENTRY']._serialized_start=6035
+  _globals['_RUNREQUEST_KWARGSENTRY']._serialized_end=6080
+  _globals['_RUNREQUEST_ENVVARSENTRY']._serialized_start=6082
+  _globals['_RUNREQUEST_ENVVARSENTRY']._serialized_end=6128
+  _globals['_RUNRESPONSE']._serialized_start=6156
+  _globals['_RUNRESPONSE']._serialized_end=6341
+  _globals['_CRONREQUEST']._serialized_start=6343
+  _globals['_CRONREQUEST']._serialized_end=6454
+  _globals['_CRONRESPONSE']._serialized_start=6456
+  _globals['_CRONRESPONSE']._serialized_end=6525
+  _globals['_REGISTERHANDLERREQUEST']._serialized_start=6527
+  _globals['_REGISTERHANDLERREQUEST']._serialized_end=6630
+  _globals['_REGISTERHANDLERRESPONSE']._serialized_start=6632
+  _globals['_REGISTERHANDLERRESPONSE']._serialized_end=6698
+  _globals['_EVENTHANDLERSREQUEST']._serialized_start=6700
+  _globals['_EVENTHANDLERSREQUEST']._serialized_end=6751
+  _globals['_EVENTHANDLERSRESPONSE']._serialized_start=6753
+  _globals['_EVENTHANDLERSRESPONSE']._serialized_end=6805
+  _globals['_UNREGISTERHANDLERREQUEST']._serialized_start=6807
+  _globals['_UNREGISTERHANDLERREQUEST']._serialized_end=6912
+  _globals['_UNREGISTERHANDLERRESPONSE']._serialized_start=6914
+  _globals['_UNREGISTERHANDLERRESPONSE']._serialized_end=6982
+  _globals['_RUNNINGJOBSREQUEST']._serialized_start=6984
+  _globals['_RUNNINGJOBSREQUEST']._serialized_end=7047
+  _globals['_RUNNINGJOBSRESPONSE']._serialized_start=7049
+  _globals['_RUNNINGJOBSRESPONSE']._serialized_end=7127
+  _globals['_JOBDATA']._serialized_start=7130
+  _globals['_JOBDATA']._serialized_end=7373
+  _globals['_STOPREQUEST']._serialized_start=7375
+  _globals['_STOPREQUEST']._serialized_end=7444
+  _globals['_STOPRESPONSE']._serialized_start=7446
+  _globals['_STOPRESPONSE']._serialized_end=7489
+  _globals['_CRONTABLERESPONSE']._serialized_start=7491
+  _globals['_CRONTABLERESPONSE']._serialized_end=7567
+  _globals['_UNREGISTERCRONREQUEST']._serialized_start=7569
+  _globals['_UNREGISTERCRONREQUEST']._serialized_end=7635
+  _globals['_UNREGISTERCRONRESPONSE']._serialized_start=7637
+  _globals['_UNREGISTERCRONRESPONSE']._serialized_end=7702
+  _globals['_LIBRARYREQUEST']._serialized_start=7704
+  _globals['_LIBRARYREQUEST']._serialized_end=7749
+  _globals['_LIBRARYRESPONSE']._serialized_start=7751
+  _globals['_LIBRARYRESPONSE']._serialized_end=7831
+  _globals['_APPDESCIPTION']._serialized_start=7833
+  _globals['_APPDESCIPTION']._serialized_end=7899
+  _globals['_EVENT']._serialized_start=7902
+  _globals['_EVENT']._serialized_end=8169
+  _globals['_EVENT_METADATAENTRY']._serialized_start=8122
+  _globals['_EVENT_METADATAENTRY']._serialized_end=8169
+  _globals['_PUBLISHREQUEST']._serialized_start=8172
+  _globals['_PUBLISHREQUEST']._serialized_end=8389
+  _globals['_PUBLISHREQUEST_METADATAENTRY']._serialized_start=8122
+  _globals['_PUBLISHREQUEST_METADATAENTRY']._serialized_end=8169
+  _globals['_PUBLISHRESPONSE']._serialized_start=8391
+  _globals['_PUBLISHRESPONSE']._serialized_end=8491
+  _globals['_SUBSCRIBEREQUEST']._serialized_start=8493
+  _globals['_SUBSCRIBEREQUEST']._serialized_end=8613
+  _globals['_FILTER']._serialized_start=8615
+  _globals['_FILTER']._serialized_end=8655
+  _globals['_REPLAYREQUEST']._serialized_start=8658
+  _globals['_REPLAYREQUEST']._serialized_end=8877
+  _globals['_DEVICECONTROL']._serialized_start=10351
+  _globals['_DEVICECONTROL']._serialized_end=10844
+  _globals['_SYSMOD']._serialized_start=10847
+  _globals['_SYSMOD']._serialized_end=11410
+  _globals['_HEALTHCHECK']._serialized_start=11412
+  _globals['_HEALTHCHECK']._serialized_end=11457
+  _globals['_HISTORY']._serialized_start=11460
+  _globals['_HISTORY']._serialized_end=11699
+  _globals['_FORECAST']._serialized_start=11701
+  _globals['_FORECAST']._serialized_end=11827
+  _globals['_SCHEDULER']._serialized_start=11830
+  _globals['_SCHEDULER']._serialized_end=12558
+  _globals['_EVENTBUS']._serialized_start=12561
+  _globals['_EVENTBUS']._serialized_end=12719
 # @@protoc_insertion_point(module_scope)
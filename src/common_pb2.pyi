@@ -18,6 +18,8 @@ class ServiceError(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     SERVICE_ERROR_NO_RESPONSE: _ClassVar[ServiceError]
     SERVICE_ERROR_TIMEOUT: _ClassVar[ServiceError]
     SERVICE_ERROR_ACCESS_DENIED: _ClassVar[ServiceError]
+    SERVICE_ERROR_UNKNOWN_HANDLE: _ClassVar[ServiceError]
+    SERVICE_ERROR_TOO_MANY_KEYS: _ClassVar[ServiceError]
 
 class GetError(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     __slots__ = ()
@@ -70,6 +72,7 @@ class Dtype(int, metaclass=_enum_type_wrapper.EnumTypeWrapper):
     BOOL: _ClassVar[Dtype]
     STRING: _ClassVar[Dtype]
     BYTES: _ClassVar[Dtype]
+    JSON: _ClassVar[Dtype]
     POINT: _ClassVar[Dtype]
     POINT_LIST: _ClassVar[Dtype]
     DEVICE: _ClassVar[Dtype]
@@ -96,6 +99,8 @@ SERVICE_ERROR_UNSPECIFIED: ServiceError
 SERVICE_ERROR_NO_RESPONSE: ServiceError
 SERVICE_ERROR_TIMEOUT: ServiceError
 SERVICE_ERROR_ACCESS_DENIED: ServiceError
+SERVICE_ERROR_UNKNOWN_HANDLE: ServiceError
+SERVICE_ERROR_TOO_MANY_KEYS: ServiceError
 GET_ERROR_NONE: GetError
 GET_ERROR_UNSPECIFIED: GetError
 GET_ERROR_KEY_DOES_NOT_EXIST: GetError
@@ -136,6 +141,7 @@ SFIXED64: Dtype
 BOOL: Dtype
 STRING: Dtype
 BYTES: Dtype
+JSON: Dtype
 POINT: Dtype
 POINT_LIST: Dtype
 DEVICE: Dtype
@@ -207,24 +213,174 @@ class SetPair(_message.Message):
     def __init__(self, Key: _Optional[str] = ..., Value: _Optional[str] = ..., Dtype: _Optional[_Union[Dtype, str]] = ..., Ok: bool = ..., Error: _Optional[_Union[SetError, str]] = ..., ErrorMsg: _Optional[str] = ...) -> None: ...
 
 class GetRequest(_message.Message):
-    __slots__ = ("Header", "Keys")
+    __slots__ = ("Header", "Keys", "Since")
     HEADER_FIELD_NUMBER: _ClassVar[int]
     KEYS_FIELD_NUMBER: _ClassVar[int]
+    SINCE_FIELD_NUMBER: _ClassVar[int]
     Header: Header
     Keys: _containers.RepeatedScalarFieldContainer[str]
-    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Keys: _Optional[_Iterable[str]] = ...) -> None: ...
+    Since: str
+    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Keys: _Optional[_Iterable[str]] = ..., Since: _Optional[str] = ...) -> None: ...
 
 class GetResponse(_message.Message):
-    __slots__ = ("Header", "Pairs", "Error", "ErrorMsg")
+    __slots__ = ("Header", "Pairs", "Error", "ErrorMsg", "Version", "Unchanged")
     HEADER_FIELD_NUMBER: _ClassVar[int]
     PAIRS_FIELD_NUMBER: _ClassVar[int]
     ERROR_FIELD_NUMBER: _ClassVar[int]
     ERRORMSG_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    UNCHANGED_FIELD_NUMBER: _ClassVar[int]
     Header: Header
     Pairs: _containers.RepeatedCompositeFieldContainer[GetPair]
     Error: ServiceError
     ErrorMsg: str
-    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Pairs: _Optional[_Iterable[_Union[GetPair, _Mapping]]] = ..., Error: _Optional[_Union[ServiceError, str]] = ..., ErrorMsg: _Optional[str] = ...) -> None: ...
+    Version: str
+    Unchanged: int
+    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Pairs: _Optional[_Iterable[_Union[GetPair, _Mapping]]] = ..., Error: _Optional[_Union[ServiceError, str]] = ..., ErrorMsg: _Optional[str] = ..., Version: _Optional[str] = ..., Unchanged: _Optional[int] = ...) -> None: ...
+
+class SubscribeKeysRequest(_message.Message):
+    __slots__ = ("Header", "Keys", "Deadband", "MinInterval")
+    HEADER_FIELD_NUMBER: _ClassVar[int]
+    KEYS_FIELD_NUMBER: _ClassVar[int]
+    DEADBAND_FIELD_NUMBER: _ClassVar[int]
+    MININTERVAL_FIELD_NUMBER: _ClassVar[int]
+    Header: Header
+    Keys: _containers.RepeatedScalarFieldContainer[str]
+    Deadband: float
+    MinInterval: float
+    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Keys: _Optional[_Iterable[str]] = ..., Deadband: _Optional[float] = ..., MinInterval: _Optional[float] = ...) -> None: ...
+
+class DiscoverRequest(_message.Message):
+    __slots__ = ("Header", "Low", "High")
+    HEADER_FIELD_NUMBER: _ClassVar[int]
+    LOW_FIELD_NUMBER: _ClassVar[int]
+    HIGH_FIELD_NUMBER: _ClassVar[int]
+    Header: Header
+    Low: int
+    High: int
+    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Low: _Optional[int] = ..., High: _Optional[int] = ...) -> None: ...
+
+class DiscoveredDevice(_message.Message):
+    __slots__ = ("Key", "Instance", "Address", "MaxApdu", "Segmented", "VendorId")
+    KEY_FIELD_NUMBER: _ClassVar[int]
+    INSTANCE_FIELD_NUMBER: _ClassVar[int]
+    ADDRESS_FIELD_NUMBER: _ClassVar[int]
+    MAXAPDU_FIELD_NUMBER: _ClassVar[int]
+    SEGMENTED_FIELD_NUMBER: _ClassVar[int]
+    VENDORID_FIELD_NUMBER: _ClassVar[int]
+    Key: str
+    Instance: int
+    Address: str
+    MaxApdu: int
+    Segmented: bool
+    VendorId: int
+    def __init__(self, Key: _Optional[str] = ..., Instance: _Optional[int] = ..., Address: _Optional[str] = ..., MaxApdu: _Optional[int] = ..., Segmented: bool = ..., VendorId: _Optional[int] = ...) -> None: ...
+
+class CatalogRequest(_message.Message):
+    __slots__ = ("Header", "Device", "Resync")
+    HEADER_FIELD_NUMBER: _ClassVar[int]
+    DEVICE_FIELD_NUMBER: _ClassVar[int]
+    RESYNC_FIELD_NUMBER: _ClassVar[int]
+    Header: Header
+    Device: str
+    Resync: bool
+    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Device: _Optional[str] = ..., Resync: bool = ...) -> None: ...
+
+class CatalogEntry(_message.Message):
+    __slots__ = ("Key", "ObjectName", "Description", "Units", "Error", "ErrorMsg", "Removed")
+    KEY_FIELD_NUMBER: _ClassVar[int]
+    OBJECTNAME_FIELD_NUMBER: _ClassVar[int]
+    DESCRIPTION_FIELD_NUMBER: _ClassVar[int]
+    UNITS_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    ERRORMSG_FIELD_NUMBER: _ClassVar[int]
+    REMOVED_FIELD_NUMBER: _ClassVar[int]
+    Key: str
+    ObjectName: str
+    Description: str
+    Units: str
+    Error: GetError
+    ErrorMsg: str
+    Removed: bool
+    def __init__(self, Key: _Optional[str] = ..., ObjectName: _Optional[str] = ..., Description: _Optional[str] = ..., Units: _Optional[str] = ..., Error: _Optional[_Union[GetError, str]] = ..., ErrorMsg: _Optional[str] = ..., Removed: bool = ...) -> None: ...
+
+class RegisterKeysRequest(_message.Message):
+    __slots__ = ("Header", "Keys", "Ttl")
+    HEADER_FIELD_NUMBER: _ClassVar[int]
+    KEYS_FIELD_NUMBER: _ClassVar[int]
+    TTL_FIELD_NUMBER: _ClassVar[int]
+    Header: Header
+    Keys: _containers.RepeatedScalarFieldContainer[str]
+    Ttl: float
+    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Keys: _Optional[_Iterable[str]] = ..., Ttl: _Optional[float] = ...) -> None: ...
+
+class RegisterKeysResponse(_message.Message):
+    __slots__ = ("Header", "Handle", "Ttl", "Count", "Error", "ErrorMsg")
+    HEADER_FIELD_NUMBER: _ClassVar[int]
+    HANDLE_FIELD_NUMBER: _ClassVar[int]
+    TTL_FIELD_NUMBER: _ClassVar[int]
+    COUNT_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    ERRORMSG_FIELD_NUMBER: _ClassVar[int]
+    Header: Header
+    Handle: str
+    Ttl: float
+    Count: int
+    Error: ServiceError
+    ErrorMsg: str
+    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Handle: _Optional[str] = ..., Ttl: _Optional[float] = ..., Count: _Optional[int] = ..., Error: _Optional[_Union[ServiceError, str]] = ..., ErrorMsg: _Optional[str] = ...) -> None: ...
+
+class KeySetRequest(_message.Message):
+    __slots__ = ("Header", "Handle", "Since")
+    HEADER_FIELD_NUMBER: _ClassVar[int]
+    HANDLE_FIELD_NUMBER: _ClassVar[int]
+    SINCE_FIELD_NUMBER: _ClassVar[int]
+    Header: Header
+    Handle: str
+    Since: str
+    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Handle: _Optional[str] = ..., Since: _Optional[str] = ...) -> None: ...
+
+class GetColumns(_message.Message):
+    __slots__ = ("Header", "Indexes", "Values", "Errors", "Text", "ErrorMsgs", "Time", "Times", "Error", "ErrorMsg", "Version", "Unchanged")
+    class TextEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: int
+        value: str
+        def __init__(self, key: _Optional[int] = ..., value: _Optional[str] = ...) -> None: ...
+    class ErrorMsgsEntry(_message.Message):
+        __slots__ = ("key", "value")
+        KEY_FIELD_NUMBER: _ClassVar[int]
+        VALUE_FIELD_NUMBER: _ClassVar[int]
+        key: int
+        value: str
+        def __init__(self, key: _Optional[int] = ..., value: _Optional[str] = ...) -> None: ...
+    HEADER_FIELD_NUMBER: _ClassVar[int]
+    INDEXES_FIELD_NUMBER: _ClassVar[int]
+    VALUES_FIELD_NUMBER: _ClassVar[int]
+    ERRORS_FIELD_NUMBER: _ClassVar[int]
+    TEXT_FIELD_NUMBER: _ClassVar[int]
+    ERRORMSGS_FIELD_NUMBER: _ClassVar[int]
+    TIME_FIELD_NUMBER: _ClassVar[int]
+    TIMES_FIELD_NUMBER: _ClassVar[int]
+    ERROR_FIELD_NUMBER: _ClassVar[int]
+    ERRORMSG_FIELD_NUMBER: _ClassVar[int]
+    VERSION_FIELD_NUMBER: _ClassVar[int]
+    UNCHANGED_FIELD_NUMBER: _ClassVar[int]
+    Header: Header
+    Indexes: _containers.RepeatedScalarFieldContainer[int]
+    Values: _containers.RepeatedScalarFieldContainer[float]
+    Errors: _containers.RepeatedScalarFieldContainer[GetError]
+    Text: _containers.ScalarMap[int, str]
+    ErrorMsgs: _containers.ScalarMap[int, str]
+    Time: _timestamp_pb2.Timestamp
+    Times: _containers.RepeatedScalarFieldContainer[int]
+    Error: ServiceError
+    ErrorMsg: str
+    Version: str
+    Unchanged: int
+    def __init__(self, Header: _Optional[_Union[Header, _Mapping]] = ..., Indexes: _Optional[_Iterable[int]] = ..., Values: _Optional[_Iterable[float]] = ..., Errors: _Optional[_Iterable[_Union[GetError, str]]] = ..., Text: _Optional[_Mapping[int, str]] = ..., ErrorMsgs: _Optional[_Mapping[int, str]] = ..., Time: _Optional[_Union[datetime.datetime, _timestamp_pb2.Timestamp, _Mapping]] = ..., Times: _Optional[_Iterable[int]] = ..., Error: _Optional[_Union[ServiceError, str]] = ..., ErrorMsg: _Optional[str] = ..., Version: _Optional[str] = ..., Unchanged: _Optional[int] = ...) -> None: ...
 
 class SetRequest(_message.Message):
     __slots__ = ("Header", "Pairs")
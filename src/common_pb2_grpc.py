@@ -46,6 +46,41 @@ class DeviceControlStub(object):
                 request_serializer=common__pb2.SetRequest.SerializeToString,
                 response_deserializer=common__pb2.SetResponse.FromString,
                 _registered_method=True)
+        self.Subscribe = channel.unary_stream(
+                '/bos.DeviceControl/Subscribe',
+                request_serializer=common__pb2.SubscribeKeysRequest.SerializeToString,
+                response_deserializer=common__pb2.GetPair.FromString,
+                _registered_method=True)
+        self.Discover = channel.unary_stream(
+                '/bos.DeviceControl/Discover',
+                request_serializer=common__pb2.DiscoverRequest.SerializeToString,
+                response_deserializer=common__pb2.DiscoveredDevice.FromString,
+                _registered_method=True)
+        self.Catalog = channel.unary_stream(
+                '/bos.DeviceControl/Catalog',
+                request_serializer=common__pb2.CatalogRequest.SerializeToString,
+                response_deserializer=common__pb2.CatalogEntry.FromString,
+                _registered_method=True)
+        self.RegisterKeys = channel.unary_unary(
+                '/bos.DeviceControl/RegisterKeys',
+                request_serializer=common__pb2.RegisterKeysRequest.SerializeToString,
+                response_deserializer=common__pb2.RegisterKeysResponse.FromString,
+                _registered_method=True)
+        self.GetKeySet = channel.unary_unary(
+                '/bos.DeviceControl/GetKeySet',
+                request_serializer=common__pb2.KeySetRequest.SerializeToString,
+                response_deserializer=common__pb2.GetResponse.FromString,
+                _registered_method=True)
+        self.GetKeySetColumns = channel.unary_unary(
+                '/bos.DeviceControl/GetKeySetColumns',
+                request_serializer=common__pb2.KeySetRequest.SerializeToString,
+                response_deserializer=common__pb2.GetColumns.FromString,
+                _registered_method=True)
+        self.ReleaseKeySet = channel.unary_unary(
+                '/bos.DeviceControl/ReleaseKeySet',
+                request_serializer=common__pb2.KeySetRequest.SerializeToString,
+                response_deserializer=common__pb2.Empty.FromString,
+                _registered_method=True)
 
 
 class DeviceControlServicer(object):
@@ -67,6 +102,52 @@ class DeviceControlServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def Subscribe(self, request, context):
+        """stream a driver's values as they change
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Discover(self, request, context):
+        """stream the devices found by a discovery sweep
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def Catalog(self, request, context):
+        """stream the objects of a device, to build its points from
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def RegisterKeys(self, request, context):
+        """register keys to get by handle, get them, and drop the handle
+        """
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetKeySet(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def GetKeySetColumns(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ReleaseKeySet(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_DeviceControlServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -80,6 +161,41 @@ def add_DeviceControlServicer_to_server(servicer, server):
                     request_deserializer=common__pb2.SetRequest.FromString,
                     response_serializer=common__pb2.SetResponse.SerializeToString,
             ),
+            'Subscribe': grpc.unary_stream_rpc_method_handler(
+                    servicer.Subscribe,
+                    request_deserializer=common__pb2.SubscribeKeysRequest.FromString,
+                    response_serializer=common__pb2.GetPair.SerializeToString,
+            ),
+            'Discover': grpc.unary_stream_rpc_method_handler(
+                    servicer.Discover,
+                    request_deserializer=common__pb2.DiscoverRequest.FromString,
+                    response_serializer=common__pb2.DiscoveredDevice.SerializeToString,
+            ),
+            'Catalog': grpc.unary_stream_rpc_method_handler(
+                    servicer.Catalog,
+                    request_deserializer=common__pb2.CatalogRequest.FromString,
+                    response_serializer=common__pb2.CatalogEntry.SerializeToString,
+            ),
+            'RegisterKeys': grpc.unary_unary_rpc_method_handler(
+                    servicer.RegisterKeys,
+                    request_deserializer=common__pb2.RegisterKeysRequest.FromString,
+                    response_serializer=common__pb2.RegisterKeysResponse.SerializeToString,
+            ),
+            'GetKeySet': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetKeySet,
+                    request_deserializer=common__pb2.KeySetRequest.FromString,
+                    response_serializer=common__pb2.GetResponse.SerializeToString,
+            ),
+            'GetKeySetColumns': grpc.unary_unary_rpc_method_handler(
+                    servicer.GetKeySetColumns,
+                    request_deserializer=common__pb2.KeySetRequest.FromString,
+                    response_serializer=common__pb2.GetColumns.SerializeToString,
+            ),
+            'ReleaseKeySet': grpc.unary_unary_rpc_method_handler(
+                    servicer.ReleaseKeySet,
+                    request_deserializer=common__pb2.KeySetRequest.FromString,
+                    response_serializer=common__pb2.Empty.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'bos.DeviceControl', rpc_method_handlers)
@@ -147,6 +263,195 @@ class DeviceControl(object):
             metadata,
             _registered_method=True)
 
+    @staticmethod
+    def Subscribe(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/bos.DeviceControl/Subscribe',
+            common__pb2.SubscribeKeysRequest.SerializeToString,
+            common__pb2.GetPair.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Discover(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/bos.DeviceControl/Discover',
+            common__pb2.DiscoverRequest.SerializeToString,
+            common__pb2.DiscoveredDevice.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def Catalog(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/bos.DeviceControl/Catalog',
+            common__pb2.CatalogRequest.SerializeToString,
+            common__pb2.CatalogEntry.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def RegisterKeys(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bos.DeviceControl/RegisterKeys',
+            common__pb2.RegisterKeysRequest.SerializeToString,
+            common__pb2.RegisterKeysResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetKeySet(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bos.DeviceControl/GetKeySet',
+            common__pb2.KeySetRequest.SerializeToString,
+            common__pb2.GetResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def GetKeySetColumns(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bos.DeviceControl/GetKeySetColumns',
+            common__pb2.KeySetRequest.SerializeToString,
+            common__pb2.GetColumns.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ReleaseKeySet(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/bos.DeviceControl/ReleaseKeySet',
+            common__pb2.KeySetRequest.SerializeToString,
+            common__pb2.Empty.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
 
 class SysmodStub(object):
     """the PointId (pid) service takes classes, names, or regexes
@@ -0,0 +1,204 @@
+import asyncio
+import time
+from typing import Callable
+
+from bacpypes3.debugging import ModuleLogger
+from bacpypes3.basetypes import Segmentation
+
+# some debugging
+_debug = 0
+_log = ModuleLogger(globals())
+
+DEVICE_TTL = 3600.0     # seconds before a device's address is confirmed with a Who-Is
+WHO_IS_TIMEOUT = 3.0    # seconds to wait for the I-Am answering a targeted Who-Is
+MISS_HOLDOFF = 30.0     # seconds a device that did not answer is not asked for again
+
+class DeviceNotFound(LookupError):
+    """No I-Am has told us where a device instance is."""
+    def __init__(self, instance:int):
+        super().__init__(f"device {instance} not found")
+        self.instance = instance
+
+class DeviceEntry:
+    """Where a device is and what it can do, from its last I-Am."""
+    __slots__ = ("instance", "address", "max_apdu", "segmentation", "vendor_id", "updated")
+
+    def __init__(self, instance:int, address:str, max_apdu:int, segmentation:Segmentation, vendor_id:int):
+        self.instance = instance
+        self.address = address              # "{host[:port]}", as in keys
+        self.max_apdu = max_apdu            # max-apdu-length-accepted
+        self.segmentation = segmentation    # segmentation-supported
+        self.vendor_id = vendor_id
+        self.updated = time.monotonic()
+
+    def __repr__(self):
+        return f"DeviceEntry(instance={self.instance}, address='{self.address}', max_apdu={self.max_apdu}, segmentation={self.segmentation}, vendor_id={self.vendor_id})"
+
+    def segmented(self) -> bool:
+        """Whether the device can send segmented responses."""
+        return self.segmentation in (Segmentation.segmentedBoth, Segmentation.segmentedTransmit)
+
+class DeviceTable:
+    """Maps device instances to addresses and capabilities, learned from
+    every I-Am the application sees. A device nobody has heard from is
+    looked for with a Who-Is for its instance alone; one that does not
+    answer is not asked for again for `miss_holdoff` seconds, so keys for
+    a missing device fail at once instead of each waiting out a Who-Is.
+
+    Entries older than `ttl` are still used while a Who-Is confirms them.
+    When a device turns up at a new address (DHCP) the `on_moved` callbacks
+    are called with the instance, old and new address.
+    """
+    def __init__(self, app, ttl:float=DEVICE_TTL, who_is_timeout:float=WHO_IS_TIMEOUT,
+                 miss_holdoff:float=MISS_HOLDOFF):
+        self._app = app
+        self.ttl = ttl
+        self.who_is_timeout = who_is_timeout
+        self.miss_holdoff = miss_holdoff
+
+        self._instances:dict[int, DeviceEntry] = {}
+        self._addresses:dict[str, DeviceEntry] = {}
+        self._resolving:dict[int, asyncio.Task] = {}    # instance -> Who-Is
+        self._misses:dict[int, float] = {}              # instance -> when it didn't answer
+        self._moved:list[Callable[[int, str, str], None]] = []
+        self._last_i_am:dict[int, object] = {}          # instance -> its last I-Am
+
+        self.i_ams = 0
+        self.who_is = 0
+        self.misses = 0
+        self.moves = 0
+
+    def __repr__(self):
+        return f"DeviceTable(devices={len(self._instances)}, ttl={self.ttl})"
+
+    def __len__(self):
+        return len(self._instances)
+
+    def on_moved(self, callback:Callable[[int, str, str], None]):
+        """Call `callback(instance, old_address, new_address)` when a device moves."""
+        self._moved.append(callback)
+
+    def i_am(self, apdu) -> DeviceEntry:
+        """Learn a device from an I-Am request. The app's I-Am hook and the
+        Who-Is waiting for an I-Am both pass it on, it only counts once.
+        """
+        instance = apdu.iAmDeviceIdentifier[1]
+        entry = self._instances.get(instance)
+        if (entry is not None) and (self._last_i_am.get(instance) is apdu):
+            return entry
+        self._last_i_am[instance] = apdu
+        self.i_ams += 1
+        return self.update(
+            instance,
+            str(apdu.pduSource),
+            apdu.maxAPDULengthAccepted,
+            apdu.segmentationSupported,
+            apdu.vendorID,
+        )
+
+    def update(self, instance:int, address:str, max_apdu:int,
+               segmentation:Segmentation=Segmentation.noSegmentation, vendor_id:int=None) -> DeviceEntry:
+        old = self._instances.get(instance)
+        entry = self._instances[instance] = DeviceEntry(instance, address, max_apdu, segmentation, vendor_id)
+        self._misses.pop(instance, None)
+
+        # another device answering from this address has moved (or gone)
+        previous = self._addresses.get(address)
+        if (previous is not None) and (previous.instance != instance):
+            if self._instances.get(previous.instance) is previous:
+                del self._instances[previous.instance]
+        self._addresses[address] = entry
+
+        if (old is not None) and (old.address != address):
+            if self._addresses.get(old.address) is old:
+                del self._addresses[old.address]
+            self.moves += 1
+            _log.info("device %d moved from %s to %s", instance, old.address, address)
+            for callback in self._moved:
+                callback(instance, old.address, address)
+        return entry
+
+    def get(self, instance:int) -> DeviceEntry:
+        """Return what is known about a device, or None. An expired entry is
+        returned while a Who-Is confirms it in the background.
+        """
+        entry = self._instances.get(instance)
+        if (entry is not None) and (time.monotonic() - entry.updated > self.ttl):
+            self.resolving(instance)
+        return entry
+
+    def confirm(self, instance:int):
+        """Look for a known device again, say after it stopped answering."""
+        if instance in self._instances:
+            self.resolving(instance)
+
+    def by_address(self, address:str) -> DeviceEntry:
+        return self._addresses.get(address)
+
+    def forget(self, instance:int):
+        entry = self._instances.pop(instance, None)
+        self._last_i_am.pop(instance, None)
+        if (entry is not None) and (self._addresses.get(entry.address) is entry):
+            del self._addresses[entry.address]
+
+    def resolving(self, instance:int) -> asyncio.Task:
+        """Return the Who-Is looking for a device, starting one unless it is
+        already running or the device recently failed to answer. Returns
+        None if there is nothing to wait for.
+        """
+        task = self._resolving.get(instance)
+        if task is not None:
+            return task
+        missed = self._misses.get(instance)
+        if (missed is not None) and (time.monotonic() - missed < self.miss_holdoff):
+            return None
+        task = self._resolving[instance] = asyncio.create_task(self._who_is(instance))
+        task.add_done_callback(lambda _: self._resolving.pop(instance, None))
+        return task
+
+    async def resolve(self, instance:int) -> DeviceEntry:
+        """Return a device's entry, sending a Who-Is for it if it's unknown.
+        Raises DeviceNotFound if it doesn't answer.
+        """
+        entry = self._instances.get(instance)
+        if entry is None:
+            task = self.resolving(instance)
+            if task is not None:
+                await asyncio.shield(task)
+            entry = self._instances.get(instance)
+        if entry is None:
+            raise DeviceNotFound(instance)
+        return entry
+
+    async def _who_is(self, instance:int):
+        self.who_is += 1
+        try:
+            i_ams = await self._app.who_is(instance, instance, timeout=self.who_is_timeout)
+        except Exception as err:
+            _log.warning("who-is for device %d failed: %r", instance, err)
+            i_ams = []
+        for apdu in i_ams or ():
+            if apdu.iAmDeviceIdentifier[1] == instance:
+                self.i_am(apdu)
+                return
+        if _debug:
+            _log.debug("    - device %d did not answer", instance)
+        self.misses += 1
+        self._misses[instance] = time.monotonic()
+
+    async def close(self):
+        tasks = list(self._resolving.values())
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    def stats(self) -> dict:
+        """Return the device count and discovery counters."""
+        return {
+            "devices": len(self._instances),
+            "resolving": len(self._resolving),
+            "i_ams": self.i_ams,
+            "who_is": self.who_is,
+            "misses": self.misses,
+            "moves": self.moves,
+        }
@@ -0,0 +1,149 @@
+import asyncio
+import time
+from typing import AsyncIterator
+
+from bacpypes3.debugging import ModuleLogger
+
+from src.devices import DeviceEntry
+
+# some debugging
+_debug = 0
+_log = ModuleLogger(globals())
+
+# a sweep's default pacing, see DiscoverySweep
+SWEEP_START_WIDTH = 4096        # instances asked for by the first Who-Is
+SWEEP_MAX_WIDTH = 262144        # instances asked for by one Who-Is at most
+SWEEP_TARGET_I_AMS = 16         # I-Ams one Who-Is should draw
+SWEEP_RESPONSE_WINDOW = 2.0     # seconds to collect the I-Ams of one Who-Is
+SWEEP_MAX_RATE = 2.0            # Who-Is per second at most
+SWEEP_MAX_I_AM_RATE = 50.0      # I-Ams per second at most, on average
+SWEEP_LATENCY_BOUND = 0.5       # seconds of median read latency above which a sweep waits
+SWEEP_PAUSE = 1.0               # seconds between latency checks while waiting
+SWEEP_MAX_PAUSE = 60.0          # seconds a sweep waits at most before going on anyway
+
+class DiscoverySweep:
+    """Finds the devices in a range of instances with a Who-Is per slice of
+    the range instead of one global Who-Is, whose I-Am storm on a large
+    network drops packets and stalls the stack live reads share.
+
+    Slices narrow when a Who-Is draws more than `target_i_ams` I-Ams and
+    widen when it draws few. Who-Is are sent at most `max_rate` a second
+    and spaced out so I-Ams arrive at most `max_i_am_rate` a second. While
+    the client's recent read latency is above `latency_bound` the sweep
+    waits, for `max_pause` seconds at most, then goes on and counts a
+    stall. One sweep runs at a time.
+    """
+    def __init__(self, client:'BACnetClient', start_width:int=SWEEP_START_WIDTH,
+                 max_width:int=SWEEP_MAX_WIDTH, target_i_ams:int=SWEEP_TARGET_I_AMS,
+                 response_window:float=SWEEP_RESPONSE_WINDOW, max_rate:float=SWEEP_MAX_RATE,
+                 max_i_am_rate:float=SWEEP_MAX_I_AM_RATE, latency_bound:float=SWEEP_LATENCY_BOUND,
+                 max_pause:float=SWEEP_MAX_PAUSE):
+        self._client = client
+        self.start_width = start_width
+        self.max_width = max_width
+        self.target_i_ams = target_i_ams
+        self.response_window = response_window
+        self.max_rate = max_rate
+        self.max_i_am_rate = max_i_am_rate
+        self.latency_bound = latency_bound
+        self.max_pause = max_pause
+        self._lock = asyncio.Lock()
+
+        self.width = start_width
+        self.position = None        # next instance of the sweep running, if any
+        self.sweeps = 0
+        self.who_is = 0
+        self.i_ams = 0
+        self.found = 0
+        self.paused = 0.0           # seconds spent waiting for reads to speed up
+        self.waiting = False        # waiting for reads to speed up now
+        self.stalls = 0             # waits that ran out of max_pause
+
+    def __repr__(self):
+        return f"DiscoverySweep(width={self.width}, max_rate={self.max_rate}, latency_bound={self.latency_bound})"
+
+    async def sweep(self, low:int, high:int) -> AsyncIterator[DeviceEntry]:
+        """Look for the devices with instances from low to high, yielding
+        each one as it answers. Every device found lands in the client's
+        device table.
+        """
+        async with self._lock:
+            self.sweeps += 1
+            loop = asyncio.get_running_loop()
+            self.width = self.start_width
+            next_send = loop.time()
+            seen:set[int] = set()
+            position = low
+            try:
+                while position <= high:
+                    self.position = position
+                    await asyncio.sleep(max(0.0, next_send - loop.time()))
+                    await self._wait_for_reads()
+
+                    end = min(position + self.width - 1, high)
+                    sent = loop.time()
+                    i_ams = await self._who_is(position, end)
+                    for apdu in i_ams:
+                        instance = apdu.iAmDeviceIdentifier[1]
+                        entry = self._client.devices.i_am(apdu)
+                        if (position <= instance <= end) and (instance not in seen):
+                            seen.add(instance)
+                            self.found += 1
+                            yield entry
+
+                    # space the next Who-Is out by both rate caps, and size it
+                    # by how crowded this slice was
+                    next_send = sent + max(1.0 / self.max_rate, len(i_ams) / self.max_i_am_rate)
+                    self.width = self._next_width(len(i_ams))
+                    position = end + 1
+            finally:
+                self.position = None
+
+    async def _who_is(self, low:int, high:int) -> list:
+        self.who_is += 1
+        try:
+            i_ams = await self._client._app.who_is(low, high, timeout=self.response_window)
+        except Exception as err:
+            _log.warning("who-is %d-%d failed: %r", low, high, err)
+            return []
+        i_ams = list(i_ams or ())
+        self.i_ams += len(i_ams)
+        if _debug:
+            _log.debug("    - who-is %d-%d: %d i-ams", low, high, len(i_ams))
+        return i_ams
+
+    def _next_width(self, i_ams:int) -> int:
+        if i_ams > self.target_i_ams:
+            return max(1, self.width // 2)
+        if i_ams < self.target_i_ams // 4:
+            return min(self.max_width, self.width * 2)
+        return self.width
+
+    async def _wait_for_reads(self):
+        start = time.monotonic()
+        try:
+            while self._client.read_latency() > self.latency_bound:
+                if time.monotonic() - start >= self.max_pause:
+                    self.stalls += 1
+                    _log.warning("reads still slow after %.0fs, sweeping anyway", self.max_pause)
+                    break
+                self.waiting = True
+                await asyncio.sleep(SWEEP_PAUSE)
+        finally:
+            self.waiting = False
+            self.paused += time.monotonic() - start
+
+    def stats(self) -> dict:
+        """Return sweep progress and counters."""
+        return {
+            "running": self.position is not None,
+            "position": self.position,
+            "width": self.width,
+            "sweeps": self.sweeps,
+            "who_is": self.who_is,
+            "i_ams": self.i_ams,
+            "found": self.found,
+            "paused": self.paused,
+            "stalled": self.waiting,
+            "stalls": self.stalls,
+        }
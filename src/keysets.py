@@ -0,0 +1,182 @@
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable
+
+from bacpypes3.debugging import ModuleLogger
+
+import src.parse
+import src.planner as planner
+
+# some debugging
+_debug = 0
+_log = ModuleLogger(globals())
+
+KEYSET_TTL = 600.0          # seconds a key set is kept after its last use
+KEYSET_MAX_SETS = 1024      # key sets kept, the least recently used go first
+KEYSET_MAX_KEYS = 1000000   # keys kept over all key sets
+
+class KeySetNotFound(LookupError):
+    """A handle that was never registered, has expired or was evicted."""
+    def __init__(self, handle:str):
+        super().__init__(f"key set {handle!r} not found")
+        self.handle = handle
+
+class KeySetTooLarge(ValueError):
+    """A key set with more keys than the registry keeps over all sets."""
+    def __init__(self, count:int, max_keys:int):
+        super().__init__(f"key set of {count} keys is over the limit of {max_keys}")
+        self.count = count
+        self.max_keys = max_keys
+
+class KeySet:
+    """Keys registered once and read by handle. The keys are parsed when
+    they are registered, and the read plan of the last read is kept for the
+    next one to reuse; polls that miss the same points every time (most do)
+    plan once.
+    """
+    __slots__ = ("handle", "keys", "points", "ttl", "used", "reads", "replans",
+                 "_planned", "_caps", "_batches")
+
+    def __init__(self, handle:str, keys:list[str], ttl:float):
+        self.handle = handle
+        self.keys = list(dict.fromkeys(keys))   # in the order they were registered
+        self.points = [src.parse.ParseKey(k) for k in self.keys]
+        self.ttl = ttl                          # seconds of the lease
+        self.used = time.monotonic()
+        self.reads = 0
+        self.replans = 0                        # reads that could not reuse the plan
+
+        self._planned:list[src.parse.BACnetKey] = []    # the points of the kept plan
+        self._caps:dict[str, tuple] = {}                # address -> caps it was planned for
+        self._batches:list[planner.ReadBatch] = []
+
+    def __repr__(self):
+        return f"KeySet(handle='{self.handle}', keys={len(self.keys)}, ttl={self.ttl}, reads={self.reads})"
+
+    def __len__(self):
+        return len(self.keys)
+
+    def expired(self, now:float=None) -> bool:
+        return (now or time.monotonic()) - self.used > self.ttl
+
+    def plan(self, points:list[src.parse.BACnetKey], caps:Callable[[str], planner.DeviceCaps]) -> list[planner.ReadBatch]:
+        """Plan reads of points from this set like `planner.PlanReads`. The
+        kept plan is reused while the routed points and their devices'
+        capabilities are the ones it was made for.
+        """
+        if (len(points) == len(self._planned)) and all(a is b for a, b in zip(points, self._planned)):
+            if all(_caps_key(caps(address)) == kept for address, kept in self._caps.items()):
+                return self._batches
+
+        batches = planner.PlanReads(points, caps)
+        self.replans += 1
+        if points:
+            self._planned = list(points)
+            self._caps = {b.address: _caps_key(caps(b.address)) for b in batches}
+            self._batches = batches
+        return batches
+
+def _caps_key(caps:planner.DeviceCaps) -> tuple:
+    return (caps.max_apdu, caps.segmented, caps.rpm)
+
+class KeySetRegistry:
+    """Key sets by handle. A set's lease is renewed every time it is read
+    and it is dropped `ttl` seconds after its last use. Past `max_sets`
+    sets or `max_keys` keys the least recently used sets are evicted; a set
+    of more than `max_keys` keys on its own is refused. A caller whose
+    handle is gone registers again.
+    """
+    def __init__(self, ttl:float=KEYSET_TTL, max_sets:int=KEYSET_MAX_SETS, max_keys:int=KEYSET_MAX_KEYS):
+        self.ttl = ttl
+        self.max_sets = max_sets
+        self.max_keys = max_keys
+
+        self._sets:OrderedDict[str, KeySet] = OrderedDict()    # least recently used first
+        self._keys = 0
+
+        self.registered = 0
+        self.released = 0
+        self.expirations = 0
+        self.evictions = 0
+        self.misses = 0
+        self.refused = 0
+
+    def __repr__(self):
+        return f"KeySetRegistry(sets={len(self._sets)}/{self.max_sets}, keys={self._keys}/{self.max_keys}, ttl={self.ttl})"
+
+    def __len__(self):
+        return len(self._sets)
+
+    def register(self, keys:list[str], ttl:float=None) -> KeySet:
+        """Register keys under a new handle, leased for `ttl` seconds (at
+        most the registry's ttl). Raises KeySetTooLarge, keeping every
+        set, if there are more distinct keys than `max_keys`.
+        """
+        count = len(set(keys))
+        if count > self.max_keys:
+            self.refused += 1
+            raise KeySetTooLarge(count, self.max_keys)
+        self.expire()
+        ttl = self.ttl if (ttl is None) or (ttl <= 0) else min(ttl, self.ttl)
+        keyset = KeySet(uuid.uuid4().hex, keys, ttl)
+        self._sets[keyset.handle] = keyset
+        self._keys += len(keyset)
+        self.registered += 1
+        while (len(self._sets) > 1) and ((len(self._sets) > self.max_sets) or (self._keys > self.max_keys)):
+            _, evicted = self._sets.popitem(last=False)
+            self._keys -= len(evicted)
+            self.evictions += 1
+            if _debug:
+                _log.debug("    - evicted %r", evicted)
+        return keyset
+
+    def get(self, handle:str) -> KeySet:
+        """Return a key set and renew its lease. Raises KeySetNotFound."""
+        keyset = self._sets.get(handle)
+        now = time.monotonic()
+        if (keyset is not None) and keyset.expired(now):
+            self._drop(keyset)
+            self.expirations += 1
+            keyset = None
+        if keyset is None:
+            self.misses += 1
+            raise KeySetNotFound(handle)
+        keyset.used = now
+        keyset.reads += 1
+        self._sets.move_to_end(handle)
+        return keyset
+
+    def release(self, handle:str) -> bool:
+        """Drop a key set, returning whether there was one."""
+        keyset = self._sets.get(handle)
+        if keyset is None:
+            return False
+        self._drop(keyset)
+        self.released += 1
+        return True
+
+    def expire(self):
+        """Drop the key sets whose leases have run out."""
+        now = time.monotonic()
+        for keyset in [k for k in self._sets.values() if k.expired(now)]:
+            self._drop(keyset)
+            self.expirations += 1
+
+    def _drop(self, keyset:KeySet):
+        del self._sets[keyset.handle]
+        self._keys -= len(keyset)
+
+    def stats(self) -> dict:
+        """Return the sets and keys kept and the registry's counters."""
+        return {
+            "sets": len(self._sets),
+            "keys": self._keys,
+            "registered": self.registered,
+            "released": self.released,
+            "expirations": self.expirations,
+            "evictions": self.evictions,
+            "misses": self.misses,
+            "refused": self.refused,
+            "replans": sum(k.replans for k in self._sets.values()),
+        }
@@ -0,0 +1,113 @@
+import asyncio
+import contextlib
+import time
+
+from bacpypes3.pdu import Address
+
+# a peer can have at most 256 confirmed requests outstanding, one per invoke
+# ID, and bacpypes3 spins looking for a free ID when they are all in use.
+MAX_INVOKE_IDS = 255
+
+class _Gate:
+    """A semaphore for one device or network, dropped once nobody uses it."""
+    __slots__ = ("semaphore", "users", "in_flight")
+
+    def __init__(self, limit:int):
+        self.semaphore = asyncio.Semaphore(limit)
+        self.users = 0      # holding or waiting
+        self.in_flight = 0  # holding
+
+class ConcurrencyLimiter:
+    """Bounds outstanding BACnet requests globally, per BACnet network and per
+    device so a slow or dead device only throttles itself.
+
+    The network limit is for remote networks, reached through a router that
+    may be the bottleneck. The local network, where every BACnet/IP device
+    of a site without routers is, is only bounded by the global limit, so a
+    few dead local devices can't take its slots from the healthy ones.
+
+    Slots are taken device first, then network, then global, so requests
+    queued behind a slow device never hold a network or global slot.
+    """
+    def __init__(self, global_limit:int=16, network_limit:int=8, device_limit:int=4):
+        self.global_limit = global_limit
+        self.network_limit = network_limit
+        self.device_limit = min(device_limit, MAX_INVOKE_IDS)
+
+        self._global = asyncio.Semaphore(global_limit)
+        self._networks:dict[int, _Gate] = {}
+        self._devices:dict[str, _Gate] = {}
+        self._address_networks:dict[str, int] = {}
+
+        # queue-wait statistics
+        self.requests = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
+
+    def __repr__(self):
+        return f"ConcurrencyLimiter(global_limit={self.global_limit}, network_limit={self.network_limit}, device_limit={self.device_limit})"
+
+    def network(self, device_addr:str) -> int:
+        """Return the BACnet network of an address, 0 for the local network."""
+        net = self._address_networks.get(device_addr)
+        if net is None:
+            net = self._address_networks[device_addr] = Address(device_addr).addrNet or 0
+        return net
+
+    def _enter(self, gates:dict, key, limit:int) -> _Gate:
+        gate = gates.get(key)
+        if gate is None:
+            gate = gates[key] = _Gate(limit)
+        gate.users += 1
+        return gate
+
+    def _leave(self, gates:dict, key, gate:_Gate):
+        gate.users -= 1
+        if gate.users == 0:
+            del gates[key]
+
+    @contextlib.asynccontextmanager
+    async def slot(self, device_addr:str):
+        """Hold one request slot for a device for the duration of the block."""
+        net = self.network(device_addr)
+        device = self._enter(self._devices, device_addr, self.device_limit)
+        network = self._enter(self._networks, net, self.network_limit if net else self.global_limit)
+        start = time.monotonic()
+        try:
+            async with device.semaphore, network.semaphore, self._global:
+                wait = time.monotonic() - start
+                self.requests += 1
+                self.wait_time += wait
+                self.max_wait = max(self.max_wait, wait)
+
+                device.in_flight += 1
+                network.in_flight += 1
+                try:
+                    yield
+                finally:
+                    device.in_flight -= 1
+                    network.in_flight -= 1
+        finally:
+            self._leave(self._networks, net, network)
+            self._leave(self._devices, device_addr, device)
+
+    def in_flight(self, device_addr:str) -> int:
+        """Return the number of requests outstanding to a device."""
+        gate = self._devices.get(device_addr)
+        return gate.in_flight if gate else 0
+
+    def stats(self) -> dict:
+        """Return queue-wait statistics and current queue depths."""
+        return {
+            "requests": self.requests,
+            "wait_time": self.wait_time,
+            "mean_wait": self.wait_time / self.requests if self.requests else 0.0,
+            "max_wait": self.max_wait,
+            "devices": {a: (g.in_flight, g.users - g.in_flight) for a, g in self._devices.items()},
+            "networks": {n: (g.in_flight, g.users - g.in_flight) for n, g in self._networks.items()},
+        }
+
+    def reset_stats(self):
+        self.requests = 0
+        self.wait_time = 0.0
+        self.max_wait = 0.0
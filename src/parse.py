@@ -1,4 +1,9 @@
 import re
+import functools
+
+from bacpypes3.pdu import Address
+from bacpypes3.primitivedata import ObjectIdentifier, PropertyIdentifier
+from bacpypes3.basetypes import PropertyReference
 
 # these are the only two needed
 bacnet_re = re.compile(r'^(?P<schema>[a-z]+)://(?P<host>[a-zA-Z0-9.-]+):?(?P<port>[0-9]+)?/(?P<device>[0-9]+)/?(?P<obj_type>[a-zA-Z-_]+)?,?(?P<obj_inst>[0-9]+)?/?(?P<prop>[a-zA-Z0-9-_]+)?/?(?P<index>[0-9]+)?\??(?P<query_params>[^\?]+)?')
@@ -6,6 +11,12 @@ params_re = re.compile(r'[a-zA-Z0-9-_]+=?[0-9\.]+?(?=&|\b)')
 
 addr_re = re.compile(r'(?P<host>[a-zA-Z0-9.-]+):?(?P<port>[0-9]+)?')
 
+PARSE_CACHE_SIZE = 65536    # keys remembered by ParseKey
+
+# the host of keys that name their device by instance alone, for example
+# bacnet://device/1234/analog-value,1/present-value
+INSTANCE_HOST = "device"
+
 class BACnetPtParams(object):
     def __init__(self) -> None:
         self.is_valid = False
@@ -36,7 +47,7 @@ class BACnetPtParams(object):
         elif self.host != "":
             self.address = self.host
 
-        if (self.address != "") and (self.object_type != "") and (self.object_instance != 0) and (self.property != ""):
+        if self.address and self.object_type and self.object_instance and self.property:
             self.object_identifier = self.GetObjectId()
             self.is_valid = True
         else:
@@ -87,6 +98,149 @@ def ParseBacnetPtKey(uri:str) -> BACnetPtParams:
     return params
 
 
+@functools.lru_cache(maxsize=4096)
+def _PropertyReference(property:str, index:int) -> tuple[PropertyIdentifier, PropertyReference]:
+    """the property id and (shared, read-only) reference of a property"""
+    property_id = int(property) if property.isdigit() else PropertyIdentifier(property)
+    reference = PropertyReference(propertyIdentifier=property_id)
+    if index is not None:
+        reference.propertyArrayIndex = index
+    return property_id, reference
+
+
+class BACnetKey(object):
+    """A BACnetKey is an immutable parsed key. Besides the fields of
+    BACnetPtParams it holds the bacpypes3 objects a request needs, so a key
+    that is parsed once (see ParseKey) costs nothing on the next poll.
+
+    Points being written carry their value; WithValue returns a copy.
+
+    A key with the INSTANCE_HOST host is `by_instance`. It is not valid
+    until WithAddress gives it the address its device was found at.
+    """
+    __slots__ = ("uri", "is_valid", "by_instance", "address", "device_instance", "object_identifier",
+                 "property", "index", "value", "priority", "cache_key",
+                 "device_address", "object_id", "property_id", "property_reference")
+
+    def __init__(self, address:str, object_identifier:str, property:str, index:int=None,
+                 device_instance:int=None, uri:str="") -> None:
+        _set = object.__setattr__
+        _set(self, "uri", uri)
+        _set(self, "address", address)               # "{host[:port]}"
+        _set(self, "device_instance", device_instance)   # None if unknown
+        _set(self, "object_identifier", object_identifier)   # e.g, "analog-value,3"
+        _set(self, "property", property)             # present-value
+        _set(self, "index", index)                   # array index or None
+        _set(self, "value", None)
+        _set(self, "priority", None)
+        _set(self, "cache_key", (address, object_identifier, property, index))
+
+        # the same, ready for bacpypes3
+        by_instance = (address == INSTANCE_HOST)
+        try:
+            property_id, property_reference = _PropertyReference(property, index)
+            _set(self, "device_address", None if by_instance else Address(address))
+            _set(self, "object_id", ObjectIdentifier(object_identifier))
+            _set(self, "property_id", property_id)
+            _set(self, "property_reference", property_reference)
+            _set(self, "is_valid", not by_instance)
+            _set(self, "by_instance", by_instance)
+        except (ValueError, TypeError, RuntimeError):
+            for name in ("device_address", "object_id", "property_id", "property_reference"):
+                _set(self, name, None)
+            _set(self, "is_valid", False)
+            _set(self, "by_instance", False)
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"BACnetKey is immutable, can't set {name}")
+
+    def __repr__(self):
+        return f"BACnetKey(address='{self.address}', object_identifier='{self.object_identifier}', property='{self.property}', index={self.index})"
+
+    def WithValue(self, value, priority:int=None) -> 'BACnetKey':
+        """WithValue returns a copy of the key holding a value to write."""
+        key = object.__new__(BACnetKey)
+        for name in BACnetKey.__slots__:
+            object.__setattr__(key, name, getattr(self, name))
+        object.__setattr__(key, "value", value)
+        object.__setattr__(key, "priority", priority)
+        return key
+
+    def WithPoint(self, object_identifier:str, property:str, index:int=None) -> 'BACnetKey':
+        """WithPoint returns the key of another point on the same device,
+        without parsing the device's address again.
+        """
+        _set = object.__setattr__
+        key = object.__new__(BACnetKey)
+        for name in BACnetKey.__slots__:
+            _set(key, name, getattr(self, name))
+        _set(key, "uri", "")
+        _set(key, "object_identifier", object_identifier)
+        _set(key, "property", property)
+        _set(key, "index", index)
+        _set(key, "value", None)
+        _set(key, "priority", None)
+        _set(key, "cache_key", (self.address, object_identifier, property, index))
+        try:
+            property_id, property_reference = _PropertyReference(property, index)
+            _set(key, "object_id", ObjectIdentifier(object_identifier))
+            _set(key, "property_id", property_id)
+            _set(key, "property_reference", property_reference)
+        except (ValueError, TypeError):
+            for name in ("object_id", "property_id", "property_reference"):
+                _set(key, name, None)
+            _set(key, "is_valid", False)
+            _set(key, "by_instance", False)
+        return key
+
+    def WithAddress(self, address:str) -> 'BACnetKey':
+        """WithAddress returns a copy of the key for a device at `address`."""
+        key = BACnetKey(address, self.object_identifier, self.property, self.index,
+                        self.device_instance, self.uri)
+        if self.value is not None:
+            key = key.WithValue(self.value, self.priority)
+        return key
+
+
+_invalid_key = BACnetKey("", "", "")
+
+@functools.lru_cache(maxsize=PARSE_CACHE_SIZE)
+def ParseKey(uri:str) -> BACnetKey:
+    """ParseKey is ParseBacnetPtKey returning a shared, immutable BACnetKey.
+    Results are memoized so repeated keys are only parsed once.
+    """
+    matches = bacnet_re.match(uri)
+    if matches is None:
+        return _invalid_key
+    groups = matches.groupdict()
+    if not (groups['obj_type'] and groups['obj_inst'] and groups['prop']):
+        return BACnetKey("", "", "", uri=uri)
+
+    address = groups['host']
+    if (groups['port'] is not None) and (groups['port'] != "47808"):
+        address += ":" + groups['port']
+    index = int(groups['index']) if groups['index'] is not None else None
+    return BACnetKey(
+        address,
+        groups['obj_type'] + "," + groups['obj_inst'],
+        groups['prop'],
+        index,
+        device_instance=int(groups['device']),
+        uri=uri,
+    )
+
+
+def ParseDeviceKey(uri:str) -> BACnetKey:
+    """ParseDeviceKey takes a device key of the format
+    `bacnet://<host>[:port]/<dev>` and returns the key of the device
+    object's object-list.
+    """
+    matches = bacnet_re.match(uri)
+    if (matches is None) or matches['obj_type']:
+        return _invalid_key
+    return ParseKey(f"{uri.rstrip('/')}/device,{matches['device']}/object-list")
+
+
 def ParseAddress(addr:str) -> dict:
     matches = bacnet_re.match(addr)
     return matches.groupdict()
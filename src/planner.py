@@ -0,0 +1,161 @@
+from collections import OrderedDict
+from typing import Callable
+
+from src.parse import BACnetKey
+
+# APDU sizes are estimates of the encoded request/ack, not exact encodings.
+# they only need to be pessimistic enough that a planned batch never trips
+# the device into segmenting (or aborting) a response it can't segment.
+APDU_HEADER_SIZE = 8        # confirmed request / complex ack header + slack
+OBJECT_OVERHEAD = 7         # context tagged object id + opening/closing tags
+PROPERTY_OVERHEAD = 6       # property id, optional index, opening/closing tags
+DEFAULT_VALUE_SIZE = 8      # a Real, Unsigned or Enumerated with its tag
+
+# properties whose values are typically much larger than a present-value
+VALUE_SIZE_HINTS = {
+    "object-name": 64,
+    "description": 128,
+    "units": 4,
+    "status-flags": 4,
+    "priority-array": 96,
+    "object-list": 512,
+    "property-list": 256,
+}
+
+DEFAULT_MAX_APDU = 480      # the smallest max-APDU common on IP and MS/TP devices
+MAX_APDU = 1476             # the largest APDU a BACnet/IP device can accept
+MAX_SEGMENTS = 4            # response segments to allow when a device segments
+MAX_PROPERTIES = 64         # hard cap on property references per RPM
+
+class DeviceCaps(object):
+    def __init__(self, max_apdu:int=DEFAULT_MAX_APDU, segmented:bool=False, rpm:bool=True, wpm:bool=True) -> None:
+        self.max_apdu = max_apdu    # max-apdu-length-accepted from I-Am
+        self.segmented = segmented  # device can transmit segmented responses
+        self.rpm = rpm              # device accepts ReadPropertyMultiple
+        self.wpm = wpm              # device accepts WritePropertyMultiple
+
+    def __repr__(self):
+        return f"DeviceCaps(max_apdu={self.max_apdu}, segmented={self.segmented}, rpm={self.rpm}, wpm={self.wpm})"
+
+    def Budget(self) -> int:
+        """Budget returns the number of bytes a single response may use."""
+        budget = min(self.max_apdu, MAX_APDU)
+        if self.segmented:
+            budget *= MAX_SEGMENTS
+        return budget
+
+
+def ValueSize(property_id:str, index:int=None) -> int:
+    """ValueSize estimates the encoded size of one property value in an ack.
+    An array element (or an array's length, index 0) is a single value.
+    """
+    if index is not None:
+        return DEFAULT_VALUE_SIZE
+    return VALUE_SIZE_HINTS.get(property_id.split("[")[0], DEFAULT_VALUE_SIZE)
+
+
+class ReadBatch(object):
+    """A ReadBatch is a set of points on one device that fit in one
+    ReadPropertyMultiple request and its acknowledgement.
+    """
+    def __init__(self, address:str, budget:int) -> None:
+        self.address = address
+        self.budget = budget
+        self.size = APDU_HEADER_SIZE
+        self.count = 0
+        self.objects:OrderedDict[str, list[BACnetKey]] = OrderedDict()
+
+    def __repr__(self):
+        return f"ReadBatch(address='{self.address}', count={self.count}, size={self.size}/{self.budget})"
+
+    def __len__(self):
+        return self.count
+
+    def Cost(self, params:BACnetKey) -> int:
+        cost = PROPERTY_OVERHEAD + ValueSize(params.property, params.index)
+        if params.object_identifier not in self.objects:
+            cost += OBJECT_OVERHEAD
+        return cost
+
+    def Fits(self, params:BACnetKey) -> bool:
+        if self.count == 0:
+            return True # a single read always gets a batch of its own
+        if self.count >= MAX_PROPERTIES:
+            return False
+        return self.size + self.Cost(params) <= self.budget
+
+    def Add(self, params:BACnetKey):
+        self.size += self.Cost(params)
+        self.objects.setdefault(params.object_identifier, []).append(params)
+        self.count += 1
+
+    def Items(self) -> list[BACnetKey]:
+        """Items returns the points in the order their results are returned."""
+        return [p for pts in self.objects.values() for p in pts]
+
+    def ParameterList(self) -> list:
+        """ParameterList returns the batch in the form expected by
+        bacpypes3's `Application.read_property_multiple`, a flat list of
+        object identifiers each followed by its property references.
+        """
+        parameter_list = []
+        for pts in self.objects.values():
+            parameter_list.append(pts[0].object_id)
+            parameter_list.append([p.property_reference for p in pts])
+        return parameter_list
+
+
+class WriteBatch(ReadBatch):
+    """A WriteBatch is a set of points on one device whose values (stored in
+    `BACnetKey.value`) fit in one WritePropertyMultiple request. Only the
+    request has to fit, the device answers with a simple ack.
+    """
+    def __repr__(self):
+        return f"WriteBatch(address='{self.address}', count={self.count}, size={self.size}/{self.budget})"
+
+    def Cost(self, params:BACnetKey) -> int:
+        cost = PROPERTY_OVERHEAD + max(DEFAULT_VALUE_SIZE, len(str(params.value)) + 3)
+        if params.object_identifier not in self.objects:
+            cost += OBJECT_OVERHEAD
+        return cost
+
+
+def _Plan(points:list[BACnetKey], new_batch:Callable[[str, DeviceCaps], ReadBatch],
+          caps:Callable[[str], DeviceCaps], multiple:Callable[[DeviceCaps], bool]) -> list[ReadBatch]:
+    by_address:OrderedDict[str, list[BACnetKey]] = OrderedDict()
+    for params in points:
+        if params.is_valid:
+            by_address.setdefault(params.address, []).append(params)
+
+    batches:list[ReadBatch] = []
+    for address, group in by_address.items():
+        device = caps(address)
+        batch = None
+        for params in group:
+            if (batch is None) or (not multiple(device)) or (not batch.Fits(params)):
+                batch = new_batch(address, device)
+                batches.append(batch)
+            batch.Add(params)
+    return batches
+
+
+def PlanReads(points:list[BACnetKey], caps:Callable[[str], DeviceCaps]) -> list[ReadBatch]:
+    """PlanReads groups valid points by device address and packs each group
+    into as few ReadBatches as fit the device's capabilities. Devices that do
+    not support RPM get one batch per point.
+    """
+    return _Plan(points,
+                 lambda address, device: ReadBatch(address, device.Budget()),
+                 caps,
+                 lambda device: device.rpm)
+
+
+def PlanWrites(points:list[BACnetKey], caps:Callable[[str], DeviceCaps]) -> list[WriteBatch]:
+    """PlanWrites is PlanReads for WritePropertyMultiple. Requests are never
+    segmented so each batch must fit in the device's max-APDU. Devices that
+    do not support WPM get one batch per point.
+    """
+    return _Plan(points,
+                 lambda address, device: WriteBatch(address, min(device.max_apdu, MAX_APDU)),
+                 caps,
+                 lambda device: device.wpm)
@@ -0,0 +1,219 @@
+import asyncio
+import json
+import math
+import zlib
+
+from bacpypes3.debugging import ModuleLogger
+
+import src.parse
+from src.cache import CacheKey
+
+# some debugging
+_debug = 0
+_log = ModuleLogger(globals())
+
+MIN_INTERVAL = 1.0      # seconds, the fastest a point can be scanned
+TTL_MARGIN = 0.5        # a scanned value stays fresh this fraction of its interval past it
+
+class ScanGroup:
+    """The points on one device scanned at the same interval. They are read
+    together so the planner can pack them into as few RPMs as possible.
+    """
+    __slots__ = ("address", "interval", "phase", "points", "held", "task",
+                 "scans", "overruns", "missed", "last_duration")
+
+    def __init__(self, address:str, interval:float):
+        self.address = address
+        self.interval = interval
+        # spread devices sharing an interval over it, the same way every time
+        self.phase = (zlib.crc32(address.encode()) % 1000) / 1000 * interval
+        self.points:dict[str, src.parse.BACnetKey] = {}   # key -> point
+        self.held:dict[str, tuple] = {}     # key -> cache key its ttl is set for
+        self.task:asyncio.Task = None
+
+        self.scans = 0
+        self.overruns = 0       # scans that took longer than the interval
+        self.missed = 0         # scans skipped because of overruns
+        self.last_duration = 0.0
+
+    def __repr__(self):
+        return f"ScanGroup(address='{self.address}', interval={self.interval}, phase={self.phase:.3f}, points={len(self.points)})"
+
+class ScanScheduler:
+    """Scans points into a BACnetClient's value cache at per-point
+    intervals. Reads land in the cache (and so reach Subscribe streams)
+    like any other read, and a scanned point's cache TTL is stretched past
+    its interval, so Gets between scans are served from the cache even
+    with caching otherwise off. A point also kept warm by COV keeps the
+    longer of the two TTLs.
+
+    Rates can be kept in a JSON file of {key: interval} so they survive a
+    restart, `refresh()` reloads it.
+    """
+    def __init__(self, client:'BACnetClient', rates_file:str=None):
+        self._client = client
+        self.rates_file = rates_file
+        self._rates:dict[str, float] = {}                   # key -> interval
+        self._groups:dict[tuple[str, float], ScanGroup] = {}
+
+    def __repr__(self):
+        return f"ScanScheduler(points={len(self._rates)}, groups={len(self._groups)})"
+
+    def rate(self, key:str) -> float:
+        """Return a key's scan interval, 0 if it isn't scanned."""
+        return self._rates.get(key, 0.0)
+
+    def rates(self) -> dict[str, float]:
+        return dict(self._rates)
+
+    def set_rate(self, key:str, interval:float):
+        """Scan a key every `interval` seconds, or stop scanning it if 0."""
+        self._set_rate(key, interval)
+        self._save()
+
+    def set_rates(self, rates:dict[str, float]) -> dict[str, ValueError]:
+        """`set_rate` for many keys, saving the rates file once. Returns the
+        error of each key whose rate was not set.
+        """
+        errors:dict[str, ValueError] = {}
+        for key, interval in rates.items():
+            try:
+                self._set_rate(key, interval)
+            except ValueError as err:
+                errors[key] = err
+        if len(errors) < len(rates):
+            self._save()
+        return errors
+
+    def _set_rate(self, key:str, interval:float):
+        params = src.parse.ParseKey(key)
+        if not (params.is_valid or params.by_instance):
+            raise ValueError("invalid bacnet key")
+        if math.isnan(interval) or (interval < 0) or (0 < interval < MIN_INTERVAL):
+            raise ValueError(f"interval must be 0 or at least {MIN_INTERVAL}s")
+
+        self._unschedule(key, params)
+        if interval:
+            self._schedule(key, params, interval)
+
+    def _schedule(self, key:str, params:src.parse.BACnetKey, interval:float):
+        self._rates[key] = interval
+        ident = (params.address, interval)
+        group = self._groups.get(ident)
+        if group is None:
+            group = self._groups[ident] = ScanGroup(*ident)
+            group.task = asyncio.create_task(self._run(group))
+        group.points[key] = params
+        self._hold(group, key, params)
+
+    def _unschedule(self, key:str, params:src.parse.BACnetKey):
+        interval = self._rates.pop(key, None)
+        if interval is None:
+            return
+        ident = (params.address, interval)
+        group = self._groups[ident]
+        del group.points[key]
+        self._release(group, key)
+        if not group.points:
+            group.task.cancel()
+            del self._groups[ident]
+
+    def _hold(self, group:ScanGroup, key:str, params:src.parse.BACnetKey):
+        """Set the TTL of a point's cache entry, at the address its device
+        is routed to now, to outlast the wait for its next scan.
+        """
+        params = self._client._route(params)
+        if not params.is_valid:
+            return
+        cache_key = CacheKey(params)
+        if group.held.get(key) != cache_key:
+            self._release(group, key)
+            self._client.cache.SetTTL(cache_key, group.interval * (1 + TTL_MARGIN), owner=(self, key))
+            group.held[key] = cache_key
+
+    def _release(self, group:ScanGroup, key:str):
+        cache_key = group.held.pop(key, None)
+        if cache_key is not None:
+            self._client.cache.SetTTL(cache_key, owner=(self, key))
+
+    async def refresh(self):
+        """Reload the rates file, if there is one, and restart every scan."""
+        rates = self._load() if self.rates_file else self.rates()
+        await self.close()
+        for key, interval in rates.items():
+            try:
+                params = src.parse.ParseKey(key)
+                if not (params.is_valid or params.by_instance):
+                    raise ValueError("invalid bacnet key")
+                interval = float(interval)
+                if interval < MIN_INTERVAL:
+                    raise ValueError(f"interval {interval}")
+            except (TypeError, ValueError) as err:
+                _log.warning("skipping scan rate for %s: %s", key, err)
+                continue
+            self._schedule(key, params, interval)
+
+    def _load(self) -> dict:
+        try:
+            with open(self.rates_file, 'r') as file:
+                rates = json.load(file)
+        except FileNotFoundError:
+            return {}
+        if not isinstance(rates, dict):
+            raise ValueError(f"{self.rates_file} must map keys to intervals")
+        return rates
+
+    def _save(self):
+        if self.rates_file:
+            with open(self.rates_file, 'w') as file:
+                json.dump(self._rates, file, indent=2)
+
+    async def close(self):
+        """Stop every scan."""
+        tasks = [g.task for g in self._groups.values()]
+        for group in self._groups.values():
+            for key in list(group.held):
+                self._release(group, key)
+        self._groups.clear()
+        self._rates.clear()
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+    async def _run(self, group:ScanGroup):
+        loop = asyncio.get_running_loop()
+        next_scan = loop.time() + group.phase
+        while group.points:
+            await asyncio.sleep(max(0.0, next_scan - loop.time()))
+            start = loop.time()
+            for key, params in group.points.items():
+                self._hold(group, key, params)     # its device may have moved
+            await self._client._read_and_cache(list(group.points.values()))
+            group.scans += 1
+            group.last_duration = loop.time() - start
+
+            next_scan += group.interval
+            late = loop.time() - next_scan
+            if late > 0:
+                # skip the scans there was no time for rather than bursting
+                missed = math.ceil(late / group.interval)
+                group.overruns += 1
+                group.missed += missed
+                next_scan += missed * group.interval
+                _log.warning("scan of %d points on %s took %.3fs, longer than its %ss interval",
+                             len(group.points), group.address, group.last_duration, group.interval)
+
+    def stats(self) -> dict:
+        """Return scan counts and overruns per group."""
+        return {
+            "points": len(self._rates),
+            "groups": {
+                f"{g.address}@{g.interval}": {
+                    "points": len(g.points),
+                    "scans": g.scans,
+                    "overruns": g.overruns,
+                    "missed": g.missed,
+                    "last_duration": g.last_duration,
+                } for g in self._groups.values()
+            },
+        }
@@ -5,7 +5,11 @@ Based on read-property.py
 """
 
 import asyncio
+import contextlib
+import json
+import math
 import re
+import struct
 
 from bacpypes3.debugging import ModuleLogger
 from bacpypes3.argparse import SimpleArgumentParser
@@ -13,9 +17,13 @@ from bacpypes3.app import Application
 from bacpypes3.settings import settings
 
 from bacpypes3.pdu import Address
-from bacpypes3.primitivedata import Atomic, ObjectIdentifier, Real
+from bacpypes3.primitivedata import (
+    Atomic, BitString, Boolean, CharacterString, Date, Double, Enumerated, Integer,
+    Null, ObjectIdentifier, OctetString, Real, Time, Unsigned,
+)
 from bacpypes3.constructeddata import Sequence,AnyAtomic, Array, List
-from bacpypes3.apdu import ErrorRejectAbortNack
+from bacpypes3.apdu import ErrorRejectAbortNack, AbortPDU, AbortReason, WritePropertyMultipleError
+from bacpypes3.basetypes import ErrorCode
 from bacpypes3.json.util import (
     atomic_encode,
     sequence_to_json,
@@ -32,8 +40,12 @@ from argparse import Namespace
 
 import grpc
 import src.parse as parse
+import src.planner as planner
 import src.common_pb2 as common_pb2
 import src.common_pb2_grpc as common_pb2_grpc
+from src.cache import CacheKey
+from src.keysets import KeySetNotFound, KeySetTooLarge
+from src.stream import PointStream
 
 from typing import Callable, Any
 
@@ -63,82 +75,598 @@ MASK:str = "24"
 
 SERVER_PORT:str = "50062"     # e.g., 50062
 
+# seconds of a Get's deadline kept back to build and send the response
+GET_DEADLINE_MARGIN = 0.05
+
+_get_error_codes = {
+    ErrorCode.readAccessDenied: common_pb2.GET_ERROR_ACCESS_DENIED,
+    ErrorCode.unknownObject: common_pb2.GET_ERROR_KEY_DOES_NOT_EXIST,
+    ErrorCode.unknownProperty: common_pb2.GET_ERROR_KEY_DOES_NOT_EXIST,
+    ErrorCode.invalidArrayIndex: common_pb2.GET_ERROR_KEY_DOES_NOT_EXIST,
+}
+
+_set_error_codes = {
+    ErrorCode.writeAccessDenied: common_pb2.SET_ERROR_READ_ONLY,
+    ErrorCode.invalidDataType: common_pb2.SET_ERROR_INVALID_VALUE_TYPE,
+    ErrorCode.valueOutOfRange: common_pb2.SET_ERROR_INVALID_VALUE_TYPE,
+    ErrorCode.unknownObject: common_pb2.SET_ERROR_KEY_DOES_NOT_EXIST,
+    ErrorCode.unknownProperty: common_pb2.SET_ERROR_KEY_DOES_NOT_EXIST,
+    ErrorCode.invalidArrayIndex: common_pb2.SET_ERROR_KEY_DOES_NOT_EXIST,
+}
+
+def _bacnet_error(err) -> tuple:
+    """split a failed request into its BACnet error code (if any) and message"""
+    if isinstance(err, WritePropertyMultipleError):
+        err = err.errorType
+    error_code = getattr(err, "errorCode", None)
+    if error_code is not None:
+        return error_code, f"{err.errorClass}: {error_code}"
+    return None, str(err)
+
+def _is_timeout(err) -> bool:
+    if isinstance(err, TimeoutError):
+        return True
+    return isinstance(err, AbortPDU) and (err.apduAbortRejectReason == AbortReason.noResponse)
+
+def _budget(context) -> float:
+    """seconds left to read in before the caller's deadline, None if it has none"""
+    remaining = context.time_remaining() if context is not None else None
+    if remaining is None:
+        return None
+    return max(0.0, remaining - GET_DEADLINE_MARGIN)
+
+def _get_error(err) -> tuple[int, str]:
+    """map a failed read to a GetError and its message"""
+    if isinstance(err, app.DeviceNotFound):
+        return common_pb2.GET_ERROR_COULD_NOT_RESOLVE_ADDR, str(err)
+    error_code, error_msg = _bacnet_error(err)
+    if error_code is not None:
+        return _get_error_codes.get(error_code, common_pb2.GET_ERROR_UNSPECIFIED), error_msg
+    if _is_timeout(err):
+        return common_pb2.GET_ERROR_TIMEOUT, error_msg
+    return common_pb2.GET_ERROR_UNSPECIFIED, error_msg
+
+def _set_error(err) -> tuple[int, str]:
+    """map a failed write to a SetError and its message"""
+    error_code, error_msg = _bacnet_error(err)
+    if error_code is not None:
+        return _set_error_codes.get(error_code, common_pb2.SET_ERROR_UNSPECIFIED), error_msg
+    if _is_timeout(err):
+        return common_pb2.SET_ERROR_TIMEOUT, error_msg
+    if isinstance(err, ValueError):
+        return common_pb2.SET_ERROR_INVALID_VALUE_TYPE, error_msg
+    return common_pb2.SET_ERROR_UNSPECIFIED, error_msg
+
+def _float32(value:float) -> float:
+    """round a float to the nearest float32"""
+    return struct.unpack("f", struct.pack("f", value))[0]
+
+def _real_text(value) -> str:
+    """the shortest text that reads back as the same Real; a Real decoded
+    from the wire is a float32, whose repr() as a double carries digits
+    that were never sent (72.30000305175781 for 72.3)"""
+    x = float(value)
+    text = repr(x)
+    if len(text) < 10:
+        # already short, and exact
+        return text
+    try:
+        if _float32(x) != x:
+            return text
+        for precision in (6, 7, 8):
+            y = float(f"{x:.{precision}g}")
+            if _float32(y) == x:
+                return repr(y)
+    except OverflowError:
+        pass
+    return text
+
+def _json_text(value) -> str:
+    return json.dumps(value, separators=(",", ":"))
+
+def _encode_any(value) -> tuple[str, int]:
+    return _encode_value(value.get_value())
+
+def _encode_sequence(value) -> tuple[str, int]:
+    return _json_text(sequence_to_json(value)), common_pb2.JSON
+
+def _encode_list(value) -> tuple[str, int]:
+    # an element that isn't atomic or a sequence has no JSON form
+    try:
+        return _json_text(extendedlist_to_json_list(value)), common_pb2.JSON
+    except TypeError:
+        return str(value), common_pb2.STRING
+
+# Value text and Dtype of a read value by its type, the most derived
+# class of a value's type found here wins. Enumerations, BinaryPV
+# included, are sent by name, the way Set takes them.
+_type_encoders:dict[type, Callable[[Any], tuple[str, int]]] = {
+    Null: lambda v: ("", common_pb2.NULL),
+    Boolean: lambda v: ("true" if v else "false", common_pb2.BOOL),
+    Enumerated: lambda v: (str(v), common_pb2.STRING),
+    Unsigned: lambda v: (int.__repr__(v), common_pb2.UINT64),
+    Integer: lambda v: (int.__repr__(v), common_pb2.INT64),
+    Real: lambda v: (_real_text(v), common_pb2.FLOAT),
+    Double: lambda v: (float.__repr__(v), common_pb2.DOUBLE),
+    CharacterString: lambda v: (str.__str__(v), common_pb2.STRING),
+    OctetString: lambda v: (v.hex(), common_pb2.BYTES),
+    BitString: lambda v: (_json_text(atomic_encode(v)), common_pb2.JSON),
+    Date: lambda v: (atomic_encode(v), common_pb2.STRING),
+    Time: lambda v: (atomic_encode(v), common_pb2.STRING),
+    ObjectIdentifier: lambda v: (atomic_encode(v), common_pb2.STRING),
+    AnyAtomic: _encode_any,
+    Sequence: _encode_sequence,
+    Array: _encode_list,
+    List: _encode_list,
+    bool: lambda v: ("true" if v else "false", common_pb2.BOOL),
+    int: lambda v: (int.__repr__(v), common_pb2.INT64),
+    float: lambda v: (float.__repr__(v), common_pb2.DOUBLE),
+    str: lambda v: (str.__str__(v), common_pb2.STRING),
+    bytes: lambda v: (v.hex(), common_pb2.BYTES),
+}
+
+# encoders resolved for each type seen, so a value costs one dict lookup
+_encoders:dict[type, Callable[[Any], tuple[str, int]]] = {}
+
+def _encoder(value_type:type) -> Callable[[Any], tuple[str, int]]:
+    for cls in value_type.__mro__:
+        encoder = _type_encoders.get(cls)
+        if encoder is not None:
+            break
+    else:
+        encoder = lambda v: (str(v), common_pb2.STRING)
+    _encoders[value_type] = encoder
+    return encoder
+
+def _encode_value(value) -> tuple[str, int]:
+    """the Value text and Dtype of a read value"""
+    encoder = _encoders.get(type(value))
+    if encoder is None:
+        encoder = _encoder(type(value))
+    return encoder(value)
+
+def _get_pair(key:str, value, read_time:float) -> common_pb2.GetPair:
+    """copy a read value, or the error that stopped it, into a GetPair"""
+    if isinstance(value, BaseException):
+        _log.error(f"Error getting key '{key}': {value}")
+        error, error_msg = _get_error(value)
+        return common_pb2.GetPair(Key=key, Error=error, ErrorMsg=error_msg)
+
+    text, dtype = _encode_value(value)
+    return common_pb2.GetPair(
+        Key=key,
+        Value=text,
+        time=dt.datetime.fromtimestamp(read_time, _local_tz),
+        Dtype=dtype
+    )
+
+# a value left out of a delta Get because it hasn't changed
+_unchanged = object()
+
+async def _read_changes(points:list[parse.BACnetKey], context, plan:Callable=planner.PlanReads,
+                        since:str=None) -> tuple[list, list, str, int]:
+    """read points for a Get, returning their values (None for invalid
+    points, _unchanged for values unchanged since the version `since`),
+    read times, the version of the values and how many were unchanged"""
+    # read the keys through the client's value cache, which plans misses
+    # into as few ReadPropertyMultiple requests as each device allows.
+    # reads that cannot finish before the caller's deadline are
+    # abandoned, the keys that did arrive are still returned.
+    bacnet_client = app.BACnetClient.get()
+    cache = bacnet_client.cache
+    since = cache.Since(since) if since else None
+    started = cache.Version()
+    # the reads may be shared with other callers so they aren't this call's
+    # tasks, only its waiting is cancelled with it (and read_points drops
+    # the reads no one else waits on)
+    async with _rpc_cancellation(context):
+        values, times = await bacnet_client.read_points(points, _budget(context), plan)
+
+    # the version is now, unless a value being returned has been replaced
+    # since it was read (or isn't kept); then it is when the read started,
+    # so the next delta has whatever changed during it
+    seqs = bacnet_client.sequences(points, values)
+    version = cache.Version()
+    if any((seq is None) and not ((v is None) or isinstance(v, BaseException)) for v, seq in zip(values, seqs)):
+        version = started
+
+    unchanged = 0
+    if since is not None:
+        for i, seq in enumerate(seqs):
+            if (seq is not None) and (seq <= since):
+                values[i] = _unchanged
+                unchanged += 1
+    return values, times, version, unchanged
+
+def _deadline_error(response, values:list):
+    """mark a response whose reads did not all finish before the deadline"""
+    timed_out = sum(1 for v in values if isinstance(v, app.DeadlineExceeded))
+    if timed_out:
+        response.Error = common_pb2.SERVICE_ERROR_TIMEOUT
+        response.ErrorMsg = f"{timed_out} of {len(values)} keys not read before the deadline"
+
+async def _read_keys(keys:list[str], points:list[parse.BACnetKey], header:common_pb2.Header, context,
+                     plan:Callable=planner.PlanReads, since:str=None) -> common_pb2.GetResponse:
+    """read the points of distinct keys into a GetResponse, in key order,
+    leaving out values unchanged since the version `since`"""
+    values, times, version, unchanged = await _read_changes(points, context, plan, since)
+
+    # copy results to the response format, in the request's key order
+    pairs:list[common_pb2.GetPair] = []
+    for k, v, t in zip(keys, values, times):
+        if (v is not None) and (v is not _unchanged):
+            pairs.append(_get_pair(k, v, t))
+    response = common_pb2.GetResponse(
+        Header=header,
+        Pairs=pairs,
+        Version=version,
+        Unchanged=unchanged,
+    )
+    _deadline_error(response, values)
+    return response
+
+# the largest magnitude a double holds every integer up to, larger integers
+# go in Text rather than lose their low digits
+_max_exact_int = 2**53
+
+
+def _get_columns(points:list[parse.BACnetKey], values:list, times:list) -> common_pb2.GetColumns:
+    """copy the read values of a key set's points, or the errors that stopped
+    them, into GetColumns, leaving out _unchanged values"""
+    # build plain lists and hand each column over at once, appending to a
+    # repeated field one value at a time costs several times as much
+    indexes:list[int] = []
+    numbers:list[float] = []
+    errors:list[int] = []
+    read_times:list[float] = []
+    text:dict[int, str] = {}
+    error_msgs:dict[int, str] = {}
+    for i, (v, t) in enumerate(zip(values, times)):
+        if v is _unchanged:
+            continue
+        n = len(numbers)
+        indexes.append(i)
+        read_times.append(t)
+        if v is None:
+            numbers.append(math.nan)
+            errors.append(common_pb2.GET_ERROR_COULD_NOT_RESOLVE_XREF)
+            error_msgs[n] = "invalid bacnet key"
+        elif isinstance(v, BaseException):
+            numbers.append(math.nan)
+            error, error_msgs[n] = _get_error(v)
+            errors.append(error)
+        elif isinstance(v, float) or (isinstance(v, int) and -_max_exact_int <= v <= _max_exact_int):
+            numbers.append(float(v))
+            errors.append(common_pb2.GET_ERROR_NONE)
+        else:
+            numbers.append(math.nan)
+            errors.append(common_pb2.GET_ERROR_NONE)
+            text[n] = str(v)
+
+    columns = common_pb2.GetColumns(Values=numbers, Errors=errors, Text=text, ErrorMsgs=error_msgs)
+    if len(indexes) != len(points):
+        columns.Indexes.extend(indexes)
+    base = min((t for t in read_times if t is not None), default=None)
+    if base is not None:
+        columns.Time.FromNanoseconds(int(base * 1e9))
+        deltas = [0 if t is None else round((t - base) * 1000) for t in read_times]
+        if any(deltas):
+            columns.Times.extend(deltas)
+    return columns
+
+async def _read_columns(points:list[parse.BACnetKey], header:common_pb2.Header, context,
+                        plan:Callable=planner.PlanReads, since:str=None) -> common_pb2.GetColumns:
+    """read the points of a key set into GetColumns, leaving out values
+    unchanged since the version `since`"""
+    values, times, version, unchanged = await _read_changes(points, context, plan, since)
+    response = _get_columns(points, values, times)
+    response.Header.CopyFrom(header)
+    response.Version = version
+    response.Unchanged = unchanged
+    _deadline_error(response, values)
+    return response
+
+@contextlib.asynccontextmanager
+async def _rpc_cancellation(context):
+    """cancel an RPC's handler as soon as the call ends, so a caller that
+    cancels or disconnects stops waiting on its BACnet requests at once
+    instead of when they time out"""
+    handler = asyncio.current_task()
+    running = True
+    def done(_):
+        if running:
+            handler.cancel()
+    if context is not None:
+        context.add_done_callback(done)
+    try:
+        yield
+    except asyncio.CancelledError:
+        app.BACnetClient.get().cancelled_rpcs += 1
+        raise
+    finally:
+        running = False
+
+@contextlib.asynccontextmanager
+async def _rpc_tasks(context):
+    """run an RPC's BACnet work in a TaskGroup that is cancelled as soon as
+    the call ends, freeing its request slots at once"""
+    async with _rpc_cancellation(context):
+        async with asyncio.TaskGroup() as tasks:
+            yield tasks
+
 # the gRPC server implementation
 class BACnetRPCServer(common_pb2_grpc.DeviceControlServicer):
     async def Get(self, request:common_pb2.GetRequest, context):
         if _debug:
             _log.debug("get_request received")
         header = common_pb2.Header(Src=request.Header.Dst, Dst=request.Header.Src)
-        bacnet_client = app.BACnetClient.get()
-        results = {}
-        for key in request.Keys:
-            params = parse.ParseBacnetPtKey(key)
-            if params.is_valid:
-                try:
-                    resp = await bacnet_client.read_property(
-                        device_addr=params.address,
-                        object_id=params.GetObjectId(),
-                        property_id=params.property,
-                    )
-                    if resp is not None:
-                        results[key] = resp
-                except Exception as e:
-                    _log.error(f"Error getting key '{key}': {e}")
-                    continue
-        
-        # copy results to the response format
-        pairs:list[common_pb2.GetPair] = []
-        for k, v in results.items():
-            # print(f'the type of {k} is {type(v)} ({v})')
-            # if isinstance(v, int):
-            #     _dtype = common_pb2.INT64
-            if isinstance(v, Real):
-                _dtype = common_pb2.DOUBLE
-            else:
-                 _dtype = common_pb2.STRING
-
-            pairs.append(common_pb2.GetPair(
-                Key=k,
-                Value=str(v),
-                time=dt.datetime.now(_local_tz),
-                Dtype=_dtype
-            ))
-        return common_pb2.GetResponse(
-            Header=header,
-            Pairs=pairs,
-        )
+        keys = list(dict.fromkeys(request.Keys))
+        since = request.Since if request.HasField("Since") else None
+        return await _read_keys(keys, [parse.ParseKey(k) for k in keys], header, context, since=since)
+
+    async def RegisterKeys(self, request:common_pb2.RegisterKeysRequest, context) -> common_pb2.RegisterKeysResponse:
+        if _debug:
+            _log.debug("register_keys_request received")
+        header = common_pb2.Header(Src=request.Header.Dst, Dst=request.Header.Src)
+        try:
+            keyset = app.BACnetClient.get().keysets.register(request.Keys, request.Ttl if request.HasField("Ttl") else None)
+        except KeySetTooLarge as err:
+            return common_pb2.RegisterKeysResponse(Header=header, Error=common_pb2.SERVICE_ERROR_TOO_MANY_KEYS, ErrorMsg=str(err))
+        return common_pb2.RegisterKeysResponse(Header=header, Handle=keyset.handle, Ttl=keyset.ttl, Count=len(keyset))
+
+    async def GetKeySet(self, request:common_pb2.KeySetRequest, context) -> common_pb2.GetResponse:
+        if _debug:
+            _log.debug("get_key_set_request received")
+        header = common_pb2.Header(Src=request.Header.Dst, Dst=request.Header.Src)
+
+        # the keys were parsed when they were registered and the set keeps
+        # the plan of its last read, a poll only reads
+        try:
+            keyset = app.BACnetClient.get().keysets.get(request.Handle)
+        except KeySetNotFound as err:
+            return common_pb2.GetResponse(Header=header, Error=common_pb2.SERVICE_ERROR_UNKNOWN_HANDLE, ErrorMsg=str(err))
+        since = request.Since if request.HasField("Since") else None
+        return await _read_keys(keyset.keys, keyset.points, header, context, keyset.plan, since)
+
+    async def GetKeySetColumns(self, request:common_pb2.KeySetRequest, context) -> common_pb2.GetColumns:
+        if _debug:
+            _log.debug("get_key_set_columns_request received")
+        header = common_pb2.Header(Src=request.Header.Dst, Dst=request.Header.Src)
+        try:
+            keyset = app.BACnetClient.get().keysets.get(request.Handle)
+        except KeySetNotFound as err:
+            return common_pb2.GetColumns(Header=header, Error=common_pb2.SERVICE_ERROR_UNKNOWN_HANDLE, ErrorMsg=str(err))
+        since = request.Since if request.HasField("Since") else None
+        return await _read_columns(keyset.points, header, context, keyset.plan, since)
+
+    async def ReleaseKeySet(self, request:common_pb2.KeySetRequest, context) -> common_pb2.Empty:
+        app.BACnetClient.get().keysets.release(request.Handle)
+        return common_pb2.Empty()
     
     async def Set(self, request:common_pb2.SetRequest, context) -> common_pb2.SetResponse:
         if _debug:
             _log.debug("set_request received")
         header = common_pb2.Header(Src=request.Header.Dst, Dst=request.Header.Src)
 
+        # plan the pairs into WritePropertyMultiple requests per device. a
+        # device's batches are written in order, different devices at once.
         bacnet_client = app.BACnetClient.get()
-        results:list[common_pb2.SetPair] = []
-        for pair in request.Pairs:
-            params = parse.ParseBacnetPtKey(pair.Key)
-            resp = await bacnet_client.write_property(
-                params.address,
-                params.GetObjectId(),
-                params.property,
-                pair.Value,
-            )
-            if resp is None:
-                pair.Ok = True
-                results.append(pair)
-                print("{} <- {} (ok={})".format(pair.Key, pair.Value, pair.Ok)) 
+
+        async def write_device(batches:list[planner.WriteBatch]) -> list:
+            return [(b, await bacnet_client.write_batch(b)) for b in batches]
+
+        # the response's pairs, the request is left as it came
+        pairs = [common_pb2.SetPair(Key=p.Key, Value=p.Value) for p in request.Pairs]
+
+        async with _rpc_tasks(context) as tasks:
+            # keys go to the address their device was last heard from
+            routed = await bacnet_client.route([parse.ParseKey(p.Key).WithValue(p.Value) for p in pairs])
+            points:dict[parse.BACnetKey, common_pb2.SetPair] = {}
+            for params, pair in zip(routed, pairs):
+                points[params] = pair
+                if params.by_instance:
+                    pair.Ok = False
+                    pair.Error = common_pb2.SET_ERROR_COULD_NOT_RESOLVE_ADDR
+                    pair.ErrorMsg = str(app.DeviceNotFound(params.device_instance))
+                elif not params.is_valid:
+                    pair.Ok = False
+                    pair.Error = common_pb2.SET_ERROR_COULD_NOT_RESOLVE_XREF
+                    pair.ErrorMsg = "invalid bacnet key"
+
+            devices:dict[str, list[planner.WriteBatch]] = {}
+            for batch in planner.PlanWrites(points.keys(), bacnet_client.device_caps):
+                devices.setdefault(batch.address, []).append(batch)
+            writes = [tasks.create_task(write_device(b)) for b in devices.values()]
+        responses = [w.result() for w in writes]
+
+        for batch, errors in (r for device in responses for r in device):
+            for params, err in zip(batch.Items(), errors):
+                pair = points[params]
+                pair.Ok = err is None
+                if err is not None:
+                    pair.Error, pair.ErrorMsg = _set_error(err)
+                    if _debug:
+                        _log.debug("set error %s <- %s: %s", pair.Key, pair.Value, pair.ErrorMsg)
 
         return common_pb2.SetResponse(
             Header=header,
-            Pairs=results,
-        )   
-                                  
+            Pairs=pairs,
+        )
+
+
+    async def Subscribe(self, request:common_pb2.SubscribeKeysRequest, context):
+        if _debug:
+            _log.debug("subscribe_request received")
+        bacnet_client = app.BACnetClient.get()
+
+        # every key the stream covers, by cache key. the points are kept warm
+        # by COV (or a poller) and each value put in the cache is offered to
+        # this stream, so any number of streams share one upstream read.
+        keys:dict[tuple, list[str]] = {}
+        points:list[parse.BACnetKey] = []
+        requested = list(dict.fromkeys(request.Keys))
+        routed = await bacnet_client.route([parse.ParseKey(k) for k in requested])
+        for k, params in zip(requested, routed):
+            if params.by_instance:
+                yield _get_pair(k, app.DeviceNotFound(params.device_instance), None)
+                continue
+            if not params.is_valid:
+                yield common_pb2.GetPair(
+                    Key=k,
+                    Error=common_pb2.GET_ERROR_COULD_NOT_RESOLVE_XREF,
+                    ErrorMsg="invalid bacnet key",
+                )
+                continue
+            cache_key = CacheKey(params)
+            if cache_key not in keys:
+                points.append(params)
+            keys.setdefault(cache_key, []).append(k)
+
+        stream = PointStream(request.Deadband, request.MinInterval)
+        for cache_key in keys:
+            bacnet_client.cache.Watch(cache_key, stream.Offer)
+        bacnet_client.cov.subscribe(points)
+        try:
+            # the current values first
+            values, times = await bacnet_client.read_points(points)
+            for params, v, t in zip(points, values, times):
+                cache_key = CacheKey(params)
+                if not isinstance(v, BaseException):
+                    stream.Sent(cache_key, v)
+                for k in keys[cache_key]:
+                    yield _get_pair(k, v, t)
+
+            while True:
+                for cache_key, entry in await stream.Next():
+                    for k in keys[cache_key]:
+                        yield _get_pair(k, entry.value, entry.time)
+        finally:
+            for cache_key in keys:
+                bacnet_client.cache.Unwatch(cache_key, stream.Offer)
+            await bacnet_client.cov.unsubscribe(points)
+            if _debug:
+                _log.debug("subscribe stream closed: %r", stream)
+
+    async def Discover(self, request:common_pb2.DiscoverRequest, context):
+        if _debug:
+            _log.debug("discover_request received")
+        bacnet_client = app.BACnetClient.get()
+
+        # the sweep is paced so it never crowds out live reads, a whole
+        # network can take a while. devices are sent as they answer.
+        low = max(INSTANCE_LOW, request.Low if request.HasField("Low") else INSTANCE_LOW)
+        high = min(INSTANCE_HIGH, request.High if request.HasField("High") else INSTANCE_HIGH)
+        async for entry in bacnet_client.discovery.sweep(low, high):
+            yield common_pb2.DiscoveredDevice(
+                Key=f"bacnet://{entry.address}/{entry.instance}",
+                Instance=entry.instance,
+                Address=entry.address,
+                MaxApdu=entry.max_apdu,
+                Segmented=entry.segmented(),
+                VendorId=entry.vendor_id or 0,
+            )
+
+    async def Catalog(self, request:common_pb2.CatalogRequest, context):
+        if _debug:
+            _log.debug("catalog_request received")
+        bacnet_client = app.BACnetClient.get()
+
+        device = parse.ParseDeviceKey(request.Device)
+        if not (device.is_valid or device.by_instance):
+            yield common_pb2.CatalogEntry(
+                Key=request.Device,
+                Error=common_pb2.GET_ERROR_COULD_NOT_RESOLVE_XREF,
+                ErrorMsg="invalid device key",
+            )
+            return
+
+        def _entry(entry, removed:bool=False) -> common_pb2.CatalogEntry:
+            return common_pb2.CatalogEntry(
+                Key=entry.key,
+                ObjectName=entry.properties.get("object-name", ""),
+                Description=entry.properties.get("description", ""),
+                Units=entry.properties.get("units", ""),
+                Removed=removed,
+            )
+
+        try:
+            if request.Resync:
+                added, removed = await bacnet_client.catalog.resync(device)
+                for entry in added:
+                    yield _entry(entry)
+                for entry in removed:
+                    yield _entry(entry, True)
+                return
+            async for entry in bacnet_client.catalog.build(device):
+                yield _entry(entry)
+        except (Exception, ErrorRejectAbortNack) as err:
+            _log.error(f"Error cataloging '{request.Device}': {err}")
+            error, error_msg = _get_error(err)
+            yield common_pb2.CatalogEntry(Key=request.Device, Error=error, ErrorMsg=error_msg)
+
+
+class HistoryRPCServer(common_pb2_grpc.HistoryServicer):
+    """Sample rates for the driver's scan scheduler. Scanned values are
+    served from the value cache by Get and pushed to Subscribe streams, the
+    historian reads them from there. GetHistory is left to the historian.
+    """
+    async def GetSampleRate(self, request:common_pb2.SetRequest, context) -> common_pb2.SetResponse:
+        header = common_pb2.Header(Src=request.Header.Dst, Dst=request.Header.Src)
+        scheduler = app.BACnetClient.get().scheduler
+        for pair in request.Pairs:
+            if parse.ParseKey(pair.Key).is_valid:
+                pair.Value = str(scheduler.rate(pair.Key))
+                pair.Dtype = common_pb2.DOUBLE
+                pair.Ok = True
+            else:
+                pair.Ok = False
+                pair.Error = common_pb2.SET_ERROR_COULD_NOT_RESOLVE_XREF
+                pair.ErrorMsg = "invalid bacnet key"
+        return common_pb2.SetResponse(Header=header, Pairs=request.Pairs)
+
+    async def SetSampleRate(self, request:common_pb2.SetRequest, context) -> common_pb2.SetResponse:
+        """Value is the scan interval in seconds, 0 stops scanning the key."""
+        header = common_pb2.Header(Src=request.Header.Dst, Dst=request.Header.Src)
+        scheduler = app.BACnetClient.get().scheduler
+        intervals:list[float] = []
+        for pair in request.Pairs:
+            try:
+                intervals.append(float(pair.Value))
+            except ValueError:
+                intervals.append(None)
+
+        # set every rate, saving the rates file once
+        errors = scheduler.set_rates({p.Key: i for p, i in zip(request.Pairs, intervals) if i is not None})
+        for pair, interval in zip(request.Pairs, intervals):
+            if interval is None:
+                pair.Ok = False
+                pair.Error = common_pb2.SET_ERROR_INVALID_VALUE_TYPE
+                pair.ErrorMsg = f"invalid interval '{pair.Value}'"
+            elif pair.Key in errors:
+                pair.Ok = False
+                pair.ErrorMsg = str(errors[pair.Key])
+                if not parse.ParseKey(pair.Key).is_valid:
+                    pair.Error = common_pb2.SET_ERROR_COULD_NOT_RESOLVE_XREF
+                else:
+                    pair.Error = common_pb2.SET_ERROR_INVALID_VALUE_TYPE
+            else:
+                pair.Ok = True
+        return common_pb2.SetResponse(Header=header, Pairs=request.Pairs)
+
+    async def RefreshRates(self, request:common_pb2.RefreshRatesRequest, context) -> common_pb2.RefreshRatesResponse:
+        try:
+            await app.BACnetClient.get().scheduler.refresh()
+        except (OSError, ValueError) as err:
+            return common_pb2.RefreshRatesResponse(Error=common_pb2.SERVICE_ERROR_UNSPECIFIED, ErrorMsg=str(err))
+        return common_pb2.RefreshRatesResponse()
+
 
 # need to use specified port in the oxigraph instance
 async def initGRPC(port:str=SERVER_PORT) -> grpc.aio.Server:
     # GRPC set up
     server = grpc.aio.server()
     common_pb2_grpc.add_DeviceControlServicer_to_server(BACnetRPCServer(), server)
+    common_pb2_grpc.add_HistoryServicer_to_server(HistoryRPCServer(), server)
     server.add_insecure_port("0.0.0.0:" + port)
     _log.info("gRPC server started. Listening on port: %s", port)
     await server.start()
@@ -146,9 +674,9 @@ async def initGRPC(port:str=SERVER_PORT) -> grpc.aio.Server:
         app._log.debug("grpc: %r", server)
     return server
 
-async def startBACnetApp():
+async def startBACnetApp(config:str=_app_config_file):
     # load args from config file
-    args = app.load_ini_args(_app_config_file, debug_modules=["src.app", __name__], color=True)
+    args = app.load_ini_args(config, debug_modules=["src.app", __name__], color=True)
     await app.BACnetClient.create(args)
 
     # create the singleton app instance
@@ -159,9 +687,9 @@ async def startBACnetApp():
         app._log.debug("settings: %r", settings)
         app._log.debug("app: %r", bacnet_client)
 
-async def main(early_stop:int=0):
-    await startBACnetApp()
-    grpc_server = await initGRPC()
+async def main(early_stop:int=0, config:str=_app_config_file, port:str=SERVER_PORT):
+    await startBACnetApp(config)
+    grpc_server = await initGRPC(port)
 
     async def server_graceful_shutdown():
         if app._debug:
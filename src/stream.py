@@ -0,0 +1,82 @@
+import asyncio
+import time
+
+from src.cache import CacheEntry
+
+class PointStream(object):
+    """A PointStream collects the updates one Subscribe stream still has to
+    send. Updates for a key that hasn't been sent yet replace each other, so
+    a slow reader gets the latest value rather than a backlog.
+
+    Numeric updates within `deadband` of the last value sent are dropped,
+    and a key is sent at most once every `min_interval` seconds.
+    """
+    def __init__(self, deadband:float=0.0, min_interval:float=0.0) -> None:
+        self.deadband = deadband
+        self.min_interval = min_interval
+
+        self._pending:dict[tuple, CacheEntry] = {}
+        self._sent:dict[tuple, tuple] = {}          # key -> (value, monotonic time)
+        self._ready = asyncio.Event()
+
+        self.offered = 0
+        self.dropped = 0
+
+    def __repr__(self):
+        return f"PointStream(pending={len(self._pending)}, deadband={self.deadband}, min_interval={self.min_interval})"
+
+    def Offer(self, key:tuple, entry:CacheEntry):
+        """Offer queues an update unless it is inside the deadband. It is
+        a ValueCache watcher.
+        """
+        self.offered += 1
+        last = self._sent.get(key)
+        if (last is not None) and self._InDeadband(last[0], entry.value):
+            self.dropped += 1
+            self._pending.pop(key, None)
+            return
+        self._pending[key] = entry
+        self._ready.set()
+
+    def Sent(self, key:tuple, value):
+        """Sent records a value sent outside of `Next`, e.g. the first one."""
+        self._sent[key] = (value, time.monotonic())
+        pending = self._pending.get(key)
+        if (pending is not None) and self._InDeadband(value, pending.value):
+            del self._pending[key]
+
+    def _InDeadband(self, last, value) -> bool:
+        if self.deadband <= 0:
+            return last == value
+        if isinstance(value, bool) or isinstance(last, bool):
+            return last == value
+        try:
+            return abs(float(value) - float(last)) < self.deadband
+        except (TypeError, ValueError):
+            return last == value
+
+    async def Next(self) -> list[tuple[tuple, CacheEntry]]:
+        """Next waits for updates that are due and returns them."""
+        while True:
+            now = time.monotonic()
+            due = []
+            wait = None
+            for key in self._pending:
+                last = self._sent.get(key)
+                not_before = (last[1] + self.min_interval) if last else now
+                if not_before <= now:
+                    due.append(key)
+                else:
+                    wait = min(wait, not_before - now) if wait is not None else not_before - now
+
+            if due:
+                updates = [(key, self._pending.pop(key)) for key in due]
+                for key, entry in updates:
+                    self._sent[key] = (entry.value, now)
+                return updates
+
+            self._ready.clear()
+            try:
+                await asyncio.wait_for(self._ready.wait(), wait)
+            except asyncio.TimeoutError:
+                pass
@@ -12,6 +12,12 @@ import random
 from bacpypes3.debugging import ModuleLogger
 from bacpypes3.settings import settings
 from bacpypes3.argparse import create_log_handlers
+from bacpypes3.app import DeviceInfoCache
+from bacpypes3.apdu import RejectPDU, RejectReason
+from bacpypes3.primitivedata import PropertyIdentifier, Real
+from bacpypes3.pdu import Address
+
+from src.cache import ValueCache, CacheKey
 
 _debug = 1
 _log = ModuleLogger(globals())
@@ -197,4 +203,132 @@ class TestWriteProperty((unittest.IsolatedAsyncioTestCase)):
 
         except Exception as e:
             print(f"Error: {e}")
-            raise
\ No newline at end of file
+            raise
+
+class _FakeCOVContext:
+    """Stands in for bacpypes3's SubscriptionContextManager."""
+    def __init__(self, app, address, object_identifier):
+        self.app = app
+        self.address = address
+        self.monitored_object_identifier = object_identifier
+        self.queue = asyncio.Queue()
+        self.refresh_subscription_handle = None
+        self.cancelled = False
+
+    async def __aenter__(self):
+        await self.refresh_subscription()
+        self.app.contexts.append(self)
+        return self
+
+    async def __aexit__(self, *exc_details):
+        self.cancelled = exc_details == (None, None, None)
+
+    async def refresh_subscription(self):
+        self.app.subscribes += 1
+        if self.app.cov_error is not None:
+            raise self.app.cov_error
+        # the initial notification
+        self.queue.put_nowait((PropertyIdentifier("present-value"), Real(self.app.value)))
+
+    async def get_value(self):
+        return await self.queue.get()
+
+class _FakeCOVApp:
+    def __init__(self, cov_error=None):
+        self.device_info_cache = DeviceInfoCache()
+        self.cov_error = cov_error
+        self.value = 1.0
+        self.contexts:list[_FakeCOVContext] = []
+        self.subscribes = 0
+        self.reads = 0
+
+    def change_of_value(self, address, object_identifier, issue_confirmed_notifications=True, lifetime=None):
+        return _FakeCOVContext(self, address, object_identifier)
+
+    async def read_property(self, address, objid, prop, array_index=None):
+        self.reads += 1
+        return Real(self.value)
+
+class TestCOVManager((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.params = src.parse.ParseKey("bacnet://192.168.1.10/100/analog-input,1/present-value")
+        self.key = CacheKey(self.params)
+
+    def make_client(self, fake_app:_FakeCOVApp, lifetime:int=60) -> src.app.BACnetClient:
+        client = src.app.BACnetClient(fake_app, cache=ValueCache(ttl=5))
+        client.cov.lifetime = lifetime
+        return client
+
+    async def test_notifications_fill_the_cache(self):
+        fake_app = _FakeCOVApp()
+        client = self.make_client(fake_app)
+        client.cov.subscribe([self.params])
+        await asyncio.sleep(0.01)
+
+        entry, stale = client.cache.Lookup(self.key)
+        self.assertEqual(entry.value, 1.0)
+        self.assertEqual(client.cache.TTL(self.key), 60)
+        self.assertTrue(client.cov.is_subscribed(self.params))
+
+        fake_app.value = 2.0
+        fake_app.contexts[0].queue.put_nowait((PropertyIdentifier("present-value"), Real(2.0)))
+        await asyncio.sleep(0.01)
+        self.assertEqual(client.cache.Lookup(self.key)[0].value, 2.0)
+        self.assertEqual(fake_app.reads, 0)
+
+        await client.cov.unsubscribe([self.params])
+        self.assertTrue(fake_app.contexts[0].cancelled)
+        self.assertEqual(client.cache.TTL(self.key), 5)
+
+    async def test_renews_before_expiry(self):
+        fake_app = _FakeCOVApp()
+        client = self.make_client(fake_app, lifetime=0.4)
+        client.cov.subscribe([self.params])
+        await asyncio.sleep(0.35)
+        self.assertEqual(fake_app.subscribes, 2)
+        await client.cov.close()
+
+    async def test_resubscribes_on_i_am(self):
+        fake_app = _FakeCOVApp()
+        client = self.make_client(fake_app)
+        client.cov.subscribe([self.params])
+        await asyncio.sleep(0.01)
+
+        client.cov.device_announced(Address("192.168.1.10"))
+        await asyncio.sleep(0.01)
+        self.assertEqual(fake_app.subscribes, 1)    # too soon after subscribing
+
+        for sub in client.cov._subscriptions.values():
+            sub.subscribed -= src.app.COV_HOLDOFF
+        client.cov.device_announced(Address("192.168.1.10"))
+        await asyncio.sleep(0.01)
+        self.assertEqual(fake_app.subscribes, 2)
+        await client.cov.close()
+
+    async def test_polls_without_cov(self):
+        fake_app = _FakeCOVApp(cov_error=RejectPDU(reason=RejectReason.unrecognizedService))
+        client = self.make_client(fake_app)
+        client.cov.poll_interval = 0.05
+        client.cov.subscribe([self.params])
+        await asyncio.sleep(0.12)
+
+        self.assertEqual(fake_app.subscribes, 1)
+        self.assertGreaterEqual(fake_app.reads, 2)
+        self.assertEqual(client.cache.Lookup(self.key)[0].value, 1.0)
+        self.assertFalse(client.cov.is_subscribed(self.params))
+        self.assertEqual(client.cov_stats()["polled"], 1)
+        await client.cov.close()
+
+    async def test_other_properties_are_polled(self):
+        fake_app = _FakeCOVApp()
+        client = self.make_client(fake_app)
+        client.cov.poll_interval = 60
+        name = src.parse.ParseKey("bacnet://192.168.1.10/100/analog-input,1/object-name")
+        client.cov.subscribe([self.params, name])
+        await asyncio.sleep(0.01)
+
+        self.assertEqual(fake_app.subscribes, 1)
+        self.assertEqual(fake_app.reads, 1)
+        self.assertTrue(client.cov.is_subscribed(self.params))
+        self.assertFalse(client.cov.is_subscribed(name))
+        await client.cov.close()
@@ -0,0 +1,111 @@
+import unittest
+import time
+
+from src.cache import ValueCache
+
+class CacheTest(unittest.TestCase):
+    def test_hit_and_miss(self):
+        cache = ValueCache(ttl=60)
+        key = ("192.168.1.10", "analog-input,1", "present-value", None)
+        self.assertEqual(cache.Lookup(key), (None, False))
+        cache.Put(key, 72.5)
+        entry, stale = cache.Lookup(key)
+        self.assertEqual(entry.value, 72.5)
+        self.assertFalse(stale)
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
+
+    def test_stale_window(self):
+        cache = ValueCache(ttl=0.01, max_stale=0.05)
+        key = ("192.168.1.10", "analog-input,1", "present-value", None)
+        cache.Put(key, 1)
+        time.sleep(0.02)
+        entry, stale = cache.Lookup(key)
+        self.assertTrue(stale)
+        time.sleep(0.05)
+        self.assertEqual(cache.Lookup(key), (None, False))
+
+    def test_per_point_ttl(self):
+        cache = ValueCache(ttl=60)
+        slow = ("192.168.1.10", "analog-input,1", "present-value", None)
+        cache.SetTTL(slow, 0)
+        cache.Put(slow, 1)
+        self.assertEqual(cache.Lookup(slow), (None, False))
+
+    def test_ttl_owners(self):
+        cache = ValueCache(ttl=0)
+        key = ("192.168.1.10", "analog-input,1", "present-value", None)
+        cache.SetTTL(key, 300, owner="cov")
+        cache.SetTTL(key, 90, owner="scan")
+        cache.Put(key, 1)
+        self.assertEqual((cache.TTL(key), cache.Lookup(key)[0].ttl), (300, 300))
+
+        # the longest ttl still given wins, the default once none is
+        cache.SetTTL(key, owner="cov")
+        self.assertEqual((cache.TTL(key), cache.Lookup(key)[0].ttl), (90, 90))
+        cache.SetTTL(key, owner="scan")
+        self.assertEqual(cache.TTL(key), 0)
+        self.assertEqual(cache.Lookup(key), (None, False))
+
+    def test_lru_eviction(self):
+        cache = ValueCache(max_entries=2, ttl=60)
+        keys = [("192.168.1.10", f"analog-input,{i}", "present-value", None) for i in range(3)]
+        cache.Put(keys[0], 0)
+        cache.Put(keys[1], 1)
+        cache.Lookup(keys[0])
+        cache.Put(keys[2], 2)
+        self.assertIsNotNone(cache.Lookup(keys[0])[0])
+        self.assertIsNone(cache.Lookup(keys[1])[0])
+        self.assertEqual(cache.evictions, 1)
+
+    def test_invalidate_beats_older_read(self):
+        cache = ValueCache(ttl=60)
+        key = ("192.168.1.10", "analog-value,1", "present-value", None)
+        epoch = cache.epoch     # a read starts
+        cache.Invalidate(key)   # a write lands
+        self.assertIsNone(cache.Put(key, 1, epoch))
+        self.assertIsNone(cache.Lookup(key)[0])
+        self.assertIsNotNone(cache.Put(key, 2, cache.epoch))
+
+    def test_invalidations_keep_live_values(self):
+        cache = ValueCache(max_entries=2, ttl=60)
+        live = [("192.168.1.10", f"analog-input,{i}", "present-value", None) for i in range(2)]
+        for i, key in enumerate(live):
+            cache.Put(key, i)
+        epoch = cache.epoch
+        written = [("192.168.1.11", f"analog-value,{i}", "present-value", None) for i in range(5)]
+        for key in written:
+            cache.Invalidate(key)
+        self.assertEqual([cache.Lookup(key)[0].value for key in live], [0, 1])
+        self.assertEqual((len(cache), cache.evictions), (2, 0))
+
+        # the newest tombstones are kept, at most max_entries of them
+        self.assertIsNone(cache.Put(written[-1], 1, epoch))
+        self.assertEqual(cache.Stats()["tombstones"], 2)
+
+    def test_change_sequence(self):
+        cache = ValueCache(ttl=60)
+        keys = [("192.168.1.10", f"analog-value,{i}", "present-value", None) for i in range(3)]
+        for i, key in enumerate(keys):
+            cache.Put(key, float(i))
+        version = cache.Version()
+        self.assertEqual(cache.Since(version), 3)
+
+        unchanged = cache.Put(keys[0], 0.0)
+        changed = cache.Put(keys[1], 5.0)
+        self.assertEqual(cache.Sequence(keys[0], unchanged.value), 1)
+        self.assertGreater(cache.Sequence(keys[1], changed.value), 3)
+        self.assertIsNone(cache.Sequence(keys[1], float("5")))    # not the value it holds
+
+        # the same value after a failed read is a change
+        cache.RefreshFailed(keys[2])
+        self.assertIsNone(cache.Sequence(keys[2], cache.Lookup(keys[2])[0].value))
+        again = cache.Put(keys[2], 2.0)
+        self.assertGreater(cache.Sequence(keys[2], again.value), 3)
+
+        cache.Invalidate(keys[0])
+        self.assertIsNone(cache.Sequence(keys[0], None))
+
+        # versions of another cache, or from its future, stand for nothing
+        self.assertIsNone(cache.Since(ValueCache().Version()))
+        self.assertIsNone(cache.Since(f"{cache.generation}.99"))
+        self.assertIsNone(cache.Since("garbage"))
@@ -0,0 +1,230 @@
+import unittest
+import asyncio
+import time
+
+from bacpypes3.app import DeviceInfoCache
+from bacpypes3.basetypes import ErrorType, EngineeringUnits
+from bacpypes3.primitivedata import CharacterString, ObjectIdentifier, Unsigned
+
+import src.app
+import src.catalog
+import src.parse
+import src.server
+import src.common_pb2 as common_pb2
+from src.cache import ValueCache
+from src.catalog import CatalogBuilder, IncompleteCatalog
+from src.devices import DeviceNotFound
+
+class _FakeController:
+    """a device with `count` analog-values and binary-values that answers
+    ReadPropertyMultiple, and records how many requests it got. binary
+    objects have no description, the device has no last-restore-time.
+    object-list elements in `flaky` fail once.
+    """
+    def __init__(self, count:int, delay:float=0.002):
+        self.device_info_cache = DeviceInfoCache()
+        self.delay = delay
+        self.requests = 0
+        self.revision = 1
+        self.flaky:set[int] = set()
+        self.objects = [ObjectIdentifier("device,100")]
+        for i in range(1, count + 1):
+            self.objects.append(ObjectIdentifier(f"{'analog' if i % 2 else 'binary'}-value,{i}"))
+
+    def value(self, obj_id, prop, index):
+        if (prop == "object-list") and (index in self.flaky):
+            self.flaky.discard(index)
+            return ErrorType(errorClass="device", errorCode="operationalProblem")
+        if prop == "object-list":
+            return Unsigned(len(self.objects)) if index == 0 else self.objects[index - 1]
+        if prop == "database-revision":
+            return Unsigned(self.revision)
+        if prop == "object-name":
+            return CharacterString(f"{obj_id[0]}-{obj_id[1]}")
+        if (prop == "description") and (str(obj_id[0]) != "binary-value"):
+            return CharacterString(f"point {obj_id[1]}")
+        if prop == "units":
+            return EngineeringUnits("degreesFahrenheit")
+        return ErrorType(errorClass="property", errorCode="unknownProperty")
+
+    async def read_property_multiple(self, address, parameter_list):
+        self.requests += 1
+        await asyncio.sleep(self.delay)
+        results = []
+        for obj_id, refs in zip(parameter_list[::2], parameter_list[1::2]):
+            for ref in refs:
+                prop, index = str(ref.propertyIdentifier), ref.propertyArrayIndex
+                results.append((obj_id, ref.propertyIdentifier, index, self.value(obj_id, prop, index)))
+        return results
+
+    async def read_property(self, address, objid, prop, array_index=None):
+        self.requests += 1
+        return self.value(objid, str(prop), array_index)
+
+    async def who_is(self, low_limit=None, high_limit=None, address=None, timeout=None):
+        return []
+
+    def close(self):
+        pass
+
+class TestCatalogBuilder(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fake_app = _FakeController(3000)
+        self.client = src.app.BACnetClient(self.fake_app, cache=ValueCache(ttl=0))
+        self.client.devices.update(100, "192.168.1.10", 1476)
+
+    async def asyncTearDown(self):
+        await self.client.close()
+
+    async def test_catalog(self):
+        device = src.parse.ParseDeviceKey("bacnet://192.168.1.10/100")
+        start = time.monotonic()
+        entries = {e.object_identifier: e async for e in self.client.catalog.build(device)}
+        self.assertLess(time.monotonic() - start, 5.0)
+
+        self.assertEqual(len(entries), 3001)
+        analog = entries["analog-value,1"]
+        self.assertEqual(analog.key, "bacnet://192.168.1.10/100/analog-value,1/present-value")
+        self.assertEqual(analog.properties, {
+            "object-name": "analog-value-1",
+            "description": "point 1",
+            "units": "degrees-fahrenheit",
+        })
+        self.assertEqual(entries["binary-value,2"].properties, {"object-name": "binary-value-2"})
+        self.assertEqual(entries["device,100"].key, "bacnet://192.168.1.10/100/device,100")
+
+        # a few hundred RPMs, not thousands of single reads
+        self.assertLess(self.fake_app.requests, 600)
+        self.assertEqual(self.client.device_stats()["catalog"]["objects"], 3001)
+        self.assertEqual(len(self.client.cache), 0)
+
+    async def test_streams_as_it_goes(self):
+        device = src.parse.ParseDeviceKey("bacnet://device/100")
+        catalog = self.client.catalog.build(device)
+        first = await anext(catalog)
+        self.assertTrue(first.key.startswith("bacnet://device/100/"))
+        self.assertLess(self.fake_app.requests, 100)
+        await catalog.aclose()
+
+    async def test_unknown_device(self):
+        with self.assertRaises(DeviceNotFound):
+            [e async for e in self.client.catalog.build(src.parse.ParseDeviceKey("bacnet://device/200"))]
+
+    async def test_resync_unchanged(self):
+        device = src.parse.ParseDeviceKey("bacnet://192.168.1.10/100")
+        [e async for e in self.client.catalog.build(device)]
+        self.assertEqual(self.client.catalog.catalog(device).revision, 1)
+
+        requests = self.fake_app.requests
+        self.assertEqual(await self.client.catalog.resync(device), ([], []))
+        self.assertEqual(self.fake_app.requests - requests, 1)
+        self.assertEqual(self.client.catalog.stats()["unchanged"], 1)
+
+    async def test_resync_changed(self):
+        self.fake_app.objects = self.fake_app.objects[:101]
+        device = src.parse.ParseDeviceKey("bacnet://192.168.1.10/100")
+        [e async for e in self.client.catalog.build(device)]
+
+        # one object deleted, two added, the database-revision bumped
+        del self.fake_app.objects[5]
+        self.fake_app.objects.append(ObjectIdentifier("analog-value,500"))
+        self.fake_app.objects.append(ObjectIdentifier("binary-value,502"))
+        self.fake_app.revision += 1
+        objects = self.client.catalog.objects
+
+        added, removed = await self.client.catalog.resync(device)
+        self.assertEqual(sorted(e.object_identifier for e in added), ["analog-value,500", "binary-value,502"])
+        self.assertEqual([e.object_identifier for e in removed], ["analog-value,5"])
+        self.assertEqual(added[0].properties["object-name"], "analog-value-500")
+
+        # only the new objects were looked up
+        self.assertEqual(self.client.catalog.objects - objects, 2)
+        catalog = self.client.catalog.catalog(device)
+        self.assertEqual((len(catalog.entries), catalog.revision), (102, 2))
+        self.assertNotIn("analog-value,5", catalog.entries)
+
+        # and the next resync finds nothing to do
+        self.assertEqual(await self.client.catalog.resync(device), ([], []))
+
+    async def test_flaky_object_list(self):
+        self.fake_app.objects = self.fake_app.objects[:101]
+        device = src.parse.ParseDeviceKey("bacnet://192.168.1.10/100")
+
+        # a catalog with a gap is not kept
+        self.fake_app.flaky = {6}
+        with self.assertRaises(IncompleteCatalog) as raised:
+            [e async for e in self.client.catalog.build(device)]
+        self.assertEqual(raised.exception.indexes, [6])
+        self.assertIsNone(self.client.catalog.catalog(device))
+        entries = [e async for e in self.client.catalog.build(device)]
+        self.assertEqual(len(entries), 101)
+
+        # nor is a resync that didn't see the whole object-list, nothing is
+        # removed and the next resync lists the device again
+        self.fake_app.objects.append(ObjectIdentifier("analog-value,500"))
+        self.fake_app.revision += 1
+        self.fake_app.flaky = {6}
+        added, removed = await self.client.catalog.resync(device)
+        self.assertEqual(([e.object_identifier for e in added], removed), (["analog-value,500"], []))
+        catalog = self.client.catalog.catalog(device)
+        self.assertIn("analog-value,5", catalog.entries)
+        self.assertIn("analog-value,500", catalog.entries)
+        self.assertEqual(catalog.revision, 1)
+
+        self.assertEqual(await self.client.catalog.resync(device), ([], []))
+        catalog = self.client.catalog.catalog(device)
+        self.assertEqual((len(catalog.entries), catalog.revision), (102, 2))
+
+    async def test_resync_loop(self):
+        device = src.parse.ParseDeviceKey("bacnet://192.168.1.10/100")
+        self.fake_app.objects = self.fake_app.objects[:3]
+        [e async for e in self.client.catalog.build(device)]
+        self.fake_app.objects.append(ObjectIdentifier("analog-value,9"))
+        self.client.catalog.start(0.01)
+        await asyncio.sleep(0.1)
+        self.assertIn("analog-value,9", self.client.catalog.catalog(device).entries)
+        self.assertGreater(self.client.catalog.stats()["resyncs"], 1)
+
+    async def test_catalog_rpc(self):
+        src.app.BACnetClient._instance = self.client
+        try:
+            server = src.server.BACnetRPCServer()
+            self.fake_app.objects = self.fake_app.objects[:3]
+            entries = [e async for e in server.Catalog(common_pb2.CatalogRequest(Device="bacnet://192.168.1.10/100"), None)]
+            self.assertEqual(sorted(e.Key for e in entries), [
+                "bacnet://192.168.1.10/100/analog-value,1/present-value",
+                "bacnet://192.168.1.10/100/binary-value,2/present-value",
+                "bacnet://192.168.1.10/100/device,100",
+            ])
+            analog = [e for e in entries if "analog" in e.Key][0]
+            self.assertEqual((analog.ObjectName, analog.Units), ("analog-value-1", "degrees-fahrenheit"))
+
+            self.fake_app.objects[2] = ObjectIdentifier("analog-value,3")
+            self.fake_app.revision += 1
+            entries = [e async for e in server.Catalog(common_pb2.CatalogRequest(Device="bacnet://192.168.1.10/100", Resync=True), None)]
+            self.assertEqual([(e.Key, e.Removed) for e in entries], [
+                ("bacnet://192.168.1.10/100/analog-value,3/present-value", False),
+                ("bacnet://192.168.1.10/100/binary-value,2/present-value", True),
+            ])
+
+            entries = [e async for e in server.Catalog(common_pb2.CatalogRequest(Device="bacnet://device/200"), None)]
+            self.assertEqual([(e.Key, e.Error) for e in entries], [("bacnet://device/200", common_pb2.GET_ERROR_COULD_NOT_RESOLVE_ADDR)])
+
+            entries = [e async for e in server.Catalog(common_pb2.CatalogRequest(Device="not a key"), None)]
+            self.assertEqual(entries[0].Error, common_pb2.GET_ERROR_COULD_NOT_RESOLVE_XREF)
+        finally:
+            src.app.BACnetClient._instance = None
+
+class TestHasPresentValue(unittest.TestCase):
+    def test_has_present_value(self):
+        for object_type in ("analog-value", "binary-input", "multi-state-output", "schedule", "loop"):
+            self.assertTrue(src.catalog.HasPresentValue(object_type), object_type)
+        for object_type in ("device", "network-port", "notification-class", "trend-log", "128"):
+            self.assertFalse(src.catalog.HasPresentValue(object_type), object_type)
+
+class TestParseDeviceKey(unittest.TestCase):
+    def test_parse_device_key(self):
+        key = src.parse.ParseDeviceKey("bacnet://192.168.1.10:47809/100")
+        self.assertTrue(key.is_valid)
+        self.assertEqual(key.cache_key, ("192.168.1.10:47809", "device,100", "object-list", None))
+        self.assertFalse(src.parse.ParseDeviceKey("bacnet://192.168.1.10/100/analog-value,1/present-value").is_valid)
@@ -0,0 +1,251 @@
+import unittest
+import asyncio
+import threading
+import time
+from concurrent import futures
+
+import grpc
+
+import src.client as client
+import src.common_pb2 as common_pb2
+import src.common_pb2_grpc as common_pb2_grpc
+
+class _FakeDriver(common_pb2_grpc.DeviceControlServicer):
+    """answers Get with the key's number as a DOUBLE, 'bad' keys with an
+    error and 'bin' keys as a BOOL, only the errors if asked for changes
+    since a version, versioned by the request's number; records every
+    request and the peers they came from. a 'fail' key fails the request,
+    a 'wait' key holds it until `expected` requests have arrived.
+    """
+    def __init__(self):
+        self.expected = None
+        self.all_in = threading.Event()
+        self.requests = []
+        self.peers = set()
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self._lock = threading.Lock()
+
+    def _track(self, request, context):
+        with self._lock:
+            self.requests.append(request)
+            n = len(self.requests)
+            if n == self.expected:
+                self.all_in.set()
+            self.peers.add(context.peer())
+            self.in_flight += 1
+            self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        time.sleep(0.01)
+        with self._lock:
+            self.in_flight -= 1
+        return n
+
+    def Get(self, request, context):
+        n = self._track(request, context)
+        if any(k.startswith("fail") for k in request.Keys):
+            context.abort(grpc.StatusCode.INTERNAL, "failed")
+        if any(k.startswith("wait") for k in request.Keys):
+            self.all_in.wait(5.0)
+        pairs = []
+        for key in request.Keys:
+            if key == "invalid":
+                continue
+            if key.startswith("bad"):
+                pairs.append(common_pb2.GetPair(Key=key, Error=common_pb2.GET_ERROR_TIMEOUT, ErrorMsg="no response"))
+            elif key.startswith("bin"):
+                pairs.append(common_pb2.GetPair(Key=key, Value="true", Dtype=common_pb2.BOOL))
+            else:
+                pairs.append(common_pb2.GetPair(Key=key, Value=key.split("-")[-1], Dtype=common_pb2.DOUBLE))
+        if request.HasField("Since"):
+            pairs = [p for p in pairs if p.HasField("Error")]
+        return common_pb2.GetResponse(Pairs=pairs, Version=f"g.{n}")
+
+    def Set(self, request, context):
+        self._track(request, context)
+        for pair in request.Pairs:
+            pair.Ok = not pair.Key.startswith("bad")
+            if not pair.Ok:
+                pair.Error = common_pb2.SET_ERROR_READ_ONLY
+                pair.ErrorMsg = "read only"
+        return common_pb2.SetResponse(Pairs=request.Pairs)
+
+class _ServerTest(unittest.TestCase):
+    def setUp(self):
+        self.driver = _FakeDriver()
+        self.server = grpc.server(futures.ThreadPoolExecutor(max_workers=16))
+        common_pb2_grpc.add_DeviceControlServicer_to_server(self.driver, self.server)
+        self.addr = f"127.0.0.1:{self.server.add_insecure_port('127.0.0.1:0')}"
+        self.server.start()
+
+    def tearDown(self):
+        self.server.stop(None)
+
+class TestClient(_ServerTest):
+    def test_get(self):
+        with client.Client(self.addr) as c:
+            values = c.get(["av-1.5", "bad-1", "bin-1", "invalid"])
+        self.assertEqual(values["av-1.5"], 1.5)
+        self.assertIs(values["bin-1"], True)
+        self.assertIsInstance(values["bad-1"], client.PointError)
+        self.assertEqual(values["bad-1"].error, common_pb2.GET_ERROR_TIMEOUT)
+        self.assertEqual(values["invalid"].error, common_pb2.GET_ERROR_COULD_NOT_RESOLVE_XREF)
+
+    def test_chunking(self):
+        keys = [f"av-{i}" for i in range(25)]
+        with client.Client(self.addr, chunk_size=4, max_parallel=3) as c:
+            pairs = c.get_pairs(keys)
+        self.assertEqual([p.Key for p in pairs], keys)
+        self.assertEqual(len(self.driver.requests), 7)
+        self.assertEqual(max(len(r.Keys) for r in self.driver.requests), 4)
+        self.assertLessEqual(self.driver.max_in_flight, 3)
+
+    def test_parallel_slots(self):
+        # a slow request holds one slot, the others keep flowing through the rest
+        self.driver.expected = 10
+        keys = ["wait-1"] + [f"av-{i}" for i in range(9)]
+        with client.Client(self.addr, chunk_size=1, max_parallel=2) as c:
+            start = time.monotonic()
+            self.assertEqual(len(c.get_pairs(keys)), 10)
+        self.assertLess(time.monotonic() - start, 4.0)
+        self.assertLessEqual(self.driver.max_in_flight, 2)
+
+    def test_failure_stops_the_rest(self):
+        keys = ["fail-1"] + [f"av-{i}" for i in range(5)]
+        with client.Client(self.addr, chunk_size=1, max_parallel=1) as c:
+            with self.assertRaises(grpc.RpcError):
+                c.get(keys)
+        self.assertEqual(len(self.driver.requests), 1)
+
+    def test_channels_are_reused(self):
+        with client.Client(self.addr, pool_size=2) as c:
+            for i in range(10):
+                c.get([f"av-{i}"])
+        self.assertEqual(len(self.driver.requests), 10)
+        self.assertLessEqual(len(self.driver.peers), 2)
+
+    def test_set(self):
+        with client.Client(self.addr, chunk_size=2) as c:
+            errors = c.set({"av-1": 72.5, "bad-2": 1, "av-3": "active"})
+        self.assertEqual(list(errors), ["bad-2"])
+        self.assertEqual(errors["bad-2"].error, common_pb2.SET_ERROR_READ_ONLY)
+        self.assertEqual(sorted(p.Value for r in self.driver.requests for p in r.Pairs), ["1", "72.5", "active"])
+
+    def test_get_changes(self):
+        keys = [f"av-{i}" for i in range(5)] + ["bad-1"]
+        with client.Client(self.addr, chunk_size=2) as c:
+            values, version = c.get_changes(keys)
+            self.assertEqual(len(values), 6)
+            self.assertEqual(version, "g.1")
+            values, version = c.get_changes(keys, version)
+        self.assertEqual(list(values), ["bad-1"])
+        self.assertEqual(version, "g.4")
+
+        # chunked like get, every chunk since the same version
+        self.assertEqual([len(r.Keys) for r in self.driver.requests], [2] * 6)
+        self.assertEqual([r.Since for r in self.driver.requests], [""] * 3 + ["g.1"] * 3)
+
+    def test_oldest_version(self):
+        self.assertEqual(client._oldest_version(["a.10", "a.9", "a.11"]), "a.9")
+        self.assertEqual(client._oldest_version(["a.10", "b.9"]), "")
+        self.assertEqual(client._oldest_version(["a.10", ""]), "")
+
+    def test_module_functions(self):
+        self.assertEqual(client.Get("av-2", addr=self.addr), {"av-2": 2.0})
+        self.assertEqual(client.Set(["av-2"], ["3"], addr=self.addr), {})
+        self.assertIs(client._shared(self.addr), client._shared(self.addr))
+        with self.assertRaises(ValueError):
+            client.Set(["av-1", "av-2"], ["1"], addr=self.addr)
+
+class TestAsyncClient(_ServerTest, unittest.IsolatedAsyncioTestCase):
+    async def test_get(self):
+        async with client.AsyncClient(self.addr, chunk_size=3, max_parallel=2) as c:
+            values = await c.get([f"av-{i}" for i in range(10)] + ["bad-1"])
+            errors = await c.set({"av-1": 1.0, "bad-1": 2.0})
+        self.assertEqual(values["av-9"], 9.0)
+        self.assertIsInstance(values["bad-1"], client.PointError)
+        self.assertEqual(list(errors), ["bad-1"])
+        self.assertEqual(len(self.driver.requests), 5)
+        self.assertLessEqual(self.driver.max_in_flight, 2)
+
+    async def test_failure_stops_the_rest(self):
+        keys = ["fail-1"] + [f"av-{i}" for i in range(9)]
+        async with client.AsyncClient(self.addr, chunk_size=1, max_parallel=1) as c:
+            with self.assertRaises(grpc.aio.AioRpcError):
+                await c.get(keys)
+            await asyncio.sleep(0.05)
+        self.assertLess(len(self.driver.requests), 3)
+
+    async def test_get_changes(self):
+        async with client.AsyncClient(self.addr) as c:
+            values, version = await c.get_changes(["av-1", "bin-2"])
+            self.assertEqual(values, {"av-1": 1.0, "bin-2": True})
+            self.assertEqual(await c.get_changes(["av-1", "bin-2"], version), ({}, "g.2"))
+            self.assertEqual(c.stats()["gets"], 0)
+
+    async def test_batching(self):
+        async with client.AsyncClient(self.addr) as c:
+            keys = [f"av-{i}" for i in range(100)]
+            values = await asyncio.gather(*(c.get([k]) for k in keys), c.get(["av-1", "bad-1", "invalid"]))
+            self.assertEqual([v[k] for v, k in zip(values, keys)], [float(i) for i in range(100)])
+            self.assertEqual(values[-1]["av-1"], 1.0)
+            self.assertEqual(values[-1]["bad-1"].error, common_pb2.GET_ERROR_TIMEOUT)
+            self.assertEqual(values[-1]["invalid"].error, common_pb2.GET_ERROR_COULD_NOT_RESOLVE_XREF)
+            self.assertEqual(c.stats(), {"gets": 101, "batched": 101, "batches": 1})
+        self.assertEqual(len(self.driver.requests), 1)
+
+    async def test_batch_limits(self):
+        async with client.AsyncClient(self.addr, batch_window=10.0, batch_keys=8) as c:
+            # a full batch goes at once, a get that would fill one alone isn't batched
+            await asyncio.gather(*(c.get([f"av-{i}"]) for i in range(8)))
+            await c.get([f"av-{i}" for i in range(8)])
+            self.assertEqual(c.stats(), {"gets": 9, "batched": 8, "batches": 1})
+        self.assertEqual([len(r.Keys) for r in self.driver.requests], [8, 8])
+
+        async with client.AsyncClient(self.addr, batch_window=0) as c:
+            await asyncio.gather(*(c.get([f"av-{i}"]) for i in range(3)))
+            self.assertEqual(c.stats()["batches"], 0)
+        self.assertEqual(len(self.driver.requests), 5)
+
+    async def test_batch_errors(self):
+        self.server.stop(None)
+        async with client.AsyncClient(self.addr) as c:
+            results = await asyncio.gather(c.get(["av-1"], timeout=1), c.get(["av-2"], timeout=1), return_exceptions=True)
+        self.assertEqual([type(r) for r in results], [grpc.aio.AioRpcError] * 2)
+
+class TestDecodeValue(unittest.TestCase):
+    def test_decode_value(self):
+        self.assertEqual(client.decode_value("3", common_pb2.INT64), 3)
+        self.assertEqual(client.decode_value("2.5", common_pb2.FLOAT), 2.5)
+        self.assertIs(client.decode_value("False", common_pb2.BOOL), False)
+        self.assertIsNone(client.decode_value("", common_pb2.NULL))
+        self.assertEqual(client.decode_value("00ff", common_pb2.BYTES), b"\x00\xff")
+        self.assertEqual(client.decode_value("active", common_pb2.STRING), "active")
+        self.assertIs(client.decode_value("inactive", common_pb2.BOOL), False)
+        self.assertEqual(client.decode_value('[{"null":[]},{"real":72.5}]', common_pb2.JSON), [{"null": []}, {"real": 72.5}])
+        self.assertEqual(client.decode_value("[", common_pb2.JSON), "[")
+        self.assertEqual(client.decode_value("not a number", common_pb2.DOUBLE), "not a number")
+
+    def test_decode_columns(self):
+        keys = ["av-1", "bv-2", "name-3", "bad-4", "av-1"]
+        columns = common_pb2.GetColumns(
+            Values=[72.5, 1.0, float("nan"), float("nan")],
+            Errors=[0, 0, 0, common_pb2.GET_ERROR_TIMEOUT],
+            Text={2: "AHU-1 SAT"},
+            ErrorMsgs={3: "no response"},
+        )
+        values = client.decode_columns(keys, columns)
+        self.assertEqual(list(values), keys[:4])
+        self.assertEqual([values["av-1"], values["bv-2"], values["name-3"]], [72.5, 1.0, "AHU-1 SAT"])
+        self.assertEqual(values["bad-4"].error, common_pb2.GET_ERROR_TIMEOUT)
+
+        # a delta names the keys it holds
+        columns = common_pb2.GetColumns(Indexes=[1], Values=[0.0], Errors=[0])
+        self.assertEqual(client.decode_columns(keys, columns), {"bv-2": 0.0})
+        with self.assertRaises(client.HandleError):
+            client.decode_columns(keys, common_pb2.GetColumns(Error=common_pb2.SERVICE_ERROR_UNKNOWN_HANDLE))
+
+    def test_decode_handle(self):
+        self.assertEqual(client.decode_handle(common_pb2.RegisterKeysResponse(Handle="abc", Count=2)), "abc")
+        refused = common_pb2.RegisterKeysResponse(Error=common_pb2.SERVICE_ERROR_TOO_MANY_KEYS, ErrorMsg="too many")
+        with self.assertRaisesRegex(ValueError, "too many"):
+            client.decode_handle(refused)
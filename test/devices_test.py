@@ -0,0 +1,110 @@
+import unittest
+import asyncio
+
+from bacpypes3.apdu import IAmRequest
+from bacpypes3.pdu import Address
+from bacpypes3.primitivedata import ObjectIdentifier
+from bacpypes3.basetypes import Segmentation
+
+from src.devices import DeviceTable, DeviceNotFound
+
+def _i_am(instance:int, address:str, max_apdu:int=1476, segmentation=Segmentation.segmentedBoth) -> IAmRequest:
+    apdu = IAmRequest(
+        iAmDeviceIdentifier=ObjectIdentifier(f"device,{instance}"),
+        maxAPDULengthAccepted=max_apdu,
+        segmentationSupported=segmentation,
+        vendorID=15,
+    )
+    apdu.pduSource = Address(address)
+    return apdu
+
+class _FakeWhoIsApp:
+    """answers a Who-Is for the devices in `devices` (instance -> address)"""
+    def __init__(self, delay:float=0.01):
+        self.delay = delay
+        self.devices = {}
+        self.who_is_requests = []
+
+    async def who_is(self, low_limit=None, high_limit=None, address=None, timeout=None):
+        self.who_is_requests.append((low_limit, high_limit))
+        await asyncio.sleep(self.delay)
+        return [_i_am(i, a) for i, a in self.devices.items() if low_limit <= i <= high_limit]
+
+class TestDeviceTable(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.app = _FakeWhoIsApp()
+        self.table = DeviceTable(self.app)
+
+    async def asyncTearDown(self):
+        await self.table.close()
+
+    async def test_i_am(self):
+        entry = self.table.i_am(_i_am(100, "192.168.1.10:47809", 480, Segmentation.noSegmentation))
+        self.assertEqual(entry.address, "192.168.1.10:47809")
+        self.assertEqual((entry.max_apdu, entry.segmented(), entry.vendor_id), (480, False, 15))
+        self.assertIs(self.table.get(100), entry)
+        self.assertIs(self.table.by_address("192.168.1.10:47809"), entry)
+
+    async def test_moved(self):
+        moves = []
+        self.table.on_moved(lambda *move: moves.append(move))
+        self.table.i_am(_i_am(100, "192.168.1.10"))
+        self.table.i_am(_i_am(100, "192.168.1.10"))
+        self.table.i_am(_i_am(100, "192.168.1.20"))
+
+        self.assertEqual(moves, [(100, "192.168.1.10", "192.168.1.20")])
+        self.assertIsNone(self.table.by_address("192.168.1.10"))
+        self.assertEqual(self.table.get(100).address, "192.168.1.20")
+
+        # another device taking over the old address replaces it
+        self.table.i_am(_i_am(200, "192.168.1.20"))
+        self.assertIsNone(self.table.get(100))
+        self.assertEqual(self.table.stats()["moves"], 1)
+
+    async def test_same_i_am_counts_once(self):
+        moves = []
+        self.table.on_moved(lambda *move: moves.append(move))
+        self.table.i_am(_i_am(100, "192.168.1.10"))
+        apdu = _i_am(100, "192.168.1.20")
+        first = self.table.i_am(apdu)
+        self.assertIs(self.table.i_am(apdu), first)
+        self.assertEqual(moves, [(100, "192.168.1.10", "192.168.1.20")])
+        self.assertEqual(self.table.stats()["i_ams"], 2)
+
+        # the device announcing itself again is another I-Am
+        self.table.i_am(_i_am(100, "192.168.1.20"))
+        self.assertEqual(self.table.stats()["i_ams"], 3)
+
+    async def test_resolve_shares_one_who_is(self):
+        self.app.devices[100] = "192.168.1.10"
+        entries = await asyncio.gather(*(self.table.resolve(100) for _ in range(5)))
+        self.assertEqual({e.address for e in entries}, {"192.168.1.10"})
+        self.assertEqual(self.app.who_is_requests, [(100, 100)])
+
+        await self.table.resolve(100)
+        self.assertEqual(len(self.app.who_is_requests), 1)
+
+    async def test_missing_device_is_held_off(self):
+        with self.assertRaises(DeviceNotFound):
+            await self.table.resolve(100)
+        with self.assertRaises(DeviceNotFound):
+            await self.table.resolve(100)
+        self.assertEqual(len(self.app.who_is_requests), 1)
+        self.assertEqual(self.table.stats()["misses"], 1)
+
+        self.table.miss_holdoff = 0
+        self.app.devices[100] = "192.168.1.10"
+        entry = await self.table.resolve(100)
+        self.assertEqual(entry.address, "192.168.1.10")
+
+    async def test_expired_entry_is_confirmed(self):
+        self.table.ttl = 0.05
+        self.table.i_am(_i_am(100, "192.168.1.10"))
+        self.app.devices[100] = "192.168.1.30"
+        await asyncio.sleep(0.1)
+
+        # served while the who-is runs
+        self.assertEqual(self.table.get(100).address, "192.168.1.10")
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.table.get(100).address, "192.168.1.30")
+        self.assertEqual(len(self.app.who_is_requests), 1)
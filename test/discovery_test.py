@@ -0,0 +1,101 @@
+import unittest
+import asyncio
+from unittest import mock
+
+import src.discovery
+from src.discovery import DiscoverySweep
+from src.devices import DeviceTable
+from test.devices_test import _i_am
+
+class _FakeNetwork:
+    """answers Who-Is for `devices` (instance -> address) and records them"""
+    def __init__(self, devices:dict):
+        self.devices = devices
+        self.requests = []
+
+    async def who_is(self, low_limit=None, high_limit=None, address=None, timeout=None):
+        self.requests.append((asyncio.get_running_loop().time(), low_limit, high_limit))
+        await asyncio.sleep(0.001)
+        return [_i_am(i, a) for i, a in self.devices.items() if low_limit <= i <= high_limit]
+
+class _FakeClient:
+    def __init__(self, devices:dict):
+        self._app = _FakeNetwork(devices)
+        self.devices = DeviceTable(self._app)
+        self.latency = 0.0
+
+    def read_latency(self) -> float:
+        return self.latency
+
+class TestDiscoverySweep(unittest.IsolatedAsyncioTestCase):
+    def sweeper(self, devices:dict, **kwargs) -> DiscoverySweep:
+        self.client = _FakeClient(devices)
+        options = dict(start_width=100, max_width=1000, target_i_ams=4,
+                       response_window=0.01, max_rate=1000.0, max_i_am_rate=10000.0)
+        options.update(kwargs)
+        return DiscoverySweep(self.client, **options)
+
+    async def test_finds_every_device_once(self):
+        devices = {i: f"192.168.{i // 250}.{i % 250 + 1}" for i in (0, 5, 99, 100, 2500, 9999)}
+        sweep = self.sweeper(devices)
+        found = [entry.instance async for entry in sweep.sweep(0, 9999)]
+        self.assertEqual(found, sorted(devices))
+        self.assertEqual(len(self.client.devices), len(devices))
+
+        covered = [(low, high) for _, low, high in self.client._app.requests]
+        self.assertEqual(covered[0][0], 0)
+        self.assertEqual(covered[-1][1], 9999)
+        for (_, high), (low, _) in zip(covered, covered[1:]):
+            self.assertEqual(low, high + 1)
+        self.assertFalse(sweep.stats()["running"])
+
+    async def test_streams_as_it_goes(self):
+        sweep = self.sweeper({1: "192.168.1.1", 5000: "192.168.1.2"})
+        sweeping = sweep.sweep(0, 9999)
+        first = await anext(sweeping)
+        self.assertEqual(first.instance, 1)
+        self.assertEqual(sweep.stats()["position"], 0)
+        await sweeping.aclose()
+
+    async def test_width_adapts_to_density(self):
+        # a crowded block of 200 devices, then nothing
+        devices = {i: f"10.0.{i // 250}.{i % 250 + 1}" for i in range(0, 200)}
+        sweep = self.sweeper(devices)
+        [entry async for entry in sweep.sweep(0, 20000)]
+        widths = [high - low + 1 for _, low, high in self.client._app.requests]
+        self.assertEqual(widths[:3], [100, 50, 25])     # narrowed in the crowd
+        self.assertEqual(max(widths), 1000)             # widened after it
+
+    async def test_rate_is_capped(self):
+        sweep = self.sweeper({}, max_rate=50.0)
+        [entry async for entry in sweep.sweep(0, 4999)]
+        times = [t for t, _, _ in self.client._app.requests]
+        self.assertGreater(len(times), 3)
+        for earlier, later in zip(times, times[1:]):
+            self.assertGreaterEqual(later - earlier, 1 / 50.0 - 0.002)
+
+    async def test_waits_for_slow_reads(self):
+        sweep = self.sweeper({1: "192.168.1.1"}, latency_bound=0.5)
+        self.client.latency = 1.0
+        with mock.patch.object(src.discovery, "SWEEP_PAUSE", 0.01):
+            sweeping = asyncio.ensure_future(anext(sweep.sweep(0, 99)))
+            await asyncio.sleep(0.05)
+            self.assertEqual(self.client._app.requests, [])
+
+            self.client.latency = 0.1
+            entry = await sweeping
+        self.assertEqual(entry.instance, 1)
+        self.assertGreater(sweep.stats()["paused"], 0.0)
+
+    async def test_stalls_are_capped(self):
+        sweep = self.sweeper({1: "192.168.1.1"}, latency_bound=0.5, max_pause=0.2)
+        self.client.latency = 1.0
+        with mock.patch.object(src.discovery, "SWEEP_PAUSE", 0.01):
+            sweeping = asyncio.ensure_future(anext(sweep.sweep(0, 99)))
+            await asyncio.sleep(0.02)
+            self.assertTrue(sweep.stats()["stalled"])
+
+            # reads never speed up, the sweep goes on without them
+            entry = await asyncio.wait_for(sweeping, 2.0)
+        self.assertEqual(entry.instance, 1)
+        self.assertEqual((sweep.stats()["stalled"], sweep.stats()["stalls"]), (False, 1))
@@ -0,0 +1,82 @@
+import unittest
+import time
+
+import src.planner as planner
+from src.keysets import KeySetRegistry, KeySetNotFound, KeySetTooLarge
+
+def _keys(count:int, device:int=100) -> list[str]:
+    return [f"bacnet://192.168.1.10/{device}/analog-value,{i}/present-value" for i in range(1, count + 1)]
+
+class KeySetRegistryTest(unittest.TestCase):
+    def test_register_and_get(self):
+        registry = KeySetRegistry()
+        keys = _keys(3)
+        keyset = registry.register(keys + keys[:1] + ["bacnet://192.168.1.10/100"])
+        self.assertEqual(len(keyset), 4)
+        self.assertEqual([p.is_valid for p in keyset.points], [True, True, True, False])
+        self.assertIs(registry.get(keyset.handle), keyset)
+        self.assertNotEqual(registry.register(keys).handle, keyset.handle)
+        with self.assertRaises(KeySetNotFound):
+            registry.get("no such handle")
+        self.assertEqual(registry.stats()["misses"], 1)
+
+    def test_lease(self):
+        registry = KeySetRegistry(ttl=0.05)
+        self.assertEqual(registry.register(_keys(1), ttl=60).ttl, 0.05)
+        short = registry.register(_keys(1), ttl=0.02)
+        kept = registry.register(_keys(1))
+        time.sleep(0.03)
+        registry.get(kept.handle)   # renewed
+        with self.assertRaises(KeySetNotFound):
+            registry.get(short.handle)
+        time.sleep(0.03)
+        self.assertIs(registry.get(kept.handle), kept)
+        time.sleep(0.06)
+        registry.expire()
+        self.assertEqual(len(registry), 0)
+        self.assertEqual(registry.stats()["expirations"], 3)
+
+    def test_lru_limits(self):
+        registry = KeySetRegistry(max_sets=2, max_keys=10)
+        first = registry.register(_keys(4))
+        second = registry.register(_keys(4))
+        registry.get(first.handle)
+        registry.register(_keys(1))
+        self.assertIs(registry.get(first.handle), first)
+        with self.assertRaises(KeySetNotFound):
+            registry.get(second.handle)
+
+        # too many keys evicts the least recently used sets
+        big = registry.register(_keys(10))
+        self.assertEqual(len(registry), 1)
+        self.assertIs(registry.get(big.handle), big)
+        self.assertEqual(registry.stats()["evictions"], 3)
+        self.assertEqual(registry.stats()["keys"], 10)
+
+        # a set over the limit on its own is refused, keeping the others
+        with self.assertRaises(KeySetTooLarge):
+            registry.register(_keys(11))
+        self.assertIs(registry.get(big.handle), big)
+        self.assertEqual((registry.stats()["keys"], registry.stats()["refused"]), (10, 1))
+
+        self.assertTrue(registry.release(big.handle))
+        self.assertFalse(registry.release(big.handle))
+        self.assertEqual(registry.stats()["keys"], 0)
+
+    def test_plan_is_reused(self):
+        keyset = KeySetRegistry().register(_keys(100) + _keys(10, device=200))
+        caps = {"192.168.1.10": planner.DeviceCaps(planner.MAX_APDU)}
+        batches = keyset.plan(keyset.points, lambda address: caps[address])
+        self.assertEqual(sum(len(b) for b in batches), 110)
+        self.assertIs(keyset.plan(keyset.points, lambda address: caps[address]), batches)
+        self.assertEqual(keyset.replans, 1)
+
+        # another subset of the points, or a device that turns out smaller,
+        # is planned again
+        self.assertEqual(len(keyset.plan(keyset.points[:1], lambda address: caps[address])), 1)
+        batches = keyset.plan(keyset.points, lambda address: caps[address])
+        caps["192.168.1.10"] = planner.DeviceCaps(planner.DEFAULT_MAX_APDU)
+        smaller = keyset.plan(keyset.points, lambda address: caps[address])
+        self.assertIsNot(smaller, batches)
+        self.assertGreater(len(smaller), len(batches))
+        self.assertEqual(keyset.replans, 4)
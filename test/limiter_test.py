@@ -0,0 +1,68 @@
+import unittest
+import asyncio
+
+from src.limiter import ConcurrencyLimiter, MAX_INVOKE_IDS
+
+class LimiterTest(unittest.IsolatedAsyncioTestCase):
+    async def hold(self, limiter:ConcurrencyLimiter, address:str, seconds:float, done:list):
+        async with limiter.slot(address):
+            await asyncio.sleep(seconds)
+        done.append(address)
+
+    async def test_device_limit(self):
+        limiter = ConcurrencyLimiter(global_limit=8, network_limit=8, device_limit=2)
+        done = []
+        tasks = [asyncio.create_task(self.hold(limiter, "192.168.1.10", 0.05, done)) for _ in range(4)]
+        await asyncio.sleep(0.01)
+        self.assertEqual(limiter.in_flight("192.168.1.10"), 2)
+        await asyncio.gather(*tasks)
+        self.assertEqual(len(done), 4)
+        self.assertGreater(limiter.stats()["max_wait"], 0.0)
+
+    async def test_slow_device_does_not_starve_others(self):
+        limiter = ConcurrencyLimiter(global_limit=4, network_limit=4, device_limit=2)
+        done = []
+        slow = [asyncio.create_task(self.hold(limiter, "192.168.1.10", 0.5, done)) for _ in range(8)]
+        await asyncio.sleep(0.01)
+        await asyncio.wait_for(self.hold(limiter, "192.168.1.11", 0.01, done), 0.2)
+        self.assertEqual(done, ["192.168.1.11"])
+        for t in slow:
+            t.cancel()
+        await asyncio.gather(*slow, return_exceptions=True)
+
+    async def test_network_limit(self):
+        limiter = ConcurrencyLimiter(global_limit=8, network_limit=1, device_limit=2)
+        done = []
+        remote = asyncio.create_task(self.hold(limiter, "2:5", 0.5, done))
+        await asyncio.sleep(0.01)
+
+        # another device on the same remote network waits, the local one does not
+        blocked = asyncio.create_task(self.hold(limiter, "2:6", 0.01, done))
+        await asyncio.wait_for(self.hold(limiter, "192.168.1.11", 0.01, done), 0.2)
+        self.assertEqual(done, ["192.168.1.11"])
+        self.assertEqual(limiter.stats()["networks"][2], (1, 1))
+
+        remote.cancel()
+        await asyncio.gather(remote, blocked, return_exceptions=True)
+        self.assertEqual(limiter.stats()["networks"], {})
+        self.assertEqual(limiter.stats()["devices"], {})
+
+    async def test_dead_local_devices(self):
+        limiter = ConcurrencyLimiter(global_limit=16, network_limit=4, device_limit=2)
+        done = []
+        stalled = [asyncio.create_task(self.hold(limiter, address, 5, done))
+                   for address in ("192.168.1.10", "192.168.1.11") for _ in range(4)]
+        await asyncio.sleep(0.01)
+
+        # both hold all they may, which would be every slot of a remote network
+        await asyncio.wait_for(self.hold(limiter, "192.168.1.12", 0.01, done), 0.2)
+        self.assertEqual(done, ["192.168.1.12"])
+        self.assertEqual(limiter.stats()["networks"][0], (4, 4))
+
+        for t in stalled:
+            t.cancel()
+        await asyncio.gather(*stalled, return_exceptions=True)
+
+    async def test_invoke_id_cap(self):
+        limiter = ConcurrencyLimiter(device_limit=1000)
+        self.assertEqual(limiter.device_limit, MAX_INVOKE_IDS)
@@ -1,5 +1,5 @@
 import unittest
-from src.parse import ParseBacnetPtKey
+from src.parse import ParseBacnetPtKey, ParseKey
 
 class ParseTest(unittest.TestCase):
     def setUp(self):
@@ -16,4 +16,41 @@ class ParseTest(unittest.TestCase):
         for k in self.test_keys:
             params = ParseBacnetPtKey(k)
             print(repr(params))
-            
\ No newline at end of file
+            
+
+class ParseKeyTest(unittest.TestCase):
+    def test_parse_key(self):
+        key = ParseKey("bacnet://192.168.1.23:47809/123/analog-value,19/priority-array/3")
+        self.assertTrue(key.is_valid)
+        self.assertEqual(key.cache_key, ("192.168.1.23:47809", "analog-value,19", "priority-array", 3))
+        self.assertEqual(key.device_instance, 123)
+        self.assertEqual(str(key.object_id), "analog-value,19")
+        self.assertEqual(key.property_reference.propertyArrayIndex, 3)
+
+    def test_memoized_and_immutable(self):
+        uri = "bacnet://192.168.1.23/123/analog-value,19/present-value"
+        key = ParseKey(uri)
+        self.assertIs(ParseKey(uri), key)
+        with self.assertRaises(AttributeError):
+            key.value = 1
+
+        written = key.WithValue("72.5", 8)
+        self.assertEqual((written.value, written.priority), ("72.5", 8))
+        self.assertIsNone(key.value)
+        self.assertEqual(written.cache_key, key.cache_key)
+
+    def test_invalid_keys(self):
+        for uri in ["bacnet://192.168.1.23/123", "bacnet://192.168.1.23/123/no-such-type,1/present-value", "junk"]:
+            self.assertFalse(ParseKey(uri).is_valid, uri)
+
+    def test_by_instance(self):
+        key = ParseKey("bacnet://device/1234/analog-value,19/present-value")
+        self.assertTrue(key.by_instance)
+        self.assertFalse(key.is_valid)
+        self.assertEqual(key.device_instance, 1234)
+
+        routed = key.WithAddress("192.168.1.23")
+        self.assertTrue(routed.is_valid)
+        self.assertFalse(routed.by_instance)
+        self.assertEqual(routed.cache_key, ("192.168.1.23", "analog-value,19", "present-value", None))
+        self.assertEqual(routed.device_instance, 1234)
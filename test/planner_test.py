@@ -0,0 +1,74 @@
+import unittest
+
+from src.parse import ParseKey
+from src.planner import DeviceCaps, PlanReads, PlanWrites, ReadBatch, MAX_PROPERTIES
+
+def _keys(host:str, count:int, prop:str="present-value") -> list[str]:
+    return [f"bacnet://{host}/100/analog-input,{i}/{prop}" for i in range(1, count+1)]
+
+class PlannerTest(unittest.TestCase):
+    def test_one_device_one_batch(self):
+        points = [ParseKey(k) for k in _keys("192.168.1.10", 40)]
+        batches = PlanReads(points, lambda addr: DeviceCaps(max_apdu=1476))
+        self.assertEqual(len(batches), 1)
+        self.assertEqual(batches[0].Items(), points)
+
+    def test_groups_by_address(self):
+        points = [ParseKey(k) for k in _keys("192.168.1.10", 3) + _keys("192.168.1.11", 3)]
+        batches = PlanReads(points, lambda addr: DeviceCaps())
+        self.assertEqual([b.address for b in batches], ["192.168.1.10", "192.168.1.11"])
+        self.assertEqual([len(b) for b in batches], [3, 3])
+
+    def test_packs_to_max_apdu(self):
+        points = [ParseKey(k) for k in _keys("192.168.1.10", 40)]
+        batches = PlanReads(points, lambda addr: DeviceCaps(max_apdu=128))
+        self.assertGreater(len(batches), 1)
+        for b in batches:
+            self.assertLessEqual(b.size, 128)
+        self.assertEqual([p for b in batches for p in b.Items()], points)
+
+    def test_segmentation_allows_larger_batches(self):
+        points = [ParseKey(k) for k in _keys("192.168.1.10", 40)]
+        unsegmented = PlanReads(points, lambda addr: DeviceCaps(max_apdu=206))
+        segmented = PlanReads(points, lambda addr: DeviceCaps(max_apdu=206, segmented=True))
+        self.assertLess(len(segmented), len(unsegmented))
+
+    def test_property_cap(self):
+        points = [ParseKey(k) for k in _keys("192.168.1.10", MAX_PROPERTIES + 1)]
+        batches = PlanReads(points, lambda addr: DeviceCaps(max_apdu=1476, segmented=True))
+        self.assertEqual([len(b) for b in batches], [MAX_PROPERTIES, 1])
+
+    def test_array_elements_are_single_values(self):
+        device = ParseKey("bacnet://192.168.1.10/100/device,100/object-list")
+        points = [device.WithPoint("device,100", "object-list", i) for i in range(1, 201)]
+        batches = PlanReads(points, lambda addr: DeviceCaps(max_apdu=480))
+        self.assertLess(len(batches), 10)
+        for b in batches:
+            self.assertLessEqual(b.size, 480)
+
+    def test_no_rpm_single_reads(self):
+        points = [ParseKey(k) for k in _keys("192.168.1.10", 5)]
+        batches = PlanReads(points, lambda addr: DeviceCaps(rpm=False))
+        self.assertEqual([len(b) for b in batches], [1] * 5)
+
+    def test_parameter_list_groups_objects(self):
+        batch = ReadBatch("192.168.1.10", 1476)
+        for k in ["bacnet://192.168.1.10/100/analog-input,1/present-value",
+                  "bacnet://192.168.1.10/100/analog-input,2/present-value",
+                  "bacnet://192.168.1.10/100/analog-input,1/status-flags"]:
+            batch.Add(ParseKey(k))
+        self.assertEqual(
+            [str(x) if i % 2 == 0 else [str(r.propertyIdentifier) for r in x] for i, x in enumerate(batch.ParameterList())],
+            ["analog-input,1", ["present-value", "status-flags"], "analog-input,2", ["present-value"]],
+        )
+        self.assertEqual([p.property for p in batch.Items()], ["present-value", "status-flags", "present-value"])
+
+    def test_plan_writes(self):
+        points = [ParseKey(k).WithValue("72.5") for k in _keys("192.168.1.10", 40)]
+        batches = PlanWrites(points, lambda addr: DeviceCaps(max_apdu=128, segmented=True))
+        self.assertGreater(len(batches), 1)
+        for b in batches:
+            self.assertLessEqual(b.size, 128)
+
+        batches = PlanWrites(points, lambda addr: DeviceCaps(wpm=False))
+        self.assertEqual(len(batches), 40)
@@ -0,0 +1,125 @@
+import unittest
+import asyncio
+import os
+import tempfile
+
+import src.scheduler
+from src.cache import ValueCache
+from src.scheduler import ScanScheduler
+
+class _FakeClient:
+    def __init__(self, delay:float=0.0):
+        self.delay = delay
+        self.reads:list[list] = []
+        self.cache = ValueCache()
+
+    def _route(self, params):
+        return params
+
+    async def _read_and_cache(self, points):
+        self.reads.append([p.object_identifier for p in points])
+        await asyncio.sleep(self.delay)
+
+def _key(address:str, instance:int) -> str:
+    return f"bacnet://{address}/100/analog-input,{instance}/present-value"
+
+class SchedulerTest(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.min_interval = src.scheduler.MIN_INTERVAL
+        src.scheduler.MIN_INTERVAL = 0.01
+
+    def tearDown(self):
+        src.scheduler.MIN_INTERVAL = self.min_interval
+
+    async def test_groups_by_device_and_rate(self):
+        scheduler = ScanScheduler(_FakeClient())
+        for i in range(1, 4):
+            scheduler.set_rate(_key("192.168.1.10", i), 0.1)
+        scheduler.set_rate(_key("192.168.1.10", 4), 0.2)
+        scheduler.set_rate(_key("192.168.1.11", 1), 0.1)
+
+        groups = scheduler._groups
+        self.assertEqual(len(groups), 3)
+        self.assertEqual(len(groups[("192.168.1.10", 0.1)].points), 3)
+        for group in groups.values():
+            self.assertTrue(0 <= group.phase < group.interval)
+
+        scheduler.set_rate(_key("192.168.1.10", 4), 0)
+        self.assertEqual(len(groups), 2)
+        self.assertEqual(scheduler.rate(_key("192.168.1.10", 4)), 0.0)
+        await scheduler.close()
+
+    async def test_ttls(self):
+        client = _FakeClient()
+        scheduler = ScanScheduler(client)
+        cache_key = ("192.168.1.10", "analog-input,1", "present-value", None)
+        scheduler.set_rate(_key("192.168.1.10", 1), 60)
+        self.assertEqual(client.cache.TTL(cache_key), 60 * (1 + src.scheduler.TTL_MARGIN))
+
+        # a rate change moves it, stopping the scan restores the default
+        scheduler.set_rate(_key("192.168.1.10", 1), 10)
+        self.assertEqual(client.cache.TTL(cache_key), 10 * (1 + src.scheduler.TTL_MARGIN))
+        scheduler.set_rate(_key("192.168.1.10", 1), 0)
+        self.assertEqual(client.cache.TTL(cache_key), client.cache.ttl)
+
+        # a longer ttl given by someone else wins while both hold
+        client.cache.SetTTL(cache_key, 300, owner="cov")
+        scheduler.set_rate(_key("192.168.1.10", 1), 60)
+        self.assertEqual(client.cache.TTL(cache_key), 300)
+        await scheduler.close()
+        self.assertEqual(client.cache.TTL(cache_key), 300)
+
+    async def test_scans_points_together(self):
+        client = _FakeClient()
+        scheduler = ScanScheduler(client)
+        for i in range(1, 4):
+            scheduler.set_rate(_key("192.168.1.10", i), 0.05)
+        await asyncio.sleep(0.18)
+        await scheduler.close()
+
+        self.assertGreaterEqual(len(client.reads), 3)
+        for read in client.reads:
+            self.assertEqual(len(read), 3)
+
+    async def test_overruns(self):
+        client = _FakeClient(delay=0.12)
+        scheduler = ScanScheduler(client)
+        key = _key("192.168.1.10", 1)
+        scheduler.set_rate(key, 0.05)
+        await asyncio.sleep(0.3)
+
+        stats = scheduler.stats()["groups"]["192.168.1.10@0.05"]
+        self.assertGreaterEqual(stats["overruns"], 1)
+        self.assertGreaterEqual(stats["missed"], 2)
+        self.assertLessEqual(stats["scans"], 3)
+        await scheduler.close()
+
+    async def test_invalid_rates(self):
+        scheduler = ScanScheduler(_FakeClient())
+        with self.assertRaises(ValueError):
+            scheduler.set_rate(_key("192.168.1.10", 1), -1)
+        with self.assertRaises(ValueError):
+            scheduler.set_rate(_key("192.168.1.10", 1), 0.001)
+        with self.assertRaises(ValueError):
+            scheduler.set_rate("bacnet://192.168.1.10/100", 5)
+
+    async def test_rates_file(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "rates.json")
+            scheduler = ScanScheduler(_FakeClient(), rates_file=path)
+            scheduler.set_rate(_key("192.168.1.10", 1), 60)
+            await scheduler.close()
+
+            scheduler = ScanScheduler(_FakeClient(), rates_file=path)
+            await scheduler.refresh()
+            self.assertEqual(scheduler.rates(), {_key("192.168.1.10", 1): 60})
+            await scheduler.close()
+
+            # a bulk update is validated key by key and saved once
+            saves = []
+            scheduler._save = lambda: saves.append(scheduler.rates())
+            errors = scheduler.set_rates({_key("192.168.1.10", i): 60 for i in range(2, 102)} | {"bacnet://192.168.1.10/100": 60})
+            self.assertEqual(list(errors), ["bacnet://192.168.1.10/100"])
+            self.assertEqual(len(saves), 1)
+            self.assertEqual(len(saves[0]), 100)
+            await scheduler.close()
@@ -1,13 +1,40 @@
 import unittest
 import asyncio
+import json
+import math
+import struct
+import time
 import grpc
 
 from bacpypes3.settings import settings
+from bacpypes3.app import DeviceInfoCache
+from bacpypes3.apdu import (
+    RejectPDU,
+    RejectReason,
+    AbortPDU,
+    AbortReason,
+    WritePropertyMultipleRequest,
+    WritePropertyMultipleError,
+)
+from bacpypes3.basetypes import (
+    BinaryPV, DateTime, EngineeringUnits, ErrorType, ObjectPropertyReference, PriorityArray,
+    PriorityValue, PropertyReference, Segmentation, StatusFlags,
+)
+from bacpypes3.vendor import get_vendor_info
+from bacpypes3.primitivedata import (
+    Boolean, CharacterString, Date, Double, Null, ObjectIdentifier, OctetString, PropertyIdentifier,
+    Real, Time, Unsigned,
+)
 
 import src.common_pb2_grpc as common_pb2_grpc
 import src.common_pb2 as common_pb2
 import src.server
+import src.parse
+import src.planner
+import src.scheduler
 import src.app
+from src.cache import ValueCache
+from test.devices_test import _i_am
 
 import random
 
@@ -116,4 +143,816 @@ class TestServerWrite((unittest.IsolatedAsyncioTestCase)):
                 value = float(value)
                 print(f"key='{pair.Key}', value={float(value):.3f}, time={pair.time.ToDatetime()}")
 
-        await _main_task
\ No newline at end of file
+        await _main_task
+
+def _property_reference(ref) -> tuple:
+    """split a property reference given to read_property_multiple into its
+    property identifier and array index, like bacpypes3"""
+    if isinstance(ref, PropertyReference):
+        return ref.propertyIdentifier, ref.propertyArrayIndex
+    if isinstance(ref, PropertyIdentifier):
+        return ref, None
+    if isinstance(ref, str):
+        prop, _, index = ref.partition("[")
+        return PropertyIdentifier(prop), (int(index.rstrip("]")) if index else None)
+    raise TypeError(f"invalid property reference: {ref!r}")
+
+class _FakeApp:
+    """stands in for a bacpypes3 Application and records the traffic it sees.
+    every point reads back as its object instance number plus `offset`,
+    analog-inputs are read-only and other objects remember what is written
+    to them. nothing supports COV. devices in `devices` (instance -> address)
+    answer a Who-Is.
+    """
+    def __init__(self, delay:float=0.05, rpm:bool=True, wpm:bool=True):
+        self.device_info_cache = DeviceInfoCache()
+        self.delay = delay
+        self.rpm = rpm
+        self.wpm = wpm
+        self.max_wpm = None     # writes a WPM may carry before it is aborted as too long
+        self.written = {}
+        self.requests = 0
+        self.in_flight = 0
+        self.max_in_flight = 0
+        self.offset = 0
+        self.devices = {}
+        self.addresses = []
+
+    async def _request(self, address=None):
+        self.addresses.append(str(address))
+        self.requests += 1
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+
+    async def read_property(self, address, objid, prop, array_index=None):
+        await self._request(address)
+        return Real(objid[1] + self.offset)
+
+    async def read_property_multiple(self, address, parameter_list):
+        await self._request(address)
+        if not self.rpm:
+            raise RejectPDU(reason=RejectReason.unrecognizedService)
+        # unpack the parameter list the way bacpypes3 does, a flat list of
+        # object identifiers each followed by its property references
+        results = []
+        while parameter_list:
+            obj_id, refs, *parameter_list = parameter_list
+            if isinstance(obj_id, str):
+                obj_id = ObjectIdentifier(obj_id)
+            elif not isinstance(obj_id, ObjectIdentifier):
+                raise TypeError("objid")
+            for ref in refs:
+                prop, index = _property_reference(ref)
+                results.append((obj_id, prop, index, Real(obj_id[1] + self.offset)))
+        return results
+
+    def change_of_value(self, address, objid, issue_confirmed_notifications=True, lifetime=None):
+        raise RejectPDU(reason=RejectReason.unrecognizedService)
+
+    async def get_vendor_info(self, device_address=None):
+        return get_vendor_info(0)
+
+    async def who_is(self, low_limit=None, high_limit=None, address=None, timeout=None):
+        await asyncio.sleep(self.delay)
+        return [_i_am(i, a) for i, a in self.devices.items() if low_limit <= i <= high_limit]
+
+    def close(self):
+        pass
+
+    async def write_property(self, address, objid, prop, value, array_index=None, priority=None):
+        await self._request(address)
+        self.written[str(objid)] = float(value)
+
+    async def request(self, apdu:WritePropertyMultipleRequest):
+        await self._request(apdu.pduDestination)
+        if not self.wpm:
+            raise RejectPDU(reason=RejectReason.unrecognizedService)
+        if (self.max_wpm is not None) and (sum(len(spec.listOfProperties) for spec in apdu.listOfWriteAccessSpecs) > self.max_wpm):
+            raise AbortPDU(reason=AbortReason.apduTooLong)
+        for spec in apdu.listOfWriteAccessSpecs:
+            for prop in spec.listOfProperties:
+                if str(spec.objectIdentifier[0]) == "analog-input":
+                    raise WritePropertyMultipleError(
+                        errorType=ErrorType(errorClass="property", errorCode="writeAccessDenied"),
+                        firstFailedWriteAttempt=ObjectPropertyReference(
+                            objectIdentifier=spec.objectIdentifier,
+                            propertyIdentifier=prop.propertyIdentifier,
+                        ),
+                    )
+                self.written[str(spec.objectIdentifier)] = prop.value.cast_out(Real)
+
+class TestServerGetBatching((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.keys = [f"bacnet://192.168.1.10/100/analog-input,{i}/present-value" for i in range(1, 41)]
+        self.server = src.server.BACnetRPCServer()
+
+    async def asyncTearDown(self):
+        src.app.BACnetClient._instance = None
+
+    def use_app(self, fake_app:_FakeApp):
+        # no caching so every Get goes to the fake device
+        src.app.BACnetClient._instance = src.app.BACnetClient(fake_app, cache=ValueCache(ttl=0))
+
+    def check_values(self, resp:common_pb2.GetResponse, keys:list[str]):
+        self.assertEqual([p.Key for p in resp.Pairs], keys)
+        for pair in resp.Pairs:
+            params = src.parse.ParseKey(pair.Key)
+            self.assertEqual(float(pair.Value), float(params.object_id[1]))
+
+    async def test_get_batches_with_rpm(self):
+        fake_app = _FakeApp()
+        self.use_app(fake_app)
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=self.keys), None)
+        self.assertLessEqual(fake_app.requests, 2)
+        self.check_values(resp, self.keys)
+
+    async def test_get_falls_back_without_rpm(self):
+        fake_app = _FakeApp(rpm=False)
+        self.use_app(fake_app)
+        keys = list(reversed(self.keys))
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=keys), None)
+        self.assertGreater(fake_app.max_in_flight, 1)
+        self.check_values(resp, keys)
+
+        # the device is remembered as not supporting RPM
+        fake_app.requests = 0
+        await self.server.Get(common_pb2.GetRequest(Keys=keys), None)
+        self.assertEqual(fake_app.requests, len(keys))
+
+    async def test_rpm_that_cannot_be_sent(self):
+        fake_app = _FakeApp()
+        self.use_app(fake_app)
+        async def read_property_multiple(address, parameter_list):
+            raise TypeError("objid")
+        fake_app.read_property_multiple = read_property_multiple
+
+        # every point of the batch gets the error, the call doesn't fail
+        points = [src.parse.ParseKey(k) for k in self.keys[:3]]
+        batch, = src.planner.PlanReads(points, lambda address: src.planner.DeviceCaps())
+        values = await src.app.BACnetClient.get().read_batch(batch)
+        self.assertEqual([type(v) for v in values], [TypeError] * 3)
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=self.keys[:3]), None)
+        self.assertEqual([p.Error for p in resp.Pairs], [common_pb2.GET_ERROR_UNSPECIFIED] * 3)
+
+class TestServerSetBatching((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.server = src.server.BACnetRPCServer()
+
+    async def asyncTearDown(self):
+        src.app.BACnetClient._instance = None
+
+    def use_app(self, fake_app:_FakeApp):
+        src.app.BACnetClient._instance = src.app.BACnetClient(fake_app)
+
+    def set_request(self, objects:list[str]) -> common_pb2.SetRequest:
+        return common_pb2.SetRequest(Pairs=[
+            common_pb2.SetPair(Key=f"bacnet://192.168.1.10/100/{obj}/present-value", Value=str(70.0 + i))
+            for i, obj in enumerate(objects)
+        ])
+
+    async def test_set_batches_with_wpm(self):
+        fake_app = _FakeApp()
+        self.use_app(fake_app)
+        objects = [f"analog-value,{i}" for i in range(1, 11)]
+        resp:common_pb2.SetResponse = await self.server.Set(self.set_request(objects), None)
+        self.assertEqual(fake_app.requests, 1)
+        self.assertTrue(all(p.Ok for p in resp.Pairs))
+        self.assertEqual([fake_app.written[o] for o in objects], [70.0 + i for i in range(10)])
+
+    async def test_set_reports_failed_pairs(self):
+        fake_app = _FakeApp()
+        self.use_app(fake_app)
+        objects = ["analog-value,1", "analog-input,2", "analog-value,3"]
+        resp:common_pb2.SetResponse = await self.server.Set(self.set_request(objects), None)
+        self.assertEqual([p.Key for p in resp.Pairs], [p.Key for p in self.set_request(objects).Pairs])
+        self.assertEqual([p.Ok for p in resp.Pairs], [True, False, True])
+        self.assertEqual(resp.Pairs[1].Error, common_pb2.SET_ERROR_READ_ONLY)
+        self.assertIn("write-access-denied", resp.Pairs[1].ErrorMsg)
+        self.assertEqual(fake_app.written, {"analog-value,1": 70.0, "analog-value,3": 72.0})
+
+    async def test_set_falls_back_without_wpm(self):
+        fake_app = _FakeApp(wpm=False)
+        self.use_app(fake_app)
+        objects = [f"analog-value,{i}" for i in range(1, 6)]
+        resp:common_pb2.SetResponse = await self.server.Set(self.set_request(objects), None)
+        self.assertEqual(fake_app.requests, 1 + len(objects))
+        self.assertTrue(all(p.Ok for p in resp.Pairs))
+        self.assertEqual(len(fake_app.written), len(objects))
+
+    async def test_set_splits_oversized_wpm(self):
+        fake_app = _FakeApp()
+        fake_app.max_wpm = 3
+        self.use_app(fake_app)
+        objects = [f"analog-value,{i}" for i in range(1, 11)]
+        request = self.set_request(objects)
+        resp:common_pb2.SetResponse = await self.server.Set(request, None)
+        self.assertTrue(all(p.Ok for p in resp.Pairs))
+        self.assertEqual([fake_app.written[o] for o in objects], [70.0 + i for i in range(10)])
+
+        # 10 and both 5s are aborted, the 2s and 3s are written, none singly
+        self.assertEqual(fake_app.requests, 7)
+
+        # the request is left as it came
+        self.assertEqual(request, self.set_request(objects))
+
+    async def test_set_failure_stays_with_its_device(self):
+        fake_app = _FakeApp()
+        self.use_app(fake_app)
+        request = fake_app.request
+        async def broken_stack(apdu):
+            if str(apdu.pduDestination) == "192.168.1.11":
+                raise RuntimeError("stack broke")
+            await request(apdu)
+        fake_app.request = broken_stack
+        req = common_pb2.SetRequest(Pairs=[
+            common_pb2.SetPair(Key=f"bacnet://{address}/100/analog-value,{i}/present-value", Value="70")
+            for address in ("192.168.1.10", "192.168.1.11") for i in (1, 2)
+        ])
+        resp:common_pb2.SetResponse = await self.server.Set(req, None)
+        self.assertEqual([p.Ok for p in resp.Pairs], [True, True, False, False])
+        self.assertEqual(resp.Pairs[2].Error, common_pb2.SET_ERROR_UNSPECIFIED)
+        self.assertIn("stack broke", resp.Pairs[3].ErrorMsg)
+
+    async def test_set_invalid_key(self):
+        self.use_app(_FakeApp())
+        req = common_pb2.SetRequest(Pairs=[common_pb2.SetPair(Key="bacnet://192.168.1.10/100", Value="1")])
+        resp:common_pb2.SetResponse = await self.server.Set(req, None)
+        self.assertFalse(resp.Pairs[0].Ok)
+        self.assertEqual(resp.Pairs[0].Error, common_pb2.SET_ERROR_COULD_NOT_RESOLVE_XREF)
+
+class TestServerGetCache((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.server = src.server.BACnetRPCServer()
+        self.keys = [f"bacnet://192.168.1.10/100/analog-value,{i}/present-value" for i in range(1, 6)]
+
+    async def asyncTearDown(self):
+        src.app.BACnetClient._instance = None
+
+    def use_app(self, fake_app:_FakeApp, cache:ValueCache) -> src.app.BACnetClient:
+        client = src.app.BACnetClient._instance = src.app.BACnetClient(fake_app, cache=cache)
+        return client
+
+    async def test_repeated_get_hits_cache(self):
+        fake_app = _FakeApp(delay=0.01)
+        client = self.use_app(fake_app, ValueCache(ttl=60))
+        await self.server.Get(common_pb2.GetRequest(Keys=self.keys), None)
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=self.keys), None)
+        self.assertEqual(fake_app.requests, 1)
+        self.assertEqual(len(resp.Pairs), len(self.keys))
+        self.assertEqual(client.cache_stats()["hits"], len(self.keys))
+
+    async def test_stale_value_is_served_and_refreshed(self):
+        fake_app = _FakeApp(delay=0.01)
+        client = self.use_app(fake_app, ValueCache(ttl=0.05, max_stale=60))
+        await self.server.Get(common_pb2.GetRequest(Keys=self.keys), None)
+        await asyncio.sleep(0.1)
+
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=self.keys), None)
+        self.assertEqual(len(resp.Pairs), len(self.keys))
+        self.assertEqual(client.cache_stats()["stale_hits"], len(self.keys))
+        self.assertEqual(fake_app.requests, 1)
+
+        # the background refresh lands without another Get
+        await asyncio.sleep(0.05)
+        self.assertEqual(fake_app.requests, 2)
+
+    async def test_set_invalidates(self):
+        fake_app = _FakeApp(delay=0.01)
+        self.use_app(fake_app, ValueCache(ttl=60))
+        await self.server.Get(common_pb2.GetRequest(Keys=self.keys[:1]), None)
+        await self.server.Set(common_pb2.SetRequest(Pairs=[common_pb2.SetPair(Key=self.keys[0], Value="42")]), None)
+        fake_app.requests = 0
+        await self.server.Get(common_pb2.GetRequest(Keys=self.keys[:1]), None)
+        self.assertEqual(fake_app.requests, 1)
+
+    async def test_get_since(self):
+        fake_app = _FakeApp(delay=0.01)
+        self.use_app(fake_app, ValueCache(ttl=0.01, max_stale=0))
+
+        async def get(since:str=None) -> common_pb2.GetResponse:
+            await asyncio.sleep(0.02)   # every Get reads the device again
+            return await self.server.Get(common_pb2.GetRequest(Keys=self.keys, Since=since), None)
+
+        resp = await get()
+        self.assertEqual(len(resp.Pairs), 5)
+        resp = await get(resp.Version)
+        self.assertEqual((len(resp.Pairs), resp.Unchanged), (0, 5))
+
+        # a write is a change, whatever is read back
+        await self.server.Set(common_pb2.SetRequest(Pairs=[common_pb2.SetPair(Key=self.keys[0], Value="1")]), None)
+        resp = await get(resp.Version)
+        self.assertEqual([p.Key for p in resp.Pairs], self.keys[:1])
+        self.assertEqual(resp.Unchanged, 4)
+
+        fake_app.offset = 10
+        resp = await get(resp.Version)
+        self.assertEqual([float(p.Value) for p in resp.Pairs], [11.0, 12.0, 13.0, 14.0, 15.0])
+        self.assertEqual(len((await get("restarted.1")).Pairs), 5)
+
+        # a registered key set's changes, the same way
+        handle = (await self.server.RegisterKeys(common_pb2.RegisterKeysRequest(Keys=self.keys), None)).Handle
+        resp = await self.server.GetKeySet(common_pb2.KeySetRequest(Handle=handle, Since=resp.Version), None)
+        self.assertEqual((len(resp.Pairs), resp.Unchanged), (0, 5))
+
+    async def test_errors_are_not_cached(self):
+        fake_app = _FakeApp(delay=0.01)
+        self.use_app(fake_app, ValueCache(ttl=60))
+        key = "bacnet://192.168.1.10/100/analog-value,1/present-value"
+
+        async def fail(*args, **kwargs):
+            fake_app.requests += 1
+            raise AbortPDU(reason=AbortReason.noResponse)
+        fake_app.read_property = fail
+
+        for _ in range(2):
+            resp = await self.server.Get(common_pb2.GetRequest(Keys=[key]), None)
+            self.assertEqual(resp.Pairs[0].Error, common_pb2.GET_ERROR_TIMEOUT)
+        self.assertEqual(fake_app.requests, 2)
+
+class TestServerKeySets((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.server = src.server.BACnetRPCServer()
+        self.keys = [f"bacnet://192.168.1.10/100/analog-value,{i}/present-value" for i in range(1, 41)]
+        self.fake_app = _FakeApp(delay=0.01)
+        self.client = src.app.BACnetClient._instance = src.app.BACnetClient(self.fake_app, cache=ValueCache(ttl=0))
+
+    async def asyncTearDown(self):
+        src.app.BACnetClient._instance = None
+
+    async def test_get_by_handle(self):
+        keys = self.keys + self.keys[:2] + ["bacnet://192.168.1.10/100"]
+        registered = await self.server.RegisterKeys(common_pb2.RegisterKeysRequest(Keys=keys, Ttl=60), None)
+        self.assertEqual(registered.Count, 41)
+        self.assertEqual(registered.Ttl, 60)
+
+        for _ in range(3):
+            resp = await self.server.GetKeySet(common_pb2.KeySetRequest(Handle=registered.Handle), None)
+            self.assertEqual([p.Key for p in resp.Pairs], self.keys)
+            self.assertEqual([float(p.Value) for p in resp.Pairs], [float(i) for i in range(1, 41)])
+
+        # planned once, every read since reused the plan
+        self.assertEqual(self.client.keyset_stats()["replans"], 1)
+        self.assertEqual(self.fake_app.requests, 6)
+
+        # the same pairs a Get of the keys returns
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=keys), None)
+        self.assertEqual([(p.Key, p.Value) for p in resp.Pairs], [(k, str(float(i))) for i, k in enumerate(self.keys, 1)])
+
+    async def test_columns(self):
+        self.client.cache = ValueCache(ttl=0.01, max_stale=0)  # keeps the values the delta compares
+        keys = self.keys + ["bacnet://192.168.1.10/100"]
+        handle = (await self.server.RegisterKeys(common_pb2.RegisterKeysRequest(Keys=keys), None)).Handle
+        columns = await self.server.GetKeySetColumns(common_pb2.KeySetRequest(Handle=handle), None)
+        self.assertEqual(list(columns.Indexes), [])
+        self.assertEqual(list(columns.Values[:40]), [float(i) for i in range(1, 41)])
+        self.assertTrue(math.isnan(columns.Values[40]))
+        self.assertEqual(list(columns.Errors), [common_pb2.GET_ERROR_NONE] * 40 + [common_pb2.GET_ERROR_COULD_NOT_RESOLVE_XREF])
+        self.assertEqual(dict(columns.ErrorMsgs), {40: "invalid bacnet key"})
+        self.assertEqual(dict(columns.Text), {})
+        self.assertAlmostEqual(columns.Time.ToNanoseconds() / 1e9, time.time(), delta=5)
+        # the batches may be read a millisecond or more apart, the first is read at Time
+        self.assertIn(len(columns.Times), (0, 41))
+        if columns.Times:
+            self.assertEqual((columns.Times[0], columns.Times[40]), (0, 0))
+
+        # the same reads as GetKeySet, and as small a delta
+        resp = await self.server.GetKeySet(common_pb2.KeySetRequest(Handle=handle), None)
+        self.assertEqual([float(p.Value) for p in resp.Pairs], list(columns.Values[:40]))
+        self.assertLess(columns.ByteSize() * 5, resp.ByteSize())
+        columns = await self.server.GetKeySetColumns(common_pb2.KeySetRequest(Handle=handle, Since=columns.Version), None)
+        self.assertEqual((list(columns.Indexes), columns.Unchanged), ([40], 40))
+
+    async def test_columns_times(self):
+        keys = [src.parse.ParseKey(k) for k in self.keys[:3]]
+        t0 = 1700000000.25
+        columns = src.server._get_columns(keys, [1.0, 2.0, None], [t0 + 0.0034, t0, None])
+        self.assertEqual(columns.Time.ToNanoseconds(), int(t0 * 1e9))
+        self.assertEqual(list(columns.Times), [3, 0, 0])
+
+        # read at Time all together
+        columns = src.server._get_columns(keys, [1.0, 2.0, 3.0], [t0, t0, t0])
+        self.assertEqual(list(columns.Times), [])
+
+        # left out values take no time
+        columns = src.server._get_columns(keys, [src.server._unchanged, 2.0, 3.0], [t0, t0 + 0.002, t0 + 0.005])
+        self.assertEqual((list(columns.Indexes), list(columns.Times)), ([1, 2], [0, 3]))
+        self.assertEqual(columns.Time.ToNanoseconds(), int((t0 + 0.002) * 1e9))
+
+    async def test_columns_numbers(self):
+        keys = [src.parse.ParseKey(k) for k in self.keys[:4]]
+        wire = Real(struct.unpack("f", struct.pack("f", 72.3))[0])
+        columns = src.server._get_columns(keys, [wire, Unsigned(2**53), Unsigned(2**53 + 1), -2**60], [0.0] * 4)
+        self.assertEqual(struct.unpack("f", struct.pack("f", columns.Values[0]))[0], wire)
+        self.assertEqual(columns.Values[1], 2**53)
+        self.assertTrue(math.isnan(columns.Values[2]) and math.isnan(columns.Values[3]))
+        self.assertEqual(dict(columns.Text), {2: str(2**53 + 1), 3: str(-2**60)})
+
+    async def test_too_many_keys(self):
+        self.client.keysets.max_keys = 39
+        resp = await self.server.RegisterKeys(common_pb2.RegisterKeysRequest(Keys=self.keys), None)
+        self.assertEqual((resp.Error, resp.Handle, resp.Count), (common_pb2.SERVICE_ERROR_TOO_MANY_KEYS, "", 0))
+        self.assertIn("over the limit of 39", resp.ErrorMsg)
+        self.assertEqual(self.client.keyset_stats()["sets"], 0)
+
+    async def test_unknown_handle(self):
+        registered = await self.server.RegisterKeys(common_pb2.RegisterKeysRequest(Keys=self.keys), None)
+        self.assertEqual(registered.Ttl, src.app.KEYSET_TTL)
+        await self.server.ReleaseKeySet(common_pb2.KeySetRequest(Handle=registered.Handle), None)
+        resp = await self.server.GetKeySet(common_pb2.KeySetRequest(Handle=registered.Handle), None)
+        self.assertEqual(resp.Error, common_pb2.SERVICE_ERROR_UNKNOWN_HANDLE)
+        self.assertEqual(len(resp.Pairs), 0)
+        columns = await self.server.GetKeySetColumns(common_pb2.KeySetRequest(Handle=registered.Handle), None)
+        self.assertEqual(columns.Error, common_pb2.SERVICE_ERROR_UNKNOWN_HANDLE)
+        self.assertEqual(self.fake_app.requests, 0)
+
+class TestServerSubscribe((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.server = src.server.BACnetRPCServer()
+        self.keys = [f"bacnet://192.168.1.10/100/analog-input,{i}/present-value" for i in range(1, 3)]
+        self.fake_app = _FakeApp(delay=0.01)
+        self.client = src.app.BACnetClient._instance = src.app.BACnetClient(self.fake_app, cache=ValueCache(ttl=60))
+        self.client.cov.poll_interval = 0.05
+
+    async def asyncTearDown(self):
+        await self.client.cov.close()
+        src.app.BACnetClient._instance = None
+
+    async def take(self, stream, n:int) -> dict[str, float]:
+        pairs = [await anext(stream) for _ in range(n)]
+        return {p.Key: float(p.Value) for p in pairs}
+
+    async def test_streams_share_reads(self):
+        streams = [self.server.Subscribe(common_pb2.SubscribeKeysRequest(Keys=self.keys), None) for _ in range(2)]
+        for stream in streams:
+            self.assertEqual(await self.take(stream, 2), {self.keys[0]: 1.0, self.keys[1]: 2.0})
+
+        self.fake_app.offset = 10
+        for stream in streams:
+            self.assertEqual(await self.take(stream, 2), {self.keys[0]: 11.0, self.keys[1]: 12.0})
+
+        # at most one read for the first values and one per poll, however many
+        # streams there are
+        self.assertLessEqual(self.fake_app.requests, self.client.cov.polls + 1)
+
+        for stream in streams:
+            await stream.aclose()
+        self.assertEqual(self.client.cov_stats()["objects"], 0)
+        self.assertEqual(self.client.cache_stats()["watched"], 0)
+
+    async def test_deadband(self):
+        bad_key = "bacnet://192.168.1.10/100"
+        stream = self.server.Subscribe(common_pb2.SubscribeKeysRequest(Keys=[bad_key, self.keys[0]], Deadband=5), None)
+        pair = await anext(stream)
+        self.assertEqual(pair.Error, common_pb2.GET_ERROR_COULD_NOT_RESOLVE_XREF)
+        self.assertEqual(await self.take(stream, 1), {self.keys[0]: 1.0})
+
+        update = asyncio.ensure_future(anext(stream))
+        self.fake_app.offset = 2
+        await asyncio.sleep(0.15)
+        self.assertFalse(update.done())
+
+        self.fake_app.offset = 10
+        pair = await update
+        self.assertEqual(float(pair.Value), 11.0)
+        await stream.aclose()
+
+class TestServerSampleRates((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.server = src.server.HistoryRPCServer()
+        self.client = src.app.BACnetClient._instance = src.app.BACnetClient(_FakeApp(delay=0.01))
+
+    async def asyncTearDown(self):
+        await self.client.scheduler.close()
+        src.app.BACnetClient._instance = None
+
+    async def test_set_and_get_sample_rate(self):
+        key = "bacnet://192.168.1.10/100/analog-input,1/present-value"
+        resp = await self.server.SetSampleRate(common_pb2.SetRequest(Pairs=[
+            common_pb2.SetPair(Key=key, Value="60"),
+            common_pb2.SetPair(Key="bacnet://192.168.1.10/100", Value="60"),
+            common_pb2.SetPair(Key=key, Value="often"),
+        ]), None)
+        self.assertEqual([p.Ok for p in resp.Pairs], [True, False, False])
+        self.assertEqual(resp.Pairs[1].Error, common_pb2.SET_ERROR_COULD_NOT_RESOLVE_XREF)
+        self.assertEqual(resp.Pairs[2].Error, common_pb2.SET_ERROR_INVALID_VALUE_TYPE)
+
+        resp = await self.server.GetSampleRate(common_pb2.SetRequest(Pairs=[common_pb2.SetPair(Key=key)]), None)
+        self.assertEqual(float(resp.Pairs[0].Value), 60.0)
+
+        resp = await self.server.RefreshRates(common_pb2.RefreshRatesRequest(), None)
+        self.assertEqual(resp.Error, common_pb2.SERVICE_ERROR_NONE)
+        self.assertEqual(self.client.scheduler.rate(key), 60.0)
+
+    async def test_scanned_values_are_served(self):
+        min_interval, src.scheduler.MIN_INTERVAL = src.scheduler.MIN_INTERVAL, 0.01
+        self.addCleanup(setattr, src.scheduler, "MIN_INTERVAL", min_interval)
+        fake_app = _FakeApp(delay=0.01)
+        self.client = src.app.BACnetClient._instance = src.app.BACnetClient(fake_app, cache=ValueCache(ttl=0))
+        key = "bacnet://192.168.1.10/100/analog-input,1/present-value"
+        await self.server.SetSampleRate(common_pb2.SetRequest(Pairs=[common_pb2.SetPair(Key=key, Value="0.5")]), None)
+        while not fake_app.requests:
+            await asyncio.sleep(0.01)
+
+        # between scans a Get is served by the last one, with caching off
+        resp = await src.server.BACnetRPCServer().Get(common_pb2.GetRequest(Keys=[key]), None)
+        self.assertEqual((resp.Pairs[0].Value, fake_app.requests), ("1.0", 1))
+
+        # not once the scan stops
+        await self.server.SetSampleRate(common_pb2.SetRequest(Pairs=[common_pb2.SetPair(Key=key, Value="0")]), None)
+        await src.server.BACnetRPCServer().Get(common_pb2.GetRequest(Keys=[key]), None)
+        self.assertEqual(fake_app.requests, 2)
+
+class TestReadCoalescing((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.server = src.server.BACnetRPCServer()
+        self.keys = [f"bacnet://192.168.1.10/100/analog-value,{i}/present-value" for i in range(1, 6)]
+        self.fake_app = _FakeApp(delay=0.05)
+        # no caching, only in-flight reads are shared
+        self.client = src.app.BACnetClient._instance = src.app.BACnetClient(self.fake_app, cache=ValueCache(ttl=0))
+
+    async def asyncTearDown(self):
+        src.app.BACnetClient._instance = None
+
+    async def test_concurrent_gets_share_a_read(self):
+        responses = await asyncio.gather(*(
+            self.server.Get(common_pb2.GetRequest(Keys=self.keys), None) for _ in range(20)
+        ))
+        self.assertEqual(self.fake_app.requests, 1)
+        self.assertEqual(self.client.cache_stats()["coalesced"], 19 * len(self.keys))
+        for resp in responses:
+            self.assertEqual([float(p.Value) for p in resp.Pairs], [1.0, 2.0, 3.0, 4.0, 5.0])
+
+    async def test_read_property_shares_a_read(self):
+        values = await asyncio.gather(*(
+            self.client.read_property("192.168.1.10", "analog-value,3", "present-value") for _ in range(5)
+        ))
+        self.assertEqual(values, [3.0] * 5)
+        self.assertEqual(self.fake_app.requests, 1)
+
+    async def test_cancelled_caller_does_not_cancel_the_read(self):
+        first = asyncio.ensure_future(self.server.Get(common_pb2.GetRequest(Keys=self.keys), None))
+        await asyncio.sleep(0.01)
+        second = asyncio.ensure_future(self.server.Get(common_pb2.GetRequest(Keys=self.keys), None))
+        await asyncio.sleep(0.01)
+        first.cancel()
+
+        resp = await second
+        self.assertEqual(len(resp.Pairs), len(self.keys))
+        self.assertEqual(self.fake_app.requests, 1)
+
+    async def test_reads_after_a_write_do_not_join_older_reads(self):
+        key = self.keys[0]
+        before = asyncio.ensure_future(self.server.Get(common_pb2.GetRequest(Keys=[key]), None))
+        await asyncio.sleep(0.01)
+        await self.server.Set(common_pb2.SetRequest(Pairs=[common_pb2.SetPair(Key=key, Value="42")]), None)
+        after = await self.server.Get(common_pb2.GetRequest(Keys=[key]), None)
+        await before
+        self.assertEqual(self.fake_app.requests, 3)  # read, write, read
+        self.assertEqual(len(after.Pairs), 1)
+
+class _SlowDeviceApp(_FakeApp):
+    """a _FakeApp where one device takes `slow_delay` to answer"""
+    def __init__(self, slow_address:str, slow_delay:float, **kwargs):
+        super().__init__(**kwargs)
+        self.slow_address = slow_address
+        self.slow_delay = slow_delay
+        self.cancelled = 0
+
+    async def read_property_multiple(self, address, parameter_list):
+        if str(address) == self.slow_address:
+            try:
+                await asyncio.sleep(self.slow_delay)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        return await super().read_property_multiple(address, parameter_list)
+
+class _CallContext:
+    """the part of a grpc.aio.ServicerContext the RPCs use, ended by hand"""
+    def __init__(self):
+        self.callbacks = []
+
+    def time_remaining(self):
+        return None
+
+    def add_done_callback(self, callback):
+        self.callbacks.append(callback)
+
+    def end(self):
+        for callback in self.callbacks:
+            callback(self)
+
+class _DeadlineContext(_CallContext):
+    def __init__(self, timeout:float):
+        super().__init__()
+        self.deadline = time.monotonic() + timeout
+
+    def time_remaining(self):
+        return max(0.0, self.deadline - time.monotonic())
+
+class TestGetDeadline((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.server = src.server.BACnetRPCServer()
+        self.fast = [f"bacnet://192.168.1.10/100/analog-value,{i}/present-value" for i in range(1, 4)]
+        self.slow = [f"bacnet://192.168.1.11/101/analog-value,{i}/present-value" for i in range(1, 3)]
+        self.fake_app = _SlowDeviceApp("192.168.1.11", 5.0, delay=0.01)
+        self.client = src.app.BACnetClient._instance = src.app.BACnetClient(self.fake_app, cache=ValueCache(ttl=0))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        src.app.BACnetClient._instance = None
+
+    async def test_partial_result_within_budget(self):
+        start = time.monotonic()
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=self.fast + self.slow), _DeadlineContext(0.3))
+        self.assertLess(time.monotonic() - start, 0.3)
+
+        self.assertEqual([p.Key for p in resp.Pairs], self.fast + self.slow)
+        self.assertEqual([float(p.Value) for p in resp.Pairs[:3]], [1.0, 2.0, 3.0])
+        for pair in resp.Pairs[3:]:
+            self.assertEqual(pair.Error, common_pb2.GET_ERROR_TIMEOUT)
+        self.assertEqual(resp.Error, common_pb2.SERVICE_ERROR_TIMEOUT)
+        self.assertIn("2 of 5", resp.ErrorMsg)
+
+    async def test_abandoned_read_is_cancelled(self):
+        await self.server.Get(common_pb2.GetRequest(Keys=self.slow), _DeadlineContext(0.1))
+        await asyncio.sleep(0)
+        self.assertEqual(self.fake_app.cancelled, 1)
+        stats = self.client.cache_stats()
+        self.assertEqual(stats["abandoned"], 1)
+        self.assertEqual(stats["in_flight"], 0)
+
+    async def test_read_with_other_waiters_is_kept(self):
+        background = asyncio.ensure_future(self.client.read_points([src.parse.ParseKey(k) for k in self.slow]))
+        await asyncio.sleep(0.01)
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=self.slow), _DeadlineContext(0.1))
+        self.assertEqual(resp.Error, common_pb2.SERVICE_ERROR_TIMEOUT)
+        self.assertEqual(self.fake_app.cancelled, 0)
+        self.assertEqual(self.client.cache_stats()["in_flight"], 2)
+        background.cancel()
+
+    async def test_no_deadline_waits(self):
+        self.fake_app.slow_delay = 0.05
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=self.fast + self.slow), None)
+        self.assertEqual(resp.Error, common_pb2.SERVICE_ERROR_NONE)
+        self.assertEqual([float(p.Value) for p in resp.Pairs], [1.0, 2.0, 3.0, 1.0, 2.0])
+
+class TestCancelledCall((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.server = src.server.BACnetRPCServer()
+        self.keys = [f"bacnet://192.168.1.11/101/analog-value,{i}/present-value" for i in range(1, 3)]
+        self.fake_app = _SlowDeviceApp("192.168.1.11", 5.0, delay=0.01)
+        self.client = src.app.BACnetClient._instance = src.app.BACnetClient(self.fake_app, cache=ValueCache(ttl=0))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        src.app.BACnetClient._instance = None
+
+    async def test_caller_going_away_cancels_reads(self):
+        context = _CallContext()
+        get = asyncio.ensure_future(self.server.Get(common_pb2.GetRequest(Keys=self.keys), context))
+        await asyncio.sleep(0.05)
+        self.assertEqual(self.client.limiter_stats()["devices"]["192.168.1.11"], (1, 0))
+
+        context.end()
+        with self.assertRaises(asyncio.CancelledError):
+            await get
+        await asyncio.sleep(0)
+        self.assertEqual(self.fake_app.cancelled, 1)
+        stats = self.client.limiter_stats()
+        self.assertEqual(stats["devices"], {})
+        self.assertEqual(stats["cancelled_rpcs"], 1)
+        self.assertEqual(self.client.cache_stats()["in_flight"], 0)
+
+    async def test_cancelled_handler_cancels_writes(self):
+        self.fake_app.delay = 5.0
+        key = "bacnet://192.168.1.10/100/analog-value,1/present-value"
+        set_ = asyncio.ensure_future(self.server.Set(common_pb2.SetRequest(Pairs=[common_pb2.SetPair(Key=key, Value="42")]), _CallContext()))
+        await asyncio.sleep(0.05)
+        set_.cancel()
+        with self.assertRaises(asyncio.CancelledError):
+            await set_
+        stats = self.client.limiter_stats()
+        self.assertEqual(stats["devices"], {})
+        self.assertEqual(stats["cancelled_rpcs"], 1)
+        self.assertEqual(self.client.cache.epoch, 1)   # invalidated all the same
+
+    async def test_finished_call_is_not_cancelled(self):
+        self.fake_app.slow_delay = 0.0
+        context = _CallContext()
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=self.keys), context)
+        context.end()
+        await asyncio.sleep(0)
+        self.assertEqual(len(resp.Pairs), 2)
+        self.assertEqual(self.client.limiter_stats()["cancelled_rpcs"], 0)
+
+class TestDeviceRouting((unittest.IsolatedAsyncioTestCase)):
+    async def asyncSetUp(self):
+        self.server = src.server.BACnetRPCServer()
+        self.fake_app = _FakeApp(delay=0.01)
+        self.fake_app.devices[100] = "192.168.1.10"
+        self.client = src.app.BACnetClient._instance = src.app.BACnetClient(self.fake_app, cache=ValueCache(ttl=0))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        src.app.BACnetClient._instance = None
+
+    async def test_get_by_instance(self):
+        keys = [f"bacnet://device/100/analog-value,{i}/present-value" for i in range(1, 4)]
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=keys), None)
+        self.assertEqual([p.Key for p in resp.Pairs], keys)
+        self.assertEqual([float(p.Value) for p in resp.Pairs], [1.0, 2.0, 3.0])
+        self.assertEqual(self.fake_app.addresses, ["192.168.1.10"])
+        self.assertEqual(self.client.device_stats()["who_is"], 1)
+
+    async def test_unknown_instance(self):
+        key = "bacnet://device/200/analog-value,1/present-value"
+        for _ in range(3):
+            resp = await self.server.Get(common_pb2.GetRequest(Keys=[key]), None)
+            self.assertEqual(resp.Pairs[0].Error, common_pb2.GET_ERROR_COULD_NOT_RESOLVE_ADDR)
+        self.assertEqual(self.client.device_stats()["who_is"], 1)  # then held off
+        self.assertEqual(self.fake_app.requests, 0)
+
+    async def test_moved_device_is_followed(self):
+        key = "bacnet://192.168.1.10/100/analog-value,1/present-value"
+        await self.server.Get(common_pb2.GetRequest(Keys=[key]), None)
+        self.client.devices.i_am(_i_am(100, "192.168.1.20"))
+        resp = await self.server.Get(common_pb2.GetRequest(Keys=[key]), None)
+        self.assertEqual(float(resp.Pairs[0].Value), 1.0)
+        self.assertEqual(self.fake_app.addresses, ["192.168.1.10", "192.168.1.20"])
+
+    async def test_set_by_instance(self):
+        pairs = [
+            common_pb2.SetPair(Key="bacnet://device/100/analog-value,1/present-value", Value="42"),
+            common_pb2.SetPair(Key="bacnet://device/200/analog-value,1/present-value", Value="43"),
+        ]
+        resp = await self.server.Set(common_pb2.SetRequest(Pairs=pairs), None)
+        self.assertTrue(resp.Pairs[0].Ok)
+        self.assertFalse(resp.Pairs[1].Ok)
+        self.assertEqual(resp.Pairs[1].Error, common_pb2.SET_ERROR_COULD_NOT_RESOLVE_ADDR)
+        self.assertEqual(self.fake_app.written, {"analog-value,1": 42.0})
+
+    async def test_device_caps_from_i_am(self):
+        self.client.devices.i_am(_i_am(100, "192.168.1.10", 1024, Segmentation.noSegmentation))
+        caps = self.client.device_caps("192.168.1.10")
+        self.assertEqual((caps.max_apdu, caps.segmented), (1024, False))
+
+    async def test_discover(self):
+        self.fake_app.devices[300] = "192.168.1.30:47809"
+        self.client.discovery.response_window = 0.01
+        self.client.discovery.max_rate = 1000.0
+        self.client.discovery.max_width = 4194303
+        found = [d async for d in self.server.Discover(common_pb2.DiscoverRequest(High=1000), None)]
+        self.assertEqual([d.Key for d in found], ["bacnet://192.168.1.10/100", "bacnet://192.168.1.30:47809/300"])
+        self.assertEqual((found[1].Instance, found[1].MaxApdu, found[1].VendorId), (300, 1476, 15))
+        self.assertEqual(self.client.device_stats()["devices"], 2)
+
+    async def test_read_latency(self):
+        self.assertEqual(self.client.read_latency(), 0.0)
+        await self.server.Get(common_pb2.GetRequest(Keys=["bacnet://192.168.1.10/100/analog-value,1/present-value"]), None)
+        self.assertGreaterEqual(self.client.read_latency(), 0.01)
+        self.assertEqual(self.client.read_latency(window=0.0), 0.0)
+
+        # reads a dead device never answered don't count
+        async def no_response(address, parameter_list):
+            await asyncio.sleep(0.2)
+            raise AbortPDU(reason=AbortReason.noResponse)
+        self.fake_app.read_property_multiple = no_response
+        keys = [f"bacnet://192.168.1.10/100/analog-value,{i}/present-value" for i in (2, 3)]
+        await self.server.Get(common_pb2.GetRequest(Keys=keys), None)
+        self.assertLess(self.client.read_latency(), 0.1)
+
+class TestValueEncoding(unittest.TestCase):
+    def test_atomic_values(self):
+        wire = Real(struct.unpack("f", struct.pack("f", 72.3))[0])
+        cases = [
+            (wire, "72.3", common_pb2.FLOAT),
+            (Real(1.0), "1.0", common_pb2.FLOAT),
+            (Double(0.1), "0.1", common_pb2.DOUBLE),
+            (Unsigned(3), "3", common_pb2.UINT64),
+            (Boolean(True), "true", common_pb2.BOOL),
+            (BinaryPV("inactive"), "inactive", common_pb2.STRING),
+            (EngineeringUnits("degreesFahrenheit"), "degrees-fahrenheit", common_pb2.STRING),
+            (CharacterString("AHU-1 SAT"), "AHU-1 SAT", common_pb2.STRING),
+            (OctetString(b"\x01\xff"), "01ff", common_pb2.BYTES),
+            (Null(()), "", common_pb2.NULL),
+            (ObjectIdentifier("analog-value,1"), "analog-value,1", common_pb2.STRING),
+        ]
+        for value, text, dtype in cases:
+            self.assertEqual(src.server._encode_value(value), (text, dtype), type(value).__name__)
+        self.assertIs(src.server._encoders[Real], src.server._encoders[type(wire)])
+        self.assertEqual(float(src.server._encode_value(wire)[0]), 72.3)
+
+    def test_structured_values(self):
+        self.assertEqual(src.server._encode_value(StatusFlags([0, 1, 0, 0])), ('["fault"]', common_pb2.JSON))
+        priority_array = PriorityArray([PriorityValue(null=())] * 15 + [PriorityValue(real=72.5)])
+        text, dtype = src.server._encode_value(priority_array)
+        self.assertEqual(dtype, common_pb2.JSON)
+        self.assertEqual(json.loads(text)[-2:], [{"null": []}, {"real": 72.5}])
+        date_time = DateTime(date=Date((124, 1, 2, 3)), time=Time((1, 2, 3, 4)))
+        self.assertEqual(src.server._encode_value(date_time), ('{"date":"2024-01-02","time":"01:02:03.04"}', common_pb2.JSON))
+
+        pair = src.server._get_pair("key", StatusFlags([1, 0, 0, 0]), time.time())
+        self.assertEqual((pair.Value, pair.Dtype), ('["in-alarm"]', common_pb2.JSON))
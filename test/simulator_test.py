@@ -0,0 +1,69 @@
+import unittest
+import asyncio
+
+from bacpypes3.apdu import AbortPDU, AbortReason
+from bacpypes3.app import Application
+from bacpypes3.local.device import DeviceObject
+from bacpypes3.local.networkport import NetworkPortObject
+
+import src.app
+import src.parse
+from src.cache import ValueCache
+from bench.simulator import SimulatorFleet
+
+def _client_app(port:int) -> Application:
+    return Application.from_object_list([
+        DeviceObject(objectIdentifier=("device", 999), objectName="driver", vendorIdentifier=15),
+        NetworkPortObject(f"127.0.0.1/8:{port}", objectIdentifier=("network-port", 1), objectName="NetworkPort-1"),
+    ])
+
+class TestSimulatorFleet(unittest.IsolatedAsyncioTestCase):
+    async def asyncSetUp(self):
+        self.fleet = await SimulatorFleet.create(3, port=47950, objects=40, latency=0.001, change=0)
+        self.client = src.app.BACnetClient(_client_app(47949), cache=ValueCache(ttl=0))
+
+    async def asyncTearDown(self):
+        await self.client.close()
+        self.fleet.close()
+
+    async def test_read(self):
+        keys = [src.parse.ParseKey(k) for k in self.fleet.keys()]
+        self.assertEqual(len(keys), 120)
+        values, _ = await self.client.read_points(keys, timeout=10)
+        self.assertEqual([str(values[0]), str(values[-1])], ["1.0", "inactive"])
+        self.assertFalse([v for v in values if isinstance(v, BaseException)])
+
+        # RPMs, a few per device
+        self.assertLess(self.client.limiter_stats()["requests"], 20)
+
+    async def test_device_options(self):
+        self.fleet.close()
+        self.fleet = await SimulatorFleet.create(2, port=47950, objects=40, latency=0.001, change=0, rpm=False, max_apdu=480)
+        self.assertEqual(self.fleet.devices[0].app.rpm, False)
+        keys = [src.parse.ParseKey(k) for k in self.fleet.devices[0].keys()]
+        values, _ = await self.client.read_points(keys, timeout=10)
+        self.assertEqual(values[0], 1.0)
+        self.assertFalse([v for v in values if isinstance(v, BaseException)])
+
+    async def test_who_is(self):
+        device = self.fleet.devices[1]
+        i_ams = await self.client._app.who_is(device.instance, device.instance, src.parse.ParseKey(device.keys()[0]).device_address, timeout=1)
+        entry = self.client.devices.i_am(i_ams[0])
+        self.assertEqual((entry.instance, entry.address, entry.max_apdu), (1001, "127.0.0.1:47951", 1476))
+
+    async def test_max_apdu(self):
+        self.fleet.close()
+        self.fleet = await SimulatorFleet.create(1, port=47950, objects=40, latency=0.001, change=0, max_apdu=480)
+        device = self.fleet.devices[0]
+        names = [src.parse.ParseKey(k) for k in device.keys("object-name")]
+        parameter_list = []
+        for key in names:
+            parameter_list.extend([key.object_id, [key.property_reference]])
+        with self.assertRaises(AbortPDU) as err:
+            await self.client._app.read_property_multiple(names[0].device_address, parameter_list)
+        self.assertEqual(err.exception.apduAbortRejectReason, AbortReason.segmentationNotSupported)
+
+        # the planner keeps batches to what the device can send
+        values, _ = await self.client.read_points(names, timeout=10)
+        self.assertEqual(str(values[0]), "AV-1")
+        self.assertFalse([v for v in values if isinstance(v, BaseException)])
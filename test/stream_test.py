@@ -0,0 +1,33 @@
+import unittest
+import asyncio
+
+from src.cache import CacheEntry
+from src.stream import PointStream
+
+class StreamTest(unittest.IsolatedAsyncioTestCase):
+    async def test_coalesces_updates(self):
+        stream = PointStream()
+        key = ("192.168.1.10", "analog-input,1", "present-value", None)
+        for value in (1.0, 2.0, 3.0):
+            stream.Offer(key, CacheEntry(value, 5))
+        updates = await stream.Next()
+        self.assertEqual([(k, e.value) for k, e in updates], [(key, 3.0)])
+
+    async def test_drops_repeats(self):
+        stream = PointStream()
+        key = ("192.168.1.10", "binary-input,1", "present-value", None)
+        stream.Sent(key, "active")
+        stream.Offer(key, CacheEntry("active", 5))
+        self.assertEqual(stream.dropped, 1)
+
+    async def test_min_interval(self):
+        stream = PointStream(min_interval=0.1)
+        key = ("192.168.1.10", "analog-input,1", "present-value", None)
+        stream.Sent(key, 1.0)
+        stream.Offer(key, CacheEntry(2.0, 5))
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        updates = await stream.Next()
+        self.assertGreaterEqual(loop.time() - start, 0.09)
+        self.assertEqual(updates[0][1].value, 2.0)